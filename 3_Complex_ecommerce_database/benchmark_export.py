@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Export Throughput Benchmark
+Scales a copy of mydb.sqlite (or of a cached generated snapshot, with --scale) up to a
+target number of order_items and measures streaming export throughput (rows/s) for
+every supported format.
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from fixtures import golden_snapshot
+from generate_data import DEFAULT_SEED
+from result_export import EXPORT_FORMATS, export_query_results, pa
+
+EXPORT_QUERY = """
+    SELECT oi.order_item_id, oi.order_id, o.order_date, o.status,
+           p.name as product_name, oi.quantity, oi.unit_price, oi.total_price
+    FROM order_items oi
+    JOIN orders o ON oi.order_id = o.order_id
+    JOIN products p ON oi.product_id = p.product_id
+"""
+
+
+def build_scaled_copy(db_path, target_rows, workdir):
+    """Copy the database and double order_items until it holds target_rows rows."""
+    scaled_db = os.path.join(workdir, 'mydb_scaled.sqlite')
+
+    source = sqlite3.connect(db_path)
+    conn = sqlite3.connect(scaled_db)
+    source.backup(conn)
+    source.close()
+
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    row_count = conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+    if row_count == 0:
+        conn.close()
+        raise ValueError("order_items is empty; run 'python setup_database.py' first")
+
+    # Each copied line item also adds its price to its order, so the order totals stay consistent
+    while row_count < target_rows:
+        conn.execute("""
+            INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+            SELECT order_id, product_id, quantity, unit_price, total_price
+            FROM order_items
+            LIMIT ?
+        """, (target_rows - row_count,))
+        conn.commit()
+        row_count = conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+
+    conn.close()
+    return scaled_db, row_count
+
+
+def main():
+    """Measure rows/s for each export format on a scaled copy of mydb.sqlite."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming query result export")
+    parser.add_argument('--db', default='mydb.sqlite', help="Database to scale (default: mydb.sqlite)")
+    parser.add_argument('--rows', type=int, default=1000000, help="Target order_items rows")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per fetchmany() call")
+    parser.add_argument('--scale', type=float, default=None,
+                        help="Start from a cached generate_data.py snapshot at this scale instead of --db")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Seed of the --scale snapshot")
+    args = parser.parse_args()
+
+    if args.scale is not None:
+        start = time.perf_counter()
+        args.db = golden_snapshot(args.scale, args.seed)
+        print(f"📦 Snapshot {args.db} ready in {time.perf_counter() - start:.1f}s")
+    elif not os.path.exists(args.db):
+        print("Database not found. Please run 'python setup_database.py' first to create the database.")
+        return 1
+
+    print("🚀 Export Throughput Benchmark")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix='export_bench_')
+    try:
+        start = time.perf_counter()
+        scaled_db, row_count = build_scaled_copy(args.db, args.rows, workdir)
+        print(f"📦 Scaled copy with {row_count:,} order_items in {time.perf_counter() - start:.1f}s")
+
+        print(f"\n{'format':10} | {'rows':>10} | {'seconds':>8} | {'rows/s':>12} | {'size MB':>8}")
+        print("-" * 60)
+        for export_format, extension in EXPORT_FORMATS.items():
+            if pa is None and export_format in ('Parquet', 'Arrow IPC'):
+                print(f"{export_format:10} | skipped (pip install pyarrow)")
+                continue
+
+            output_path = os.path.join(workdir, f"export{extension}")
+            start = time.perf_counter()
+            _, exported = export_query_results(EXPORT_QUERY, export_format, scaled_db,
+                                               output_path, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(output_path) / (1024 * 1024)
+            print(f"{export_format:10} | {exported:10,} | {elapsed:8.2f} | {exported / elapsed:12,.0f} | {size_mb:8.1f}")
+            os.remove(output_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Category Closure Table
+Maintains category_closure(ancestor_id, descendant_id, depth) for the self-referencing
+categories table, so "everything under Electronics" is a single indexed join instead
+of a recursive CTE. Triggers on categories keep it current; moves that would create a
+cycle are rejected.
+"""
+
+import argparse
+import os
+import sqlite3
+
+CATEGORY_CLOSURE_TABLE = ["""
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+) WITHOUT ROWID
+""", """
+CREATE INDEX IF NOT EXISTS idx_category_closure_descendant ON category_closure (descendant_id, ancestor_id)
+""", """
+CREATE INDEX IF NOT EXISTS idx_products_category_id ON products (category_id)
+"""]
+
+CATEGORY_CLOSURE_TRIGGERS = ["""
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_insert
+AFTER INSERT ON categories
+BEGIN
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    VALUES (NEW.category_id, NEW.category_id, 0);
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, NEW.category_id, depth + 1
+    FROM category_closure
+    WHERE descendant_id = NEW.parent_category_id;
+END
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_cycle_guard
+BEFORE UPDATE OF parent_category_id ON categories
+WHEN NEW.parent_category_id IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'category hierarchy cycle: new parent is inside the moved subtree')
+    WHERE EXISTS (
+        SELECT 1 FROM category_closure
+        WHERE ancestor_id = NEW.category_id AND descendant_id = NEW.parent_category_id
+    );
+END
+""",
+# Moving a subtree: drop every path from the old ancestors into the subtree,
+# then connect each new ancestor to each node of the subtree
+"""
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_move
+AFTER UPDATE OF parent_category_id ON categories
+WHEN OLD.parent_category_id IS NOT NEW.parent_category_id
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.category_id)
+      AND ancestor_id IN (SELECT ancestor_id FROM category_closure
+                          WHERE descendant_id = NEW.category_id AND ancestor_id != NEW.category_id);
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT super.ancestor_id, sub.descendant_id, super.depth + sub.depth + 1
+    FROM category_closure super, category_closure sub
+    WHERE super.descendant_id = NEW.parent_category_id
+      AND sub.ancestor_id = NEW.category_id;
+END
+""",
+# Children of a deleted category become roots of their own subtrees
+"""
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_delete
+AFTER DELETE ON categories
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = OLD.category_id)
+      AND ancestor_id IN (SELECT ancestor_id FROM category_closure WHERE descendant_id = OLD.category_id);
+END
+"""]
+
+TRIGGER_NAMES = [
+    'trg_category_closure_insert',
+    'trg_category_closure_cycle_guard',
+    'trg_category_closure_move',
+    'trg_category_closure_delete',
+]
+
+# Every (ancestor, descendant, depth) path from the parent links; the depth bound
+# stops the recursion if the stored hierarchy already contains a cycle
+CLOSURE_FROM_PARENTS = """
+    WITH RECURSIVE paths(ancestor_id, descendant_id, depth) AS (
+        SELECT category_id, category_id, 0 FROM categories
+        UNION
+        SELECT parent.category_id, paths.descendant_id, paths.depth + 1
+        FROM paths
+        JOIN categories child ON child.category_id = paths.ancestor_id
+        JOIN categories parent ON parent.category_id = child.parent_category_id
+        WHERE paths.depth < (SELECT COUNT(*) FROM categories)
+    )
+    SELECT ancestor_id, descendant_id, MIN(depth)
+    FROM paths
+    GROUP BY ancestor_id, descendant_id
+"""
+
+
+def install_category_closure(conn):
+    """Create the closure table, fill it from parent_category_id and install its triggers."""
+    for statement in CATEGORY_CLOSURE_TABLE:
+        conn.execute(statement)
+    rebuild_category_closure(conn)
+    for statement in CATEGORY_CLOSURE_TRIGGERS:
+        conn.execute(statement)
+
+
+def drop_category_closure_triggers(conn):
+    """Remove the maintenance triggers, e.g. before a bulk load."""
+    for trigger_name in TRIGGER_NAMES:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+
+def rebuild_category_closure(conn):
+    """Recompute the closure table from the parent links in one pass."""
+    conn.execute("DELETE FROM category_closure")
+    conn.execute(f"INSERT INTO category_closure (ancestor_id, descendant_id, depth) {CLOSURE_FROM_PARENTS}")
+
+
+def verify_category_closure(conn):
+    """Compare the stored closure with the parent links.
+
+    Returns (missing, unexpected): lists of (ancestor_id, descendant_id, depth) rows.
+    """
+    missing = conn.execute(f"""
+        SELECT * FROM ({CLOSURE_FROM_PARENTS})
+        EXCEPT SELECT ancestor_id, descendant_id, depth FROM category_closure
+    """).fetchall()
+    unexpected = conn.execute(f"""
+        SELECT ancestor_id, descendant_id, depth FROM category_closure
+        EXCEPT SELECT * FROM ({CLOSURE_FROM_PARENTS})
+    """).fetchall()
+    return missing, unexpected
+
+
+def get_subtree(conn, category_name):
+    """Return (category_id, name, depth) for a category and everything below it."""
+    return conn.execute("""
+        SELECT c.category_id, c.name, cc.depth
+        FROM categories root
+        JOIN category_closure cc ON cc.ancestor_id = root.category_id
+        JOIN categories c ON c.category_id = cc.descendant_id
+        WHERE root.name = ?
+        ORDER BY cc.depth, c.name
+    """, (category_name,)).fetchall()
+
+
+def main():
+    """Install, rebuild, verify or inspect the category closure table."""
+    parser = argparse.ArgumentParser(description="Maintain the categories closure table")
+    parser.add_argument('action', choices=['install', 'rebuild', 'verify', 'subtree'])
+    parser.add_argument('category', nargs='?', help="Category name (for the 'subtree' action)")
+    parser.add_argument('--db', default='mydb.sqlite', help="Database file (default: mydb.sqlite)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print("Database not found. Please run 'python setup_database.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'install':
+            with conn:
+                install_category_closure(conn)
+            print("✅ Category closure table built and triggers installed")
+        elif args.action == 'rebuild':
+            with conn:
+                rebuild_category_closure(conn)
+            print("✅ Category closure table recomputed from parent_category_id")
+        elif args.action == 'verify':
+            missing, unexpected = verify_category_closure(conn)
+            if not missing and not unexpected:
+                print("✅ category_closure matches the parent_category_id links")
+            else:
+                print(f"⚠️  {len(missing)} missing and {len(unexpected)} unexpected closure rows "
+                      f"(run 'python category_closure.py rebuild')")
+                return 2
+        else:
+            subtree = get_subtree(conn, args.category or "")
+            if not subtree:
+                print(f"❌ No category named '{args.category}'")
+                return 1
+            for category_id, name, depth in subtree:
+                print(f"{'  ' * depth}- {name} (id {category_id})")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
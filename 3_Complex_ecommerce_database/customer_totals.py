@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Customer Totals Maintenance
+Keeps the pre-calculated customers.total_orders and customers.total_spent fields
+correct under live writes with O(1) triggers, and verifies them against the
+full aggregate in chunked scans.
+"""
+
+import argparse
+import os
+import sqlite3
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Stored and recomputed totals are sums of REAL values; allow for rounding drift
+SPENT_TOLERANCE = 0.005
+
+CUSTOMER_TOTALS_TRIGGERS = ["""
+CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON orders (customer_id)
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_orders_customer_totals_insert
+AFTER INSERT ON orders
+BEGIN
+    UPDATE customers
+    SET total_orders = COALESCE(total_orders, 0) + 1,
+        total_spent = COALESCE(total_spent, 0) + COALESCE(NEW.total_amount, 0)
+    WHERE customer_id = NEW.customer_id;
+END
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_orders_customer_totals_delete
+AFTER DELETE ON orders
+BEGIN
+    UPDATE customers
+    SET total_orders = COALESCE(total_orders, 0) - 1,
+        total_spent = COALESCE(total_spent, 0) - COALESCE(OLD.total_amount, 0)
+    WHERE customer_id = OLD.customer_id;
+END
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_orders_customer_totals_update
+AFTER UPDATE OF customer_id, total_amount ON orders
+WHEN OLD.customer_id IS NOT NEW.customer_id OR OLD.total_amount IS NOT NEW.total_amount
+BEGIN
+    UPDATE customers
+    SET total_orders = COALESCE(total_orders, 0) - 1,
+        total_spent = COALESCE(total_spent, 0) - COALESCE(OLD.total_amount, 0)
+    WHERE customer_id = OLD.customer_id;
+    UPDATE customers
+    SET total_orders = COALESCE(total_orders, 0) + 1,
+        total_spent = COALESCE(total_spent, 0) + COALESCE(NEW.total_amount, 0)
+    WHERE customer_id = NEW.customer_id;
+END
+""",
+# Added, removed and corrected line items flow into the order total, which in
+# turn fires trg_orders_customer_totals_update for the customer. So an order is
+# inserted with subtotal 0 and total_amount = tax + shipping, then its items add
+# the rest; setup_database.py and generate_data.py load rows before installing
+# the triggers and store subtotal = SUM(order_items.total_price) directly.
+"""
+CREATE TRIGGER IF NOT EXISTS trg_order_items_order_total_insert
+AFTER INSERT ON order_items
+BEGIN
+    UPDATE orders
+    SET subtotal = subtotal + COALESCE(NEW.total_price, 0),
+        total_amount = total_amount + COALESCE(NEW.total_price, 0)
+    WHERE order_id = NEW.order_id;
+END
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_order_items_order_total_delete
+AFTER DELETE ON order_items
+BEGIN
+    UPDATE orders
+    SET subtotal = subtotal - COALESCE(OLD.total_price, 0),
+        total_amount = total_amount - COALESCE(OLD.total_price, 0)
+    WHERE order_id = OLD.order_id;
+END
+""", """
+CREATE TRIGGER IF NOT EXISTS trg_order_items_order_total_update
+AFTER UPDATE OF total_price, order_id ON order_items
+WHEN OLD.order_id IS NOT NEW.order_id OR OLD.total_price IS NOT NEW.total_price
+BEGIN
+    UPDATE orders
+    SET subtotal = subtotal - COALESCE(OLD.total_price, 0),
+        total_amount = total_amount - COALESCE(OLD.total_price, 0)
+    WHERE order_id = OLD.order_id;
+    UPDATE orders
+    SET subtotal = subtotal + COALESCE(NEW.total_price, 0),
+        total_amount = total_amount + COALESCE(NEW.total_price, 0)
+    WHERE order_id = NEW.order_id;
+END
+"""]
+
+TRIGGER_NAMES = [
+    'trg_orders_customer_totals_insert',
+    'trg_orders_customer_totals_delete',
+    'trg_orders_customer_totals_update',
+    'trg_order_items_order_total_insert',
+    'trg_order_items_order_total_delete',
+    'trg_order_items_order_total_update',
+]
+
+
+def install_customer_total_triggers(conn):
+    """Create the triggers (and the orders.customer_id index) that maintain customer totals."""
+    for statement in CUSTOMER_TOTALS_TRIGGERS:
+        conn.execute(statement)
+
+
+def drop_customer_total_triggers(conn):
+    """Remove the maintenance triggers, e.g. before a bulk load."""
+    for trigger_name in TRIGGER_NAMES:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+
+def rebuild_customer_totals(conn):
+    """Recompute every customer's totals from the orders table in one pass."""
+    conn.execute("""
+        UPDATE customers
+        SET total_orders = (
+            SELECT COUNT(*) FROM orders WHERE orders.customer_id = customers.customer_id
+        ),
+        total_spent = (
+            SELECT COALESCE(SUM(total_amount), 0) FROM orders WHERE orders.customer_id = customers.customer_id
+        )
+    """)
+
+
+def verify_customer_totals(conn, chunk_size=DEFAULT_CHUNK_SIZE, fix=False):
+    """Compare stored totals with the full aggregate, chunk_size customers at a time.
+
+    Returns a list of (customer_id, stored_orders, expected_orders, stored_spent, expected_spent)
+    for every customer whose stored values have drifted.
+    """
+    mismatches = []
+    last_customer_id = -1
+
+    while True:
+        rows = conn.execute("""
+            SELECT c.customer_id, c.total_orders, c.total_spent,
+                   COUNT(o.order_id), COALESCE(SUM(o.total_amount), 0)
+            FROM (
+                SELECT customer_id, total_orders, total_spent
+                FROM customers
+                WHERE customer_id > ?
+                ORDER BY customer_id
+                LIMIT ?
+            ) c
+            LEFT JOIN orders o ON o.customer_id = c.customer_id
+            GROUP BY c.customer_id
+            ORDER BY c.customer_id
+        """, (last_customer_id, chunk_size)).fetchall()
+
+        if not rows:
+            break
+
+        for customer_id, stored_orders, stored_spent, expected_orders, expected_spent in rows:
+            if (stored_orders or 0) != expected_orders or abs((stored_spent or 0) - expected_spent) > SPENT_TOLERANCE:
+                mismatches.append((customer_id, stored_orders, expected_orders, stored_spent, expected_spent))
+
+        last_customer_id = rows[-1][0]
+
+    if fix and mismatches:
+        with conn:
+            conn.executemany(
+                "UPDATE customers SET total_orders = ?, total_spent = ? WHERE customer_id = ?",
+                [(expected_orders, expected_spent, customer_id)
+                 for customer_id, _, expected_orders, _, expected_spent in mismatches]
+            )
+
+    return mismatches
+
+
+def main():
+    """Install, rebuild or verify the maintained customer totals."""
+    parser = argparse.ArgumentParser(description="Maintain customers.total_orders / total_spent")
+    parser.add_argument('action', choices=['install', 'rebuild', 'verify'])
+    parser.add_argument('--db', default='mydb.sqlite', help="Database file (default: mydb.sqlite)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Customers checked per verification chunk")
+    parser.add_argument('--fix', action='store_true', help="Repair drifted rows found by 'verify'")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print("Database not found. Please run 'python setup_database.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'install':
+            with conn:
+                install_customer_total_triggers(conn)
+            print("✅ Customer total triggers installed")
+        elif args.action == 'rebuild':
+            with conn:
+                rebuild_customer_totals(conn)
+            print("✅ Customer totals recomputed from orders")
+        else:
+            mismatches = verify_customer_totals(conn, args.chunk_size, fix=args.fix)
+            if not mismatches:
+                print("✅ customers.total_orders / total_spent match the orders table")
+            else:
+                print(f"⚠️  {len(mismatches)} customers have drifted totals:")
+                for customer_id, stored_orders, expected_orders, stored_spent, expected_spent in mismatches[:20]:
+                    print(f"  - customer {customer_id}: orders {stored_orders} (expected {expected_orders}), "
+                          f"spent {stored_spent} (expected {expected_spent:.2f})")
+                if args.fix:
+                    print("✅ Drifted rows repaired")
+                    return 0
+                return 2
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Snapshot Fixtures for Tests and Benchmarks
+Builds each fixture database once - the hand-written sample from setup_database.py
+or a generate_data.py database at a scale factor and seed - and caches it as a golden
+snapshot. The cache key includes a hash of the code that builds it, so editing the
+generator or the setup script invalidates old snapshots. Tests get their own copy in
+milliseconds through the SQLite backup API, into :memory: or a temporary file, so the
+suite no longer pays for data generation on every run.
+"""
+
+import argparse
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+from generate_data import DEFAULT_SEED, generate_database
+from setup_database import create_database
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Override with FIXTURE_CACHE_DIR, e.g. to share snapshots between checkouts or CI jobs
+CACHE_DIR = os.environ.get('FIXTURE_CACHE_DIR', os.path.join(HERE, '.fixture_cache'))
+
+# Everything that decides the contents of a fixture database
+SOURCE_FILES = ['setup_database.py', 'generate_data.py', 'category_closure.py', 'customer_totals.py',
+                'full_text_search.py', 'summary_tables.py']
+
+
+@functools.lru_cache(maxsize=None)
+def generator_version():
+    """Short hash of SOURCE_FILES; part of every snapshot name."""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        with open(os.path.join(HERE, name), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+def snapshot_path(scale=None, seed=DEFAULT_SEED):
+    """Cache path of a snapshot: the sample database when scale is None, else a generated one."""
+    name = 'sample' if scale is None else f"scale{scale:g}-seed{seed}"
+    return os.path.join(CACHE_DIR, f"{name}-{generator_version()}.sqlite")
+
+
+def golden_snapshot(scale=None, seed=DEFAULT_SEED):
+    """Path of the snapshot for (scale, seed), building it first if it is not cached yet.
+
+    The snapshot is built under a temporary name and renamed into place, so a concurrent
+    or interrupted build never leaves a half-written snapshot behind.
+    """
+    path = snapshot_path(scale, seed)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix='build_', dir=CACHE_DIR)
+    build_path = os.path.join(build_dir, os.path.basename(path))
+    try:
+        if scale is None:
+            # create_database lists the tables and example questions; not useful in test output
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_database(build_path)
+        else:
+            generate_database(build_path, scale, seed, jobs=os.cpu_count() or 1)
+        os.replace(build_path, path)
+    finally:
+        if os.path.exists(build_path):
+            os.remove(build_path)
+        os.rmdir(build_dir)
+    return path
+
+
+def restore_snapshot(target, scale=None, seed=DEFAULT_SEED):
+    """Copy the snapshot for (scale, seed) into the open connection target."""
+    source = sqlite3.connect(f"file:{golden_snapshot(scale, seed)}?mode=ro", uri=True)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+    return target
+
+
+def fixture_connection(scale=None, seed=DEFAULT_SEED):
+    """A private in-memory copy of the snapshot; changes never reach the cache."""
+    return restore_snapshot(sqlite3.connect(':memory:'), scale, seed)
+
+
+def fixture_copy(db_path=None, scale=None, seed=DEFAULT_SEED):
+    """A private on-disk copy of the snapshot at db_path (default: a new temp file); returns the path.
+
+    Use this when the code under test opens the database by path.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='fixture_'), 'mydb.sqlite')
+    elif os.path.exists(db_path):
+        os.remove(db_path)
+    restore_snapshot(sqlite3.connect(db_path), scale, seed).close()
+    return db_path
+
+
+def clear_snapshots(stale_only=False):
+    """Delete cached snapshots (only those built by older code if stale_only); returns the paths."""
+    removed = []
+    for path in glob.glob(os.path.join(CACHE_DIR, '*.sqlite')):
+        if not (stale_only and path.endswith(f"-{generator_version()}.sqlite")):
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def main():
+    """Build, list or clear the cached fixture snapshots."""
+    parser = argparse.ArgumentParser(description="Manage cached fixture databases")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="Build a snapshot (if needed) and time a copy of it")
+    build.add_argument('--scale', type=float, default=None,
+                       help="Scale factor for generate_data.py (default: the setup_database.py sample)")
+    build.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    subparsers.add_parser('list', help="List cached snapshots")
+    clear = subparsers.add_parser('clear', help="Delete cached snapshots")
+    clear.add_argument('--stale', action='store_true', help="Only delete snapshots built by older code")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        path = golden_snapshot(args.scale, args.seed)
+        print(f"📦 {path} ready in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        fixture_connection(args.scale, args.seed).close()
+        print(f"⚡ In-memory copy in {(time.perf_counter() - start) * 1000:.0f} ms")
+    elif args.command == 'list':
+        for path in sorted(glob.glob(os.path.join(CACHE_DIR, '*.sqlite'))):
+            current = '' if path.endswith(f"-{generator_version()}.sqlite") else ' (stale)'
+            print(f"{os.path.basename(path):40} {os.path.getsize(path) / (1024 * 1024):8.1f} MB{current}")
+    else:
+        for path in clear_snapshots(args.stale):
+            print(f"🗑️  Removed {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
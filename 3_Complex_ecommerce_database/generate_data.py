@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Scale-Factor Synthetic Data Generator
+Builds an e-commerce database of any size with realistic, skewed distributions:
+a three-level category tree, Zipfian product popularity, a skewed number of items
+per order, heavy-buyer customers and seasonal order dates. Every block of rows
+draws from its own RNG seeded from (seed, table, block), so a given --scale and
+--seed always produce the same data. Rows are loaded with chunked executemany()
+inside large transactions with journaling and syncing switched off. With --jobs,
+customers and orders are generated by worker processes into shard files that are
+merged with ATTACH; the data is the same for any number of jobs.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from array import array
+from datetime import date, timedelta
+
+from category_closure import install_category_closure
+from customer_totals import install_customer_total_triggers, rebuild_customer_totals
+from full_text_search import install_fts_indexes
+from setup_database import create_schema
+from summary_tables import install_summary_tables
+
+DEFAULT_SCALE = 1.0
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_SIZE = 50000
+# Rows written between commits; large transactions keep the load fast
+TRANSACTION_ROWS = 1000000
+# Rows generated from one RNG; block n of a table is the same for a given seed at any scale
+BLOCK_SIZE = 10000
+# With --jobs > 1, customers and orders are split into about this many shard files per worker
+SHARDS_PER_JOB = 4
+
+# Rows per unit of --scale (scale 1 gives about 120,000 order_items)
+SCALE_COUNTS = {
+    'suppliers': 50,
+    'products': 2000,
+    'customers': 20000,
+    'orders': 50000,
+}
+
+# Columns written by the generator; order_items and reviews take their ids from AUTOINCREMENT
+TABLE_COLUMNS = {
+    'categories': ['category_id', 'parent_category_id', 'name', 'description', 'is_active', 'created_at'],
+    'suppliers': ['supplier_id', 'name', 'email', 'phone', 'address', 'country', 'rating', 'is_active',
+                  'created_at'],
+    'products': ['product_id', 'name', 'description', 'category_id', 'supplier_id', 'sku', 'price', 'cost_price',
+                 'weight', 'dimensions', 'is_active', 'created_at'],
+    'inventory': ['product_id', 'warehouse_location', 'quantity_in_stock', 'reorder_level', 'last_updated'],
+    'product_tags': ['product_id', 'tag_name'],
+    'customers': ['customer_id', 'first_name', 'last_name', 'email', 'phone', 'date_of_birth',
+                  'registration_date'],
+    'shipping_addresses': ['address_id', 'customer_id', 'address_line1', 'address_line2', 'city', 'state',
+                           'country', 'postal_code', 'is_default', 'created_at'],
+    'payment_methods': ['payment_method_id', 'customer_id', 'method_type', 'card_number', 'expiry_date',
+                        'card_holder_name', 'is_default', 'is_active', 'created_at'],
+    'orders': ['order_id', 'customer_id', 'shipping_address_id', 'payment_method_id', 'order_date', 'status',
+               'subtotal', 'tax_amount', 'shipping_cost', 'total_amount', 'notes'],
+    'order_items': ['order_id', 'product_id', 'quantity', 'unit_price', 'total_price'],
+    'reviews': ['product_id', 'customer_id', 'order_id', 'rating', 'title', 'comment', 'review_date',
+                'is_verified_purchase'],
+}
+
+# Indexes for the bulk tables' foreign keys, created once after the load
+LOAD_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id)",
+    "CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items (product_id)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_product_id ON reviews (product_id)",
+    "CREATE INDEX IF NOT EXISTS idx_shipping_addresses_customer_id ON shipping_addresses (customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_payment_methods_customer_id ON payment_methods (customer_id)",
+]
+
+# Department → subcategory → [(leaf category, product noun)]
+CATEGORY_TREE = {
+    'Electronics': {
+        'Computers': [('Laptops', 'Laptop'), ('Desktops', 'Desktop PC'), ('Monitors', 'Monitor'), ('Tablets', 'Tablet')],
+        'Smartphones': [('Android Phones', 'Android Phone'), ('iPhone', 'iPhone'), ('Phone Accessories', 'Phone Case')],
+        'Audio': [('Headphones', 'Headphones'), ('Speakers', 'Speaker'), ('Microphones', 'Microphone')],
+        'Gaming': [('Consoles', 'Console'), ('Gaming Mice', 'Gaming Mouse'), ('Keyboards', 'Keyboard')],
+    },
+    'Clothing': {
+        "Men's Clothing": [('Shirts', 'Shirt'), ('Jackets', 'Jacket'), ('Jeans', 'Jeans')],
+        "Women's Clothing": [('Dresses', 'Dress'), ('Tops', 'Top'), ('Coats', 'Coat')],
+        'Kids Clothing': [('Baby Clothing', 'Baby Bodysuit'), ('Boys Clothing', 'Hoodie'), ('Girls Clothing', 'Skirt')],
+        'Shoes': [('Running Shoes', 'Running Shoes'), ('Boots', 'Boots'), ('Sandals', 'Sandals')],
+    },
+    'Home & Garden': {
+        'Kitchen': [('Cookware', 'Frying Pan'), ('Small Appliances', 'Blender'), ('Cutlery', 'Knife Set')],
+        'Furniture': [('Chairs', 'Office Chair'), ('Desks', 'Desk'), ('Sofas', 'Sofa')],
+        'Garden': [('Garden Tools', 'Garden Tool Set'), ('Plants', 'Plant Pot'), ('Outdoor Lighting', 'Solar Lamp')],
+    },
+    'Sports & Outdoors': {
+        'Fitness': [('Yoga', 'Yoga Mat'), ('Weights', 'Dumbbell Set'), ('Fitness Trackers', 'Fitness Tracker')],
+        'Camping': [('Tents', 'Tent'), ('Sleeping Bags', 'Sleeping Bag'), ('Backpacks', 'Backpack')],
+        'Cycling': [('Bikes', 'Bike'), ('Helmets', 'Helmet'), ('Bike Lights', 'Bike Light')],
+    },
+    'Books': {
+        'Fiction': [('Mystery', 'Mystery Novel'), ('Science Fiction', 'Sci-Fi Novel'), ('Romance', 'Romance Novel')],
+        'Non-Fiction': [('Biography', 'Biography'), ('Cooking', 'Cookbook'), ('History', 'History Book')],
+    },
+}
+
+# Department → (lowest, highest) list price; prices are log-uniform in between
+PRICE_RANGES = {
+    'Electronics': (15.0, 2500.0),
+    'Clothing': (10.0, 300.0),
+    'Home & Garden': (8.0, 1500.0),
+    'Sports & Outdoors': (10.0, 1200.0),
+    'Books': (5.0, 60.0),
+}
+
+BRANDS = ['Acme', 'Nova', 'Zenith', 'Orion', 'Apex', 'Lumen', 'Vertex', 'Summit', 'Aurora', 'Pioneer',
+          'Everest', 'Harbor', 'Maple', 'Cobalt', 'Quartz', 'Atlas']
+ADJECTIVES = ['Pro', 'Lite', 'Max', 'Classic', 'Ultra', 'Essential', 'Plus', 'Air', 'Prime', 'Eco']
+FEATURES = ['long battery life', 'a durable build', 'a lightweight design', 'premium materials',
+            'a two-year warranty', 'fast charging', 'a water-resistant finish', 'an ergonomic shape',
+            'easy assembly', 'a compact size']
+GENERIC_TAGS = ['sale', 'new', 'bestseller', 'eco-friendly', 'premium', 'budget', 'gift', 'limited']
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David', 'Sarah',
+               'Wei', 'Yuki', 'Carlos', 'Sofia', 'Ahmed', 'Fatima', 'Lukas', 'Emma', 'Raj', 'Priya',
+               'Olga', 'Pierre', 'Chloe', 'Diego', 'Aisha', 'Noah', 'Mia', 'Lars', 'Ana', 'Kenji']
+LAST_NAMES = ['Smith', 'Johnson', 'Brown', 'Garcia', 'Miller', 'Davis', 'Martinez', 'Wilson', 'Anderson',
+              'Taylor', 'Chen', 'Tanaka', 'Silva', 'Rossi', 'Khan', 'Muller', 'Dubois', 'Patel', 'Kim',
+              'Novak', 'Larsen', 'Lopez', 'Nguyen', 'Cohen', 'Okafor']
+
+# Country → (share of customers, cities)
+COUNTRIES = {
+    'USA': (40, ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Seattle', 'Boston']),
+    'UK': (12, ['London', 'Manchester', 'Bristol', 'Leeds']),
+    'Germany': (10, ['Berlin', 'Munich', 'Hamburg', 'Cologne']),
+    'Canada': (8, ['Toronto', 'Vancouver', 'Montreal']),
+    'France': (8, ['Paris', 'Lyon', 'Marseille']),
+    'Japan': (7, ['Tokyo', 'Osaka', 'Yokohama']),
+    'Australia': (6, ['Sydney', 'Melbourne', 'Brisbane']),
+    'Brazil': (5, ['Sao Paulo', 'Rio de Janeiro']),
+    'India': (4, ['Mumbai', 'Bangalore', 'Delhi']),
+}
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Park Rd', 'High St', 'Church Ln', 'Lake View', 'Hill Rd']
+WAREHOUSES = ['Warehouse A', 'Warehouse B', 'Warehouse C', 'Warehouse D', 'Warehouse E']
+PAYMENT_TYPES = [('credit_card', 55), ('debit_card', 20), ('paypal', 20), ('bank_transfer', 5)]
+
+# Orders fall between these dates; every timestamp is explicit so the data does not depend on today's date
+ORDER_WINDOW = (date(2022, 1, 1), date(2024, 12, 31))
+CATALOG_CREATED_AT = '2021-06-01 00:00:00'
+INVENTORY_UPDATED_AT = '2024-12-31 00:00:00'
+# Relative order volume per calendar month (holiday peak in November/December)
+MONTH_WEIGHTS = [0.80, 0.75, 0.85, 0.85, 0.90, 0.90, 1.00, 0.90, 0.90, 1.00, 1.50, 1.70]
+WEEKEND_UPLIFT = 1.15
+# Year-over-year growth of order volume
+ANNUAL_GROWTH = 0.20
+# Relative order volume per hour of day (evening peak)
+HOUR_WEIGHTS = [2, 1, 1, 1, 1, 2, 3, 4, 5, 6, 6, 7, 8, 7, 6, 6, 7, 8, 9, 10, 10, 9, 6, 4]
+
+# Products ranked by popularity get weight 1 / rank ** s; customers are skewed more gently
+PRODUCT_ZIPF_EXPONENT = 1.1
+CUSTOMER_ZIPF_EXPONENT = 0.6
+# Weights for 1..10 distinct products per order, and for a quantity of 1..5 per line
+ITEMS_PER_ORDER_WEIGHTS = [45, 22, 12, 8, 5, 3, 2, 1.5, 1, 0.5]
+QUANTITY_WEIGHTS = [80, 12, 5, 2, 1]
+TAX_RATE = 0.08
+FREE_SHIPPING_OVER = 100.0
+SHIPPING_COST = 9.99
+
+# Share of delivered order lines that get a review, and how ratings are spread
+REVIEW_RATE = 0.12
+RATING_WEIGHTS = [5, 6, 12, 32, 45]
+REVIEW_ASPECTS = ['battery life', 'build quality', 'sound', 'fit', 'delivery', 'price', 'comfort',
+                  'screen', 'size', 'instructions', 'packaging', 'colour']
+REVIEW_TITLES = {
+    1: ['Very disappointed', 'Stopped working', 'Do not buy'],
+    2: ['Not great', 'Below expectations', 'Returned it'],
+    3: ['It is okay', 'Average', 'Does the job'],
+    4: ['Very good', 'Happy with it', 'Solid purchase'],
+    5: ['Excellent!', 'Love it', 'Best purchase this year'],
+}
+REVIEW_OPINIONS = {
+    1: 'the {aspect} is terrible and it stopped working after a week',
+    2: 'the {aspect} is poor for the price',
+    3: 'the {aspect} is fine but nothing special',
+    4: 'the {aspect} is good and it works as described',
+    5: 'the {aspect} is excellent, highly recommended',
+}
+
+
+def block_rng(seed, table, block):
+    """RNG for one block of one table; independent of every other block."""
+    return random.Random(f"{seed}:{table}:{block}")
+
+
+def scaled_counts(scale):
+    """Row counts for the independently sized tables at a scale factor."""
+    return {table: max(1, int(round(count * scale))) for table, count in SCALE_COUNTS.items()}
+
+
+def zipf_cum_weights(count, exponent):
+    """Cumulative weights for random.choices() where rank r has weight 1 / r ** exponent."""
+    return list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def _timestamp(day, seconds):
+    """'YYYY-MM-DD HH:MM:SS' for a date plus seconds since midnight."""
+    return f"{day.isoformat()} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def order_day_weights():
+    """(days, cumulative weights) over ORDER_WINDOW with seasonality, weekends and growth."""
+    first, last = ORDER_WINDOW
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    weights = (
+        MONTH_WEIGHTS[day.month - 1]
+        * (WEEKEND_UPLIFT if day.weekday() >= 5 else 1.0)
+        * (1.0 + ANNUAL_GROWTH) ** ((day - first).days / 365.0)
+        for day in days
+    )
+    return days, list(itertools.accumulate(weights))
+
+
+class BulkLoader:
+    """Chunked executemany() inside large transactions, with per-table row and time counts."""
+
+    def __init__(self, conn, chunk_size=DEFAULT_CHUNK_SIZE, transaction_rows=TRANSACTION_ROWS):
+        """Load through conn, which must be in autocommit mode (isolation_level=None)."""
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.transaction_rows = transaction_rows
+        self.stats = {}
+        self._uncommitted = 0
+        self.conn.execute("BEGIN")
+
+    def insert(self, table, columns, rows):
+        """Insert an iterable of row tuples; rows are generated lazily, one chunk at a time."""
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        rows = iter(rows)
+        row_count, seconds = self.stats.get(table, (0, 0.0))
+        start = time.perf_counter()
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.conn.executemany(sql, chunk)
+            row_count += len(chunk)
+            self._uncommitted += len(chunk)
+            if self._uncommitted >= self.transaction_rows:
+                self.conn.execute("COMMIT")
+                self.conn.execute("BEGIN")
+                self._uncommitted = 0
+        self.stats[table] = (row_count, seconds + time.perf_counter() - start)
+
+    def finish(self):
+        """Commit the last transaction."""
+        self.conn.execute("COMMIT")
+
+
+def generate_categories():
+    """(category rows, leaf categories as (category_id, department, noun))."""
+    rows = []
+    leaves = []
+    for department, subcategories in CATEGORY_TREE.items():
+        rows.append((len(rows) + 1, None, department, f"{department} products", 1, CATALOG_CREATED_AT))
+        department_id = len(rows)
+        for subcategory, leaf_categories in subcategories.items():
+            rows.append((len(rows) + 1, department_id, subcategory, f"{subcategory} in {department}", 1,
+                         CATALOG_CREATED_AT))
+            subcategory_id = len(rows)
+            for leaf, noun in leaf_categories:
+                rows.append((len(rows) + 1, subcategory_id, leaf, f"{leaf} ({subcategory})", 1, CATALOG_CREATED_AT))
+                leaves.append((len(rows), department, noun))
+    return rows, leaves
+
+
+def generate_suppliers(seed, count):
+    """Supplier rows, one RNG block at a time."""
+    countries = list(COUNTRIES)
+    for block_start in range(0, count, BLOCK_SIZE):
+        rng = block_rng(seed, 'suppliers', block_start // BLOCK_SIZE)
+        for supplier_id in range(block_start + 1, min(block_start + BLOCK_SIZE, count) + 1):
+            name = f"{rng.choice(BRANDS)} {rng.choice(['Supply', 'Trading', 'Goods', 'Industries', 'Imports'])} {supplier_id}"
+            yield (supplier_id, name, f"sales{supplier_id}@supplier{supplier_id}.example.com",
+                   f"+1-555-{rng.randint(1000, 9999)}", f"{rng.randint(1, 999)} {rng.choice(STREETS)}",
+                   rng.choice(countries), round(rng.uniform(3.0, 5.0), 1), 1, CATALOG_CREATED_AT)
+
+
+def generate_products(seed, count, leaves, supplier_count):
+    """Product rows, one RNG block at a time."""
+    for block_start in range(0, count, BLOCK_SIZE):
+        rng = block_rng(seed, 'products', block_start // BLOCK_SIZE)
+        for product_id in range(block_start + 1, min(block_start + BLOCK_SIZE, count) + 1):
+            category_id, department, noun = rng.choice(leaves)
+            low, high = PRICE_RANGES[department]
+            price = round(low * (high / low) ** rng.random(), 2)
+            name = f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {noun} {rng.randint(100, 999)}"
+            description = f"{noun} with {rng.choice(FEATURES)} and {rng.choice(FEATURES)}."
+            yield (product_id, name, description, category_id, rng.randint(1, supplier_count),
+                   f"SKU-{product_id:08d}", price, round(price * rng.uniform(0.45, 0.75), 2),
+                   round(rng.uniform(0.1, 20.0), 2),
+                   f"{rng.randint(5, 100)}x{rng.randint(5, 100)}x{rng.randint(1, 50)} cm",
+                   1, CATALOG_CREATED_AT)
+
+
+def generate_product_details(seed, product_rows):
+    """(inventory rows, product_tags rows) for the generated products."""
+    inventory = []
+    tags = []
+    for product_id, name, _, _, _, _, _, _, _, _, _, _ in product_rows:
+        rng = block_rng(seed, 'product_details', product_id)
+        for warehouse in rng.sample(WAREHOUSES, rng.randint(1, 3)):
+            inventory.append((product_id, warehouse, rng.randint(0, 500), rng.choice([5, 10, 20, 50]),
+                              INVENTORY_UPDATED_AT))
+        brand, _, noun = name.split(' ', 2)
+        product_tags = {brand.lower(), noun.rsplit(' ', 1)[0].lower()}
+        product_tags.update(rng.sample(GENERIC_TAGS, rng.randint(1, 2)))
+        tags.extend((product_id, tag) for tag in sorted(product_tags))
+    return inventory, tags
+
+
+def customer_layout(seed, count):
+    """(address_of, payment_method_of): first address / payment method id per customer_id.
+
+    Both arrays have a sentinel at count + 1, so customer c owns ids address_of[c] up to
+    address_of[c + 1] - 1. Drawn from their own RNG so every customer block knows its ids
+    without generating the blocks before it.
+    """
+    address_of = array('q', [0, 1])
+    payment_method_of = array('q', [0, 1])
+    for block_start in range(0, count, BLOCK_SIZE):
+        rng = block_rng(seed, 'customer_layout', block_start // BLOCK_SIZE)
+        for _ in range(min(BLOCK_SIZE, count - block_start)):
+            address_of.append(address_of[-1] + (2 if rng.random() < 0.25 else 1))
+            payment_method_of.append(payment_method_of[-1] + (2 if rng.random() < 0.3 else 1))
+    return address_of, payment_method_of
+
+
+def generate_customer_block(seed, block, context):
+    """Customers, shipping_addresses and payment_methods rows for one block of customers.
+
+    Every customer has a default shipping address and payment method; some have a second one.
+    """
+    rng = block_rng(seed, 'customers', block)
+    countries = list(COUNTRIES)
+    country_weights = [COUNTRIES[country][0] for country in countries]
+    payment_types = [payment_type for payment_type, _ in PAYMENT_TYPES]
+    payment_weights = [weight for _, weight in PAYMENT_TYPES]
+    address_of, payment_method_of = context['address_of'], context['payment_method_of']
+    first_order_day = ORDER_WINDOW[0]
+    rows = {'customers': [], 'shipping_addresses': [], 'payment_methods': []}
+
+    first_id = block * BLOCK_SIZE + 1
+    for customer_id in range(first_id, min(first_id + BLOCK_SIZE, context['counts']['customers'] + 1)):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        # Registered in the three years before the order window, so every order follows registration
+        registered = _timestamp(first_order_day - timedelta(days=rng.randint(1, 3 * 365)), rng.randint(0, 86399))
+        born = date(rng.randint(1950, 2004), rng.randint(1, 12), rng.randint(1, 28))
+        rows['customers'].append((customer_id, first_name, last_name,
+                                  f"{first_name.lower()}.{last_name.lower()}{customer_id}@example.com",
+                                  f"+1-555-{rng.randint(1000, 9999)}", born.isoformat(), registered))
+
+        country = rng.choices(countries, country_weights)[0]
+        for address_id in range(address_of[customer_id], address_of[customer_id + 1]):
+            rows['shipping_addresses'].append((
+                address_id, customer_id, f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+                None if rng.random() < 0.8 else f"Apt {rng.randint(1, 300)}",
+                rng.choice(COUNTRIES[country][1]), None, country, f"{rng.randint(10000, 99999)}",
+                1 if address_id == address_of[customer_id] else 0, registered
+            ))
+
+        for payment_method_id in range(payment_method_of[customer_id], payment_method_of[customer_id + 1]):
+            method_type = rng.choices(payment_types, payment_weights)[0]
+            card = method_type in ('credit_card', 'debit_card')
+            rows['payment_methods'].append((
+                payment_method_id, customer_id, method_type,
+                f"****-****-****-{rng.randint(1000, 9999)}" if card else None,
+                f"{rng.randint(1, 12):02d}/{rng.randint(25, 30)}" if card else None,
+                f"{first_name} {last_name}", 1 if payment_method_id == payment_method_of[customer_id] else 0, 1,
+                registered
+            ))
+    return rows
+
+
+def generate_order_block(seed, block, context):
+    """Orders, order_items and reviews rows for one block of BLOCK_SIZE orders."""
+    rng = block_rng(seed, 'orders', block)
+    first_id = block * BLOCK_SIZE + 1
+    order_ids = range(first_id, min(first_id + BLOCK_SIZE, context['counts']['orders'] + 1))
+    count = len(order_ids)
+    last_day = ORDER_WINDOW[1]
+    prices = context['prices']
+
+    # Draw each attribute for the whole block at once; choices(k=...) is far cheaper than per-row calls
+    customer_ids = rng.choices(context['customer_ranking'], cum_weights=context['customer_weights'], k=count)
+    days = rng.choices(context['days'], cum_weights=context['day_weights'], k=count)
+    hours = rng.choices(range(24), HOUR_WEIGHTS, k=count)
+    line_counts = rng.choices(range(1, 11), ITEMS_PER_ORDER_WEIGHTS, k=count)
+    picks = iter(rng.choices(context['product_ranking'], cum_weights=context['product_weights'],
+                             k=sum(line_counts)))
+    quantities = iter(rng.choices(range(1, 6), QUANTITY_WEIGHTS, k=sum(line_counts)))
+
+    orders, items, reviews = [], [], []
+    for order_id, customer_id, day, hour, line_count in zip(order_ids, customer_ids, days, hours, line_counts):
+        order_date = _timestamp(day, hour * 3600 + rng.randint(0, 3599))
+        age = (last_day - day).days
+        if age < 3:
+            status = 'pending'
+        elif age < 10:
+            status = 'shipped'
+        else:
+            status = 'cancelled' if rng.random() < 0.05 else 'completed'
+
+        # A product picked twice for one order becomes a single line
+        product_ids = dict.fromkeys(next(picks) for _ in range(line_count))
+        subtotal = 0.0
+        for product_id in product_ids:
+            quantity = next(quantities)
+            unit_price = prices[product_id]
+            total_price = round(unit_price * quantity, 2)
+            subtotal += total_price
+            items.append((order_id, product_id, quantity, unit_price, total_price))
+            if status == 'completed' and rng.random() < REVIEW_RATE:
+                rating = rng.choices(range(1, 6), RATING_WEIGHTS)[0]
+                opinion = REVIEW_OPINIONS[rating].format(aspect=rng.choice(REVIEW_ASPECTS))
+                reviewed = _timestamp(day + timedelta(days=rng.randint(3, 30)), rng.randint(0, 86399))
+                reviews.append((product_id, customer_id, order_id, rating, rng.choice(REVIEW_TITLES[rating]),
+                                opinion[0].upper() + opinion[1:] + '.', reviewed, 1))
+
+        subtotal = round(subtotal, 2)
+        tax_amount = round(subtotal * TAX_RATE, 2)
+        shipping_cost = 0.0 if subtotal >= FREE_SHIPPING_OVER else SHIPPING_COST
+        orders.append((order_id, customer_id, context['address_of'][customer_id],
+                       context['payment_method_of'][customer_id], order_date, status, subtotal, tax_amount,
+                       shipping_cost, round(subtotal + tax_amount + shipping_cost, 2),
+                       'Gift wrap requested' if rng.random() < 0.02 else None))
+    return {'orders': orders, 'order_items': items, 'reviews': reviews}
+
+
+# Bulk entities generated block by block; with --jobs > 1 their blocks are spread over worker processes
+BLOCK_GENERATORS = {
+    'customers': generate_customer_block,
+    'orders': generate_order_block,
+}
+SHARD_TABLES = {
+    'customers': ['customers', 'shipping_addresses', 'payment_methods'],
+    'orders': ['orders', 'order_items', 'reviews'],
+}
+
+
+def plan_shards(counts, jobs):
+    """[(entity, blocks)]: contiguous runs of blocks, about SHARDS_PER_JOB per worker for each entity."""
+    shards = []
+    for entity in BLOCK_GENERATORS:
+        block_count = (counts[entity] + BLOCK_SIZE - 1) // BLOCK_SIZE
+        shard_count = min(block_count, jobs * SHARDS_PER_JOB)
+        bounds = [block_count * shard // shard_count for shard in range(shard_count + 1)]
+        shards.extend((entity, range(start, end)) for start, end in zip(bounds, bounds[1:]))
+    return shards
+
+
+_worker_state = None
+
+
+def _init_worker(seed, context, chunk_size, shard_dir):
+    """Pool initializer: keep the shared generation context in the worker process."""
+    global _worker_state
+    _worker_state = (seed, context, chunk_size, shard_dir)
+
+
+def _generate_shard(task):
+    """Worker: write one shard's blocks to its own SQLite file; returns (path, entity, stats)."""
+    number, (entity, blocks) = task
+    seed, context, chunk_size, shard_dir = _worker_state
+    path = os.path.join(shard_dir, f"shard_{number:05d}.sqlite")
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        create_schema(conn.cursor())
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        loader = BulkLoader(conn, chunk_size)
+        for block in blocks:
+            for table, rows in BLOCK_GENERATORS[entity](seed, block, context).items():
+                loader.insert(table, TABLE_COLUMNS[table], rows)
+        loader.finish()
+    finally:
+        conn.close()
+    return path, entity, loader.stats
+
+
+def merge_shard(conn, path, entity):
+    """Copy one shard's rows into conn with ATTACH + INSERT ... SELECT, then delete the shard file.
+
+    Shards are merged in key order, so AUTOINCREMENT ids come out as in a single-process load.
+    """
+    conn.execute("ATTACH DATABASE ? AS shard", (path,))
+    try:
+        conn.execute("BEGIN")
+        for table in SHARD_TABLES[entity]:
+            columns = ', '.join(TABLE_COLUMNS[table])
+            conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM shard.{table} ORDER BY rowid")
+        conn.execute("COMMIT")
+    finally:
+        conn.execute("DETACH DATABASE shard")
+    os.remove(path)
+
+
+def generate_database(db_path='mydb.sqlite', scale=DEFAULT_SCALE, seed=DEFAULT_SEED,
+                      chunk_size=DEFAULT_CHUNK_SIZE, progress=None, jobs=1):
+    """Create db_path from scratch with generated data; returns {table: (rows, seconds)}.
+
+    With jobs > 1, customer and order blocks are generated by a process pool into temporary
+    shard files next to db_path and merged in key order; the rows are the same as with jobs=1.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    counts = scaled_counts(scale)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        create_schema(conn.cursor())
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        # Loader settings: no rollback journal and no fsync; a crash mid-load means re-running the generator
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        loader = BulkLoader(conn, chunk_size)
+        category_rows, leaves = generate_categories()
+        loader.insert('categories', TABLE_COLUMNS['categories'], category_rows)
+        loader.insert('suppliers', TABLE_COLUMNS['suppliers'], generate_suppliers(seed, counts['suppliers']))
+
+        product_rows = list(generate_products(seed, counts['products'], leaves, counts['suppliers']))
+        loader.insert('products', TABLE_COLUMNS['products'], product_rows)
+        inventory_rows, tag_rows = generate_product_details(seed, product_rows)
+        loader.insert('inventory', TABLE_COLUMNS['inventory'], inventory_rows)
+        loader.insert('product_tags', TABLE_COLUMNS['product_tags'], tag_rows)
+        if progress:
+            progress('products', counts['products'])
+
+        # Everything a customer or order block needs, so blocks can be generated in any process and order.
+        # Popularity ranks are a seeded shuffle, so the best sellers are spread over ids and categories.
+        address_of, payment_method_of = customer_layout(seed, counts['customers'])
+        rng = block_rng(seed, 'popularity', 0)
+        product_ranking = list(range(1, counts['products'] + 1))
+        rng.shuffle(product_ranking)
+        customer_ranking = list(range(1, counts['customers'] + 1))
+        rng.shuffle(customer_ranking)
+        days, day_weights = order_day_weights()
+        context = {
+            'counts': counts,
+            'prices': [None] + [row[6] for row in product_rows],
+            'product_ranking': product_ranking,
+            'product_weights': zipf_cum_weights(counts['products'], PRODUCT_ZIPF_EXPONENT),
+            'customer_ranking': customer_ranking,
+            'customer_weights': zipf_cum_weights(counts['customers'], CUSTOMER_ZIPF_EXPONENT),
+            'days': days,
+            'day_weights': day_weights,
+            'address_of': address_of,
+            'payment_method_of': payment_method_of,
+        }
+        del product_rows
+
+        if jobs <= 1:
+            for entity, blocks in plan_shards(counts, 1):
+                for block in blocks:
+                    for table, rows in BLOCK_GENERATORS[entity](seed, block, context).items():
+                        loader.insert(table, TABLE_COLUMNS[table], rows)
+                    if progress:
+                        progress(entity, min((block + 1) * BLOCK_SIZE, counts[entity]))
+            loader.finish()
+        else:
+            loader.finish()
+            merge_seconds = 0.0
+            shard_dir = tempfile.mkdtemp(prefix='shards_', dir=os.path.dirname(os.path.abspath(db_path)))
+            try:
+                with multiprocessing.Pool(jobs, _init_worker, (seed, context, chunk_size, shard_dir)) as pool:
+                    # imap returns shards in plan order, so merging can start while later shards are generated
+                    for path, entity, shard_stats in pool.imap(_generate_shard, enumerate(plan_shards(counts, jobs))):
+                        start = time.perf_counter()
+                        merge_shard(conn, path, entity)
+                        merge_seconds += time.perf_counter() - start
+                        for table, (row_count, seconds) in shard_stats.items():
+                            total_rows, total_seconds = loader.stats.get(table, (0, 0.0))
+                            loader.stats[table] = (total_rows + row_count, total_seconds + seconds)
+                        if progress:
+                            progress(entity, loader.stats[entity][0])
+            finally:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+            loader.stats['(merge shards)'] = (0, merge_seconds)
+
+        # Indexes, derived totals and the trigger-maintained structures, built once over the loaded rows
+        start = time.perf_counter()
+        with conn:
+            conn.execute("BEGIN")
+            for statement in LOAD_INDEXES:
+                conn.execute(statement)
+            install_customer_total_triggers(conn)
+            rebuild_customer_totals(conn)
+            install_category_closure(conn)
+            install_fts_indexes(conn)
+            install_summary_tables(conn)
+        loader.stats['(indexes and derived tables)'] = (0, time.perf_counter() - start)
+
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+    finally:
+        conn.close()
+    return loader.stats
+
+
+def main():
+    """Generate a scaled database and report rows/s per table."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic e-commerce database at a scale factor")
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE,
+                        help=f"Scale factor; 1 is about {SCALE_COUNTS['orders']:,} orders (default: {DEFAULT_SCALE:g})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    parser.add_argument('--db', default='mydb.sqlite', help="Database file to (re)create (default: mydb.sqlite)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per executemany() call")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for customers and orders; the data does not depend on it "
+                             "(default: CPU count)")
+    args = parser.parse_args()
+
+    counts = scaled_counts(args.scale)
+    print(f"🏗️  Generating {args.db} at scale {args.scale:g} (seed {args.seed}): "
+          f"{counts['products']:,} products, {counts['customers']:,} customers, {counts['orders']:,} orders, "
+          f"{args.jobs} job(s)")
+
+    start = time.perf_counter()
+    stats = generate_database(args.db, args.scale, args.seed, args.chunk_size,
+                              progress=lambda table, done: print(f"  {table}: {done:,}"), jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'table':30} | {'rows':>12} | {'insert s':>8} | {'rows/s':>10}")
+    print("-" * 70)
+    for table, (row_count, seconds) in stats.items():
+        rate = f"{row_count / seconds:10,.0f}" if row_count and seconds else f"{'':>10}"
+        print(f"{table:30} | {row_count:12,} | {seconds:8.2f} | {rate}")
+    total_rows = sum(row_count for row_count, _ in stats.values())
+    print(f"\n✅ {total_rows:,} rows in {elapsed:.1f}s ({total_rows / elapsed:,.0f} rows/s end to end)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
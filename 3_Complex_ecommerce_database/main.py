@@ -4,6 +4,9 @@ import os
 from openai import OpenAI
 import json
 from dotenv import load_dotenv
+from result_export import EXPORT_FORMATS, export_query_results
+from full_text_search import get_fts_prompt_section
+from summary_tables import get_summary_prompt_section
 
 # Load .env from the root directory
 load_dotenv('/Users/anidhula/learn/agno/promptengineer48/.env')
@@ -18,13 +21,14 @@ def get_database_schema():
     
     schema = "Complex E-commerce Database Schema:\n\n"
     
-    # Get all table names
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+    # Get all table names (FTS5 shadow tables such as reviews_fts_data are internal)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT GLOB '*_fts_*' ORDER BY name")
     tables = cursor.fetchall()
     
     # Define table relationships
     relationships = {
         'categories': 'Self-referencing (parent_category_id → category_id)',
+        'category_closure': 'Every (ancestor_id, descendant_id) pair of categories, depth 0 = the category itself',
         'suppliers': 'Referenced by products',
         'products': 'References categories, suppliers. Referenced by order_items, inventory, reviews, product_tags',
         'customers': 'Referenced by shipping_addresses, payment_methods, orders, reviews',
@@ -34,7 +38,13 @@ def get_database_schema():
         'order_items': 'References orders, products',
         'inventory': 'References products',
         'reviews': 'References products, customers, orders',
-        'product_tags': 'Many-to-many relationship with products'
+        'product_tags': 'Many-to-many relationship with products',
+        'reviews_fts': 'FTS5 index of reviews (rowid = reviews.review_id)',
+        'products_fts': 'FTS5 index of products (rowid = products.product_id)',
+        'summary_revenue_by_supplier': 'Pre-aggregated from order_items, products, suppliers',
+        'summary_rating_by_category': 'Pre-aggregated from reviews, products, categories',
+        'summary_order_status_by_country': 'Pre-aggregated from orders, shipping_addresses',
+        'summary_refresh_log': 'Last refresh time of each summary table'
     }
     
     # Get schema for each table
@@ -72,14 +82,19 @@ def get_database_schema():
     schema += "- products → reviews (customer feedback)\n"
     schema += "- products → product_tags (many-to-many)\n"
     schema += "- categories → categories (hierarchical)\n"
+    schema += "- categories → category_closure → categories (all subcategories at any depth)\n"
     schema += "- suppliers → products → order_items → orders\n"
     
     # Add pre-calculated fields information
     schema += "\nPRE-CALCULATED FIELDS (Use these instead of complex joins when possible):\n"
-    schema += "- customers.total_spent: Sum of all order amounts for the customer\n"
-    schema += "- customers.total_orders: Count of orders for the customer\n"
+    schema += "- customers.total_spent: Sum of all order amounts for the customer (kept current by triggers)\n"
+    schema += "- customers.total_orders: Count of orders for the customer (kept current by triggers)\n"
     schema += "- orders.total_amount: Total amount including tax and shipping\n"
     schema += "- order_items.total_price: Quantity * unit_price\n"
+    schema += "- category_closure: Whole category subtrees (kept current by triggers). A category and all of its\n"
+    schema += "  subcategories are the descendant_id values for ancestor_id = that category (no recursive CTE needed)\n"
+    
+    schema += get_fts_prompt_section()
     
     conn.close()
     return schema
@@ -89,16 +104,22 @@ def nl2sql(nl_query):
     
     schema = get_database_schema()
     
+    # Route dashboard-style questions to the pre-aggregated summary tables
+    conn = sqlite3.connect('mydb.sqlite')
+    summary_section = get_summary_prompt_section(nl_query, conn)
+    conn.close()
+    
     prompt = f"""
 You are a SQL expert. Convert the following natural language query to SQL for a complex e-commerce database.
 
 {schema}
+{summary_section}
 
 Natural Language Query: {nl_query}
 
 CRITICAL RULES:
 1. ALWAYS check if the requested data is already available in a single table before using joins
-2. Use pre-calculated fields when available (e.g., customers.total_spent, customers.total_orders)
+2. Use pre-calculated fields when available (e.g., customers.total_spent, customers.total_orders), and answer from the SUMMARY TABLES when they are listed above
 3. Only use JOINs when you need data from multiple tables
 4. Prefer simple queries over complex ones when they achieve the same result
 5. Use appropriate JOIN types (INNER JOIN, LEFT JOIN) based on the query needs
@@ -107,12 +128,16 @@ CRITICAL RULES:
 8. Use GROUP BY and HAVING for grouped aggregations
 9. Use ORDER BY and LIMIT for sorting and limiting results
 10. Use meaningful table aliases for readability
-11. Return ONLY the SQL query, no explanations
+11. For a category "and everything under it", join category_closure instead of matching categories.name directly
+12. For words or phrases inside reviews (title, comment) or products (name, description), use the FULL-TEXT SEARCH indexes with MATCH
+13. Return ONLY the SQL query, no explanations
 
 EXAMPLES:
 - "Show customers with total spending" → SELECT customer_id, first_name, last_name, total_spent FROM customers
 - "Show customers with order count" → SELECT customer_id, first_name, last_name, total_orders FROM customers
 - "Show customers with both spending and orders" → SELECT customer_id, first_name, last_name, total_spent, total_orders FROM customers
+- "Show reviews complaining about battery" → SELECT r.review_id, r.rating, r.title, r.comment FROM reviews_fts JOIN reviews r ON r.review_id = reviews_fts.rowid WHERE reviews_fts MATCH 'battery' ORDER BY bm25(reviews_fts)
+- "List products in Electronics category" → SELECT p.product_id, p.name, c.name as category FROM categories root JOIN category_closure cc ON cc.ancestor_id = root.category_id JOIN products p ON p.category_id = cc.descendant_id JOIN categories c ON c.category_id = p.category_id WHERE root.name = 'Electronics'
 
 SQL Query:
 """
@@ -161,10 +186,22 @@ def execute_sql(sql_query):
     except Exception as e:
         return f"Error executing SQL: {str(e)}"
 
-def query_db_with_nl(nl_query):
-    """Converts natural language to SQL and executes the query."""
+def export_results(sql_query, export_format):
+    """Re-execute the generated SQL and stream the full result into a download file."""
+    if export_format == "None" or sql_query.startswith("Error generating SQL"):
+        return None
+    
+    try:
+        output_path, _ = export_query_results(sql_query, export_format)
+        return output_path
+    except Exception as e:
+        print(f"Error exporting results: {str(e)}")
+        return None
+
+def query_db_with_nl(nl_query, export_format="None"):
+    """Converts natural language to SQL, executes the query and optionally exports the results."""
     if not nl_query.strip():
-        return "Please enter a natural language query."
+        return "Please enter a natural language query.", None
     
     # Convert NL to SQL
     sql_query = nl2sql(nl_query)
@@ -177,7 +214,7 @@ def query_db_with_nl(nl_query):
     output += f"Generated SQL: {sql_query}\n\n"
     output += results
     
-    return output
+    return output, export_results(sql_query, export_format)
 
 # Check if database exists, if not create it
 if not os.path.exists('mydb.sqlite'):
@@ -186,18 +223,28 @@ if not os.path.exists('mydb.sqlite'):
 
 iface = gr.Interface(
     fn=query_db_with_nl,
-    inputs=gr.Textbox(
-        label="Natural Language Query",
-        placeholder="e.g., Show me all customers with their total spending and order count",
-        lines=2
-    ),
-    outputs=gr.Textbox(
-        label="SQL Query and Results",
-        lines=25
-    ),
+    inputs=[
+        gr.Textbox(
+            label="Natural Language Query",
+            placeholder="e.g., Show me all customers with their total spending and order count",
+            lines=2
+        ),
+        gr.Dropdown(
+            choices=["None"] + list(EXPORT_FORMATS),
+            value="None",
+            label="Download full results as"
+        )
+    ],
+    outputs=[
+        gr.Textbox(
+            label="SQL Query and Results",
+            lines=25
+        ),
+        gr.File(label="Download Results")
+    ],
     title="Natural Language to SQL Query Tool (Complex E-commerce)",
     description="Ask complex questions about the e-commerce database with 11+ tables and relationships",
-    examples=[
+    examples=[[query, "None"] for query in [
         "Show me all customers with their total spending and order count",
         "Find products with low inventory that need reordering",
         "List top 5 customers by total spending with their preferred payment methods",
@@ -213,7 +260,7 @@ iface = gr.Interface(
         "List products in Electronics category with their reviews",
         "Find orders with multiple items and their total values",
         "Show inventory levels by warehouse location"
-    ]
+    ]]
 )
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Streaming Query Result Export
+Re-executes a generated SQL query and streams the rows with fetchmany()
+into CSV, JSONL, Parquet or Arrow IPC without holding the result in memory.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet and Arrow IPC export are optional
+    pa = pq = None
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Display name → file extension
+EXPORT_FORMATS = {
+    'CSV': '.csv',
+    'JSONL': '.jsonl',
+    'Parquet': '.parquet',
+    'Arrow IPC': '.arrow',
+}
+
+
+def iter_row_chunks(cursor, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of rows from a cursor, chunk_size rows at a time."""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def _json_value(value):
+    """Make a SQLite value JSON serializable (BLOBs become hex strings)."""
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def write_csv(chunks, column_names, output_path):
+    """Stream row chunks into a CSV file with a header row."""
+    row_count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(column_names)
+        for rows in chunks:
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
+
+def write_jsonl(chunks, column_names, output_path):
+    """Stream row chunks into a JSON Lines file, one object per row."""
+    row_count = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for rows in chunks:
+            f.writelines(
+                json.dumps(dict(zip(column_names, map(_json_value, row))), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+            row_count += len(rows)
+    return row_count
+
+
+def _require_pyarrow(export_format):
+    """Raise a helpful error when an Arrow-based format is requested without pyarrow."""
+    if pa is None:
+        raise ImportError(f"{export_format} export requires pyarrow: pip install pyarrow")
+
+
+def _column_type(values):
+    """Arrow type of one chunk of a column; values of mixed types fall back to string."""
+    try:
+        return pa.array(values).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.string()
+
+
+def _infer_arrow_schema(rows, column_names):
+    """Infer an Arrow schema from the first chunk; all-NULL columns become strings."""
+    fields = []
+    for index, name in enumerate(column_names):
+        arrow_type = _column_type([row[index] for row in rows])
+        if pa.types.is_null(arrow_type):
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _widen_arrow_schema(schema, rows):
+    """Schema that holds both the rows written so far and this chunk.
+
+    An int64 column widens to float64 when REAL values appear (COALESCE(rating, 0), NUMERIC
+    columns storing whole values as integers); string columns take anything in text form.
+    Any other type change raises ValueError instead of silently casting.
+    """
+    fields = []
+    for index, field in enumerate(schema):
+        chunk_type = _column_type([row[index] for row in rows])
+        arrow_type = field.type
+        if pa.types.is_null(chunk_type) or chunk_type == arrow_type or pa.types.is_string(arrow_type):
+            pass
+        elif pa.types.is_integer(arrow_type) and pa.types.is_floating(chunk_type):
+            arrow_type = pa.float64()
+        elif not (pa.types.is_floating(arrow_type) and pa.types.is_integer(chunk_type)):
+            raise ValueError(f"Column '{field.name}' changes type mid-result ({arrow_type} → {chunk_type}); "
+                             f"CAST it in the query to export it")
+        fields.append(pa.field(field.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _arrow_batch(rows, schema):
+    """Convert a chunk of rows into a RecordBatch with the given schema."""
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if not pa.types.is_string(field.type):
+                raise
+            # SQLite is dynamically typed; fall back to the text form
+            arrays.append(pa.array([None if v is None else str(v) for v in values], type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _rewrite_widened(output_path, schema, open_writer, read_batches):
+    """Copy the batches written so far into a new file with the widened schema; returns its open writer."""
+    narrow_path = f"{output_path}.narrow"
+    os.replace(output_path, narrow_path)
+    writer = open_writer(output_path, schema)
+    try:
+        for batch in read_batches(narrow_path):
+            writer.write_batch(pa.Table.from_batches([batch]).cast(schema).to_batches()[0])
+    except Exception:
+        writer.close()
+        raise
+    finally:
+        os.remove(narrow_path)
+    return writer
+
+
+def _write_arrow(chunks, column_names, output_path, open_writer, read_batches):
+    """Shared streaming loop for the Arrow-based formats.
+
+    Each chunk is checked against the schema; when a column has to widen, the batches
+    already written are copied into a file with the wider schema, chunk by chunk.
+    """
+    row_count = 0
+    writer = None
+    try:
+        for rows in chunks:
+            if writer is None:
+                schema = _infer_arrow_schema(rows, column_names)
+                writer = open_writer(output_path, schema)
+            else:
+                widened = _widen_arrow_schema(schema, rows)
+                if not widened.equals(schema):
+                    writer.close()
+                    writer = None
+                    writer = _rewrite_widened(output_path, widened, open_writer, read_batches)
+                    schema = widened
+            writer.write_batch(_arrow_batch(rows, schema))
+            row_count += len(rows)
+
+        if writer is None:
+            # Empty result: still produce a valid file with string columns
+            schema = pa.schema([pa.field(name, pa.string()) for name in column_names])
+            writer = open_writer(output_path, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return row_count
+
+
+def _read_parquet_batches(path):
+    """Record batches of a Parquet file, one row group at a time."""
+    parquet_file = pq.ParquetFile(path)
+    for group in range(parquet_file.num_row_groups):
+        yield from parquet_file.read_row_group(group).to_batches()
+
+
+def _read_arrow_ipc_batches(path):
+    """Record batches of an Arrow IPC file."""
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+
+
+def write_parquet(chunks, column_names, output_path):
+    """Stream row chunks into a Parquet file, one row group per chunk."""
+    _require_pyarrow('Parquet')
+    return _write_arrow(chunks, column_names, output_path, pq.ParquetWriter, _read_parquet_batches)
+
+
+def write_arrow_ipc(chunks, column_names, output_path):
+    """Stream row chunks into an Arrow IPC file for zero-copy loading in pandas/pyarrow."""
+    _require_pyarrow('Arrow IPC')
+    return _write_arrow(chunks, column_names, output_path, pa.ipc.new_file, _read_arrow_ipc_batches)
+
+
+WRITERS = {
+    'CSV': write_csv,
+    'JSONL': write_jsonl,
+    'Parquet': write_parquet,
+    'Arrow IPC': write_arrow_ipc,
+}
+
+
+def export_query_results(sql_query, export_format, db_path='mydb.sqlite', output_path=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE):
+    """Re-execute a query and stream its rows into a file. Returns (output_path, row_count)."""
+    if export_format not in WRITERS:
+        raise ValueError(f"Unsupported export format: {export_format} "
+                         f"(expected one of {', '.join(EXPORT_FORMATS)})")
+
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(prefix='query_results_', suffix=EXPORT_FORMATS[export_format])
+        os.close(fd)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # Exports only ever read; never let generated SQL modify the database
+        conn.execute("PRAGMA query_only=ON")
+        cursor = conn.cursor()
+        cursor.execute(sql_query)
+
+        if not cursor.description:
+            raise ValueError("Query does not return rows")
+
+        column_names = [description[0] for description in cursor.description]
+        row_count = WRITERS[export_format](iter_row_chunks(cursor, chunk_size), column_names, output_path)
+    except Exception:
+        # A partly written file is never a valid export, whether ours or the caller's
+        for path in (output_path, f"{output_path}.narrow"):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    finally:
+        conn.close()
+
+    return output_path, row_count
+
+
+def main():
+    """Export the result of a SQL query from the command line."""
+    parser = argparse.ArgumentParser(description="Stream a SQL query result into a file")
+    parser.add_argument('sql_query', help="SELECT statement to export")
+    parser.add_argument('--format', default='CSV', choices=list(EXPORT_FORMATS), dest='export_format')
+    parser.add_argument('--db', default='mydb.sqlite', help="Database file (default: mydb.sqlite)")
+    parser.add_argument('--output', default=None, help="Output file (default: a temp file)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        output_path, row_count = export_query_results(args.sql_query, args.export_format, args.db,
+                                                      args.output, args.chunk_size)
+    except (sqlite3.Error, ValueError, ImportError) as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Exported {row_count} rows to {output_path} "
+          f"({row_count / elapsed if elapsed else 0:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,19 +2,13 @@ import sqlite3
 import os
 from datetime import datetime, timedelta
 import random
+from category_closure import install_category_closure
+from customer_totals import install_customer_total_triggers
+from full_text_search import install_fts_indexes
+from summary_tables import install_summary_tables
 
-def create_database():
-    """Create SQLite database with comprehensive e-commerce tables and sample data."""
-    
-    # Remove existing database if it exists
-    if os.path.exists('mydb.sqlite'):
-        os.remove('mydb.sqlite')
-    
-    # Connect to database
-    conn = sqlite3.connect('mydb.sqlite')
-    cursor = conn.cursor()
-    
-    # Create tables with proper foreign key relationships
+def create_schema(cursor):
+    """Create the 11 e-commerce tables with their foreign key relationships."""
     
     # 1. Categories table
     cursor.execute('''
@@ -187,6 +181,20 @@ def create_database():
             FOREIGN KEY (product_id) REFERENCES products (product_id)
         )
     ''')
+
+def create_database(db_path='mydb.sqlite'):
+    """Create SQLite database with comprehensive e-commerce tables and sample data."""
+    
+    # Remove existing database if it exists
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    
+    # Connect to database
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    # Create tables with proper foreign key relationships
+    create_schema(cursor)
     
     # Insert sample data
     
@@ -444,6 +452,18 @@ def create_database():
         )
     ''')
     
+    # Keep customer totals correct as orders change from here on
+    install_customer_total_triggers(conn)
+    
+    # Ancestor/descendant paths for subtree queries, kept current by triggers
+    install_category_closure(conn)
+    
+    # Full-text indexes over reviews and product descriptions, kept in sync by triggers
+    install_fts_indexes(conn)
+    
+    # Pre-aggregate the recurring dashboard questions and keep them current
+    install_summary_tables(conn)
+    
     # Commit and close
     conn.commit()
     conn.close()
@@ -451,6 +471,7 @@ def create_database():
     print("Complex e-commerce database created successfully!")
     print("Tables created:")
     print("- categories (with parent-child relationships)")
+    print("- category_closure (every ancestor/descendant pair with depth)")
     print("- suppliers")
     print("- products")
     print("- customers")
@@ -461,6 +482,8 @@ def create_database():
     print("- inventory")
     print("- reviews")
     print("- product_tags (many-to-many)")
+    print("- reviews_fts, products_fts (FTS5 full-text indexes)")
+    print("- summary_revenue_by_supplier, summary_rating_by_category, summary_order_status_by_country (pre-aggregated)")
     print("\nSample complex queries you can try:")
     print("- Show me all customers with their total spending and order count")
     print("- Find products with low inventory that need reordering")
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Summary Tables for Recurring Dashboard Questions
+Pre-aggregated tables for the grain combinations the dashboard asks about over and
+over (revenue by supplier/country, rating by category, order status by country),
+kept current incrementally by triggers or by a scheduled full refresh, plus a
+router that tells the prompt builder when a question can be answered from them.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+
+SUMMARY_REFRESH_LOG = """
+CREATE TABLE IF NOT EXISTS summary_refresh_log (
+    summary_table TEXT PRIMARY KEY,
+    refreshed_at TIMESTAMP NOT NULL,
+    refresh_mode TEXT NOT NULL
+)
+"""
+
+SUMMARY_TABLES = OrderedDict()
+
+SUMMARY_TABLES['summary_revenue_by_supplier'] = {
+    'description': "Revenue, units sold and line items per supplier (one row per supplier, includes supplier country)",
+    'columns': "supplier_id, supplier_name, country, line_items, units_sold, revenue",
+    # Every keyword group must match at least one of its words
+    'keywords': [('revenue', 'sales', 'sold', 'selling'), ('supplier', 'suppliers', 'vendor', 'vendors')],
+    'example': ("Show revenue by supplier and country → SELECT supplier_name, country, revenue "
+                "FROM summary_revenue_by_supplier ORDER BY revenue DESC"),
+    'ddl': """
+        CREATE TABLE IF NOT EXISTS summary_revenue_by_supplier (
+            supplier_id INTEGER PRIMARY KEY,
+            supplier_name TEXT,
+            country TEXT,
+            line_items INTEGER NOT NULL DEFAULT 0,
+            units_sold INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0.0
+        )
+    """,
+    'refresh': [
+        "DELETE FROM summary_revenue_by_supplier",
+        """
+        INSERT INTO summary_revenue_by_supplier (supplier_id, supplier_name, country, line_items, units_sold, revenue)
+        SELECT s.supplier_id, s.name, s.country,
+               COUNT(oi.order_item_id), COALESCE(SUM(oi.quantity), 0), COALESCE(SUM(oi.total_price), 0)
+        FROM order_items oi
+        JOIN products p ON oi.product_id = p.product_id
+        JOIN suppliers s ON p.supplier_id = s.supplier_id
+        GROUP BY s.supplier_id
+        """,
+    ],
+    'triggers': [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_supplier_revenue_insert
+        AFTER INSERT ON order_items
+        BEGIN
+            INSERT OR IGNORE INTO summary_revenue_by_supplier (supplier_id, supplier_name, country)
+            SELECT s.supplier_id, s.name, s.country
+            FROM products p JOIN suppliers s ON p.supplier_id = s.supplier_id
+            WHERE p.product_id = NEW.product_id;
+            UPDATE summary_revenue_by_supplier
+            SET line_items = line_items + 1,
+                units_sold = units_sold + COALESCE(NEW.quantity, 0),
+                revenue = revenue + COALESCE(NEW.total_price, 0)
+            WHERE supplier_id = (SELECT supplier_id FROM products WHERE product_id = NEW.product_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_supplier_revenue_delete
+        AFTER DELETE ON order_items
+        BEGIN
+            UPDATE summary_revenue_by_supplier
+            SET line_items = line_items - 1,
+                units_sold = units_sold - COALESCE(OLD.quantity, 0),
+                revenue = revenue - COALESCE(OLD.total_price, 0)
+            WHERE supplier_id = (SELECT supplier_id FROM products WHERE product_id = OLD.product_id);
+            DELETE FROM summary_revenue_by_supplier WHERE line_items <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_supplier_revenue_update
+        AFTER UPDATE OF product_id, quantity, total_price ON order_items
+        BEGIN
+            UPDATE summary_revenue_by_supplier
+            SET line_items = line_items - 1,
+                units_sold = units_sold - COALESCE(OLD.quantity, 0),
+                revenue = revenue - COALESCE(OLD.total_price, 0)
+            WHERE supplier_id = (SELECT supplier_id FROM products WHERE product_id = OLD.product_id);
+            INSERT OR IGNORE INTO summary_revenue_by_supplier (supplier_id, supplier_name, country)
+            SELECT s.supplier_id, s.name, s.country
+            FROM products p JOIN suppliers s ON p.supplier_id = s.supplier_id
+            WHERE p.product_id = NEW.product_id;
+            UPDATE summary_revenue_by_supplier
+            SET line_items = line_items + 1,
+                units_sold = units_sold + COALESCE(NEW.quantity, 0),
+                revenue = revenue + COALESCE(NEW.total_price, 0)
+            WHERE supplier_id = (SELECT supplier_id FROM products WHERE product_id = NEW.product_id);
+            DELETE FROM summary_revenue_by_supplier WHERE line_items <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_supplier_revenue_product_move
+        AFTER UPDATE OF supplier_id ON products
+        WHEN OLD.supplier_id IS NOT NEW.supplier_id
+        BEGIN
+            DELETE FROM summary_revenue_by_supplier WHERE supplier_id IN (OLD.supplier_id, NEW.supplier_id);
+            INSERT INTO summary_revenue_by_supplier (supplier_id, supplier_name, country, line_items, units_sold, revenue)
+            SELECT s.supplier_id, s.name, s.country,
+                   COUNT(oi.order_item_id), COALESCE(SUM(oi.quantity), 0), COALESCE(SUM(oi.total_price), 0)
+            FROM order_items oi
+            JOIN products p ON oi.product_id = p.product_id
+            JOIN suppliers s ON p.supplier_id = s.supplier_id
+            WHERE s.supplier_id IN (OLD.supplier_id, NEW.supplier_id)
+            GROUP BY s.supplier_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_supplier_revenue_supplier_update
+        AFTER UPDATE OF name, country ON suppliers
+        BEGIN
+            UPDATE summary_revenue_by_supplier
+            SET supplier_name = NEW.name,
+                country = NEW.country
+            WHERE supplier_id = NEW.supplier_id;
+        END
+        """,
+    ],
+}
+
+SUMMARY_TABLES['summary_rating_by_category'] = {
+    'description': "Review count, rating sum and average rating per product category (direct category of each product)",
+    'columns': "category_id, category_name, review_count, rating_sum, avg_rating",
+    'keywords': [('rating', 'ratings', 'rated', 'review', 'reviews'), ('category', 'categories')],
+    'example': ("Show average rating by product category → SELECT category_name, avg_rating, review_count "
+                "FROM summary_rating_by_category ORDER BY avg_rating DESC"),
+    'ddl': """
+        CREATE TABLE IF NOT EXISTS summary_rating_by_category (
+            category_id INTEGER PRIMARY KEY,
+            category_name TEXT,
+            review_count INTEGER NOT NULL DEFAULT 0,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            avg_rating REAL
+        )
+    """,
+    'refresh': [
+        "DELETE FROM summary_rating_by_category",
+        """
+        INSERT INTO summary_rating_by_category (category_id, category_name, review_count, rating_sum, avg_rating)
+        SELECT c.category_id, c.name, COUNT(r.review_id), SUM(r.rating), AVG(r.rating)
+        FROM reviews r
+        JOIN products p ON r.product_id = p.product_id
+        JOIN categories c ON p.category_id = c.category_id
+        GROUP BY c.category_id
+        """,
+    ],
+    'triggers': [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_category_rating_insert
+        AFTER INSERT ON reviews
+        BEGIN
+            INSERT OR IGNORE INTO summary_rating_by_category (category_id, category_name)
+            SELECT c.category_id, c.name
+            FROM products p JOIN categories c ON p.category_id = c.category_id
+            WHERE p.product_id = NEW.product_id;
+            UPDATE summary_rating_by_category
+            SET review_count = review_count + 1,
+                rating_sum = rating_sum + NEW.rating,
+                avg_rating = (rating_sum + NEW.rating) * 1.0 / (review_count + 1)
+            WHERE category_id = (SELECT category_id FROM products WHERE product_id = NEW.product_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_category_rating_delete
+        AFTER DELETE ON reviews
+        BEGIN
+            UPDATE summary_rating_by_category
+            SET review_count = review_count - 1,
+                rating_sum = rating_sum - OLD.rating,
+                avg_rating = CASE WHEN review_count > 1
+                                  THEN (rating_sum - OLD.rating) * 1.0 / (review_count - 1) END
+            WHERE category_id = (SELECT category_id FROM products WHERE product_id = OLD.product_id);
+            DELETE FROM summary_rating_by_category WHERE review_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_category_rating_update
+        AFTER UPDATE OF product_id, rating ON reviews
+        BEGIN
+            UPDATE summary_rating_by_category
+            SET review_count = review_count - 1,
+                rating_sum = rating_sum - OLD.rating,
+                avg_rating = CASE WHEN review_count > 1
+                                  THEN (rating_sum - OLD.rating) * 1.0 / (review_count - 1) END
+            WHERE category_id = (SELECT category_id FROM products WHERE product_id = OLD.product_id);
+            INSERT OR IGNORE INTO summary_rating_by_category (category_id, category_name)
+            SELECT c.category_id, c.name
+            FROM products p JOIN categories c ON p.category_id = c.category_id
+            WHERE p.product_id = NEW.product_id;
+            UPDATE summary_rating_by_category
+            SET review_count = review_count + 1,
+                rating_sum = rating_sum + NEW.rating,
+                avg_rating = (rating_sum + NEW.rating) * 1.0 / (review_count + 1)
+            WHERE category_id = (SELECT category_id FROM products WHERE product_id = NEW.product_id);
+            DELETE FROM summary_rating_by_category WHERE review_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_category_rating_product_move
+        AFTER UPDATE OF category_id ON products
+        WHEN OLD.category_id IS NOT NEW.category_id
+        BEGIN
+            DELETE FROM summary_rating_by_category WHERE category_id IN (OLD.category_id, NEW.category_id);
+            INSERT INTO summary_rating_by_category (category_id, category_name, review_count, rating_sum, avg_rating)
+            SELECT c.category_id, c.name, COUNT(r.review_id), SUM(r.rating), AVG(r.rating)
+            FROM reviews r
+            JOIN products p ON r.product_id = p.product_id
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE c.category_id IN (OLD.category_id, NEW.category_id)
+            GROUP BY c.category_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_category_rating_category_update
+        AFTER UPDATE OF name ON categories
+        BEGIN
+            UPDATE summary_rating_by_category SET category_name = NEW.name WHERE category_id = NEW.category_id;
+        END
+        """,
+    ],
+}
+
+SUMMARY_TABLES['summary_order_status_by_country'] = {
+    'description': "Order count and order value per (shipping country, order status)",
+    'columns': "country, status, order_count, total_amount",
+    'keywords': [('status', 'statuses'), ('country', 'countries')],
+    'example': ("Show order status distribution by customer country → SELECT country, status, order_count "
+                "FROM summary_order_status_by_country ORDER BY country, status"),
+    'ddl': """
+        CREATE TABLE IF NOT EXISTS summary_order_status_by_country (
+            country TEXT,
+            status TEXT,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0.0,
+            PRIMARY KEY (country, status)
+        )
+    """,
+    'refresh': [
+        "DELETE FROM summary_order_status_by_country",
+        """
+        INSERT INTO summary_order_status_by_country (country, status, order_count, total_amount)
+        SELECT sa.country, o.status, COUNT(*), COALESCE(SUM(o.total_amount), 0)
+        FROM orders o
+        JOIN shipping_addresses sa ON o.shipping_address_id = sa.address_id
+        GROUP BY sa.country, o.status
+        """,
+    ],
+    'triggers': [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_status_country_insert
+        AFTER INSERT ON orders
+        BEGIN
+            INSERT OR IGNORE INTO summary_order_status_by_country (country, status)
+            SELECT country, NEW.status FROM shipping_addresses WHERE address_id = NEW.shipping_address_id;
+            UPDATE summary_order_status_by_country
+            SET order_count = order_count + 1,
+                total_amount = total_amount + COALESCE(NEW.total_amount, 0)
+            WHERE country IS (SELECT country FROM shipping_addresses WHERE address_id = NEW.shipping_address_id)
+              AND status IS NEW.status;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_status_country_delete
+        AFTER DELETE ON orders
+        BEGIN
+            UPDATE summary_order_status_by_country
+            SET order_count = order_count - 1,
+                total_amount = total_amount - COALESCE(OLD.total_amount, 0)
+            WHERE country IS (SELECT country FROM shipping_addresses WHERE address_id = OLD.shipping_address_id)
+              AND status IS OLD.status;
+            DELETE FROM summary_order_status_by_country WHERE order_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_status_country_update
+        AFTER UPDATE OF status, total_amount, shipping_address_id ON orders
+        BEGIN
+            UPDATE summary_order_status_by_country
+            SET order_count = order_count - 1,
+                total_amount = total_amount - COALESCE(OLD.total_amount, 0)
+            WHERE country IS (SELECT country FROM shipping_addresses WHERE address_id = OLD.shipping_address_id)
+              AND status IS OLD.status;
+            INSERT OR IGNORE INTO summary_order_status_by_country (country, status)
+            SELECT country, NEW.status FROM shipping_addresses WHERE address_id = NEW.shipping_address_id;
+            UPDATE summary_order_status_by_country
+            SET order_count = order_count + 1,
+                total_amount = total_amount + COALESCE(NEW.total_amount, 0)
+            WHERE country IS (SELECT country FROM shipping_addresses WHERE address_id = NEW.shipping_address_id)
+              AND status IS NEW.status;
+            DELETE FROM summary_order_status_by_country WHERE order_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_summary_status_country_address_update
+        AFTER UPDATE OF country ON shipping_addresses
+        WHEN OLD.country IS NOT NEW.country
+        BEGIN
+            DELETE FROM summary_order_status_by_country WHERE country IS OLD.country OR country IS NEW.country;
+            INSERT INTO summary_order_status_by_country (country, status, order_count, total_amount)
+            SELECT sa.country, o.status, COUNT(*), COALESCE(SUM(o.total_amount), 0)
+            FROM orders o
+            JOIN shipping_addresses sa ON o.shipping_address_id = sa.address_id
+            WHERE sa.country IS OLD.country OR sa.country IS NEW.country
+            GROUP BY sa.country, o.status;
+        END
+        """,
+    ],
+}
+
+
+def _trigger_names(summary):
+    """Names of the triggers declared for a summary table."""
+    return [re.search(r"CREATE TRIGGER IF NOT EXISTS (\w+)", sql).group(1) for sql in summary['triggers']]
+
+
+def _log_refresh(conn, table_name, refresh_mode):
+    """Record when and how a summary table was last brought up to date."""
+    conn.execute(SUMMARY_REFRESH_LOG)
+    conn.execute("""
+        INSERT OR REPLACE INTO summary_refresh_log (summary_table, refreshed_at, refresh_mode)
+        VALUES (?, datetime('now'), ?)
+    """, (table_name, refresh_mode))
+
+
+def refresh_summaries(conn, names=None):
+    """Fully recompute the given summary tables (all by default)."""
+    for table_name in names or SUMMARY_TABLES:
+        summary = SUMMARY_TABLES[table_name]
+        conn.execute(summary['ddl'])
+        for statement in summary['refresh']:
+            conn.execute(statement)
+        _log_refresh(conn, table_name, 'full')
+
+
+def _summary_rows(conn, table_name):
+    """Rows of a summary table in a stable order, REAL sums rounded for comparison."""
+    rows = conn.execute(f"SELECT * FROM {table_name} ORDER BY 1, 2").fetchall()
+    return [tuple(round(v, 4) if isinstance(v, float) else v for v in row) for row in rows]
+
+
+def verify_summaries(conn, names=None, fix=False):
+    """Names of the summary tables whose rows differ from a full refresh; with fix, refresh those.
+
+    The comparison refresh runs inside a savepoint that is rolled back, so verifying writes nothing.
+    """
+    names = list(names or SUMMARY_TABLES)
+    stored = {table_name: _summary_rows(conn, table_name) for table_name in names}
+    conn.execute("SAVEPOINT verify_summaries")
+    try:
+        refresh_summaries(conn, names)
+        expected = {table_name: _summary_rows(conn, table_name) for table_name in names}
+    finally:
+        conn.execute("ROLLBACK TO verify_summaries")
+        conn.execute("RELEASE verify_summaries")
+
+    drifted = [table_name for table_name in names if stored[table_name] != expected[table_name]]
+    if fix and drifted:
+        with conn:
+            refresh_summaries(conn, drifted)
+    return drifted
+
+
+def install_summary_tables(conn, incremental=True):
+    """Create and populate the summary tables, with incremental triggers unless scheduled-only."""
+    refresh_summaries(conn)
+    for table_name, summary in SUMMARY_TABLES.items():
+        if incremental:
+            for statement in summary['triggers']:
+                conn.execute(statement)
+            _log_refresh(conn, table_name, 'incremental')
+        else:
+            drop_summary_triggers(conn, [table_name])
+
+
+def drop_summary_triggers(conn, names=None):
+    """Remove the incremental triggers; the tables are then refreshed on a schedule only."""
+    for table_name in names or SUMMARY_TABLES:
+        for trigger_name in _trigger_names(SUMMARY_TABLES[table_name]):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+
+def route_to_summaries(nl_query):
+    """Return the names of the summary tables that cover a natural language question."""
+    words = set(re.findall(r"[a-z]+", nl_query.lower()))
+    return [
+        table_name for table_name, summary in SUMMARY_TABLES.items()
+        if all(words.intersection(group) for group in summary['keywords'])
+    ]
+
+
+def get_summary_prompt_section(nl_query, conn=None):
+    """Prompt text pointing the LLM at the summary tables that answer this question (or '')."""
+    table_names = route_to_summaries(nl_query)
+    if conn is not None:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        table_names = [name for name in table_names if name in existing]
+    if not table_names:
+        return ""
+
+    section = "\nSUMMARY TABLES (Pre-aggregated and kept current - answer from these instead of aggregating orders/order_items/reviews):\n"
+    for table_name in table_names:
+        summary = SUMMARY_TABLES[table_name]
+        section += f"- {table_name}({summary['columns']}): {summary['description']}\n"
+        section += f"  Example: \"{summary['example']}\"\n"
+    return section
+
+
+def main():
+    """Install, refresh (once or on a schedule), verify or route questions to the summary tables."""
+    parser = argparse.ArgumentParser(description="Maintain the dashboard summary tables")
+    parser.add_argument('action', choices=['install', 'refresh', 'verify', 'drop-triggers', 'route'])
+    parser.add_argument('question', nargs='?', help="Question to route (for the 'route' action)")
+    parser.add_argument('--db', default='mydb.sqlite', help="Database file (default: mydb.sqlite)")
+    parser.add_argument('--fix', action='store_true', help="With 'verify': refresh the summaries that drifted")
+    parser.add_argument('--every', type=float, default=None,
+                        help="With 'refresh': keep refreshing every N seconds (scheduled mode)")
+    args = parser.parse_args()
+
+    if args.action == 'route':
+        print(route_to_summaries(args.question or "") or "No summary table covers this question")
+        return 0
+
+    if not os.path.exists(args.db):
+        print("Database not found. Please run 'python setup_database.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'install':
+            with conn:
+                install_summary_tables(conn)
+            print(f"✅ Installed {len(SUMMARY_TABLES)} summary tables with incremental refresh")
+        elif args.action == 'verify':
+            drifted = verify_summaries(conn, fix=args.fix)
+            if drifted:
+                print(f"{'🔧 Refreshed' if args.fix else '❌ Drifted'}: {', '.join(drifted)}")
+                return 0 if args.fix else 1
+            print(f"✅ All {len(SUMMARY_TABLES)} summary tables match a full refresh")
+        elif args.action == 'drop-triggers':
+            with conn:
+                drop_summary_triggers(conn)
+            print("✅ Incremental triggers removed; refresh the summaries on a schedule instead")
+        else:
+            while True:
+                start = time.perf_counter()
+                with conn:
+                    refresh_summaries(conn)
+                print(f"✅ Refreshed {len(SUMMARY_TABLES)} summary tables in {time.perf_counter() - start:.3f}s")
+                if args.every is None:
+                    break
+                time.sleep(args.every)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
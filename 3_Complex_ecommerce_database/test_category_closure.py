@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the category closure table
+Inserts, moves and deletes categories in an in-memory copy of the sample database and checks that
+category_closure still matches the parent_category_id links.
+"""
+
+import sqlite3
+
+from category_closure import get_subtree, verify_category_closure
+from fixtures import fixture_connection
+
+
+def test_closure_follows_hierarchy_changes():
+    """Subtrees stay correct as categories are added, moved and removed."""
+    conn = fixture_connection()
+    cursor = conn.cursor()
+
+    print("🧪 Testing the category closure table")
+    print("=" * 50)
+
+    electronics = [name for _, name, _ in get_subtree(conn, 'Electronics')]
+    print(f"Electronics subtree: {electronics}")
+    assert set(electronics) == {'Electronics', 'Computers', 'Smartphones', 'Audio', 'Laptops',
+                                'Desktops', 'Android Phones', 'iPhone'}
+
+    # New leaf under Laptops (id 12), then move Computers (id 4) under Home & Garden (id 3)
+    cursor.execute("INSERT INTO categories (parent_category_id, name) VALUES (12, 'Gaming Laptops')")
+    cursor.execute("UPDATE categories SET parent_category_id = 3 WHERE category_id = 4")
+    conn.commit()
+
+    depths = {name: depth for _, name, depth in get_subtree(conn, 'Home & Garden')}
+    print(f"Home & Garden subtree: {depths}")
+    assert depths['Computers'] == 1 and depths['Gaming Laptops'] == 3
+    assert 'Laptops' not in [name for _, name, _ in get_subtree(conn, 'Electronics')]
+
+    # Moving a category under its own descendant is rejected
+    try:
+        cursor.execute("UPDATE categories SET parent_category_id = 12 WHERE category_id = 4")
+        raise AssertionError("cycle was not rejected")
+    except sqlite3.IntegrityError as e:
+        print(f"Cycle rejected: {e}")
+    conn.rollback()
+
+    # Deleting Computers leaves Laptops and Desktops as roots of their own subtrees
+    cursor.execute("DELETE FROM categories WHERE category_id = 4")
+    conn.commit()
+    assert [name for _, name, _ in get_subtree(conn, 'Laptops')] == ['Laptops', 'Gaming Laptops']
+
+    assert verify_category_closure(conn) == ([], [])
+
+    conn.close()
+    print("✅ Category closure stays correct under hierarchy changes")
+
+
+if __name__ == "__main__":
+    test_closure_follows_hierarchy_changes()
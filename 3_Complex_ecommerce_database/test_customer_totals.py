@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the trigger-maintained customer totals
+Applies live order changes to an in-memory copy of the sample database and checks that
+customers.total_orders / total_spent still match the full aggregate.
+"""
+
+from customer_totals import verify_customer_totals
+from fixtures import fixture_connection
+
+
+def order_totals(cursor, order_id):
+    """(subtotal, total_amount) of one order."""
+    cursor.execute("SELECT subtotal, total_amount FROM orders WHERE order_id = ?", (order_id,))
+    return cursor.fetchone()
+
+
+def subtotal_drift(cursor):
+    """Orders whose subtotal differs from the sum of their line items."""
+    cursor.execute("""
+        SELECT o.order_id FROM orders o
+        WHERE ABS(o.subtotal - (SELECT COALESCE(SUM(total_price), 0) FROM order_items oi
+                                WHERE oi.order_id = o.order_id)) > 0.005
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def test_customer_totals_follow_order_changes():
+    """Insert, update and delete orders and line items, then verify the totals."""
+    conn = fixture_connection()
+    cursor = conn.cursor()
+
+    print("🧪 Testing trigger-maintained customer totals")
+    print("=" * 50)
+
+    # setup_database.py writes orders whose subtotal is the sum of their line items
+    assert subtotal_drift(cursor) == []
+
+    # New order for customer 3: created with its shipping cost, its line items add the rest
+    cursor.execute("""
+        INSERT INTO orders (customer_id, shipping_address_id, payment_method_id, status, subtotal, total_amount)
+        VALUES (3, 4, 4, 'pending', 0.0, 10.0)
+    """)
+    new_order_id = cursor.lastrowid
+    cursor.executemany("""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+        VALUES (?, ?, 1, ?, ?)
+    """, [(new_order_id, 10, 100.0, 100.0), (new_order_id, 1, 25.0, 25.0)])
+    assert order_totals(cursor, new_order_id) == (125.0, 135.0)
+
+    # Removing a line item and correcting a price both flow into the order and the customer
+    cursor.execute("DELETE FROM order_items WHERE order_id = ? AND product_id = 1", (new_order_id,))
+    cursor.execute("UPDATE order_items SET total_price = 80.0 WHERE order_id = ?", (new_order_id,))
+    assert order_totals(cursor, new_order_id) == (80.0, 90.0)
+
+    # Order moved to another customer, another one cancelled outright
+    cursor.execute("UPDATE orders SET customer_id = 5 WHERE order_id = 2")
+    cursor.execute("DELETE FROM orders WHERE order_id = 18")
+    conn.commit()
+
+    cursor.execute("SELECT total_orders, total_spent FROM customers WHERE customer_id = 3")
+    total_orders, total_spent = cursor.fetchone()
+    print(f"Customer 3 after changes: {total_orders} orders, {total_spent:.2f} spent")
+    assert total_orders == 3
+    assert abs(total_spent - (1109.99 + 392.99 + 90.0)) < 0.005
+
+    assert subtotal_drift(cursor) == []
+    mismatches = verify_customer_totals(conn, chunk_size=3)
+    print(f"Drifted customers: {len(mismatches)}")
+    assert mismatches == []
+
+    # Drift introduced behind the triggers' back is reported and repaired
+    cursor.execute("UPDATE customers SET total_spent = 0 WHERE customer_id = 1")
+    conn.commit()
+    assert [row[0] for row in verify_customer_totals(conn, fix=True)] == [1]
+    assert verify_customer_totals(conn) == []
+
+    conn.close()
+    print("✅ Customer totals stay correct under live writes")
+
+
+if __name__ == "__main__":
+    test_customer_totals_follow_order_changes()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the snapshot fixtures
+Builds the sample snapshot in a temporary cache, checks that it is built only once
+and that copies made from it are independent of each other and of the snapshot.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import fixtures
+
+
+def test_snapshot_is_built_once_and_copies_are_isolated():
+    """The second request reuses the snapshot; writes to a copy never reach it."""
+    # A private cache for this test only; later tests keep using the shared one
+    cache_dir = fixtures.CACHE_DIR
+    fixtures.CACHE_DIR = tempfile.mkdtemp()
+    try:
+        print("🧪 Testing snapshot fixtures")
+        print("=" * 50)
+
+        start = time.perf_counter()
+        path = fixtures.golden_snapshot()
+        build_seconds = time.perf_counter() - start
+        built_at = os.path.getmtime(path)
+        assert os.listdir(fixtures.CACHE_DIR) == [os.path.basename(path)]
+        assert fixtures.generator_version() in path
+
+        start = time.perf_counter()
+        conn = fixtures.fixture_connection()
+        copy_seconds = time.perf_counter() - start
+        print(f"Snapshot built in {build_seconds * 1000:.0f} ms, copied in {copy_seconds * 1000:.1f} ms")
+        assert fixtures.golden_snapshot() == path and os.path.getmtime(path) == built_at
+
+        customers = conn.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+        conn.execute("DELETE FROM reviews")
+        conn.execute("DELETE FROM order_items")
+        conn.execute("DELETE FROM orders")
+        assert conn.execute("SELECT SUM(total_orders) FROM customers").fetchone()[0] == 0
+
+        db_path = fixtures.fixture_copy()
+        on_disk = sqlite3.connect(db_path)
+        assert on_disk.execute("SELECT COUNT(*) FROM customers").fetchone()[0] == customers
+        assert on_disk.execute("SELECT COUNT(*) FROM orders").fetchone()[0] > 0
+        on_disk.close()
+
+        snapshot = sqlite3.connect(path)
+        assert snapshot.execute("SELECT COUNT(*) FROM orders").fetchone()[0] > 0
+        snapshot.close()
+        conn.close()
+    finally:
+        fixtures.CACHE_DIR = cache_dir
+    print("✅ Snapshot reused; copies are isolated")
+
+
+if __name__ == "__main__":
+    test_snapshot_is_built_once_and_copies_are_isolated()
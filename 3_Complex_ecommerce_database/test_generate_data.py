@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the scale-factor data generator
+Generates two small databases from the same seed and checks that they are identical,
+that the distributions are skewed as intended and that the derived structures exist.
+Also checks that a parallel, sharded build gives the same rows as a single process.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from category_closure import verify_category_closure
+from customer_totals import verify_customer_totals
+from generate_data import generate_database
+
+CHECKED_TABLES = ['categories', 'suppliers', 'products', 'customers', 'shipping_addresses',
+                  'payment_methods', 'orders', 'order_items', 'inventory', 'reviews', 'product_tags']
+
+
+def table_contents(conn):
+    """Every row of the generated tables, in a stable order."""
+    return {table: conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall() for table in CHECKED_TABLES}
+
+
+def test_generated_data_is_deterministic_and_skewed():
+    """Same seed gives the same rows; products, order sizes and months are skewed."""
+    workdir = tempfile.mkdtemp()
+    first_path = os.path.join(workdir, 'first.sqlite')
+    second_path = os.path.join(workdir, 'second.sqlite')
+
+    print("🧪 Testing the synthetic data generator")
+    print("=" * 50)
+
+    stats = generate_database(first_path, scale=0.1, seed=123)
+    generate_database(second_path, scale=0.1, seed=123)
+    print(f"Rows loaded: { {table: rows for table, (rows, _) in stats.items() if rows} }")
+
+    first = sqlite3.connect(first_path)
+    second = sqlite3.connect(second_path)
+    assert table_contents(first) == table_contents(second)
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    print("Same seed, same data")
+
+    other_path = os.path.join(workdir, 'other.sqlite')
+    generate_database(other_path, scale=0.1, seed=124)
+    other = sqlite3.connect(other_path)
+    assert table_contents(other)['order_items'] != table_contents(first)['order_items']
+
+    # The best-selling 1% of products account for far more than 1% of order lines
+    product_count = first.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    line_count = first.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+    top_lines = first.execute("""
+        SELECT SUM(lines) FROM (
+            SELECT COUNT(*) AS lines FROM order_items GROUP BY product_id ORDER BY lines DESC LIMIT ?
+        )
+    """, (max(1, product_count // 100),)).fetchone()[0]
+    print(f"Top 1% of products: {top_lines / line_count:.0%} of order lines")
+    assert top_lines / line_count > 0.2
+
+    # Most orders have one item, a few have many
+    sizes = dict(first.execute("""
+        SELECT items, COUNT(*) FROM (SELECT COUNT(*) AS items FROM order_items GROUP BY order_id) GROUP BY items
+    """))
+    print(f"Orders by item count: {sizes}")
+    assert sizes[1] > sizes[2] > sizes[4] and max(sizes) >= 6
+
+    # Holiday season outsells late winter
+    december, february = (first.execute(
+        "SELECT COUNT(*) FROM orders WHERE strftime('%m', order_date) = ?", (month,)
+    ).fetchone()[0] for month in ('12', '02'))
+    print(f"December orders: {december}, February orders: {february}")
+    assert december > 1.5 * february
+
+    # The trigger-maintained structures were built over the loaded rows
+    assert verify_category_closure(first) == ([], [])
+    assert verify_customer_totals(first) == []
+    assert first.execute("SELECT COUNT(*) FROM reviews_fts WHERE reviews_fts MATCH 'battery'").fetchone()[0] > 0
+    assert first.execute("SELECT SUM(line_items) FROM summary_revenue_by_supplier").fetchone()[0] == line_count
+
+    for conn in (first, second, other):
+        conn.close()
+    print("✅ Generator is deterministic and produces skewed, fully indexed data")
+
+
+def test_parallel_build_matches_single_process():
+    """Sharding customers and orders over worker processes does not change a single row."""
+    workdir = tempfile.mkdtemp()
+    serial_path = os.path.join(workdir, 'serial.sqlite')
+    parallel_path = os.path.join(workdir, 'parallel.sqlite')
+
+    print("\n🧪 Testing the parallel sharded build")
+    print("=" * 50)
+
+    generate_database(serial_path, scale=0.3, seed=5, jobs=1)
+    stats = generate_database(parallel_path, scale=0.3, seed=5, jobs=2)
+    print(f"Merged shards in {stats['(merge shards)'][1]:.2f}s")
+
+    serial = sqlite3.connect(serial_path)
+    parallel = sqlite3.connect(parallel_path)
+    assert table_contents(serial) == table_contents(parallel)
+    assert verify_customer_totals(parallel) == []
+    assert sorted(os.listdir(workdir)) == ['parallel.sqlite', 'serial.sqlite']
+    serial.close()
+    parallel.close()
+    print("✅ Parallel build is identical to the single-process build")
+
+
+if __name__ == "__main__":
+    test_generated_data_is_deterministic_and_skewed()
+    test_parallel_build_matches_single_process()
@@ -1,8 +1,9 @@
-import sqlite3
 import os
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from fixtures import fixture_connection
+
 # Load .env from the root directory
 load_dotenv('/Users/anidhula/learn/agno/promptengineer48/.env')
 
@@ -11,7 +12,7 @@ client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", "your-api-key-here"))
 
 def get_database_schema():
     """Get the schema of all tables with sample data and relationships."""
-    conn = sqlite3.connect('mydb.sqlite')
+    conn = fixture_connection()
     cursor = conn.cursor()
     
     schema = "Complex E-commerce Database Schema:\n\n"
@@ -142,7 +143,7 @@ def test_query():
     
     # Test if the SQL executes correctly
     try:
-        conn = sqlite3.connect('mydb.sqlite')
+        conn = fixture_connection()
         cursor = conn.cursor()
         
         cursor.execute(sql_query)
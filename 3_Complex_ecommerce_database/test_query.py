@@ -1,8 +1,8 @@
-import sqlite3
+from fixtures import fixture_connection
 
 def test_customer_query():
     """Test the correct SQL query for customers with total spending and order count."""
-    conn = sqlite3.connect('mydb.sqlite')
+    conn = fixture_connection()
     cursor = conn.cursor()
     
     print("=== Correct Query ===")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming result export
+Exports small results in tiny chunks so that column types change between chunks:
+integers followed by REAL values must widen the column instead of being truncated,
+mixed types inside one chunk become text, and an impossible type change fails with a
+clear error and leaves no partial file behind.
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+
+from result_export import export_query_results, pa, pq
+
+READINGS_SCHEMA = """
+CREATE TABLE readings (id INTEGER PRIMARY KEY, rating NUMERIC, label TEXT);
+INSERT INTO readings (rating, label) VALUES (0, 'a'), (1, 'b'), (2, 'c'), (3, 'd'), (4, 'e'), (2.5, 'f'), (NULL, 'g');
+"""
+
+
+def readings_database():
+    """A temp database whose rating column holds integers first and a REAL later; returns (workdir, path)."""
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'readings.sqlite')
+    conn = sqlite3.connect(db_path)
+    conn.executescript(READINGS_SCHEMA)
+    conn.close()
+    return workdir, db_path
+
+
+def read_arrow_export(path, export_format):
+    """The exported file as a pyarrow Table."""
+    if export_format == 'Parquet':
+        return pq.read_table(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def test_text_exports_stream_every_row():
+    """CSV and JSONL write a header or one object per row, across chunks."""
+    workdir, db_path = readings_database()
+
+    print("🧪 Testing streaming result export")
+    print("=" * 50)
+
+    csv_path, row_count = export_query_results("SELECT id, rating FROM readings ORDER BY id", 'CSV', db_path,
+                                               os.path.join(workdir, 'readings.csv'), chunk_size=2)
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert row_count == 7 and rows[0] == ['id', 'rating'] and rows[6] == ['6', '2.5']
+
+    jsonl_path, _ = export_query_results("SELECT label FROM readings ORDER BY id", 'JSONL', db_path, chunk_size=3)
+    with open(jsonl_path, encoding='utf-8') as f:
+        assert [json.loads(line)['label'] for line in f] == list('abcdefg')
+    os.remove(jsonl_path)
+    print("✅ CSV and JSONL exports hold every row")
+
+
+def test_integer_column_widens_to_float():
+    """0..4 then 2.5 with chunk_size=2: the column becomes float64 and keeps 2.5."""
+    if pa is None:
+        print("⏭️  Arrow export skipped (pip install pyarrow)")
+        return
+
+    workdir, db_path = readings_database()
+    for export_format, extension in (('Parquet', '.parquet'), ('Arrow IPC', '.arrow')):
+        output_path, row_count = export_query_results(
+            "SELECT id, COALESCE(rating, 0) AS rating FROM readings ORDER BY id", export_format, db_path,
+            os.path.join(workdir, f"widened{extension}"), chunk_size=2)
+        table = read_arrow_export(output_path, export_format)
+        print(f"{export_format}: rating {table.schema.field('rating').type} {table.column('rating').to_pylist()}")
+        assert row_count == 7
+        assert table.schema.field('rating').type == pa.float64()
+        assert table.schema.field('id').type == pa.int64()
+        assert table.column('rating').to_pylist() == [0, 1, 2, 3, 4, 2.5, 0]
+        assert not os.path.exists(f"{output_path}.narrow")
+    print("✅ Integers followed by REAL values widen the column instead of truncating them")
+
+
+def test_mixed_and_conflicting_types():
+    """Mixed types in the first chunk become text; integers turning into text later fail cleanly."""
+    if pa is None:
+        print("⏭️  Arrow export skipped (pip install pyarrow)")
+        return
+
+    workdir, db_path = readings_database()
+    mixed_query = "SELECT CASE WHEN id % 2 THEN id ELSE label END AS value FROM readings ORDER BY id"
+    output_path, _ = export_query_results(mixed_query, 'Parquet', db_path,
+                                          os.path.join(workdir, 'mixed.parquet'), chunk_size=10)
+    table = pq.read_table(output_path)
+    assert table.schema.field('value').type == pa.string()
+    assert table.column('value').to_pylist() == ['1', 'b', '3', 'd', '5', 'f', '7']
+
+    conflicting_query = "SELECT CASE WHEN id < 5 THEN id ELSE label END AS value FROM readings ORDER BY id"
+    output_path = os.path.join(workdir, 'conflicting.parquet')
+    try:
+        export_query_results(conflicting_query, 'Parquet', db_path, output_path, chunk_size=2)
+        raise AssertionError("expected a type change error")
+    except ValueError as e:
+        print(f"Conflicting types: {e}")
+        assert "'value' changes type mid-result" in str(e)
+    assert sorted(os.listdir(workdir)) == ['mixed.parquet', 'readings.sqlite']
+
+    before = {name for name in os.listdir(tempfile.gettempdir()) if name.startswith('query_results_')}
+    try:
+        export_query_results(conflicting_query, 'Arrow IPC', db_path, chunk_size=2)
+        raise AssertionError("expected a type change error")
+    except ValueError:
+        pass
+    after = {name for name in os.listdir(tempfile.gettempdir()) if name.startswith('query_results_')}
+    assert after == before
+    print("✅ Mixed chunks exported as text; conflicting types raise and remove the partial file")
+
+
+if __name__ == "__main__":
+    test_text_exports_stream_every_row()
+    test_integer_column_widens_to_float()
+    test_mixed_and_conflicting_types()
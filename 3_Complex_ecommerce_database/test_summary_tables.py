@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the dashboard summary tables
+Applies live writes to an in-memory copy of the sample database and checks that the incrementally
+maintained summaries match a full refresh, also after dimension rows (suppliers, categories,
+product assignments, address countries) change, and that questions are routed to them.
+"""
+
+from fixtures import fixture_connection
+from summary_tables import SUMMARY_TABLES, refresh_summaries, route_to_summaries, verify_summaries
+
+
+def snapshot(conn):
+    """Read every summary table in a stable order, rounding REAL sums."""
+    tables = {}
+    for table_name in SUMMARY_TABLES:
+        rows = conn.execute(f"SELECT * FROM {table_name} ORDER BY 1, 2").fetchall()
+        tables[table_name] = [tuple(round(v, 4) if isinstance(v, float) else v for v in row) for row in rows]
+    return tables
+
+
+def test_summaries_follow_live_writes():
+    """Insert, update and delete orders, line items and reviews, then compare with a full refresh."""
+    conn = fixture_connection()
+    cursor = conn.cursor()
+
+    print("🧪 Testing incrementally maintained summary tables")
+    print("=" * 50)
+
+    cursor.execute("""
+        INSERT INTO orders (customer_id, shipping_address_id, payment_method_id, status, subtotal, total_amount)
+        VALUES (3, 4, 4, 'pending', 0.0, 10.0)
+    """)
+    new_order_id = cursor.lastrowid
+    cursor.execute("""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+        VALUES (?, 10, 2, 50.0, 100.0)
+    """, (new_order_id,))
+    # Line items add to the order's shipping cost (customer_totals triggers)
+    assert cursor.execute("SELECT subtotal, total_amount FROM orders WHERE order_id = ?",
+                          (new_order_id,)).fetchone() == (100.0, 110.0)
+    cursor.execute("UPDATE order_items SET product_id = 1, quantity = 3 WHERE order_id = ?", (new_order_id,))
+    cursor.execute("UPDATE orders SET status = 'shipped' WHERE order_id = ?", (new_order_id,))
+    cursor.execute("UPDATE orders SET shipping_address_id = 1 WHERE order_id = 2")
+    cursor.execute("DELETE FROM order_items WHERE order_id = 3")
+    cursor.execute("DELETE FROM orders WHERE order_id = 18")
+
+    cursor.execute("""
+        INSERT INTO reviews (product_id, customer_id, order_id, rating, title, comment)
+        VALUES (2, 3, ?, 1, 'Broke quickly', 'Stopped working after a week')
+    """, (new_order_id,))
+    cursor.execute("UPDATE reviews SET rating = 5 WHERE review_id = 1")
+    cursor.execute("DELETE FROM reviews WHERE review_id = 2")
+    conn.commit()
+
+    incremental = snapshot(conn)
+    with conn:
+        refresh_summaries(conn)
+    refreshed = snapshot(conn)
+
+    for table_name in SUMMARY_TABLES:
+        print(f"{table_name}: {len(incremental[table_name])} rows")
+        assert incremental[table_name] == refreshed[table_name], table_name
+
+    conn.close()
+    print("✅ Summary tables stay correct under live writes")
+
+
+def test_summaries_follow_dimension_changes():
+    """Rename and move suppliers, categories, products and addresses; verify finds no drift."""
+    conn = fixture_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("UPDATE suppliers SET name = 'Renamed Supplier', country = 'Iceland' WHERE supplier_id = 1")
+    cursor.execute("UPDATE products SET supplier_id = 2, category_id = 14 WHERE product_id = 1")
+    cursor.execute("UPDATE products SET category_id = 3 WHERE product_id = 2")
+    cursor.execute("UPDATE categories SET name = 'Renamed Category' WHERE category_id = 14")
+    cursor.execute("UPDATE shipping_addresses SET country = 'Iceland' WHERE address_id = 1")
+    conn.commit()
+
+    assert conn.execute("SELECT country FROM summary_revenue_by_supplier WHERE supplier_id = 1").fetchone() == ('Iceland',)
+    assert conn.execute("SELECT COUNT(*) FROM summary_order_status_by_country WHERE country = 'Iceland'").fetchone()[0] > 0
+    assert verify_summaries(conn) == []
+
+    # Drift made behind the triggers' back is reported, and fixed on request
+    conn.execute("DROP TRIGGER trg_summary_category_rating_category_update")
+    conn.execute("UPDATE categories SET name = 'Untracked' WHERE category_id = 14")
+    assert verify_summaries(conn) == ['summary_rating_by_category']
+    assert verify_summaries(conn, fix=True) == ['summary_rating_by_category']
+    assert verify_summaries(conn) == []
+
+    conn.close()
+    print("✅ Summary tables follow supplier, category, product and address changes")
+
+
+def test_questions_are_routed_to_summaries():
+    """The recurring dashboard questions map to their summary table; others do not."""
+    assert route_to_summaries("Show revenue by supplier and country") == ['summary_revenue_by_supplier']
+    assert route_to_summaries("Show average rating by product category") == ['summary_rating_by_category']
+    assert route_to_summaries("Show order status distribution by customer country") == \
+        ['summary_order_status_by_country']
+    assert route_to_summaries("Show me all customers with their total spending") == []
+    print("✅ Dashboard questions are routed to the summary tables")
+
+
+if __name__ == "__main__":
+    test_summaries_follow_live_writes()
+    test_summaries_follow_dimension_changes()
+    test_questions_are_routed_to_summaries()
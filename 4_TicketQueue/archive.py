@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Hot/Cold Archive for TicketQueue
+Moves completed ticket items older than N days, with their comments, attachments and
+dependencies, into an ATTACHed archive database in bounded batches. Open work stays
+in the (now smaller) hot tables; history_* TEMP views UNION ALL both sides for
+questions about past work, and a small router decides which the prompt should use.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+
+DEFAULT_ARCHIVE_PATH = 'ticketqueue_archive.db'
+DEFAULT_OLDER_THAN_DAYS = 90
+DEFAULT_BATCH_SIZE = 500
+
+# Archived table → SQL selecting the rows that follow the items in temp.archive_batch
+ARCHIVED_TABLES = {
+    'ticket_item_comments': "ticket_item_id IN (SELECT id FROM temp.archive_batch)",
+    'ticket_item_attachments': "ticket_item_id IN (SELECT id FROM temp.archive_batch)",
+    # A completed item's own prerequisites are history; edges pointing at it from
+    # items that stay hot remain in the hot table
+    'ticket_item_dependencies': "dependent_item_id IN (SELECT id FROM temp.archive_batch)",
+    'ticket_items': "id IN (SELECT id FROM temp.archive_batch)",
+}
+
+ARCHIVE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_comments_item ON ticket_item_comments (ticket_item_id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_attachments_item ON ticket_item_attachments (ticket_item_id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_dependencies_dependent ON ticket_item_dependencies (dependent_item_id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archive_dependencies_prerequisite ON ticket_item_dependencies (prerequisite_item_id)",
+]
+
+# Completed long enough ago, and nothing still open waits on it
+ELIGIBLE_ITEMS = """
+    SELECT ti.id FROM main.ticket_items ti
+    WHERE ti.status = 'completed'
+      AND COALESCE(ti.completed_at, ti.updated_at, ti.created_at) < datetime('now', ?)
+      AND NOT EXISTS (
+          SELECT 1 FROM main.ticket_item_dependencies d
+          JOIN main.ticket_items dependent ON dependent.id = d.dependent_item_id
+          WHERE d.prerequisite_item_id = ti.id AND dependent.status != 'completed'
+      )
+    ORDER BY ti.id
+    LIMIT ?
+"""
+
+# Words that point a question at past work rather than the current queue
+HISTORY_KEYWORDS = {
+    'history', 'historical', 'archive', 'archived', 'completed', 'finished', 'closed', 'done',
+    'past', 'previous', 'last', 'ago', 'ever', 'all-time', 'alltime', 'year', 'years', 'trend', 'trends',
+}
+
+
+def _columns(conn, schema, table):
+    """Column names of a table in the given schema."""
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def attach_archive(conn, archive_path=DEFAULT_ARCHIVE_PATH, create=False):
+    """ATTACH the archive as schema 'archive'; with create=True, create missing archive tables.
+
+    Returns False (and attaches nothing) if the archive file does not exist and create is False.
+    """
+    if any(row[1] == 'archive' for row in conn.execute("PRAGMA database_list")):
+        return True
+    if not create and not os.path.exists(archive_path):
+        return False
+
+    conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+    if create:
+        for table in ARCHIVED_TABLES:
+            # Plain columns and primary key only: the archive holds history, not live constraints
+            columns = conn.execute(f"PRAGMA main.table_info({table})").fetchall()
+            column_defs = ", ".join(f"{name} {col_type}".strip() for _, name, col_type, _, _, _ in columns)
+            primary_key = [name for _, name, _, _, _, pk in sorted(columns, key=lambda col: col[5]) if pk]
+            conn.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} ({column_defs}, "
+                         f"PRIMARY KEY ({', '.join(primary_key)}))")
+        for statement in ARCHIVE_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+    return True
+
+
+def create_history_views(conn):
+    """TEMP views history_<table> = hot rows UNION ALL archived rows (needs the archive attached)."""
+    for table in ARCHIVED_TABLES:
+        columns = ", ".join(_columns(conn, 'main', table))
+        conn.execute(f"""
+            CREATE TEMP VIEW IF NOT EXISTS history_{table} AS
+            SELECT {columns} FROM main.{table}
+            UNION ALL
+            SELECT {columns} FROM archive.{table}
+        """)
+
+
+def history_open(conn):
+    """True if conn already has the history_* views."""
+    return conn.execute("SELECT 1 FROM sqlite_temp_master WHERE type = 'view' AND name = ?",
+                        (f"history_{next(iter(ARCHIVED_TABLES))}",)).fetchone() is not None
+
+
+def open_history(conn, archive_path=DEFAULT_ARCHIVE_PATH):
+    """Attach the archive (if it exists) and create the history views on a query connection.
+
+    Returns True once conn has the views. Safe to call before every query: it is a single
+    lookup when the views exist, and an archive that archive.py is still creating (its
+    tables not committed yet) is left for a later call.
+    """
+    if history_open(conn):
+        return True
+    if not attach_archive(conn, archive_path):
+        return False
+    archived = conn.execute("SELECT COUNT(*) FROM archive.sqlite_master WHERE type = 'table' AND name IN "
+                            f"({', '.join('?' * len(ARCHIVED_TABLES))})", list(ARCHIVED_TABLES)).fetchone()[0]
+    if archived < len(ARCHIVED_TABLES):
+        return False
+    create_history_views(conn)
+    return True
+
+
+def archive_batch(conn, older_than_days=DEFAULT_OLDER_THAN_DAYS, batch_size=DEFAULT_BATCH_SIZE):
+    """Move one batch of eligible items and their children in one transaction; returns items moved."""
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.archive_batch")
+        conn.execute(f"INSERT INTO temp.archive_batch (id) {ELIGIBLE_ITEMS}",
+                     (f"-{int(older_than_days)} days", batch_size))
+        moved = conn.execute("SELECT COUNT(*) FROM temp.archive_batch").fetchone()[0]
+        if moved == 0:
+            return 0
+
+        # Children first so nothing in the hot tables points at a missing item mid-batch;
+        # the hot tables' triggers (rollups, dependency index, full-text index) see plain deletes
+        for table, condition in ARCHIVED_TABLES.items():
+            columns = ", ".join(_columns(conn, 'main', table))
+            conn.execute(f"INSERT OR REPLACE INTO archive.{table} ({columns}) "
+                         f"SELECT {columns} FROM main.{table} WHERE {condition}")
+            conn.execute(f"DELETE FROM main.{table} WHERE {condition}")
+    return moved
+
+
+def archive_completed_items(conn, older_than_days=DEFAULT_OLDER_THAN_DAYS, batch_size=DEFAULT_BATCH_SIZE,
+                            max_batches=None, progress=None):
+    """Archive in bounded batches until nothing is eligible (or max_batches). Returns items moved."""
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(conn, older_than_days, batch_size)
+        if moved == 0:
+            break
+        total += moved
+        batches += 1
+        if progress:
+            progress(batches, total)
+    return total
+
+
+def route_question(nl_query):
+    """'history' if the question is about past/completed work, else 'current'."""
+    # "not completed" / "not yet done" is a question about open work
+    text = re.sub(r"\bnot\s+(yet\s+)?(completed|finished|done|closed)\b", " ", nl_query.lower())
+    words = set(re.findall(r"[a-z\-]+", text))
+    return 'history' if words & HISTORY_KEYWORDS else 'current'
+
+
+def get_archive_prompt_section(nl_query, archive_available=True):
+    """Prompt text telling the LLM whether to query the hot tables or the history views."""
+    if not archive_available:
+        return ""
+    if route_question(nl_query) == 'history':
+        tables = ", ".join(f"history_{table}" for table in ARCHIVED_TABLES)
+        return ("\nHISTORY VIEWS (This question is about past work. Completed items older than the archive cutoff "
+                f"are only in these views, which combine current and archived rows): {tables}. "
+                "They have the same columns as the tables without the history_ prefix; "
+                "use them instead of those tables. The users.total_* and ticket_queue.total_* fields "
+                "count non-archived items only.\n")
+    return ("\nCURRENT WORK (ticket_items and its comments, attachments and dependencies hold open and recently "
+            "completed work; long-completed items are archived, so query these tables directly).\n")
+
+
+def archive_status(conn):
+    """(table, hot_rows, archived_rows) for every archived table."""
+    return [
+        (table,
+         conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0],
+         conn.execute(f"SELECT COUNT(*) FROM archive.{table}").fetchone()[0])
+        for table in ARCHIVED_TABLES
+    ]
+
+
+def main():
+    """Archive old completed work, show hot/cold row counts or route a question."""
+    parser = argparse.ArgumentParser(description="Move old completed ticket items into an archive database")
+    parser.add_argument('action', choices=['run', 'status', 'route'])
+    parser.add_argument('question', nargs='?', help="Question to route (for 'route')")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH,
+                        help=f"Archive database file (default: {DEFAULT_ARCHIVE_PATH})")
+    parser.add_argument('--days', type=int, default=DEFAULT_OLDER_THAN_DAYS,
+                        help="Archive items completed more than this many days ago")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Items moved per transaction")
+    parser.add_argument('--max-batches', type=int, default=None, help="Stop after this many batches")
+    args = parser.parse_args()
+
+    if args.action == 'route':
+        print(route_question(args.question or ""))
+        return 0
+
+    if not os.path.exists(args.db):
+        print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'run':
+            attach_archive(conn, args.archive, create=True)
+            moved = archive_completed_items(
+                conn, args.days, args.batch_size, args.max_batches,
+                progress=lambda batches, total: print(f"  batch {batches}: {total:,} items archived")
+            )
+            print(f"✅ Archived {moved:,} completed ticket items older than {args.days} days into {args.archive}")
+        else:
+            if not attach_archive(conn, args.archive):
+                print(f"No archive yet ({args.archive} does not exist)")
+                return 0
+            print(f"{'table':26} | {'hot':>10} | {'archived':>10}")
+            print("-" * 52)
+            for table, hot_rows, archived_rows in archive_status(conn):
+                print(f"{table:26} | {hot_rows:10,} | {archived_rows:10,}")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
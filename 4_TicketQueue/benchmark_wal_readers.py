@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Reader/Writer Benchmark for WAL Mode
+Runs N concurrent readers through the app's execute_sql path while a background
+writer updates ticket_items, once in rollback-journal mode and once in WAL mode,
+and reports reader latency percentiles for both. Both modes use the same
+connection strategy (a reader pool by default, or a connection per query), so
+the difference is the journal mode alone. With --scale, the benchmark runs on a
+cached generate_data.py snapshot instead of ticketqueue.db.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from fixtures import golden_snapshot
+from generate_data import DEFAULT_SEED
+from wal_mode import ReaderPool, checkpoint_wal, connect_writer, enable_wal_mode, run_sql_query
+
+# A mix of the questions the NL tool answers most often
+READER_QUERIES = [
+    "SELECT first_name, last_name, total_assigned_items, total_completed_items FROM users",
+    "SELECT title, total_ticket_items, completed_ticket_items, total_estimated_hours FROM ticket_queue",
+    """SELECT ti.title, ti.due_date, u.first_name || ' ' || u.last_name as assigned_to
+       FROM ticket_items ti LEFT JOIN users u ON ti.assigned_to = u.id
+       WHERE ti.due_date < datetime('now') AND ti.status != 'completed'""",
+    """SELECT u.first_name, u.last_name, COUNT(ti.id) as assigned_items
+       FROM users u LEFT JOIN ticket_items ti ON u.id = ti.assigned_to
+       GROUP BY u.id ORDER BY assigned_items DESC""",
+    """SELECT status, COUNT(*), SUM(estimated_hours), SUM(actual_hours)
+       FROM ticket_items GROUP BY status""",
+]
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def writer_loop(db_path, stop_event, stats, batch_size, write_interval, seed):
+    """Keep updating ticket_items in small transactions until stopped."""
+    rng = random.Random(seed)
+    conn = connect_writer(db_path)
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM ticket_items").fetchone()[0]
+
+    while not stop_event.is_set() and max_id:
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE ticket_items SET actual_hours = COALESCE(actual_hours, 0) + 0.25, "
+                    "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    [(rng.randint(1, max_id),) for _ in range(batch_size)]
+                )
+            stats['commits'] += 1
+        except sqlite3.OperationalError:
+            stats['writer_busy'] += 1
+        time.sleep(write_interval)
+
+    conn.close()
+
+
+def reader_loop(db_path, reader_pool, stop_event, latencies, errors, seed):
+    """Run queries the way execute_sql does in a loop, recording per-call latency in milliseconds."""
+    rng = random.Random(seed)
+    while not stop_event.is_set():
+        sql_query = rng.choice(READER_QUERIES)
+        start = time.perf_counter()
+        result = run_sql_query(sql_query, db_path, reader_pool)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if result.startswith("Error executing SQL"):
+            errors.append(result)
+
+
+def run_scenario(db_path, journal_mode, readers, duration, batch_size, write_interval, connections='pool'):
+    """Run one reader/writer scenario against a private copy of the database.
+
+    connections is 'pool' (one ReaderPool connection per reader) or 'per-query' (a new
+    connection for every query); either way it is the same in both journal modes.
+    """
+    workdir = tempfile.mkdtemp(prefix=f"wal_bench_{journal_mode}_")
+    bench_db = os.path.join(workdir, os.path.basename(db_path))
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(bench_db)
+    source.backup(target)
+    source.close()
+    target.execute("PRAGMA journal_mode=DELETE")
+    target.close()
+
+    if journal_mode == 'wal':
+        enable_wal_mode(bench_db)
+    reader_pool = ReaderPool(bench_db, size=readers) if connections == 'pool' else None
+
+    stop_event = threading.Event()
+    writer_stats = {'commits': 0, 'writer_busy': 0}
+    latencies = []
+    errors = []
+
+    threads = [threading.Thread(target=writer_loop,
+                                args=(bench_db, stop_event, writer_stats, batch_size, write_interval, 0))]
+    for i in range(readers):
+        threads.append(threading.Thread(target=reader_loop,
+                                        args=(bench_db, reader_pool, stop_event, latencies, errors, i + 1)))
+
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+
+    if reader_pool:
+        reader_pool.close()
+    if journal_mode == 'wal':
+        checkpoint_wal(bench_db, 'TRUNCATE')
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'mode': journal_mode,
+        'reads': len(latencies),
+        'reads_per_sec': len(latencies) / duration,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies) if latencies else 0.0,
+        'errors': len(errors),
+        'commits': writer_stats['commits'],
+        'writer_busy': writer_stats['writer_busy'],
+    }
+
+
+def main():
+    """Benchmark reader latency under a concurrent writer in both journal modes."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent NL readers against a background writer")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database to copy for the benchmark")
+    parser.add_argument('--readers', type=int, default=os.cpu_count() or 1, help="Concurrent reader threads")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument('--batch-size', type=int, default=500, help="ticket_items updated per write transaction")
+    parser.add_argument('--write-interval', type=float, default=0.01, help="Pause between write transactions")
+    parser.add_argument('--connections', choices=['pool', 'per-query'], default='pool',
+                        help="Reader connection strategy, used in both journal modes (default: pool)")
+    parser.add_argument('--scale', type=float, default=None,
+                        help="Use a cached generate_data.py snapshot at this scale instead of --db")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Seed of the --scale snapshot")
+    args = parser.parse_args()
+
+    if args.scale is not None:
+        args.db = golden_snapshot(args.scale, args.seed)
+    elif not os.path.exists(args.db):
+        print(f"❌ Database not found: {args.db}")
+        print("Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    print("🚀 WAL Reader/Writer Benchmark")
+    print("=" * 50)
+    print(f"Database: {args.db} | readers: {args.readers} ({args.connections}) | {args.duration:.0f}s per mode")
+
+    results = []
+    for journal_mode in ('delete', 'wal'):
+        print(f"\n⏱️  Running {journal_mode.upper()} journal mode...")
+        results.append(run_scenario(args.db, journal_mode, args.readers, args.duration,
+                                    args.batch_size, args.write_interval, args.connections))
+
+    print("\n" + "=" * 50)
+    print(f"{'mode':8} | {'reads/s':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'max ms':>8} | {'errors':>6} | {'commits':>7}")
+    print("-" * 82)
+    for r in results:
+        print(f"{r['mode']:8} | {r['reads_per_sec']:9.1f} | {r['p50']:8.2f} | {r['p95']:8.2f} | "
+              f"{r['p99']:8.2f} | {r['max']:8.2f} | {r['errors']:6} | {r['commits']:7}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
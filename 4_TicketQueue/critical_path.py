@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Critical Path Engine for TicketQueue
+Schedules ticket items over ticket_item_dependencies (topological sort weighted by
+estimated/actual hours) and computes earliest start/finish, latest start, slack and
+the critical path per ticket_queue. Results are cached per database data version and
+exposed to generated SQL as functions registered with create_function().
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Floating point sums of hours; slack below this counts as zero
+SLACK_TOLERANCE = 1e-9
+
+# Per-item SQL functions: SQL name → schedule field
+SQL_FUNCTIONS = {
+    'cp_earliest_start': 'earliest_start',
+    'cp_earliest_finish': 'earliest_finish',
+    'cp_latest_start': 'latest_start',
+    'cp_latest_finish': 'latest_finish',
+    'cp_slack': 'slack',
+    'cp_is_critical': 'critical',
+}
+
+
+# Hours an item occupies in the schedule: actual hours once completed, else the estimate
+ITEMS_QUERY = """
+    SELECT id, ticket_queue_id,
+           CASE WHEN status = 'completed' THEN COALESCE(actual_hours, estimated_hours, 0.0)
+                ELSE COALESCE(estimated_hours, actual_hours, 0.0) END
+    FROM ticket_items
+"""
+EDGES_QUERY = "SELECT dependent_item_id, prerequisite_item_id FROM ticket_item_dependencies"
+
+
+def compute_schedule(items, edges):
+    """Forward and backward pass over the dependency DAG.
+
+    items: iterable of (item_id, ticket_queue_id, duration)
+    edges: iterable of (dependent_item_id, prerequisite_item_id)
+    Returns a schedule dict: 'index' maps item_id to a position in the per-item lists
+    'ticket_queue_id', 'earliest_start', 'earliest_finish', 'latest_start', 'latest_finish',
+    'slack' and 'critical'; 'queue_finish' maps ticket_queue_id to its finish; 'cyclic_items'
+    holds the items on or behind a dependency cycle, which cannot be scheduled (their values are None).
+    """
+    index_of = {}
+    queue_ids = []
+    duration = []
+    for item_id, queue_id, hours in items:
+        index_of[item_id] = len(duration)
+        queue_ids.append(queue_id)
+        duration.append(hours)
+    item_count = len(duration)
+
+    dependents = [[] for _ in range(item_count)]
+    prerequisite_count = [0] * item_count
+    lookup = index_of.get
+    for dependent_id, prerequisite_id in edges:
+        dependent = lookup(dependent_id)
+        prerequisite = lookup(prerequisite_id)
+        if dependent is not None and prerequisite is not None:
+            dependents[prerequisite].append(dependent)
+            prerequisite_count[dependent] += 1
+
+    # Kahn's algorithm: `order` doubles as the work queue, the forward pass runs in topological order
+    earliest_start = [0.0] * item_count
+    earliest_finish = [None] * item_count
+    order = [item for item in range(item_count) if prerequisite_count[item] == 0]
+    for item in order:
+        finish = earliest_finish[item] = earliest_start[item] + duration[item]
+        for dependent in dependents[item]:
+            if finish > earliest_start[dependent]:
+                earliest_start[dependent] = finish
+            prerequisite_count[dependent] -= 1
+            if prerequisite_count[dependent] == 0:
+                order.append(dependent)
+
+    # Each queue finishes when its last item finishes
+    queue_finish = {}
+    for item in order:
+        queue_id = queue_ids[item]
+        if earliest_finish[item] > queue_finish.get(queue_id, 0.0):
+            queue_finish[queue_id] = earliest_finish[item]
+        else:
+            queue_finish.setdefault(queue_id, 0.0)
+
+    # Backward pass: an item must finish before its earliest-needed dependent starts,
+    # and no later than its own queue's finish. Dependents on a cycle were never scheduled
+    # (latest_start stays None), so they do not constrain the item.
+    latest_start = [None] * item_count
+    latest_finish = [None] * item_count
+    slack = [None] * item_count
+    critical = [None] * item_count
+    for item in reversed(order):
+        finish = queue_finish[queue_ids[item]]
+        for dependent in dependents[item]:
+            if latest_start[dependent] is not None and latest_start[dependent] < finish:
+                finish = latest_start[dependent]
+        latest_finish[item] = finish
+        latest_start[item] = finish - duration[item]
+        slack[item] = latest_start[item] - earliest_start[item]
+        critical[item] = 1 if slack[item] <= SLACK_TOLERANCE else 0
+
+    scheduled = set(order)
+    cyclic_items = set() if len(order) == item_count else {
+        item_id for item_id, item in index_of.items() if item not in scheduled
+    }
+    for item_id in cyclic_items:
+        earliest_start[index_of[item_id]] = None
+
+    return {
+        'index': index_of,
+        'ticket_queue_id': queue_ids,
+        'earliest_start': earliest_start,
+        'earliest_finish': earliest_finish,
+        'latest_start': latest_start,
+        'latest_finish': latest_finish,
+        'slack': slack,
+        'critical': critical,
+        'queue_finish': queue_finish,
+        'cyclic_items': cyclic_items,
+    }
+
+
+def schedule_value(schedule, field, item_id):
+    """One per-item field of a schedule (None for unknown items)."""
+    item = schedule['index'].get(item_id)
+    return None if item is None else schedule[field][item]
+
+
+class CriticalPathEngine:
+    """Cached schedule for one database, recomputed only when its data version changes."""
+
+    def __init__(self, db_path=None, conn=None):
+        """Read through a dedicated connection to db_path, or through conn (e.g. :memory:)."""
+        if conn is None:
+            if not os.path.exists(db_path):
+                raise FileNotFoundError(f"Database file not found: {db_path}")
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA query_only=ON")
+        self.conn = conn
+        self.schedule = compute_schedule([], [])
+        self.refresh_seconds = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _data_version(self):
+        """Changes whenever another connection commits (data_version) or this one writes (total_changes)."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes
+
+    def refresh(self, force=False):
+        """Recompute the schedule if the database changed since the last run; returns the schedule."""
+        with self._lock:
+            version = self._data_version()
+            if force or version != self._version:
+                start = time.perf_counter()
+                # Swapped in one assignment so concurrent readers see either the old or the new schedule
+                self.schedule = compute_schedule(self.conn.execute(ITEMS_QUERY), self.conn.execute(EDGES_QUERY))
+                self.refresh_seconds = time.perf_counter() - start
+                self._version = version
+            return self.schedule
+
+    def critical_path(self, queue_id):
+        """Critical item ids of a queue in schedule order."""
+        schedule = self.refresh()
+        critical_items = [
+            item_id for item_id, item in schedule['index'].items()
+            if schedule['critical'][item] and schedule['ticket_queue_id'][item] == queue_id
+        ]
+        return sorted(critical_items, key=lambda item_id: schedule_value(schedule, 'earliest_start', item_id))
+
+    def close(self):
+        """Close the engine's connection."""
+        self.conn.close()
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_path):
+    """Shared engine per database file."""
+    key = os.path.abspath(db_path)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = CriticalPathEngine(key)
+        return _engines[key]
+
+
+def register_critical_path_functions(conn):
+    """Expose the schedule to SQL on this connection.
+
+    Adds cp_earliest_start(item_id), cp_earliest_finish, cp_latest_start, cp_latest_finish,
+    cp_slack, cp_is_critical and cp_queue_finish(ticket_queue_id). Every call in one statement
+    reads the same schedule. The connection's trace callback is left to the caller.
+    """
+    db_file = next((row[2] for row in conn.execute("PRAGMA database_list") if row[1] == 'main'), '')
+    engine = get_engine(db_file) if db_file else CriticalPathEngine(conn=conn)
+    pinned = {'key': None, 'schedule': None}
+
+    def current_schedule():
+        # data_version only moves when a statement of this connection starts a read transaction
+        # that sees other connections' commits, total_changes when it writes: the key stays put
+        # for the whole statement, so the schedule is pinned per snapshot of this connection
+        key = conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+        if key != pinned['key']:
+            pinned['schedule'] = engine.refresh()
+            pinned['key'] = key
+        return pinned['schedule']
+
+    for sql_name, field in SQL_FUNCTIONS.items():
+        conn.create_function(
+            sql_name, 1, lambda item_id, field=field: schedule_value(current_schedule(), field, item_id)
+        )
+    conn.create_function('cp_queue_finish', 1, lambda queue_id: current_schedule()['queue_finish'].get(queue_id))
+    return engine
+
+
+def main():
+    """Print each queue's estimated finish and critical path."""
+    parser = argparse.ArgumentParser(description="Critical path per ticket queue")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    parser.add_argument('--queue', type=int, default=None, help="Only this ticket_queue id")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    engine = CriticalPathEngine(args.db)
+    try:
+        schedule = engine.refresh()
+        print(f"📊 Scheduled {len(schedule['index']):,} ticket items in {engine.refresh_seconds:.3f}s")
+        if schedule['cyclic_items']:
+            print(f"⚠️  {len(schedule['cyclic_items'])} items are on a dependency cycle and were not scheduled")
+
+        titles = dict(engine.conn.execute("SELECT id, title FROM ticket_items"))
+        queue_ids = [args.queue] if args.queue is not None else sorted(schedule['queue_finish'], key=str)
+        for queue_id in queue_ids:
+            path = engine.critical_path(queue_id)
+            print(f"\nQueue {queue_id}: finishes after {schedule['queue_finish'].get(queue_id, 0):.1f}h, "
+                  f"{len(path)} critical items")
+            for item_id in path[:20]:
+                start = schedule_value(schedule, 'earliest_start', item_id)
+                finish = schedule_value(schedule, 'earliest_finish', item_id)
+                print(f"  - [{start:.1f}h → {finish:.1f}h] {titles[item_id]}")
+            if len(path) > 20:
+                print(f"  ... {len(path) - 20} more")
+    finally:
+        engine.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Transitive Dependency Index for TicketQueue
+Maintains ticket_item_dependency_closure: one row per (dependent, prerequisite) pair
+that is connected by any chain of ticket_item_dependencies edges, with the number of
+distinct paths. Counting paths lets edge deletes be applied incrementally; a guard
+trigger rejects edges that would close a cycle.
+"""
+
+import argparse
+import os
+import sqlite3
+
+CLOSURE_TABLE = ["""
+CREATE TABLE IF NOT EXISTS ticket_item_dependency_closure (
+    dependent_item_id INTEGER NOT NULL,
+    prerequisite_item_id INTEGER NOT NULL,
+    path_count INTEGER NOT NULL,
+    PRIMARY KEY (dependent_item_id, prerequisite_item_id)
+) WITHOUT ROWID
+""", """
+CREATE INDEX IF NOT EXISTS idx_dependency_closure_prerequisite
+ON ticket_item_dependency_closure (prerequisite_item_id, dependent_item_id)
+"""]
+
+# Every item that (transitively) depends on {dependent}, plus {dependent} itself,
+# combined with every item {prerequisite} (transitively) depends on, plus {prerequisite}.
+# Templates are shared by the triggers (NEW./OLD. columns) and the rebuild (:parameters).
+_UPSTREAM = """
+    SELECT {dependent} AS item_id, 1 AS paths
+    UNION ALL
+    SELECT dependent_item_id, path_count FROM ticket_item_dependency_closure
+    WHERE prerequisite_item_id = {dependent}
+"""
+_DOWNSTREAM = """
+    SELECT {prerequisite} AS item_id, 1 AS paths
+    UNION ALL
+    SELECT prerequisite_item_id, path_count FROM ticket_item_dependency_closure
+    WHERE dependent_item_id = {prerequisite}
+"""
+
+ADD_EDGE_PATHS = f"""
+    INSERT INTO ticket_item_dependency_closure (dependent_item_id, prerequisite_item_id, path_count)
+    SELECT upstream.item_id, downstream.item_id, upstream.paths * downstream.paths
+    FROM ({_UPSTREAM}) upstream, ({_DOWNSTREAM}) downstream
+    WHERE true
+    ON CONFLICT (dependent_item_id, prerequisite_item_id)
+    DO UPDATE SET path_count = path_count + excluded.path_count
+"""
+
+# In a DAG the paths through an edge never pass through a pair being decremented,
+# so the lookups below see the pre-delete counts (the outer row is referenced by
+# table name because UPDATE aliases are not allowed inside triggers)
+REMOVE_EDGE_PATHS = """
+    UPDATE ticket_item_dependency_closure
+    SET path_count = path_count - (
+        CASE WHEN ticket_item_dependency_closure.dependent_item_id = {dependent} THEN 1 ELSE (
+            SELECT up.path_count FROM ticket_item_dependency_closure up
+            WHERE up.dependent_item_id = ticket_item_dependency_closure.dependent_item_id
+              AND up.prerequisite_item_id = {dependent}
+        ) END
+    ) * (
+        CASE WHEN ticket_item_dependency_closure.prerequisite_item_id = {prerequisite} THEN 1 ELSE (
+            SELECT down.path_count FROM ticket_item_dependency_closure down
+            WHERE down.dependent_item_id = {prerequisite}
+              AND down.prerequisite_item_id = ticket_item_dependency_closure.prerequisite_item_id
+        ) END
+    )
+    WHERE (ticket_item_dependency_closure.dependent_item_id = {dependent}
+           OR ticket_item_dependency_closure.dependent_item_id IN (
+               SELECT dependent_item_id FROM ticket_item_dependency_closure
+               WHERE prerequisite_item_id = {dependent}))
+      AND (ticket_item_dependency_closure.prerequisite_item_id = {prerequisite}
+           OR ticket_item_dependency_closure.prerequisite_item_id IN (
+               SELECT prerequisite_item_id FROM ticket_item_dependency_closure
+               WHERE dependent_item_id = {prerequisite}));
+    DELETE FROM ticket_item_dependency_closure WHERE path_count <= 0
+"""
+
+# An edge closes a cycle when its prerequisite already depends on its dependent
+CREATES_CYCLE = """
+    SELECT 1 WHERE {dependent} = {prerequisite} OR EXISTS (
+        SELECT 1 FROM ticket_item_dependency_closure
+        WHERE dependent_item_id = {prerequisite} AND prerequisite_item_id = {dependent}
+    )
+"""
+
+_NEW = {'dependent': 'NEW.dependent_item_id', 'prerequisite': 'NEW.prerequisite_item_id'}
+_OLD = {'dependent': 'OLD.dependent_item_id', 'prerequisite': 'OLD.prerequisite_item_id'}
+_PARAMS = {'dependent': ':dependent', 'prerequisite': ':prerequisite'}
+
+CYCLE_ERROR = 'ticket item dependency cycle: the prerequisite already depends on the dependent item'
+
+CLOSURE_TRIGGERS = [f"""
+CREATE TRIGGER IF NOT EXISTS trg_dependency_closure_cycle_guard_insert
+BEFORE INSERT ON ticket_item_dependencies
+BEGIN
+    SELECT RAISE(ABORT, '{CYCLE_ERROR}') WHERE EXISTS ({CREATES_CYCLE.format(**_NEW)});
+END
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_dependency_closure_insert
+AFTER INSERT ON ticket_item_dependencies
+BEGIN
+    {ADD_EDGE_PATHS.format(**_NEW)};
+END
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_dependency_closure_delete
+AFTER DELETE ON ticket_item_dependencies
+BEGIN
+    {REMOVE_EDGE_PATHS.format(**_OLD)};
+END
+""",
+# Checked against the graph that still contains the old edge, so reversing an
+# edge in place is rejected; delete and re-insert it instead
+f"""
+CREATE TRIGGER IF NOT EXISTS trg_dependency_closure_cycle_guard_update
+BEFORE UPDATE OF dependent_item_id, prerequisite_item_id ON ticket_item_dependencies
+WHEN OLD.dependent_item_id IS NOT NEW.dependent_item_id OR OLD.prerequisite_item_id IS NOT NEW.prerequisite_item_id
+BEGIN
+    SELECT RAISE(ABORT, '{CYCLE_ERROR}') WHERE EXISTS ({CREATES_CYCLE.format(**_NEW)});
+END
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_dependency_closure_update
+AFTER UPDATE OF dependent_item_id, prerequisite_item_id ON ticket_item_dependencies
+WHEN OLD.dependent_item_id IS NOT NEW.dependent_item_id OR OLD.prerequisite_item_id IS NOT NEW.prerequisite_item_id
+BEGIN
+    {REMOVE_EDGE_PATHS.format(**_OLD)};
+    {ADD_EDGE_PATHS.format(**_NEW)};
+END
+"""]
+
+TRIGGER_NAMES = [
+    'trg_dependency_closure_cycle_guard_insert',
+    'trg_dependency_closure_insert',
+    'trg_dependency_closure_delete',
+    'trg_dependency_closure_cycle_guard_update',
+    'trg_dependency_closure_update',
+]
+
+
+def install_dependency_index(conn):
+    """Create the closure table, fill it from the existing edges and install its triggers."""
+    for statement in CLOSURE_TABLE:
+        conn.execute(statement)
+    rebuild_dependency_index(conn)
+    for statement in CLOSURE_TRIGGERS:
+        conn.execute(statement)
+
+
+def drop_dependency_index_triggers(conn):
+    """Remove the maintenance triggers, e.g. before a bulk load."""
+    for trigger_name in TRIGGER_NAMES:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+
+def rebuild_dependency_index(conn):
+    """Recompute the closure by replaying every edge; raises ValueError on a stored cycle."""
+    conn.execute("DELETE FROM ticket_item_dependency_closure")
+    add_paths = ADD_EDGE_PATHS.format(**_PARAMS)
+    creates_cycle = CREATES_CYCLE.format(**_PARAMS)
+
+    edges = conn.execute(
+        "SELECT dependent_item_id, prerequisite_item_id FROM ticket_item_dependencies ORDER BY id"
+    ).fetchall()
+    for dependent, prerequisite in edges:
+        params = {'dependent': dependent, 'prerequisite': prerequisite}
+        if conn.execute(creates_cycle, params).fetchone():
+            raise ValueError(f"Dependency cycle: item {dependent} → {prerequisite} closes a loop")
+        conn.execute(add_paths, params)
+    return len(edges)
+
+
+def verify_dependency_index(conn):
+    """Compare the stored closure with a recursive walk of the edges.
+
+    Returns (missing, unexpected): lists of (dependent_item_id, prerequisite_item_id) pairs.
+    """
+    reachable = """
+        WITH RECURSIVE reach(dependent_item_id, prerequisite_item_id) AS (
+            SELECT dependent_item_id, prerequisite_item_id FROM ticket_item_dependencies
+            UNION
+            SELECT reach.dependent_item_id, d.prerequisite_item_id
+            FROM reach JOIN ticket_item_dependencies d ON d.dependent_item_id = reach.prerequisite_item_id
+        )
+        SELECT dependent_item_id, prerequisite_item_id FROM reach
+    """
+    missing = conn.execute(f"""
+        {reachable}
+        EXCEPT SELECT dependent_item_id, prerequisite_item_id FROM ticket_item_dependency_closure
+    """).fetchall()
+    unexpected = conn.execute(f"""
+        SELECT dependent_item_id, prerequisite_item_id FROM ticket_item_dependency_closure
+        EXCEPT SELECT * FROM ({reachable})
+    """).fetchall()
+    return missing, unexpected
+
+
+def main():
+    """Install, rebuild or verify the transitive dependency index."""
+    parser = argparse.ArgumentParser(description="Maintain the ticket item dependency closure")
+    parser.add_argument('action', choices=['install', 'rebuild', 'verify'])
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'install':
+            with conn:
+                install_dependency_index(conn)
+            print("✅ Dependency closure built and triggers installed")
+        elif args.action == 'rebuild':
+            with conn:
+                edge_count = rebuild_dependency_index(conn)
+            print(f"✅ Dependency closure recomputed from {edge_count} edges")
+        else:
+            missing, unexpected = verify_dependency_index(conn)
+            if not missing and not unexpected:
+                print("✅ ticket_item_dependency_closure matches ticket_item_dependencies")
+            else:
+                print(f"⚠️  {len(missing)} missing and {len(unexpected)} unexpected pairs "
+                      f"(run 'python dependency_index.py rebuild')")
+                return 2
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
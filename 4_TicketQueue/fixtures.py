@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Snapshot Fixtures for TicketQueue Tests and Benchmarks
+Builds each generate_data.py database once per scale factor, seed and as-of date and
+caches it as a golden snapshot. The cache key includes a hash of the code that builds it,
+so editing the generator invalidates old snapshots. Tests get their own copy in
+milliseconds through the SQLite backup API, into :memory: or a temporary file, so the
+suite no longer pays for data generation on every run.
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date
+
+from generate_data import DEFAULT_SEED, generate_database
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Override with FIXTURE_CACHE_DIR, e.g. to share snapshots between checkouts or CI jobs
+CACHE_DIR = os.environ.get('FIXTURE_CACHE_DIR', os.path.join(HERE, '.fixture_cache'))
+
+# 12 users, 50 queues and 5,000 ticket items: enough for every example question, quick to build
+DEFAULT_FIXTURE_SCALE = 0.05
+
+# Everything that decides the contents of a fixture database
+SOURCE_FILES = ['generate_data.py', 'rollups.py', 'dependency_index.py', 'full_text_search.py']
+
+
+@functools.lru_cache(maxsize=None)
+def generator_version():
+    """Short hash of SOURCE_FILES; part of every snapshot name."""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        with open(os.path.join(HERE, name), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+def snapshot_path(scale=DEFAULT_FIXTURE_SCALE, seed=DEFAULT_SEED, as_of=None):
+    """Cache path of the snapshot for (scale, seed, as_of); as_of defaults to today."""
+    as_of = as_of or date.today()
+    return os.path.join(CACHE_DIR, f"scale{scale:g}-seed{seed}-{as_of.isoformat()}-{generator_version()}.db")
+
+
+def golden_snapshot(scale=DEFAULT_FIXTURE_SCALE, seed=DEFAULT_SEED, as_of=None):
+    """Path of the snapshot for (scale, seed, as_of), building it first if it is not cached yet.
+
+    The data is relative to as_of ("overdue" means due before it), so by default a new
+    snapshot is built each day. It is built under a temporary name and renamed into
+    place, so a concurrent or interrupted build never leaves a half-written snapshot.
+    """
+    as_of = as_of or date.today()
+    path = snapshot_path(scale, seed, as_of)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix='build_', dir=CACHE_DIR)
+    build_path = os.path.join(build_dir, os.path.basename(path))
+    try:
+        generate_database(build_path, scale, seed, as_of, jobs=os.cpu_count() or 1)
+        os.replace(build_path, path)
+    finally:
+        if os.path.exists(build_path):
+            os.remove(build_path)
+        os.rmdir(build_dir)
+    return path
+
+
+def restore_snapshot(target, scale=DEFAULT_FIXTURE_SCALE, seed=DEFAULT_SEED, as_of=None):
+    """Copy the snapshot for (scale, seed, as_of) into the open connection target."""
+    source = sqlite3.connect(f"file:{golden_snapshot(scale, seed, as_of)}?mode=ro", uri=True)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+    return target
+
+
+def fixture_connection(scale=DEFAULT_FIXTURE_SCALE, seed=DEFAULT_SEED, as_of=None):
+    """A private in-memory copy of the snapshot; changes never reach the cache."""
+    return restore_snapshot(sqlite3.connect(':memory:'), scale, seed, as_of)
+
+
+def fixture_copy(db_path=None, scale=DEFAULT_FIXTURE_SCALE, seed=DEFAULT_SEED, as_of=None):
+    """A private on-disk copy of the snapshot at db_path (default: a new temp file); returns the path.
+
+    Use this when the code under test opens the database by path.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='fixture_'), 'ticketqueue.db')
+    elif os.path.exists(db_path):
+        os.remove(db_path)
+    restore_snapshot(sqlite3.connect(db_path), scale, seed, as_of).close()
+    return db_path
+
+
+def clear_snapshots(stale_only=False):
+    """Delete cached snapshots (only those built by older code or for past days if stale_only)."""
+    current = f"-{date.today().isoformat()}-{generator_version()}.db"
+    removed = []
+    for path in glob.glob(os.path.join(CACHE_DIR, '*.db')):
+        if not (stale_only and path.endswith(current)):
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def main():
+    """Build, list or clear the cached fixture snapshots."""
+    parser = argparse.ArgumentParser(description="Manage cached TicketQueue fixture databases")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="Build a snapshot (if needed) and time a copy of it")
+    build.add_argument('--scale', type=float, default=DEFAULT_FIXTURE_SCALE,
+                       help=f"Scale factor (default: {DEFAULT_FIXTURE_SCALE:g})")
+    build.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    build.add_argument('--as-of', type=date.fromisoformat, default=None,
+                       help="Date the data is generated relative to, YYYY-MM-DD (default: today)")
+    subparsers.add_parser('list', help="List cached snapshots")
+    clear = subparsers.add_parser('clear', help="Delete cached snapshots")
+    clear.add_argument('--stale', action='store_true', help="Only delete snapshots built by older code or days")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        path = golden_snapshot(args.scale, args.seed, args.as_of)
+        print(f"📦 {path} ready in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        fixture_connection(args.scale, args.seed, args.as_of).close()
+        print(f"⚡ In-memory copy in {(time.perf_counter() - start) * 1000:.0f} ms")
+    elif args.command == 'list':
+        for path in sorted(glob.glob(os.path.join(CACHE_DIR, '*.db'))):
+            print(f"{os.path.basename(path):48} {os.path.getsize(path) / (1024 * 1024):8.1f} MB")
+    else:
+        for path in clear_snapshots(args.stale):
+            print(f"🗑️  Removed {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
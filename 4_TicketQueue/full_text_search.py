@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search Indexes
+FTS5 external-content indexes over the free-text columns, kept in sync with their
+base tables by triggers, so text questions become MATCH lookups ranked by bm25()
+instead of LIKE '%...%' scans.
+"""
+
+import argparse
+import os
+import sqlite3
+
+# Base table, its INTEGER PRIMARY KEY (the FTS rowid) and the indexed text columns
+FTS_INDEXES = [
+    {'table': 'ticket_item_comments', 'rowid': 'id', 'columns': ['comment']},
+]
+
+# Porter stemming lets "crashing" match "crash", "logins" match "login"
+FTS_TOKENIZER = 'porter unicode61'
+
+
+def fts_table_name(index):
+    """Name of the FTS5 table that indexes a base table."""
+    return f"{index['table']}_fts"
+
+
+def fts_statements(index):
+    """DDL for one external-content index and the triggers that keep it in sync."""
+    fts_table = fts_table_name(index)
+    table, rowid = index['table'], index['rowid']
+    columns = ', '.join(index['columns'])
+    new_values = ', '.join(f"NEW.{column}" for column in index['columns'])
+    old_values = ', '.join(f"OLD.{column}" for column in index['columns'])
+
+    return [f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+USING fts5({columns}, content='{table}', content_rowid='{rowid}', tokenize='{FTS_TOKENIZER}')
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_insert AFTER INSERT ON {table}
+BEGIN
+    INSERT INTO {fts_table} (rowid, {columns}) VALUES (NEW.{rowid}, {new_values});
+END
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_delete AFTER DELETE ON {table}
+BEGIN
+    INSERT INTO {fts_table} ({fts_table}, rowid, {columns}) VALUES ('delete', OLD.{rowid}, {old_values});
+END
+""", f"""
+CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_update AFTER UPDATE OF {rowid}, {columns} ON {table}
+BEGIN
+    INSERT INTO {fts_table} ({fts_table}, rowid, {columns}) VALUES ('delete', OLD.{rowid}, {old_values});
+    INSERT INTO {fts_table} (rowid, {columns}) VALUES (NEW.{rowid}, {new_values});
+END
+"""]
+
+
+def install_fts_indexes(conn, indexes=FTS_INDEXES):
+    """Create the FTS5 tables and triggers and index the existing rows."""
+    for index in indexes:
+        for statement in fts_statements(index):
+            conn.execute(statement)
+    rebuild_fts_indexes(conn, indexes)
+
+
+def rebuild_fts_indexes(conn, indexes=FTS_INDEXES):
+    """Re-index every row from the base tables, e.g. after a bulk load with triggers dropped."""
+    for index in indexes:
+        fts_table = fts_table_name(index)
+        conn.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+
+
+def optimize_fts_indexes(conn, indexes=FTS_INDEXES):
+    """Merge each index's b-trees into one for the fastest lookups."""
+    for index in indexes:
+        fts_table = fts_table_name(index)
+        conn.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('optimize')")
+
+
+def drop_fts_indexes(conn, indexes=FTS_INDEXES):
+    """Remove the sync triggers and the FTS5 tables."""
+    for index in indexes:
+        fts_table = fts_table_name(index)
+        for action in ('insert', 'delete', 'update'):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{fts_table}_{action}")
+        conn.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+def search(conn, table, query, limit=10, indexes=FTS_INDEXES):
+    """Best bm25 matches for an FTS5 query: list of (rowid, score, *indexed columns)."""
+    index = next((index for index in indexes if index['table'] == table), None)
+    if index is None:
+        raise ValueError(f"No full-text index on {table} (indexed: {', '.join(i['table'] for i in indexes)})")
+
+    fts_table = fts_table_name(index)
+    return conn.execute(f"""
+        SELECT rowid, bm25({fts_table}), {', '.join(index['columns'])}
+        FROM {fts_table}
+        WHERE {fts_table} MATCH ?
+        ORDER BY bm25({fts_table})
+        LIMIT ?
+    """, (query, limit)).fetchall()
+
+
+def get_fts_prompt_section(indexes=FTS_INDEXES):
+    """Prompt text teaching the LLM to use the FTS5 indexes instead of LIKE scans."""
+    section = "\nFULL-TEXT SEARCH (FTS5 indexes kept in sync by triggers - use MATCH, never LIKE '%word%', on these columns):\n"
+    for index in indexes:
+        fts_table = fts_table_name(index)
+        section += (f"- {fts_table}({', '.join(index['columns'])}): "
+                    f"{fts_table}.rowid = {index['table']}.{index['rowid']}\n")
+
+    example = indexes[0]
+    fts_table = fts_table_name(example)
+    section += f"""Syntax:
+  - Match words (stemmed, case-insensitive): WHERE {fts_table} MATCH 'login'
+  - Phrase: MATCH '"login bug"'; prefix: MATCH 'deploy*'; boolean: MATCH 'login AND NOT password'
+  - One column only: MATCH '{example['columns'][-1]}: login'
+  - Join back with JOIN {example['table']} ON {example['table']}.{example['rowid']} = {fts_table}.rowid
+  - Rank best first with ORDER BY bm25({fts_table}) (lower bm25 = better match)
+"""
+    return section
+
+
+def main():
+    """Install, rebuild, optimize or query the full-text indexes."""
+    parser = argparse.ArgumentParser(description="Maintain the FTS5 full-text indexes")
+    parser.add_argument('action', choices=['install', 'rebuild', 'optimize', 'drop', 'search'])
+    parser.add_argument('table', nargs='?', help="Indexed table (for 'search')")
+    parser.add_argument('query', nargs='?', help="FTS5 query (for 'search')")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'search':
+            for row in search(conn, args.table, args.query or "", args.limit):
+                print(f"  {row}")
+        else:
+            with conn:
+                {'install': install_fts_indexes, 'rebuild': rebuild_fts_indexes,
+                 'optimize': optimize_fts_indexes, 'drop': drop_fts_indexes}[args.action](conn)
+            print(f"✅ Full-text indexes: {args.action} done "
+                  f"({', '.join(fts_table_name(index) for index in FTS_INDEXES)})")
+    except (sqlite3.Error, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
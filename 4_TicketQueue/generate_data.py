@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+Scale-Factor Synthetic Data Generator for TicketQueue
+Creates the TicketQueue schema and fills it with users, queues, many-to-many category
+assignments, ticket items with due-date distributions (a controllable share overdue),
+acyclic dependency graphs with bounded fan-in/fan-out, and comment and attachment
+streams. Each queue draws from its own RNG seeded from (seed, queue), so the same
+--scale, --seed and --as-of always produce the same data. The pre-calculated user and
+queue totals, the dependency closure and the comment index are built after the load.
+With --jobs, ranges of queues are generated by worker processes into shard files that
+are merged with ATTACH; the data is the same for any number of jobs.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from dependency_index import install_dependency_index
+from full_text_search import install_fts_indexes
+from rollups import install_rollup_triggers, rebuild_rollups
+
+DEFAULT_SCALE = 1.0
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_SIZE = 50000
+TRANSACTION_ROWS = 1000000
+# With --jobs > 1, queues are split into about this many shard files per worker
+SHARDS_PER_JOB = 4
+
+# Rows per unit of --scale; --scale 10 gives a million ticket items
+SCALE_COUNTS = {
+    'users': 250,
+    'ticket_queue': 1000,
+    'ticket_items': 100000,
+}
+
+# Share of open items whose due date has passed
+DEFAULT_OVERDUE_SHARE = 0.15
+# Share of items that depend on at least one earlier item, and the most prerequisites /
+# dependents any item can have
+DEFAULT_DEPENDENCY_SHARE = 0.4
+DEFAULT_MAX_FAN_IN = 3
+DEFAULT_MAX_FAN_OUT = 4
+# Items of a queue are grouped into milestones; prerequisites come from earlier items of
+# the same milestone, so edges always point from a lower to a higher id (acyclic) and the
+# transitive closure stays proportional to the number of items
+MILESTONE_SIZE = 20
+
+SCHEMA_TABLES = ["""
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'worker',
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    total_assigned_items INTEGER DEFAULT 0,
+    total_completed_items INTEGER DEFAULT 0,
+    total_estimated_hours REAL DEFAULT 0.0,
+    total_actual_hours REAL DEFAULT 0.0
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'pending',
+    priority INTEGER DEFAULT 2,
+    assigned_to INTEGER,
+    created_by INTEGER,
+    due_date TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    total_estimated_hours REAL DEFAULT 0.0,
+    total_actual_hours REAL DEFAULT 0.0,
+    total_ticket_items INTEGER DEFAULT 0,
+    completed_ticket_items INTEGER DEFAULT 0,
+    FOREIGN KEY (assigned_to) REFERENCES users (id),
+    FOREIGN KEY (created_by) REFERENCES users (id)
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_queue_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'pending',
+    assigned_to INTEGER,
+    priority INTEGER DEFAULT 2,
+    estimated_hours REAL,
+    actual_hours REAL,
+    due_date TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (ticket_queue_id) REFERENCES ticket_queue (id),
+    FOREIGN KEY (assigned_to) REFERENCES users (id)
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_queue_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    description TEXT,
+    color TEXT
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_queue_category_assignment (
+    ticket_queue_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    PRIMARY KEY (ticket_queue_id, category_id),
+    FOREIGN KEY (ticket_queue_id) REFERENCES ticket_queue (id),
+    FOREIGN KEY (category_id) REFERENCES ticket_queue_categories (id)
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_item_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_item_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    comment TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (ticket_item_id) REFERENCES ticket_items (id),
+    FOREIGN KEY (user_id) REFERENCES users (id)
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_item_attachments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_item_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    file_path TEXT,
+    file_size INTEGER,
+    mime_type TEXT,
+    uploaded_by INTEGER,
+    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (ticket_item_id) REFERENCES ticket_items (id),
+    FOREIGN KEY (uploaded_by) REFERENCES users (id)
+)
+""", """
+CREATE TABLE IF NOT EXISTS ticket_item_dependencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dependent_item_id INTEGER NOT NULL,
+    prerequisite_item_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (dependent_item_id, prerequisite_item_id),
+    FOREIGN KEY (dependent_item_id) REFERENCES ticket_items (id),
+    FOREIGN KEY (prerequisite_item_id) REFERENCES ticket_items (id)
+)
+"""]
+
+# Created after the bulk load (the rollup group_by indexes come with the rollup triggers)
+SCHEMA_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_ticket_items_status ON ticket_items (status)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_items_due_date ON ticket_items (due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_item_comments_item ON ticket_item_comments (ticket_item_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_item_attachments_item ON ticket_item_attachments (ticket_item_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_item_dependencies_prerequisite "
+    "ON ticket_item_dependencies (prerequisite_item_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_queue_category_assignment_category "
+    "ON ticket_queue_category_assignment (category_id)",
+]
+
+CATEGORIES = [
+    ('Frontend', 'User interface work', '#3498db'),
+    ('Backend', 'Server-side services and APIs', '#2ecc71'),
+    ('Mobile', 'iOS and Android apps', '#9b59b6'),
+    ('Infrastructure', 'Servers, networking and deployment', '#e67e22'),
+    ('Security', 'Security reviews and fixes', '#e74c3c'),
+    ('Data', 'Databases, reporting and analytics', '#1abc9c'),
+    ('Design', 'UX research and visual design', '#f1c40f'),
+    ('QA', 'Testing and quality assurance', '#95a5a6'),
+    ('Documentation', 'Guides and reference material', '#34495e'),
+    ('Customer Support', 'Escalated customer issues', '#d35400'),
+    ('Marketing', 'Campaigns and landing pages', '#c0392b'),
+    ('Compliance', 'Audits and regulatory work', '#7f8c8d'),
+]
+
+# Role → share of users
+ROLE_WEIGHTS = {'admin': 2, 'manager': 13, 'worker': 85}
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy',
+               'Mallory', 'Niaj', 'Olivia', 'Peggy', 'Rupert', 'Sybil', 'Trent', 'Uma', 'Victor', 'Wendy',
+               'Xavier', 'Yara', 'Zoe', 'Omar', 'Lena', 'Kai', 'Mei', 'Raj', 'Sofia', 'Tomas']
+LAST_NAMES = ['Johnson', 'Smith', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Lopez',
+              'Wilson', 'Anderson', 'Thomas', 'Moore', 'Martin', 'Lee', 'Clark', 'Lewis', 'Walker',
+              'Young', 'King', 'Chen', 'Singh', 'Novak', 'Costa', 'Berg']
+
+PROJECTS = ['Website Redesign', 'Mobile App', 'Payment Gateway', 'Data Warehouse', 'Customer Portal',
+            'Search Service', 'Billing System', 'Onboarding Flow', 'Reporting Dashboard', 'API Platform',
+            'Security Audit', 'Cloud Migration', 'Notification Service', 'Inventory Sync', 'Help Center']
+PHASES = ['Phase 1', 'Phase 2', 'Q1 Sprint', 'Q2 Sprint', 'Hardening', 'Launch', 'Maintenance', 'Pilot']
+TASK_VERBS = ['Design', 'Implement', 'Review', 'Test', 'Fix', 'Document', 'Deploy', 'Refactor', 'Migrate',
+              'Investigate', 'Optimize', 'Configure']
+TASK_OBJECTS = ['login page', 'checkout flow', 'user profile API', 'database schema', 'search index',
+                'email templates', 'payment webhook', 'admin dashboard', 'CI pipeline', 'access control',
+                'caching layer', 'error handling', 'release notes', 'load balancer', 'session timeout',
+                'password reset', 'export job', 'mobile push notifications', 'audit log', 'rate limiter']
+COMMENTS = [
+    'Started working on the {object}.',
+    'Blocked on deploy until the {object} change is merged.',
+    'Found a bug in the {object}: it crashes when the input is empty.',
+    'Waiting for review of the {object} pull request.',
+    'Login fails intermittently after the {object} update, investigating.',
+    'Performance of the {object} is slow under load, needs profiling.',
+    'Customer reported an issue with the {object}.',
+    'Fixed and verified the {object} in staging.',
+    'Added tests for the {object}.',
+    'Estimate was too low, the {object} needs more work.',
+    'Security review requested for the {object}.',
+    'Done, the {object} is live in production.',
+]
+ATTACHMENTS = [('png', 'image/png'), ('pdf', 'application/pdf'), ('log', 'text/plain'),
+               ('csv', 'text/csv'), ('zip', 'application/zip'), ('docx',
+               'application/vnd.openxmlformats-officedocument.wordprocessingml.document')]
+
+# Weights for priority 1 (high), 2 (medium), 3 (low) and for the estimated hours of an item
+PRIORITY_WEIGHTS = [20, 50, 30]
+ESTIMATE_HOURS = [1.0, 2.0, 4.0, 6.0, 8.0, 12.0, 16.0, 24.0, 40.0]
+ESTIMATE_WEIGHTS = [8, 15, 20, 12, 18, 8, 10, 5, 4]
+# Mean comments per item and share of items with attachments
+COMMENTS_PER_ITEM = 2.0
+ATTACHMENT_SHARE = 0.2
+# Assignees are skewed: a few workers hold many items
+ASSIGNEE_ZIPF_EXPONENT = 0.7
+
+
+def block_rng(seed, table, block):
+    """RNG for one block (e.g. one queue) of one table; independent of every other block."""
+    return random.Random(f"{seed}:{table}:{block}")
+
+
+def scaled_counts(scale):
+    """Row counts for the independently sized tables at a scale factor."""
+    return {table: max(1, int(round(count * scale))) for table, count in SCALE_COUNTS.items()}
+
+
+def _timestamp(moment):
+    """'YYYY-MM-DD HH:MM:SS' for a datetime."""
+    return moment.isoformat(' ', 'seconds')
+
+
+def create_schema(conn, indexes=True):
+    """Create the TicketQueue tables (and, unless indexes=False, their secondary indexes)."""
+    for statement in SCHEMA_TABLES + (SCHEMA_INDEXES if indexes else []):
+        conn.execute(statement)
+
+
+def queue_sizes(seed, queue_count, item_count):
+    """Items per queue: skewed (log-normal) and summing to item_count."""
+    rng = block_rng(seed, 'queue_sizes', 0)
+    weights = [rng.lognormvariate(0.0, 0.8) for _ in range(queue_count)]
+    total = sum(weights)
+    sizes = [int(item_count * weight / total) for weight in weights]
+    for queue in range(item_count - sum(sizes)):
+        sizes[queue % queue_count] += 1
+    return sizes
+
+
+class BulkLoader:
+    """Chunked executemany() inside large transactions, with per-table row and time counts."""
+
+    def __init__(self, conn, chunk_size=DEFAULT_CHUNK_SIZE, transaction_rows=TRANSACTION_ROWS):
+        """Load through conn, which must be in autocommit mode (isolation_level=None)."""
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.transaction_rows = transaction_rows
+        self.stats = {}
+        self._uncommitted = 0
+        self.conn.execute("BEGIN")
+
+    def insert(self, table, columns, rows):
+        """Insert an iterable of row tuples, one chunk at a time."""
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        rows = iter(rows)
+        row_count, seconds = self.stats.get(table, (0, 0.0))
+        start = time.perf_counter()
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.conn.executemany(sql, chunk)
+            row_count += len(chunk)
+            self._uncommitted += len(chunk)
+            if self._uncommitted >= self.transaction_rows:
+                self.conn.execute("COMMIT")
+                self.conn.execute("BEGIN")
+                self._uncommitted = 0
+        self.stats[table] = (row_count, seconds + time.perf_counter() - start)
+
+    def finish(self):
+        """Commit the last transaction."""
+        self.conn.execute("COMMIT")
+
+
+TABLE_COLUMNS = {
+    'users': ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'is_active', 'created_at'],
+    'ticket_queue_categories': ['id', 'name', 'description', 'color'],
+    'ticket_queue': ['id', 'title', 'description', 'status', 'priority', 'assigned_to', 'created_by',
+                     'due_date', 'created_at', 'updated_at'],
+    'ticket_queue_category_assignment': ['ticket_queue_id', 'category_id'],
+    'ticket_items': ['id', 'ticket_queue_id', 'title', 'description', 'status', 'assigned_to', 'priority',
+                     'estimated_hours', 'actual_hours', 'due_date', 'started_at', 'completed_at',
+                     'created_at', 'updated_at'],
+    'ticket_item_dependencies': ['dependent_item_id', 'prerequisite_item_id', 'created_at'],
+    'ticket_item_comments': ['ticket_item_id', 'user_id', 'comment', 'created_at'],
+    'ticket_item_attachments': ['ticket_item_id', 'filename', 'file_path', 'file_size', 'mime_type',
+                                'uploaded_by', 'uploaded_at'],
+}
+
+
+# Tables filled queue by queue; with --jobs > 1 they are generated in shard files and merged
+QUEUE_TABLES = ['ticket_queue', 'ticket_queue_category_assignment', 'ticket_items', 'ticket_item_dependencies',
+                'ticket_item_comments', 'ticket_item_attachments']
+
+
+def generate_users(seed, count, as_of):
+    """User rows; the first user is always an admin."""
+    rng = block_rng(seed, 'users', 0)
+    roles = list(ROLE_WEIGHTS)
+    rows = []
+    for user_id in range(1, count + 1):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        role = 'admin' if user_id == 1 else rng.choices(roles, list(ROLE_WEIGHTS.values()))[0]
+        username = f"{first_name.lower()}.{last_name.lower()}{user_id}"
+        rows.append((user_id, username, f"{username}@example.com", first_name, last_name, role,
+                     0 if rng.random() < 0.03 else 1,
+                     _timestamp(as_of - timedelta(days=rng.randint(400, 1500)))))
+    return rows
+
+
+def generate_queue(seed, queue_id, first_item_id, item_count, context):
+    """All rows of one queue: {table: rows}. Items get ids first_item_id .. first_item_id + item_count - 1."""
+    rng = block_rng(seed, 'queue', queue_id)
+    as_of = context['as_of']
+    overdue_share = context['overdue_share']
+    rows = {table: [] for table in QUEUE_TABLES}
+
+    # The queue runs from its start until it is done; `progress` is the share of its items finished so far
+    started = as_of - timedelta(days=rng.randint(14, 540), seconds=rng.randint(0, 86399))
+    span = (as_of - started).total_seconds()
+    progress = min(1.0, rng.random() * 1.3)
+    project = rng.choice(PROJECTS)
+    manager = rng.choice(context['managers'])
+    queue_status = 'completed' if progress >= 1.0 else ('pending' if progress < 0.05 else 'in_progress')
+    rows['ticket_queue'].append((
+        queue_id, f"{project} - {rng.choice(PHASES)} #{queue_id}",
+        f"Work for the {project.lower()} project", queue_status,
+        rng.choices((1, 2, 3), PRIORITY_WEIGHTS)[0], manager, rng.choice(context['managers']),
+        _timestamp(as_of + timedelta(days=rng.randint(-60, 180))), _timestamp(started), _timestamp(as_of)
+    ))
+    for category_id in sorted(rng.sample(range(1, len(CATEGORIES) + 1), rng.choices((1, 2, 3), (50, 35, 15))[0])):
+        rows['ticket_queue_category_assignment'].append((queue_id, category_id))
+
+    fan_out = {}
+    for position in range(item_count):
+        item_id = first_item_id + position
+        fraction = position / item_count
+        created = started + timedelta(seconds=int(span * fraction * 0.9))
+
+        if fraction < progress:
+            status = 'cancelled' if rng.random() < 0.04 else 'completed'
+        elif fraction < progress + 0.15:
+            status = 'in_progress'
+        else:
+            status = 'pending'
+
+        estimated = rng.choices(ESTIMATE_HOURS, ESTIMATE_WEIGHTS)[0]
+        actual = None
+        started_at = completed_at = None
+        if status in ('completed', 'in_progress'):
+            started_at = created + timedelta(hours=rng.randint(1, 72))
+            if started_at > as_of:
+                started_at = as_of
+        if status == 'completed':
+            actual = round(estimated * rng.lognormvariate(0.0, 0.35) * 2) / 2 or 0.5
+            completed_at = min(as_of, started_at + timedelta(hours=actual * rng.uniform(1.5, 4.0)))
+        elif status == 'in_progress':
+            actual = round(estimated * rng.uniform(0.1, 0.9) * 2) / 2
+
+        # Open items are overdue with probability overdue_share; finished items were due around completion
+        if status in ('pending', 'in_progress'):
+            if rng.random() < overdue_share:
+                due = as_of - timedelta(days=rng.randint(1, 45), hours=rng.randint(0, 23))
+            else:
+                due = as_of + timedelta(days=rng.randint(1, 90), hours=rng.randint(0, 23))
+        else:
+            due = (completed_at or created) + timedelta(days=rng.randint(-5, 10))
+
+        assignee = None
+        if status != 'pending' or rng.random() < 0.8:
+            assignee = rng.choices(context['workers'], cum_weights=context['worker_weights'])[0]
+        task_object = rng.choice(TASK_OBJECTS)
+        rows['ticket_items'].append((
+            item_id, queue_id, f"{rng.choice(TASK_VERBS)} {task_object}",
+            f"{project}: {task_object} work item", status, assignee,
+            rng.choices((1, 2, 3), PRIORITY_WEIGHTS)[0], estimated, actual, _timestamp(due),
+            started_at and _timestamp(started_at), completed_at and _timestamp(completed_at),
+            _timestamp(created), _timestamp(completed_at or started_at or created)
+        ))
+
+        # Prerequisites: earlier items of the same milestone that still have room for another dependent
+        milestone_start = first_item_id + position - position % MILESTONE_SIZE
+        candidates = [prerequisite for prerequisite in range(milestone_start, item_id)
+                      if fan_out.get(prerequisite, 0) < context['max_fan_out']]
+        if candidates and rng.random() < context['dependency_share']:
+            fan_in = min(len(candidates), rng.randint(1, context['max_fan_in']))
+            for prerequisite in sorted(rng.sample(candidates, fan_in)):
+                fan_out[prerequisite] = fan_out.get(prerequisite, 0) + 1
+                rows['ticket_item_dependencies'].append((item_id, prerequisite, _timestamp(created)))
+
+        # Comment stream: more discussion on items that were worked on, in time order
+        last_activity = completed_at or (as_of if status == 'in_progress' else created + timedelta(days=2))
+        activity_seconds = max(60, int((min(last_activity, as_of) - created).total_seconds()))
+        comment_count = int(rng.expovariate(1.0 / COMMENTS_PER_ITEM) * (1.5 if started_at else 0.5))
+        offsets = sorted(rng.randint(0, activity_seconds) for _ in range(comment_count))
+        for offset in offsets:
+            author = assignee if assignee and rng.random() < 0.6 else rng.choice(context['user_ids'])
+            rows['ticket_item_comments'].append((
+                item_id, author, rng.choice(COMMENTS).format(object=task_object),
+                _timestamp(created + timedelta(seconds=offset))
+            ))
+
+        if rng.random() < ATTACHMENT_SHARE:
+            for number in range(rng.choices((1, 2, 3), (70, 22, 8))[0]):
+                extension, mime_type = rng.choice(ATTACHMENTS)
+                filename = f"{task_object.replace(' ', '_')}_{item_id}_{number + 1}.{extension}"
+                rows['ticket_item_attachments'].append((
+                    item_id, filename, f"/attachments/{queue_id}/{filename}",
+                    int(rng.lognormvariate(11.0, 1.5)), mime_type, assignee or manager,
+                    _timestamp(created + timedelta(seconds=rng.randint(0, activity_seconds)))
+                ))
+    return rows
+
+
+def plan_shards(sizes, jobs):
+    """[(first queue_id, first item id, item counts)]: contiguous queue ranges, about SHARDS_PER_JOB per worker."""
+    shard_count = min(len(sizes), jobs * SHARDS_PER_JOB)
+    bounds = [len(sizes) * shard // shard_count for shard in range(shard_count + 1)]
+    first_item_ids = list(itertools.accumulate(sizes, initial=1))
+    return [(start + 1, first_item_ids[start], sizes[start:end]) for start, end in zip(bounds, bounds[1:])]
+
+
+_worker_state = None
+
+
+def _init_worker(seed, context, chunk_size, shard_dir):
+    """Pool initializer: keep the shared generation context in the worker process."""
+    global _worker_state
+    _worker_state = (seed, context, chunk_size, shard_dir)
+
+
+def _generate_shard(task):
+    """Worker: write one range of queues to its own SQLite file; returns (path, stats)."""
+    number, (first_queue_id, first_item_id, sizes) = task
+    seed, context, chunk_size, shard_dir = _worker_state
+    path = os.path.join(shard_dir, f"shard_{number:05d}.db")
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        create_schema(conn, indexes=False)
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        loader = BulkLoader(conn, chunk_size)
+        for queue_id, item_count in enumerate(sizes, first_queue_id):
+            for table, rows in generate_queue(seed, queue_id, first_item_id, item_count, context).items():
+                loader.insert(table, TABLE_COLUMNS[table], rows)
+            first_item_id += item_count
+        loader.finish()
+    finally:
+        conn.close()
+    return path, loader.stats
+
+
+def merge_shard(conn, path):
+    """Copy one shard's rows into conn with ATTACH + INSERT ... SELECT, then delete the shard file.
+
+    Shards are merged in queue order, so AUTOINCREMENT ids come out as in a single-process load.
+    """
+    conn.execute("ATTACH DATABASE ? AS shard", (path,))
+    try:
+        conn.execute("BEGIN")
+        for table in QUEUE_TABLES:
+            columns = ', '.join(TABLE_COLUMNS[table])
+            conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM shard.{table} ORDER BY rowid")
+        conn.execute("COMMIT")
+    finally:
+        conn.execute("DETACH DATABASE shard")
+    os.remove(path)
+
+
+def generate_database(db_path='ticketqueue.db', scale=DEFAULT_SCALE, seed=DEFAULT_SEED, as_of=None,
+                      overdue_share=DEFAULT_OVERDUE_SHARE, dependency_share=DEFAULT_DEPENDENCY_SHARE,
+                      max_fan_in=DEFAULT_MAX_FAN_IN, max_fan_out=DEFAULT_MAX_FAN_OUT,
+                      chunk_size=DEFAULT_CHUNK_SIZE, progress=None, jobs=1):
+    """Create db_path from scratch with generated data; returns {table: (rows, seconds)}.
+
+    as_of (a date, default today) is the "now" of the data: due dates, overdue items and
+    timestamps are placed relative to it. With jobs > 1, queues are generated by a process
+    pool into temporary shard files next to db_path and merged in queue order; the rows are
+    the same as with jobs=1.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    as_of = datetime.combine(as_of or date.today(), datetime.min.time())
+    counts = scaled_counts(scale)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        create_schema(conn, indexes=False)
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        # Loader settings: no rollback journal and no fsync; a crash mid-load means re-running the generator
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        loader = BulkLoader(conn, chunk_size)
+        users = generate_users(seed, counts['users'], as_of)
+        loader.insert('users', TABLE_COLUMNS['users'], users)
+        loader.insert('ticket_queue_categories', TABLE_COLUMNS['ticket_queue_categories'],
+                      [(category_id, *category) for category_id, category in enumerate(CATEGORIES, 1)])
+
+        workers = [row[0] for row in users if row[5] == 'worker'] or [1]
+        block_rng(seed, 'assignees', 0).shuffle(workers)
+        context = {
+            'as_of': as_of,
+            'overdue_share': overdue_share,
+            'dependency_share': dependency_share,
+            'max_fan_in': max_fan_in,
+            'max_fan_out': max_fan_out,
+            'user_ids': [row[0] for row in users],
+            'managers': [row[0] for row in users if row[5] in ('admin', 'manager')] or [1],
+            'workers': workers,
+            'worker_weights': list(itertools.accumulate(
+                1.0 / rank ** ASSIGNEE_ZIPF_EXPONENT for rank in range(1, len(workers) + 1))),
+        }
+
+        sizes = queue_sizes(seed, counts['ticket_queue'], counts['ticket_items'])
+        if jobs <= 1:
+            pending = {}
+            first_item_id = 1
+            for queue_id, item_count in enumerate(sizes, 1):
+                for table, rows in generate_queue(seed, queue_id, first_item_id, item_count, context).items():
+                    pending.setdefault(table, []).extend(rows)
+                first_item_id += item_count
+                if len(pending['ticket_items']) >= chunk_size or queue_id == counts['ticket_queue']:
+                    for table, rows in pending.items():
+                        loader.insert(table, TABLE_COLUMNS[table], rows)
+                    pending = {}
+                    if progress:
+                        progress(queue_id, first_item_id - 1)
+            loader.finish()
+        else:
+            loader.finish()
+            merge_seconds = 0.0
+            shard_dir = tempfile.mkdtemp(prefix='shards_', dir=os.path.dirname(os.path.abspath(db_path)))
+            try:
+                with multiprocessing.Pool(jobs, _init_worker, (seed, context, chunk_size, shard_dir)) as pool:
+                    # imap returns shards in plan order, so merging can start while later shards are generated
+                    for path, shard_stats in pool.imap(_generate_shard, enumerate(plan_shards(sizes, jobs))):
+                        start = time.perf_counter()
+                        merge_shard(conn, path)
+                        merge_seconds += time.perf_counter() - start
+                        for table, (row_count, seconds) in shard_stats.items():
+                            total_rows, total_seconds = loader.stats.get(table, (0, 0.0))
+                            loader.stats[table] = (total_rows + row_count, total_seconds + seconds)
+                        if progress:
+                            progress(loader.stats['ticket_queue'][0], loader.stats['ticket_items'][0])
+            finally:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+            loader.stats['(merge shards)'] = (0, merge_seconds)
+
+        # Indexes, totals and the trigger-maintained structures, built once over the loaded rows
+        start = time.perf_counter()
+        with conn:
+            conn.execute("BEGIN")
+            for statement in SCHEMA_INDEXES:
+                conn.execute(statement)
+            install_rollup_triggers(conn)
+            rebuild_rollups(conn)
+            install_dependency_index(conn)
+            install_fts_indexes(conn)
+        loader.stats['(indexes and derived tables)'] = (0, time.perf_counter() - start)
+
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+    finally:
+        conn.close()
+    return loader.stats
+
+
+def main():
+    """Generate a scaled TicketQueue database and report rows/s per table."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic TicketQueue database at a scale factor")
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE,
+                        help=f"Scale factor; 1 is {SCALE_COUNTS['ticket_items']:,} ticket items (default: {DEFAULT_SCALE:g})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    parser.add_argument('--as-of', type=date.fromisoformat, default=None,
+                        help="Date the data is generated relative to, YYYY-MM-DD (default: today)")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file to (re)create (default: ticketqueue.db)")
+    parser.add_argument('--overdue-share', type=float, default=DEFAULT_OVERDUE_SHARE,
+                        help=f"Share of open items past their due date (default: {DEFAULT_OVERDUE_SHARE})")
+    parser.add_argument('--dependency-share', type=float, default=DEFAULT_DEPENDENCY_SHARE,
+                        help=f"Share of items with prerequisites (default: {DEFAULT_DEPENDENCY_SHARE})")
+    parser.add_argument('--max-fan-in', type=int, default=DEFAULT_MAX_FAN_IN,
+                        help=f"Most prerequisites per item (default: {DEFAULT_MAX_FAN_IN})")
+    parser.add_argument('--max-fan-out', type=int, default=DEFAULT_MAX_FAN_OUT,
+                        help=f"Most dependents per item (default: {DEFAULT_MAX_FAN_OUT})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per executemany() call")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes generating queues; the data does not depend on it (default: CPU count)")
+    args = parser.parse_args()
+
+    counts = scaled_counts(args.scale)
+    print(f"🏗️  Generating {args.db} at scale {args.scale:g} (seed {args.seed}): {counts['users']:,} users, "
+          f"{counts['ticket_queue']:,} queues, {counts['ticket_items']:,} ticket items, {args.jobs} job(s)")
+
+    start = time.perf_counter()
+    stats = generate_database(
+        args.db, args.scale, args.seed, args.as_of, args.overdue_share, args.dependency_share,
+        args.max_fan_in, args.max_fan_out, args.chunk_size,
+        progress=lambda queues, items: print(f"  {queues:,} queues, {items:,} items"), jobs=args.jobs
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'table':34} | {'rows':>12} | {'insert s':>8} | {'rows/s':>10}")
+    print("-" * 74)
+    for table, (row_count, seconds) in stats.items():
+        rate = f"{row_count / seconds:10,.0f}" if row_count and seconds else f"{'':>10}"
+        print(f"{table:34} | {row_count:12,} | {seconds:8.2f} | {rate}")
+    total_rows = sum(row_count for row_count, _ in stats.values())
+    print(f"\n✅ {total_rows:,} rows in {elapsed:.1f}s ({total_rows / elapsed:,.0f} rows/s end to end)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,11 +4,99 @@ TicketQueue SQLite Database Initialization Script
 Creates and populates the database based on the TQ_ERD.png ER diagram
 """
 
+import argparse
+import re
 import sqlite3
 import os
+import time
 from pathlib import Path
+from dependency_index import install_dependency_index
+from full_text_search import install_fts_indexes
+from rollups import install_rollup_triggers, rebuild_rollups
 
-def init_ticketqueue_database(db_path='ticketqueue.db'):
+# Transaction control in dumps (e.g. sqlite3 .dump writes BEGIN TRANSACTION; ... COMMIT;);
+# the loader runs the whole script in its own single transaction instead
+TRANSACTION_CONTROL = re.compile(
+    r"^\s*(BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(\s+TRANSACTION)?|(COMMIT|END|ROLLBACK)(\s+TRANSACTION)?)\s*;\s*$",
+    re.IGNORECASE
+)
+# Comments before a statement belong to it (including a trailing comment of the previous line)
+LEADING_COMMENTS = re.compile(r"^(\s*(--[^\n]*(\n|$)|/\*.*?\*/))*\s*", re.DOTALL)
+PROGRESS_INTERVAL_SECONDS = 2.0
+
+def iter_sql_statements(sql_file):
+    """Yield (line_number, statement) from a file object, reading one line at a time.
+    
+    A statement ends at the first semicolon where sqlite3.complete_statement() accepts the
+    buffered text, so semicolons inside string literals, comments and trigger bodies do
+    not split it. Memory use is bounded by the longest single statement.
+    """
+    buffer = ''
+    start_line = None
+    for line_number, line in enumerate(sql_file, 1):
+        while line:
+            if not buffer and not line.strip():
+                break
+            if start_line is None:
+                start_line = line_number
+            # A statement can only end at a semicolon; try each one on this line in turn
+            end = line.find(';')
+            while end != -1 and not sqlite3.complete_statement(buffer + line[:end + 1]):
+                end = line.find(';', end + 1)
+            if end == -1:
+                buffer += line
+                break
+            yield start_line, buffer + line[:end + 1]
+            buffer = ''
+            start_line = None
+            line = line[end + 1:]
+    if buffer.strip():
+        # Trailing text without a final semicolon, e.g. a last statement or a comment
+        yield start_line, buffer
+
+def load_sql_script(conn, sql_path, progress=None):
+    """Execute a .sql script or dump in one transaction, streaming it from disk.
+    
+    BEGIN/COMMIT/ROLLBACK lines in the script are skipped, also after comments. progress(bytes_read, total_bytes, statements)
+    is called every PROGRESS_INTERVAL_SECONDS. Returns the number of statements executed;
+    on error the transaction is rolled back and the error names the statement's line.
+    """
+    total_bytes = os.path.getsize(sql_path)
+    executed = 0
+    last_report = time.perf_counter()
+    
+    with open(sql_path, 'r', encoding='utf-8') as sql_file:
+        # One cursor for every statement: conn.execute() would create a cursor per call
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for line_number, statement in iter_sql_statements(sql_file):
+                # Dumps wrap themselves in BEGIN ... COMMIT (or "ROLLBACK; -- due to errors")
+                if TRANSACTION_CONTROL.match(LEADING_COMMENTS.sub('', statement, count=1)) or not statement.strip():
+                    continue
+                try:
+                    cursor.execute(statement)
+                except sqlite3.Error as e:
+                    raise sqlite3.Error(f"{sql_path}:{line_number}: {e}") from e
+                executed += 1
+                if progress and time.perf_counter() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                    progress(sql_file.buffer.tell(), total_bytes, executed)
+                    last_report = time.perf_counter()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    if progress:
+        progress(total_bytes, total_bytes, executed)
+    return executed
+
+def print_load_progress(bytes_read, total_bytes, statements):
+    """Progress line for load_sql_script."""
+    percent = 100.0 * bytes_read / total_bytes if total_bytes else 100.0
+    print(f"  {percent:5.1f}% ({bytes_read / 1e6:,.1f} of {total_bytes / 1e6:,.1f} MB), {statements:,} statements")
+
+def init_ticketqueue_database(db_path='ticketqueue.db', schema_path=None):
     """Initialize the TicketQueue SQLite database with schema and sample data"""
     
     # Connect to database (creates it if it doesn't exist)
@@ -21,19 +109,22 @@ def init_ticketqueue_database(db_path='ticketqueue.db'):
         existing_tables = cursor.fetchall()
         
         if not existing_tables or len(existing_tables) <= 1:  # Only sqlite_sequence or empty
-            # Read and execute the schema file
-            schema_file = Path(__file__).parent / 'ticketqueue_schema.sql'
+            # Stream the schema file (or a larger .sql dump) into the database in one transaction
+            schema_file = Path(schema_path) if schema_path else Path(__file__).parent / 'ticketqueue_schema.sql'
             
             if schema_file.exists():
-                with open(schema_file, 'r') as f:
-                    schema_sql = f.read()
-            
-                # Execute the schema (split by semicolon for multiple statements)
-                statements = schema_sql.split(';')
-                for statement in statements:
-                    statement = statement.strip()
-                    if statement:
-                        cursor.execute(statement)
+                statement_count = load_sql_script(conn, schema_file, progress=print_load_progress)
+                print(f"Loaded {statement_count:,} statements from {schema_file}")
+                
+                # Bring the pre-calculated totals in line with the loaded data and keep them there
+                rebuild_rollups(conn)
+                install_rollup_triggers(conn)
+                
+                # Transitive dependency index, kept current by triggers on ticket_item_dependencies
+                install_dependency_index(conn)
+                
+                # Full-text index over ticket item comments, kept in sync by triggers
+                install_fts_indexes(conn)
                 
                 conn.commit()
                 print(f"TicketQueue database initialized successfully: {db_path}")
@@ -67,6 +158,7 @@ def init_ticketqueue_database(db_path='ticketqueue.db'):
                 
             else:
                 print(f"Schema file not found: {schema_file}")
+                print("To generate a synthetic database instead, run 'python generate_data.py --scale 0.01'")
                 return False
             
     except sqlite3.Error as e:
@@ -200,10 +292,15 @@ def test_ticketqueue_database(db_path='ticketqueue.db'):
         conn.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Initialize the TicketQueue database from a .sql schema or dump")
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    parser.add_argument('--sql', default=None, help="SQL script or dump to load (default: ticketqueue_schema.sql)")
+    args = parser.parse_args()
+    
     print("Initializing TicketQueue SQLite database based on TQ_ERD.png...")
     
-    if init_ticketqueue_database():
-        test_ticketqueue_database()
+    if init_ticketqueue_database(args.db, args.sql):
+        test_ticketqueue_database(args.db)
         print("\nTicketQueue database setup complete!")
     else:
         print("TicketQueue database setup failed!")
@@ -4,6 +4,11 @@ import os
 from openai import OpenAI
 import json
 from dotenv import load_dotenv
+from archive import DEFAULT_ARCHIVE_PATH, get_archive_prompt_section, open_history
+from critical_path import register_critical_path_functions
+from full_text_search import get_fts_prompt_section
+from schema_watcher import SchemaWatcher
+from wal_mode import ReaderPool, enable_wal_mode, run_sql_query
 
 # Load environment variables
 load_dotenv()
@@ -11,6 +16,25 @@ load_dotenv()
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Opt-in WAL mode (TICKETQUEUE_WAL_MODE=1): readers are served from a pool and
+# no longer block on writers such as init_ticketqueue_db.py or total refreshes
+reader_pool = None
+
+# Set once a query connection has opened the history_* views; until then the prompt does
+# not mention them, so the model is never sent to views the serving connection lacks
+history_available = False
+
+def prepare_query_connection(conn):
+    """Register the schedule functions and, once an archive exists, the history_* views."""
+    register_critical_path_functions(conn)
+    refresh_history(conn)
+
+def refresh_history(conn):
+    """Open the history_* views on conn once the archive exists; pooled connections retry on every borrow."""
+    global history_available
+    if open_history(conn, DEFAULT_ARCHIVE_PATH):
+        history_available = True
+
 def get_ticketqueue_schema():
     """Get the schema of all tables with sample data and relationships."""
     conn = sqlite3.connect('ticketqueue.db')
@@ -18,8 +42,9 @@ def get_ticketqueue_schema():
     
     schema = "Complex TicketQueue Management Database Schema:\n\n"
     
-    # Get all table names
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+    # Get all table names (FTS5 shadow tables such as ticket_item_comments_fts_data are internal)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+                   "AND name NOT GLOB '*_fts_*' ORDER BY name")
     tables = cursor.fetchall()
     
     # Define table relationships
@@ -31,7 +56,9 @@ def get_ticketqueue_schema():
         'ticket_item_attachments': 'References ticket_items, users (uploaded_by)',
         'ticket_queue_categories': 'Referenced by ticket_queue_category_assignment',
         'ticket_queue_category_assignment': 'Many-to-many relationship between ticket_queue and ticket_queue_categories',
-        'ticket_item_dependencies': 'Self-referencing (dependent_item_id, prerequisite_item_id → ticket_items.id)'
+        'ticket_item_dependencies': 'Self-referencing (dependent_item_id, prerequisite_item_id → ticket_items.id)',
+        'ticket_item_dependency_closure': 'Transitive closure of ticket_item_dependencies (dependent_item_id, prerequisite_item_id → ticket_items.id)',
+        'ticket_item_comments_fts': 'FTS5 index of ticket_item_comments (rowid = ticket_item_comments.id)'
     }
     
     # Get schema for each table
@@ -66,13 +93,14 @@ def get_ticketqueue_schema():
     schema += "- users → ticket_queue → ticket_items → ticket_item_attachments\n"
     schema += "- ticket_queue → ticket_queue_category_assignment → ticket_queue_categories\n"
     schema += "- ticket_items → ticket_item_dependencies (self-referencing for task dependencies)\n"
+    schema += "- ticket_items → ticket_item_dependency_closure (direct and indirect dependencies at any depth)\n"
     schema += "- users → ticket_items (assignment tracking)\n"
     schema += "- ticket_queue → ticket_items (queue management)\n"
     schema += "- ticket_items → ticket_item_comments (collaboration)\n"
     schema += "- ticket_items → ticket_item_attachments (file management)\n"
     
     # Add pre-calculated fields information
-    schema += "\nPRE-CALCULATED FIELDS (Use these instead of complex joins when possible):\n"
+    schema += "\nPRE-CALCULATED FIELDS (Kept current by triggers - use these instead of complex joins when possible):\n"
     schema += "- users.total_assigned_items: Total ticket items assigned to user\n"
     schema += "- users.total_completed_items: Total completed ticket items for user\n"
     schema += "- users.total_estimated_hours: Total estimated hours for user's tasks\n"
@@ -83,19 +111,35 @@ def get_ticketqueue_schema():
     schema += "- ticket_queue.completed_ticket_items: Number of completed ticket items in queue\n"
     schema += "- ticket_items.estimated_hours: Pre-calculated time estimates\n"
     schema += "- ticket_items.actual_hours: Actual time spent on tasks\n"
+    schema += "- ticket_item_dependency_closure: Every (dependent_item_id, prerequisite_item_id) pair connected by a chain of\n"
+    schema += "  dependencies at any depth, with path_count. Use it for transitive blocking instead of recursive CTEs\n"
+    schema += "\nSCHEDULE FUNCTIONS (Critical path over ticket_item_dependencies, weighted by estimated_hours, actual_hours once completed):\n"
+    schema += "- cp_earliest_start(ticket_items.id), cp_earliest_finish(ticket_items.id): Hours from the schedule start until the item can start / finish\n"
+    schema += "- cp_latest_start(ticket_items.id), cp_latest_finish(ticket_items.id): Latest times that do not delay the item's queue\n"
+    schema += "- cp_slack(ticket_items.id): Hours the item can slip; cp_is_critical(ticket_items.id): 1 if on the critical path\n"
+    schema += "- cp_queue_finish(ticket_queue.id): Estimated hours until every item in the queue is finished\n"
+    schema += get_fts_prompt_section()
     
     conn.close()
     return schema
 
+# Started with the app: rebuilds the prompt schema in the background when the database's
+# PRAGMA schema_version changes, so requests neither rebuild it nor wait for a rebuild
+schema_watcher = SchemaWatcher('ticketqueue.db', lambda db_path: get_ticketqueue_schema())
+
 def nl2sql(nl_query):
     """Convert natural language to SQL using OpenAI."""
     
-    schema = get_ticketqueue_schema()
+    schema = schema_watcher.snapshot.value if schema_watcher.running else get_ticketqueue_schema()
+    
+    # Old completed work lives in the archive; point history questions at the history_* views
+    archive_section = get_archive_prompt_section(nl_query, history_available)
     
     prompt = f"""
 You are a SQL expert specializing in TicketQueue management systems. Convert the following natural language query to SQL.
 
 {schema}
+{archive_section}
 
 Natural Language Query: {nl_query}
 
@@ -110,11 +154,14 @@ CRITICAL RULES:
 8. Use GROUP BY and HAVING for grouped aggregations
 9. Use ORDER BY and LIMIT for sorting and limiting results
 10. Use meaningful table aliases for readability
-11. Handle self-referencing relationships properly (ticket_item_dependencies)
+11. Handle self-referencing relationships properly (ticket_item_dependencies); for indirect/transitive blocking use ticket_item_dependency_closure
 12. Consider many-to-many relationships (ticket_queue_category_assignment)
 13. For "overdue" queries: use ticket_items.due_date < datetime('now') AND status != 'completed'
 14. For "over budget" queries: use actual_hours > estimated_hours
-15. Return ONLY the SQL query, no explanations
+15. For completion time, critical path or slack questions: use the cp_* SCHEDULE FUNCTIONS, never sum estimated_hours
+16. For words or phrases inside comments, use the FULL-TEXT SEARCH index (ticket_item_comments_fts MATCH ...)
+17. Each ticket item has many comments, attachments and dependencies: when counting or summing two or more of these child tables, aggregate each one in a subquery before joining it (joining them directly multiplies the rows and inflates every COUNT and SUM)
+18. Return ONLY the SQL query, no explanations
 
 EXAMPLES:
 - "Show users with their ticket load summary" → SELECT first_name, last_name, total_assigned_items, total_completed_items, total_estimated_hours, total_actual_hours FROM users
@@ -127,7 +174,11 @@ EXAMPLES:
 - "Show ticket items with dependencies, users, and ticket queue" → SELECT dep.title as dependent_item, pre.title as prerequisite, u.first_name || ' ' || u.last_name as assigned_user, tq.title as ticket_queue FROM ticket_item_dependencies tid JOIN ticket_items dep ON tid.dependent_item_id = dep.id JOIN ticket_items pre ON tid.prerequisite_item_id = pre.id LEFT JOIN users u ON dep.assigned_to = u.id LEFT JOIN ticket_queue tq ON dep.ticket_queue_id = tq.id
 - "Show ticket items with comments from assigned users" → SELECT ti.title, tic.comment, u.first_name || ' ' || u.last_name as comment_author FROM ticket_items ti JOIN ticket_item_comments tic ON ti.id = tic.ticket_item_id JOIN users u ON tic.user_id = u.id WHERE u.id = ti.assigned_to
 - "Show ticket queues with categories and assigned users" → SELECT tq.title, tqc.name as category, u.first_name || ' ' || u.last_name as assigned_user FROM ticket_queue tq LEFT JOIN ticket_queue_category_assignment tqca ON tq.id = tqca.ticket_queue_id LEFT JOIN ticket_queue_categories tqc ON tqca.category_id = tqc.id LEFT JOIN users u ON tq.assigned_to = u.id
-- "Show ticket items with dependencies and attachment count" → SELECT ti.title, COUNT(tid.dependent_item_id) as dependency_count, COUNT(tia.id) as attachment_count FROM ticket_items ti LEFT JOIN ticket_item_dependencies tid ON ti.id = tid.dependent_item_id LEFT JOIN ticket_item_attachments tia ON ti.id = tia.ticket_item_id GROUP BY ti.id, ti.title
+- "Find ticket items that are blocking other tasks (directly or indirectly)" → SELECT pre.title, COUNT(*) as blocked_items FROM ticket_item_dependency_closure tdc JOIN ticket_items pre ON tdc.prerequisite_item_id = pre.id WHERE pre.status != 'completed' GROUP BY pre.id, pre.title ORDER BY blocked_items DESC
+- "List ticket items with their prerequisites and estimated completion time" → SELECT dep.title as ticket_item, pre.title as prerequisite, cp_earliest_finish(dep.id) as estimated_completion_hours FROM ticket_item_dependencies tid JOIN ticket_items dep ON tid.dependent_item_id = dep.id JOIN ticket_items pre ON tid.prerequisite_item_id = pre.id ORDER BY estimated_completion_hours
+- "Show the critical path of each ticket queue" → SELECT tq.title as ticket_queue, ti.title, cp_earliest_start(ti.id) as start_hours, cp_earliest_finish(ti.id) as finish_hours FROM ticket_items ti JOIN ticket_queue tq ON ti.ticket_queue_id = tq.id WHERE cp_is_critical(ti.id) = 1 ORDER BY tq.id, start_hours
+- "Find tickets whose comments mention the login bug" → SELECT DISTINCT ti.id, ti.title, ti.status FROM ticket_item_comments_fts JOIN ticket_item_comments tic ON tic.id = ticket_item_comments_fts.rowid JOIN ticket_items ti ON tic.ticket_item_id = ti.id WHERE ticket_item_comments_fts MATCH '"login bug"'
+- "Show ticket items with dependencies and attachment count" → SELECT ti.title, COALESCE(dep.dependency_count, 0) as dependency_count, COALESCE(att.attachment_count, 0) as attachment_count FROM ticket_items ti LEFT JOIN (SELECT dependent_item_id, COUNT(*) as dependency_count FROM ticket_item_dependencies GROUP BY dependent_item_id) dep ON dep.dependent_item_id = ti.id LEFT JOIN (SELECT ticket_item_id, COUNT(*) as attachment_count FROM ticket_item_attachments GROUP BY ticket_item_id) att ON att.ticket_item_id = ti.id
 
 SQL Query:
 """
@@ -148,41 +199,7 @@ SQL Query:
 
 def execute_sql(sql_query):
     """Execute SQL query and return results."""
-    try:
-        conn = sqlite3.connect('ticketqueue.db')
-        cursor = conn.cursor()
-        
-        cursor.execute(sql_query)
-        results = cursor.fetchall()
-        
-        # Get column names
-        column_names = [description[0] for description in cursor.description] if cursor.description else []
-        
-        conn.close()
-        
-        if not results:
-            return "Query executed successfully. No results returned."
-        
-        # Format results as a table
-        if len(results) > 0:
-            # Create header
-            output = "Query Results:\n"
-            output += " | ".join(column_names) + "\n"
-            output += "-" * (len(" | ".join(column_names)) + 10) + "\n"
-            
-            # Add rows
-            for row in results:
-                output += " | ".join(str(cell) for cell in row) + "\n"
-            
-            # Add summary
-            output += f"\nTotal rows returned: {len(results)}"
-        else:
-            output = "Query executed successfully. No results returned."
-        
-        return output
-        
-    except Exception as e:
-        return f"Error executing SQL: {str(e)}"
+    return run_sql_query(sql_query, 'ticketqueue.db', reader_pool, prepare_query_connection)
 
 def query_ticketqueue_with_nl(nl_query):
     """Converts natural language to SQL and executes the query."""
@@ -234,6 +251,16 @@ if not os.path.exists('ticketqueue.db'):
     print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
     exit(1)
 
+# Mention the history views from the first request on if the archive is already there
+startup_conn = sqlite3.connect('ticketqueue.db')
+refresh_history(startup_conn)
+startup_conn.close()
+
+if os.getenv("TICKETQUEUE_WAL_MODE") == "1":
+    enable_wal_mode('ticketqueue.db')
+    reader_pool = ReaderPool('ticketqueue.db', on_connect=prepare_query_connection, on_borrow=refresh_history)
+    print(f"WAL mode enabled: serving queries from {reader_pool.size} reader connections")
+
 # Create Gradio interface
 iface = gr.Interface(
     fn=query_ticketqueue_with_nl,
@@ -315,4 +342,6 @@ combined_iface = gr.TabbedInterface(
 )
 
 if __name__ == "__main__":
+    if os.path.exists('ticketqueue.db'):
+        schema_watcher.start()
     combined_iface.launch()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Incremental Materialized Rollups for TicketQueue
+The PRE-CALCULATED FIELDS advertised to the LLM (users.total_*, ticket_queue.total_*)
+are declared here once; the engine generates the triggers that apply deltas on every
+ticket_items change, a full-rebuild path for bulk loads and a drift report.
+"""
+
+import argparse
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Each rollup: target.column = aggregate(source.value) grouped by source.group_by = target.target_key,
+# optionally restricted to source rows matching every column = value pair in 'where'
+ROLLUPS = [
+    {'target': 'users', 'column': 'total_assigned_items',
+     'source': 'ticket_items', 'group_by': 'assigned_to', 'aggregate': 'COUNT'},
+    {'target': 'users', 'column': 'total_completed_items',
+     'source': 'ticket_items', 'group_by': 'assigned_to', 'aggregate': 'COUNT',
+     'where': {'status': 'completed'}},
+    {'target': 'users', 'column': 'total_estimated_hours',
+     'source': 'ticket_items', 'group_by': 'assigned_to', 'aggregate': 'SUM', 'value': 'estimated_hours'},
+    {'target': 'users', 'column': 'total_actual_hours',
+     'source': 'ticket_items', 'group_by': 'assigned_to', 'aggregate': 'SUM', 'value': 'actual_hours'},
+    {'target': 'ticket_queue', 'column': 'total_ticket_items',
+     'source': 'ticket_items', 'group_by': 'ticket_queue_id', 'aggregate': 'COUNT'},
+    {'target': 'ticket_queue', 'column': 'completed_ticket_items',
+     'source': 'ticket_items', 'group_by': 'ticket_queue_id', 'aggregate': 'COUNT',
+     'where': {'status': 'completed'}},
+    {'target': 'ticket_queue', 'column': 'total_estimated_hours',
+     'source': 'ticket_items', 'group_by': 'ticket_queue_id', 'aggregate': 'SUM', 'value': 'estimated_hours'},
+    {'target': 'ticket_queue', 'column': 'total_actual_hours',
+     'source': 'ticket_items', 'group_by': 'ticket_queue_id', 'aggregate': 'SUM', 'value': 'actual_hours'},
+]
+
+# Only invertible aggregates can be maintained from deltas
+SUPPORTED_AGGREGATES = ('COUNT', 'SUM')
+
+# Stored SUMs accumulate floating point deltas; differences below this are not drift
+DRIFT_TOLERANCE = 0.005
+
+TRIGGER_EVENTS = ('insert', 'delete', 'update')
+
+
+def sql_literal(value):
+    """Render a Python value as a SQL literal for generated trigger bodies."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def validate_rollup(rollup):
+    """Fill in defaults and reject rollups the engine cannot maintain incrementally."""
+    rollup = dict(rollup)
+    rollup.setdefault('target_key', 'id')
+    rollup.setdefault('where', {})
+    rollup['aggregate'] = rollup['aggregate'].upper()
+
+    if rollup['aggregate'] not in SUPPORTED_AGGREGATES:
+        raise ValueError(f"Rollup {rollup['target']}.{rollup['column']}: aggregate {rollup['aggregate']} "
+                         f"is not invertible (supported: {', '.join(SUPPORTED_AGGREGATES)})")
+    if rollup['aggregate'] == 'SUM' and not rollup.get('value'):
+        raise ValueError(f"Rollup {rollup['target']}.{rollup['column']}: SUM needs a 'value' column")
+    return rollup
+
+
+def group_rollups(rollups=ROLLUPS):
+    """Group rollups by (source, target, target_key, group_by) so each group is one UPDATE."""
+    groups = OrderedDict()
+    for rollup in map(validate_rollup, rollups):
+        key = (rollup['source'], rollup['target'], rollup['target_key'], rollup['group_by'])
+        groups.setdefault(key, []).append(rollup)
+    return groups
+
+
+def _condition(rollup, prefix):
+    """SQL condition for the rollup's 'where' filter against NEW/OLD (or a table alias)."""
+    if not rollup['where']:
+        return None
+    return " AND ".join(f"{prefix}.{column} = {sql_literal(value)}"
+                        for column, value in rollup['where'].items())
+
+
+def _delta_expression(rollup, prefix):
+    """Contribution of a single NEW/OLD row to the rollup column."""
+    contribution = '1' if rollup['aggregate'] == 'COUNT' else f"COALESCE({prefix}.{rollup['value']}, 0)"
+    condition = _condition(rollup, prefix)
+    if condition:
+        return f"(CASE WHEN {condition} THEN {contribution} ELSE 0 END)"
+    return contribution
+
+
+def _aggregate_expression(rollup, alias):
+    """Full aggregate of the rollup over a set of source rows (used for rebuilds and drift checks)."""
+    condition = _condition(rollup, alias)
+    if rollup['aggregate'] == 'COUNT':
+        if condition:
+            return f"COALESCE(SUM(CASE WHEN {condition} THEN 1 ELSE 0 END), 0)"
+        return "COUNT(*)"
+    value = f"{alias}.{rollup['value']}"
+    if condition:
+        return f"COALESCE(SUM(CASE WHEN {condition} THEN {value} END), 0)"
+    return f"COALESCE(SUM({value}), 0)"
+
+
+def _delta_update(target, target_key, group_by, rollups, prefix, sign):
+    """One UPDATE statement applying a row's delta to every rollup column of a group."""
+    assignments = ",\n        ".join(
+        f"{r['column']} = COALESCE({r['column']}, 0) {sign} {_delta_expression(r, prefix)}"
+        for r in rollups
+    )
+    return (f"    UPDATE {target}\n"
+            f"    SET {assignments}\n"
+            f"    WHERE {target_key} = {prefix}.{group_by};")
+
+
+def trigger_name(source, event):
+    """Name of the generated trigger for a source table and event."""
+    return f"rollup_{source}_{event}"
+
+
+def generate_rollup_triggers(rollups=ROLLUPS):
+    """Generate CREATE TRIGGER statements (one per source table and event)."""
+    by_source = OrderedDict()
+    for (source, target, target_key, group_by), group in group_rollups(rollups).items():
+        by_source.setdefault(source, []).append((target, target_key, group_by, group))
+
+    statements = []
+    for source, groups in by_source.items():
+        insert_body = [_delta_update(t, k, g, rs, 'NEW', '+') for t, k, g, rs in groups]
+        delete_body = [_delta_update(t, k, g, rs, 'OLD', '-') for t, k, g, rs in groups]
+        update_body = []
+        for t, k, g, rs in groups:
+            update_body.append(_delta_update(t, k, g, rs, 'OLD', '-'))
+            update_body.append(_delta_update(t, k, g, rs, 'NEW', '+'))
+
+        # Only changes to columns a rollup reads need to fire the update trigger
+        watched = []
+        for _, _, group_by, rs in groups:
+            for column in [group_by] + [r.get('value') for r in rs] + [c for r in rs for c in r['where']]:
+                if column and column not in watched:
+                    watched.append(column)
+
+        statements.append(f"CREATE TRIGGER IF NOT EXISTS {trigger_name(source, 'insert')}\n"
+                          f"AFTER INSERT ON {source}\nBEGIN\n" + "\n".join(insert_body) + "\nEND")
+        statements.append(f"CREATE TRIGGER IF NOT EXISTS {trigger_name(source, 'delete')}\n"
+                          f"AFTER DELETE ON {source}\nBEGIN\n" + "\n".join(delete_body) + "\nEND")
+        statements.append(f"CREATE TRIGGER IF NOT EXISTS {trigger_name(source, 'update')}\n"
+                          f"AFTER UPDATE OF {', '.join(watched)} ON {source}\nBEGIN\n"
+                          + "\n".join(update_body) + "\nEND")
+    return statements
+
+
+def generate_group_indexes(rollups=ROLLUPS):
+    """Indexes on the source group_by columns used by rebuilds and drift checks."""
+    statements = []
+    for source, _, _, group_by in group_rollups(rollups):
+        statement = f"CREATE INDEX IF NOT EXISTS idx_{source}_{group_by} ON {source} ({group_by})"
+        if statement not in statements:
+            statements.append(statement)
+    return statements
+
+
+def install_rollup_triggers(conn, rollups=ROLLUPS):
+    """Create the group_by indexes and the delta triggers."""
+    for statement in generate_group_indexes(rollups) + generate_rollup_triggers(rollups):
+        conn.execute(statement)
+
+
+def drop_rollup_triggers(conn, rollups=ROLLUPS):
+    """Drop the generated delta triggers."""
+    for source in OrderedDict.fromkeys(key[0] for key in group_rollups(rollups)):
+        for event in TRIGGER_EVENTS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name(source, event)}")
+
+
+def rebuild_rollups(conn, rollups=ROLLUPS):
+    """Recompute every rollup column from the source tables (full-rebuild path)."""
+    for (source, target, target_key, group_by), group in group_rollups(rollups).items():
+        columns = ", ".join(r['column'] for r in group)
+        aggregates = ", ".join(_aggregate_expression(r, 's') for r in group)
+        conn.execute(f"""
+            UPDATE {target}
+            SET ({columns}) = (
+                SELECT {aggregates}
+                FROM {source} s
+                WHERE s.{group_by} = {target}.{target_key}
+            )
+        """)
+
+
+@contextmanager
+def rollups_suspended(conn, rollups=ROLLUPS, rebuild=True):
+    """Drop the triggers for a bulk load, then rebuild (optionally) and reinstall them."""
+    drop_rollup_triggers(conn, rollups)
+    try:
+        yield conn
+        if rebuild:
+            rebuild_rollups(conn, rollups)
+    finally:
+        install_rollup_triggers(conn, rollups)
+
+
+def rollup_drift_report(conn, rollups=ROLLUPS):
+    """Compare stored rollup values with the full aggregate.
+
+    Returns a list of dicts (target, key, column, stored, expected) for every drifted value.
+    """
+    drift = []
+    for (source, target, target_key, group_by), group in group_rollups(rollups).items():
+        stored = ", ".join(f"t.{r['column']}" for r in group)
+        expected = ", ".join(f"COALESCE(a.c{i}, 0)" for i in range(len(group)))
+        aggregates = ", ".join(f"{_aggregate_expression(r, 's')} AS c{i}" for i, r in enumerate(group))
+        rows = conn.execute(f"""
+            SELECT t.{target_key}, {stored}, {expected}
+            FROM {target} t
+            LEFT JOIN (
+                SELECT s.{group_by} AS group_key, {aggregates}
+                FROM {source} s
+                WHERE s.{group_by} IS NOT NULL
+                GROUP BY s.{group_by}
+            ) a ON a.group_key = t.{target_key}
+        """).fetchall()
+
+        for row in rows:
+            key = row[0]
+            for i, rollup in enumerate(group):
+                stored_value = row[1 + i] or 0
+                expected_value = row[1 + len(group) + i]
+                if abs(stored_value - expected_value) > DRIFT_TOLERANCE:
+                    drift.append({
+                        'target': target,
+                        'key': key,
+                        'column': rollup['column'],
+                        'stored': stored_value,
+                        'expected': expected_value,
+                    })
+    return drift
+
+
+def main():
+    """Install, rebuild or check the TicketQueue rollup fields."""
+    parser = argparse.ArgumentParser(description="Maintain the TicketQueue pre-calculated rollup fields")
+    parser.add_argument('action', choices=['install', 'rebuild', 'drift', 'sql'])
+    parser.add_argument('--db', default='ticketqueue.db', help="Database file (default: ticketqueue.db)")
+    args = parser.parse_args()
+
+    if args.action == 'sql':
+        for statement in generate_group_indexes() + generate_rollup_triggers():
+            print(statement + ";\n")
+        return 0
+
+    if not os.path.exists(args.db):
+        print("TicketQueue database not found. Please run 'python init_ticketqueue_db.py' first to create the database.")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.action == 'install':
+            with conn:
+                rebuild_rollups(conn)
+                install_rollup_triggers(conn)
+            print(f"✅ Rollup triggers installed for {len(ROLLUPS)} pre-calculated fields")
+        elif args.action == 'rebuild':
+            with conn:
+                rebuild_rollups(conn)
+            print(f"✅ Rebuilt {len(ROLLUPS)} pre-calculated fields from ticket_items")
+        else:
+            drift = rollup_drift_report(conn)
+            if not drift:
+                print("✅ All pre-calculated fields match ticket_items")
+            else:
+                print(f"⚠️  {len(drift)} drifted values:")
+                for d in drift[:50]:
+                    print(f"  - {d['target']}[{d['key']}].{d['column']}: stored {d['stored']}, expected {d['expected']}")
+                return 2
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
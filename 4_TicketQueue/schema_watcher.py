@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Schema Watcher
+Keeps schema artifacts for a long-running service in step with its SQLite database. A
+background thread polls the database file (and its -wal file) for size and mtime changes,
+and only when they change asks SQLite for PRAGMA schema_version. A new schema version
+rebuilds the artifacts on that thread and swaps them in as one immutable snapshot, so
+requests never wait for a rebuild and a request that read the old snapshot keeps using
+it consistently. Each rebuild reports its duration to a metric callback. Checks and
+rebuilds hold a lock, so the first snapshot read from a request thread and the poller
+never build at the same time; reading an existing snapshot takes no lock.
+
+The examples are standalone directories, so 4_TicketQueue/schema_watcher.py and
+5_DB_Schema_Analyser/schema_watcher.py are identical copies: change both together.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+# value is whatever build(db_path) returned for schema_version
+SchemaSnapshot = namedtuple('SchemaSnapshot', ['schema_version', 'value', 'built_at', 'build_seconds'])
+
+
+def file_signature(db_path):
+    """(size, mtime_ns) of the database and its -wal file; None for a file that does not exist."""
+    signature = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def read_schema_version(db_path):
+    """PRAGMA schema_version of the database, read over a short-lived read-only connection."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA schema_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def print_rebuild(seconds, snapshot):
+    """Default metric callback: one line per rebuild."""
+    print(f"🔄 Schema version {snapshot.schema_version} rebuilt in {seconds * 1000:.1f} ms")
+
+
+class SchemaWatcher:
+    """Rebuilds schema artifacts in the background when the database schema changes."""
+
+    def __init__(self, db_path, build, interval=DEFAULT_POLL_INTERVAL, on_rebuild=print_rebuild, on_error=None):
+        """Watch db_path every interval seconds; build(db_path) returns the artifacts for a snapshot.
+
+        on_rebuild(seconds, snapshot) receives the duration of every rebuild; on_error(exception)
+        is called when a check or rebuild fails, and the previous snapshot stays in place.
+        """
+        self.db_path = db_path
+        self.build = build
+        self.interval = interval
+        self.on_rebuild = on_rebuild
+        self.on_error = on_error
+        self.rebuilds = 0
+        self._snapshot = None
+        self._signature = None
+        # Serializes check() and rebuild() between the poller and a request building the first snapshot
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def snapshot(self):
+        """The current SchemaSnapshot; read it once per request and use that object throughout."""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self.check()
+        return self._snapshot
+
+    @property
+    def running(self):
+        """True while the background thread is polling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self):
+        """Rebuild if the schema version changed since the last snapshot; returns True if it rebuilt."""
+        with self._lock:
+            signature = file_signature(self.db_path)
+            if self._snapshot is not None and signature == self._signature:
+                return False
+            schema_version = read_schema_version(self.db_path)
+            if self._snapshot is None or schema_version != self._snapshot.schema_version:
+                # A failed rebuild leaves the old signature, so the next poll tries again
+                self.rebuild(schema_version)
+                rebuilt = True
+            else:
+                rebuilt = False
+            self._signature = signature
+            return rebuilt
+
+    def rebuild(self, schema_version=None):
+        """Build new artifacts and swap them in with one reference assignment; returns the snapshot."""
+        with self._lock:
+            if schema_version is None:
+                schema_version = read_schema_version(self.db_path)
+            start = time.perf_counter()
+            value = self.build(self.db_path)
+            seconds = time.perf_counter() - start
+            snapshot = SchemaSnapshot(schema_version, value, time.time(), seconds)
+            self._snapshot = snapshot
+            self.rebuilds += 1
+            if self.on_rebuild:
+                self.on_rebuild(seconds, snapshot)
+            return snapshot
+
+    def _poll(self):
+        """Background loop: check every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+                else:
+                    print(f"❌ Schema rebuild failed for {self.db_path}: {e}")
+
+    def start(self):
+        """Build the first snapshot (if there is none yet) and start polling in a daemon thread."""
+        if self.running:
+            return self
+        if self._snapshot is None:
+            self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name=f"schema-watcher:{os.path.basename(self.db_path)}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for a rebuild in progress to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
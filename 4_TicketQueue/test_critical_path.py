@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the critical path engine
+Schedules a small dependency graph in memory and checks earliest start/finish,
+slack, the critical path and that the SQL functions follow data changes, including
+commits from other connections, without taking over the connection's trace callback.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from critical_path import compute_schedule, register_critical_path_functions, schedule_value
+
+MINIMAL_SCHEMA = """
+CREATE TABLE ticket_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_queue_id INTEGER NOT NULL,
+    title TEXT,
+    status TEXT DEFAULT 'pending',
+    estimated_hours REAL,
+    actual_hours REAL
+);
+CREATE TABLE ticket_item_dependencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dependent_item_id INTEGER NOT NULL,
+    prerequisite_item_id INTEGER NOT NULL
+);
+-- Design (done in 3h) → Backend (8h) and Frontend (5h) → Release (1h)
+INSERT INTO ticket_items (ticket_queue_id, title, status, estimated_hours, actual_hours) VALUES
+    (1, 'Design', 'completed', 4.0, 3.0),
+    (1, 'Backend', 'in_progress', 8.0, 2.0),
+    (1, 'Frontend', 'pending', 5.0, NULL),
+    (1, 'Release', 'pending', 1.0, NULL);
+INSERT INTO ticket_item_dependencies (dependent_item_id, prerequisite_item_id)
+VALUES (2, 1), (3, 1), (4, 2), (4, 3);
+"""
+
+
+def test_schedule_and_cycles():
+    """Forward/backward pass on plain tuples; items behind a cycle are left unscheduled."""
+    schedule = compute_schedule(
+        [(1, 'q', 2.0), (2, 'q', 3.0), (3, 'q', 1.0), (10, 'q', 1.0), (11, 'q', 1.0)],
+        [(2, 1), (3, 1), (10, 11), (11, 10)]
+    )
+    assert schedule_value(schedule, 'earliest_finish', 2) == 5.0
+    assert schedule_value(schedule, 'slack', 3) == 2.0
+    assert schedule['queue_finish'] == {'q': 5.0}
+    assert schedule['cyclic_items'] == {10, 11}
+    assert schedule_value(schedule, 'earliest_start', 10) is None
+    print("✅ Schedule computed; cyclic items left unscheduled")
+
+
+def test_scheduled_item_feeding_a_cycle():
+    """An acyclic prerequisite of a cycle is scheduled as if the cycle were not there."""
+    # 1 → 2 ⇄ 3: item 1 is scheduled, 2 and 3 are on a cycle
+    schedule = compute_schedule([(1, 1, 2.0), (2, 1, 3.0), (3, 1, 1.0)], [(2, 1), (2, 3), (3, 2)])
+    assert schedule['cyclic_items'] == {2, 3}
+    assert schedule['queue_finish'] == {1: 2.0}
+    assert schedule_value(schedule, 'latest_finish', 1) == 2.0
+    assert schedule_value(schedule, 'slack', 1) == 0.0
+    assert schedule_value(schedule, 'latest_start', 2) is None
+    print("✅ Item feeding a cycle scheduled; its cyclic dependents ignored")
+
+
+def test_sql_functions_follow_changes():
+    """cp_* functions expose the schedule to SQL and recompute after writes."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(MINIMAL_SCHEMA)
+    register_critical_path_functions(conn)
+
+    print("🧪 Testing the critical path engine")
+    print("=" * 50)
+
+    rows = conn.execute("""
+        SELECT title, cp_earliest_start(id), cp_earliest_finish(id), cp_slack(id), cp_is_critical(id)
+        FROM ticket_items ORDER BY id
+    """).fetchall()
+    for row in rows:
+        print(f"  {row}")
+    assert rows == [('Design', 0.0, 3.0, 0.0, 1), ('Backend', 3.0, 11.0, 0.0, 1),
+                    ('Frontend', 3.0, 8.0, 3.0, 0), ('Release', 11.0, 12.0, 0.0, 1)]
+    assert conn.execute("SELECT cp_queue_finish(1)").fetchone() == (12.0,)
+
+    # Frontend grows past Backend and takes over the critical path
+    conn.execute("UPDATE ticket_items SET estimated_hours = 10.0 WHERE title = 'Frontend'")
+    assert conn.execute("SELECT cp_queue_finish(1), cp_is_critical(2), cp_is_critical(3)").fetchone() == \
+        (14.0, 0, 1)
+
+    conn.close()
+    print("✅ Critical path follows ticket item changes")
+
+
+def test_sql_functions_keep_the_trace_callback():
+    """A caller's trace callback keeps working; commits by other connections show up from the next statement on."""
+    with tempfile.TemporaryDirectory(prefix='critical_path_') as workdir:
+        db_path = os.path.join(workdir, 'ticketqueue.db')
+        writer = sqlite3.connect(db_path)
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.executescript(MINIMAL_SCHEMA)
+        reader = sqlite3.connect(db_path)
+        traced = []
+        reader.set_trace_callback(traced.append)
+        register_critical_path_functions(reader)
+        assert reader.execute("SELECT cp_queue_finish(1)").fetchone() == (12.0,)
+        assert "SELECT cp_queue_finish(1)" in traced
+
+        # Set after registering: the schedule still follows the writer's commits
+        later = []
+        reader.set_trace_callback(later.append)
+        writer.execute("UPDATE ticket_items SET estimated_hours = 10.0 WHERE title = 'Frontend'")
+        writer.commit()
+        assert reader.execute("SELECT cp_queue_finish(1), cp_is_critical(3)").fetchone() == (14.0, 1)
+        assert "SELECT cp_queue_finish(1), cp_is_critical(3)" in later
+
+        # A commit in the middle of a statement does not change the schedule its later rows read
+        def commit_once(item_id):
+            if item_id == 2:
+                writer.execute("UPDATE ticket_items SET estimated_hours = 20.0 WHERE title = 'Frontend'")
+                writer.commit()
+            return item_id
+
+        reader.create_function('commit_once', 1, commit_once)
+        finishes = reader.execute("SELECT cp_queue_finish(commit_once(id) * 0 + 1) FROM ticket_items ORDER BY id").fetchall()
+        assert finishes == [(14.0,)] * 4
+        assert reader.execute("SELECT cp_queue_finish(1)").fetchone() == (24.0,)
+        reader.close()
+        writer.close()
+    print("✅ Trace callback left to the caller; one schedule per statement")
+
+
+if __name__ == "__main__":
+    test_schedule_and_cycles()
+    test_scheduled_item_feeding_a_cycle()
+    test_sql_functions_follow_changes()
+    test_sql_functions_keep_the_trace_callback()
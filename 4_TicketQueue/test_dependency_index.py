@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the transitive dependency index
+Builds a small dependency graph in memory, adds and removes edges and checks that
+ticket_item_dependency_closure matches a recursive walk and that cycles are rejected.
+"""
+
+import sqlite3
+
+from dependency_index import install_dependency_index, verify_dependency_index
+
+MINIMAL_SCHEMA = """
+CREATE TABLE ticket_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT
+);
+CREATE TABLE ticket_item_dependencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dependent_item_id INTEGER NOT NULL,
+    prerequisite_item_id INTEGER NOT NULL,
+    UNIQUE (dependent_item_id, prerequisite_item_id)
+);
+INSERT INTO ticket_items (title) VALUES ('Design'), ('Backend'), ('Frontend'), ('QA'), ('Release');
+-- Backend and Frontend need Design, QA needs both, Release needs QA
+INSERT INTO ticket_item_dependencies (dependent_item_id, prerequisite_item_id)
+VALUES (2, 1), (3, 1), (4, 2), (4, 3), (5, 4);
+"""
+
+
+def closure(conn):
+    """All (dependent, prerequisite, path_count) rows in a stable order."""
+    return conn.execute("SELECT * FROM ticket_item_dependency_closure ORDER BY 1, 2").fetchall()
+
+
+def test_closure_follows_edge_changes():
+    """Paths are counted, removed edge by edge, and cycles never enter the graph."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(MINIMAL_SCHEMA)
+    install_dependency_index(conn)
+
+    print("🧪 Testing the transitive dependency index")
+    print("=" * 50)
+
+    # Release reaches Design through Backend and through Frontend
+    paths = {(d, p): n for d, p, n in closure(conn)}
+    print(f"Release → Design paths: {paths[(5, 1)]}")
+    assert paths[(5, 1)] == 2 and len(paths) == 9
+
+    # Dropping one route keeps the pair; dropping both removes it
+    conn.execute("DELETE FROM ticket_item_dependencies WHERE dependent_item_id = 4 AND prerequisite_item_id = 2")
+    assert conn.execute("SELECT path_count FROM ticket_item_dependency_closure "
+                        "WHERE dependent_item_id = 5 AND prerequisite_item_id = 1").fetchone() == (1,)
+    conn.execute("UPDATE ticket_item_dependencies SET prerequisite_item_id = 2 "
+                 "WHERE dependent_item_id = 4 AND prerequisite_item_id = 3")
+    assert verify_dependency_index(conn) == ([], [])
+
+    # Design depending on Release would close a loop
+    for edge in [(1, 5), (3, 3)]:
+        try:
+            conn.execute("INSERT INTO ticket_item_dependencies (dependent_item_id, prerequisite_item_id) "
+                         "VALUES (?, ?)", edge)
+            raise AssertionError(f"cycle {edge} was not rejected")
+        except sqlite3.IntegrityError as e:
+            print(f"Cycle {edge} rejected: {e}")
+
+    conn.execute("DELETE FROM ticket_item_dependencies")
+    assert closure(conn) == []
+
+    conn.close()
+    print("✅ Dependency closure stays correct under edge changes")
+
+
+if __name__ == "__main__":
+    test_closure_follows_edge_changes()
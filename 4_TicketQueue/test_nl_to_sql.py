@@ -11,10 +11,21 @@ import sys
 # Add the current directory to the path so we can import functions
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from fixtures import fixture_copy
+
+_db_path = None
+
+def database_path():
+    """This run's private copy of the cached fixture database, made on first use."""
+    global _db_path
+    if _db_path is None:
+        _db_path = fixture_copy()
+    return _db_path
+
 # Import functions directly to avoid OpenAI dependency
 def get_ticketqueue_schema():
     """Get the schema of all tables in the TicketQueue database."""
-    conn = sqlite3.connect('ticketqueue.db')
+    conn = sqlite3.connect(database_path())
     cursor = conn.cursor()
     
     schema_info = {}
@@ -69,7 +80,7 @@ def get_ticketqueue_schema():
 
 def get_database_stats():
     """Get basic statistics about the TicketQueue database."""
-    conn = sqlite3.connect('ticketqueue.db')
+    conn = sqlite3.connect(database_path())
     cursor = conn.cursor()
     
     stats = {}
@@ -97,7 +108,7 @@ def get_database_stats():
 def execute_sql(sql_query):
     """Execute SQL query and return results."""
     try:
-        conn = sqlite3.connect('ticketqueue.db')
+        conn = sqlite3.connect(database_path())
         cursor = conn.cursor()
         
         cursor.execute(sql_query)
@@ -136,13 +147,13 @@ def test_database_connection():
     """Test if the TicketQueue database exists and is accessible."""
     print("Testing database connection...")
     
-    if not os.path.exists('ticketqueue.db'):
+    if not os.path.exists(database_path()):
         print("❌ TicketQueue database not found!")
         print("Please run 'python init_ticketqueue_db.py' first.")
         return False
     
     try:
-        conn = sqlite3.connect('ticketqueue.db')
+        conn = sqlite3.connect(database_path())
         cursor = conn.cursor()
         
         # Test basic query
@@ -229,7 +240,7 @@ def test_sample_data():
     print("\nTesting sample data...")
     
     try:
-        conn = sqlite3.connect('ticketqueue.db')
+        conn = sqlite3.connect(database_path())
         cursor = conn.cursor()
         
         # Check key tables have data
@@ -3,13 +3,14 @@
 Test script to demonstrate the fixed "overdue" query functionality
 """
 
-import sqlite3
 from datetime import datetime
 
+from fixtures import fixture_connection
+
 def test_overdue_queries():
     """Test various overdue and time-based queries."""
     
-    conn = sqlite3.connect('ticketqueue.db')
+    conn = fixture_connection()
     cursor = conn.cursor()
     
     print("🧪 Testing Overdue Query Functionality")
@@ -20,7 +21,7 @@ def test_overdue_queries():
     cursor.execute("""
         SELECT ti.title, ti.due_date, ti.status, 
                u.first_name || ' ' || u.last_name as assigned_to
-        FROM ticket_items wi
+        FROM ticket_items ti
         LEFT JOIN users u ON ti.assigned_to = u.id
         WHERE ti.due_date < datetime('now') AND ti.status != 'completed'
         ORDER BY ti.due_date ASC
@@ -36,7 +37,7 @@ def test_overdue_queries():
     cursor.execute("""
         SELECT ti.title, ti.estimated_hours, ti.actual_hours,
                (ti.actual_hours - ti.estimated_hours) as hours_over_budget
-        FROM ticket_items wi
+        FROM ticket_items ti
         WHERE ti.actual_hours > ti.estimated_hours
         ORDER BY hours_over_budget DESC
     """)
@@ -50,7 +51,7 @@ def test_overdue_queries():
     cursor.execute("""
         SELECT ti.title, ti.due_date, ti.status,
                u.first_name || ' ' || u.last_name as assigned_to
-        FROM ticket_items wi
+        FROM ticket_items ti
         LEFT JOIN users u ON ti.assigned_to = u.id
         WHERE ti.due_date BETWEEN datetime('now') AND datetime('now', '+7 days')
         AND ti.status != 'completed'
@@ -66,7 +67,7 @@ def test_overdue_queries():
     cursor.execute("""
         SELECT ti.title, ti.priority, ti.due_date, ti.status,
                u.first_name || ' ' || u.last_name as assigned_to
-        FROM ticket_items wi
+        FROM ticket_items ti
         LEFT JOIN users u ON ti.assigned_to = u.id
         WHERE ti.due_date < datetime('now') 
         AND ti.status != 'completed'
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental TicketQueue rollups
+Builds a small in-memory TicketQueue, changes ticket items and checks that the
+pre-calculated user and queue totals never drift from ticket_items.
+"""
+
+import sqlite3
+
+from rollups import install_rollup_triggers, rollup_drift_report, rollups_suspended
+
+MINIMAL_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name TEXT,
+    total_assigned_items INTEGER DEFAULT 0,
+    total_completed_items INTEGER DEFAULT 0,
+    total_estimated_hours REAL DEFAULT 0,
+    total_actual_hours REAL DEFAULT 0
+);
+CREATE TABLE ticket_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT,
+    total_estimated_hours REAL DEFAULT 0,
+    total_actual_hours REAL DEFAULT 0,
+    total_ticket_items INTEGER DEFAULT 0,
+    completed_ticket_items INTEGER DEFAULT 0
+);
+CREATE TABLE ticket_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_queue_id INTEGER NOT NULL,
+    title TEXT,
+    status TEXT DEFAULT 'pending',
+    assigned_to INTEGER,
+    estimated_hours REAL,
+    actual_hours REAL
+);
+INSERT INTO users (first_name) VALUES ('Alice'), ('Bob');
+INSERT INTO ticket_queue (title) VALUES ('Website'), ('Mobile');
+"""
+
+
+def test_rollups_follow_ticket_item_changes():
+    """Insert, reassign, complete and delete ticket items with the triggers installed."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(MINIMAL_SCHEMA)
+    install_rollup_triggers(conn)
+
+    print("🧪 Testing incremental rollups")
+    print("=" * 50)
+
+    conn.executemany(
+        "INSERT INTO ticket_items (ticket_queue_id, title, status, assigned_to, estimated_hours, actual_hours) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(1, 'Design', 'completed', 1, 8.0, 7.5),
+         (1, 'Build', 'in_progress', 1, 16.0, 4.0),
+         (2, 'Release', 'pending', 2, 4.0, None),
+         (2, 'Triage', 'pending', None, 2.0, None)]
+    )
+    conn.execute("UPDATE ticket_items SET assigned_to = 2, ticket_queue_id = 2 WHERE title = 'Build'")
+    conn.execute("UPDATE ticket_items SET status = 'completed', actual_hours = 5.0 WHERE title = 'Release'")
+    conn.execute("DELETE FROM ticket_items WHERE title = 'Design'")
+
+    users = conn.execute("SELECT first_name, total_assigned_items, total_completed_items, "
+                         "total_estimated_hours, total_actual_hours FROM users ORDER BY id").fetchall()
+    for row in users:
+        print(f"  - {row[0]}: {row[1]} assigned, {row[2]} completed, {row[3]}h estimated, {row[4]}h actual")
+    assert users == [('Alice', 0, 0, 0.0, 0.0), ('Bob', 2, 1, 20.0, 9.0)]
+
+    queues = conn.execute("SELECT total_ticket_items, completed_ticket_items FROM ticket_queue ORDER BY id").fetchall()
+    assert queues == [(0, 0), (3, 1)]
+    assert rollup_drift_report(conn) == []
+
+    # Bulk path: triggers off during the load, one rebuild at the end
+    with rollups_suspended(conn):
+        conn.executemany("INSERT INTO ticket_items (ticket_queue_id, title, assigned_to, estimated_hours) "
+                         "VALUES (1, 'Bulk', 1, 1.0)", [()] * 100)
+    assert conn.execute("SELECT total_assigned_items FROM users WHERE id = 1").fetchone()[0] == 100
+    assert rollup_drift_report(conn) == []
+
+    # Out-of-band edits show up in the drift report
+    conn.execute("UPDATE ticket_queue SET total_ticket_items = 0 WHERE id = 2")
+    drift = rollup_drift_report(conn)
+    assert [(d['target'], d['key'], d['column']) for d in drift] == [('ticket_queue', 2, 'total_ticket_items')]
+
+    conn.close()
+    print("✅ Rollups stay in sync with ticket_items")
+
+
+if __name__ == "__main__":
+    test_rollups_follow_ticket_item_changes()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Test script for the copied schema watcher
+schema_watcher.py is shared with 5_DB_Schema_Analyser (where its tests live) as an
+identical copy, so each example directory stays standalone; this checks the copies match.
+"""
+
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SHARED_COPY = os.path.join(HERE, '..', '5_DB_Schema_Analyser', 'schema_watcher.py')
+
+
+def test_schema_watcher_matches_the_analyzer_copy():
+    """Both schema_watcher.py files are byte-for-byte identical (skipped outside the full checkout)."""
+    if not os.path.exists(SHARED_COPY):
+        print("⏭️  5_DB_Schema_Analyser/schema_watcher.py not found; copy check skipped")
+        return
+
+    with open(os.path.join(HERE, 'schema_watcher.py'), 'rb') as local, open(SHARED_COPY, 'rb') as shared:
+        assert local.read() == shared.read(), "schema_watcher.py copies differ; change both together"
+    print("✅ schema_watcher.py matches the 5_DB_Schema_Analyser copy")
+
+
+if __name__ == "__main__":
+    test_schema_watcher_matches_the_analyzer_copy()
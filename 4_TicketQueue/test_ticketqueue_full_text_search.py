@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for the TicketQueue comment full-text index
+Adds, edits and removes comments in memory and checks that MATCH queries on
+ticket_item_comments_fts follow the changes.
+"""
+
+import sqlite3
+
+from full_text_search import install_fts_indexes, search
+
+MINIMAL_SCHEMA = """
+CREATE TABLE ticket_item_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_item_id INTEGER NOT NULL,
+    user_id INTEGER,
+    comment TEXT NOT NULL
+);
+INSERT INTO ticket_item_comments (ticket_item_id, user_id, comment) VALUES
+    (1, 1, 'Reproduced the login bug on Safari'),
+    (2, 2, 'Waiting for review');
+"""
+
+
+def test_comment_search_follows_changes():
+    """Existing rows are indexed on install; triggers keep later writes in sync."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(MINIMAL_SCHEMA)
+    install_fts_indexes(conn)
+
+    print("🧪 Testing the comment full-text index")
+    print("=" * 50)
+
+    assert [row[0] for row in search(conn, 'ticket_item_comments', '"login bug"')] == [1]
+
+    conn.execute("INSERT INTO ticket_item_comments (ticket_item_id, user_id, comment) "
+                 "VALUES (3, 1, 'Logins fail after the deploy')")
+    conn.execute("UPDATE ticket_item_comments SET comment = 'Fixed' WHERE id = 1")
+    conn.execute("DELETE FROM ticket_item_comments WHERE id = 2")
+
+    matches = search(conn, 'ticket_item_comments', 'login')
+    print(f"Comments matching 'login': {matches}")
+    assert [row[0] for row in matches] == [3]
+    assert search(conn, 'ticket_item_comments', 'review') == []
+
+    conn.close()
+    print("✅ Comment index stays in sync with ticket_item_comments")
+
+
+if __name__ == "__main__":
+    test_comment_search_follows_changes()
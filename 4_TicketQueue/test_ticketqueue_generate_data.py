@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the TicketQueue data generator
+Generates two small databases from the same seed and checks that they are identical,
+that the dependency graph is acyclic and within its fan-in/fan-out limits, that the
+overdue share is close to the requested one and that the pre-calculated totals match.
+Also checks that a parallel, sharded build gives the same rows as a single process.
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+from dependency_index import verify_dependency_index
+from generate_data import SCHEMA_TABLES, generate_database
+from rollups import rollup_drift_report
+
+AS_OF = date(2025, 6, 1)
+
+
+def table_contents(conn):
+    """Every row of every generated table, in a stable order."""
+    tables = [statement.split()[5] for statement in SCHEMA_TABLES]
+    return {table: conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall() for table in tables}
+
+
+def test_generated_ticketqueue_is_deterministic_and_consistent():
+    """Same seed and as-of date give the same rows; the graph and totals are consistent."""
+    workdir = tempfile.mkdtemp()
+    first_path = os.path.join(workdir, 'first.db')
+    second_path = os.path.join(workdir, 'second.db')
+
+    print("🧪 Testing the TicketQueue data generator")
+    print("=" * 50)
+
+    stats = generate_database(first_path, scale=0.05, seed=7, as_of=AS_OF, overdue_share=0.3,
+                              max_fan_in=2, max_fan_out=3)
+    generate_database(second_path, scale=0.05, seed=7, as_of=AS_OF, overdue_share=0.3,
+                      max_fan_in=2, max_fan_out=3)
+    print(f"Rows loaded: { {table: rows for table, (rows, _) in stats.items() if rows} }")
+
+    first = sqlite3.connect(first_path)
+    second = sqlite3.connect(second_path)
+    assert table_contents(first) == table_contents(second)
+    print("Same seed, same data")
+
+    # Edges point from later to earlier items, so the graph is acyclic; fan-in/out respect the limits
+    assert first.execute(
+        "SELECT COUNT(*) FROM ticket_item_dependencies WHERE prerequisite_item_id >= dependent_item_id"
+    ).fetchone()[0] == 0
+    max_fan_in, max_fan_out = (first.execute(
+        f"SELECT MAX(edges) FROM (SELECT COUNT(*) AS edges FROM ticket_item_dependencies GROUP BY {column})"
+    ).fetchone()[0] for column in ('dependent_item_id', 'prerequisite_item_id'))
+    print(f"Max fan-in: {max_fan_in}, max fan-out: {max_fan_out}")
+    assert max_fan_in <= 2 and max_fan_out <= 3
+    assert verify_dependency_index(first) == ([], [])
+
+    # About 30% of open items are past their due date
+    open_items, overdue = first.execute("""
+        SELECT COUNT(*), SUM(due_date < ?) FROM ticket_items WHERE status IN ('pending', 'in_progress')
+    """, (AS_OF.isoformat(),)).fetchone()
+    print(f"Overdue share of open items: {overdue / open_items:.0%}")
+    assert 0.2 < overdue / open_items < 0.4
+
+    # Pre-calculated totals match ticket_items; comments are indexed for MATCH
+    assert rollup_drift_report(first) == []
+    assert first.execute(
+        "SELECT COUNT(*) FROM ticket_item_comments_fts WHERE ticket_item_comments_fts MATCH 'login'"
+    ).fetchone()[0] > 0
+
+    first.close()
+    second.close()
+    print("✅ Generator is deterministic and the generated data is consistent")
+
+
+def test_parallel_build_matches_single_process():
+    """Sharding queues over worker processes does not change a single row."""
+    workdir = tempfile.mkdtemp()
+    serial_path = os.path.join(workdir, 'serial.db')
+    parallel_path = os.path.join(workdir, 'parallel.db')
+
+    print("\n🧪 Testing the parallel sharded build")
+    print("=" * 50)
+
+    generate_database(serial_path, scale=0.05, seed=11, as_of=AS_OF, jobs=1)
+    stats = generate_database(parallel_path, scale=0.05, seed=11, as_of=AS_OF, jobs=3)
+    print(f"Merged shards in {stats['(merge shards)'][1]:.2f}s")
+
+    serial = sqlite3.connect(serial_path)
+    parallel = sqlite3.connect(parallel_path)
+    assert table_contents(serial) == table_contents(parallel)
+    assert rollup_drift_report(parallel) == []
+    assert sorted(os.listdir(workdir)) == ['parallel.db', 'serial.db']
+    serial.close()
+    parallel.close()
+    print("✅ Parallel build is identical to the single-process build")
+
+
+if __name__ == "__main__":
+    test_generated_ticketqueue_is_deterministic_and_consistent()
+    test_parallel_build_matches_single_process()
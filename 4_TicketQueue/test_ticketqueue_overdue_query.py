@@ -3,13 +3,14 @@
 Test script to demonstrate the fixed "overdue" query functionality
 """
 
-import sqlite3
 from datetime import datetime
 
+from fixtures import fixture_connection
+
 def test_overdue_queries():
     """Test various overdue and time-based queries."""
     
-    conn = sqlite3.connect('ticketqueue.db')
+    conn = fixture_connection()
     cursor = conn.cursor()
     
     print("🧪 Testing Overdue Query Functionality")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming SQL script loader
+Loads scripts with semicolons inside strings, comments and trigger bodies, several
+statements per line and dump-style BEGIN/COMMIT/ROLLBACK lines (also behind comments),
+and checks that a failing statement rolls the whole script back.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from init_ticketqueue_db import iter_sql_statements, load_sql_script
+
+TRICKY_SCRIPT = """BEGIN TRANSACTION;
+-- a comment; with a semicolon
+CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT, edits INTEGER DEFAULT 0);
+CREATE TABLE note_log (note_id INTEGER, message TEXT);
+CREATE TRIGGER trg_notes_insert AFTER INSERT ON notes
+BEGIN
+    INSERT INTO note_log (note_id, message) VALUES (NEW.id, 'created; logged');
+    UPDATE notes SET edits = edits + 1 WHERE id = NEW.id;
+END;
+INSERT INTO notes (body) VALUES ('first; with semicolon'); INSERT INTO notes (body) VALUES ('second');
+INSERT INTO notes (body) VALUES ('multi
+line; text');
+/* block comment; */ INSERT INTO notes (body) VALUES ('it''s; quoted');
+COMMIT;
+INSERT INTO notes (body) VALUES ('no final semicolon')
+"""
+
+
+def write_script(text):
+    """Write text to a temporary .sql file and return its path."""
+    path = os.path.join(tempfile.mkdtemp(), 'script.sql')
+    with open(path, 'w', encoding='utf-8') as sql_file:
+        sql_file.write(text)
+    return path
+
+
+def test_loader_splits_statements_correctly():
+    """Semicolons in strings, comments and triggers do not split statements."""
+    print("🧪 Testing the streaming SQL loader")
+    print("=" * 50)
+
+    path = write_script(TRICKY_SCRIPT)
+    with open(path, encoding='utf-8') as sql_file:
+        statements = list(iter_sql_statements(sql_file))
+    print(f"Split into {len(statements)} statements starting at lines {[line for line, _ in statements]}")
+    assert [line for line, _ in statements] == [1, 2, 4, 5, 10, 10, 11, 13, 14, 15]
+
+    conn = sqlite3.connect(':memory:')
+    executed = load_sql_script(conn, path)
+    assert executed == 8
+    bodies = [row[0] for row in conn.execute("SELECT body FROM notes ORDER BY id")]
+    assert bodies == ['first; with semicolon', 'second', 'multi\nline; text', "it's; quoted", 'no final semicolon']
+    assert conn.execute("SELECT COUNT(*) FROM note_log WHERE message = 'created; logged'").fetchone()[0] == 5
+    assert conn.execute("SELECT SUM(edits) FROM notes").fetchone()[0] == 5
+    print("✅ All statements loaded intact")
+
+
+def test_transaction_control_behind_comments_is_skipped():
+    """BEGIN after a comment header and a dump's 'ROLLBACK; -- due to errors' do not reach SQLite."""
+    path = write_script("-- header\n/* generated; by hand */\nBEGIN TRANSACTION;\n"
+                        "CREATE TABLE t (id INTEGER);\nINSERT INTO t VALUES (1);\n"
+                        "ROLLBACK; -- due to errors\n-- trailing comment\ncommit;\n")
+    conn = sqlite3.connect(':memory:')
+    assert load_sql_script(conn, path) == 2
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+    assert not conn.in_transaction
+    print("✅ Commented BEGIN and dump ROLLBACK lines skipped")
+
+
+def test_failing_statement_rolls_back_the_script():
+    """An error reports the statement's line and leaves nothing behind."""
+    path = write_script("CREATE TABLE kept (id INTEGER);\nINSERT INTO kept VALUES (1);\nINSERT INTO missing VALUES (1);\n")
+    conn = sqlite3.connect(':memory:')
+    try:
+        load_sql_script(conn, path)
+        raise AssertionError("the failing statement was not reported")
+    except sqlite3.Error as e:
+        print(f"Error reported: {e}")
+        assert f"{path}:3:" in str(e)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'kept'").fetchone()[0] == 0
+    print("✅ Failed load rolled back")
+
+
+if __name__ == "__main__":
+    test_loader_splits_statements_correctly()
+    test_transaction_control_behind_comments_is_skipped()
+    test_failing_statement_rolls_back_the_script()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for WAL mode and the reader pool
+Switches a private copy of the fixture database to WAL and checks that pooled readers are
+query_only, that they see every committed write (and no uncommitted one) while a writer
+works alongside them, and that queries return the same text with and without the pool.
+"""
+
+import sqlite3
+
+from fixtures import fixture_copy
+from wal_mode import (ReaderPool, checkpoint_wal, connect_writer, disable_wal_mode, enable_wal_mode,
+                      get_journal_mode, run_sql_query)
+
+HOURS_QUERY = "SELECT actual_hours FROM ticket_items WHERE id = 1"
+
+
+def test_pooled_readers_are_query_only():
+    """Every pooled connection refuses writes, also through run_sql_query; on_connect still runs first."""
+    db_path = fixture_copy()
+    assert enable_wal_mode(db_path) == 'wal' and get_journal_mode(db_path) == 'wal'
+
+    print("🧪 Testing WAL mode and the reader pool")
+    print("=" * 50)
+
+    prepared = []
+    with ReaderPool(db_path, size=3, on_connect=lambda conn: prepared.append(conn)) as pool:
+        assert len(prepared) == 3
+        for conn in prepared:
+            assert conn.execute("PRAGMA query_only").fetchone() == (1,)
+            try:
+                conn.execute("DELETE FROM ticket_items")
+                raise AssertionError("a pooled reader accepted a write")
+            except sqlite3.OperationalError as e:
+                assert 'readonly' in str(e)
+
+        result = run_sql_query("UPDATE ticket_items SET actual_hours = 0", db_path, pool)
+        assert result.startswith("Error executing SQL") and 'readonly' in result
+    print("✅ Pooled readers are query_only")
+
+
+def test_pooled_readers_see_committed_writes():
+    """A commit is visible to the next pooled read; an open write transaction is not, and does not block."""
+    db_path = fixture_copy()
+    enable_wal_mode(db_path)
+    writer = connect_writer(db_path)
+
+    with ReaderPool(db_path, size=2) as pool:
+        before = pool.execute(HOURS_QUERY)[1][0][0] or 0
+
+        writer.execute("UPDATE ticket_items SET actual_hours = ? WHERE id = 1", (before + 5,))
+        assert pool.execute(HOURS_QUERY)[1] == [(before,)]
+        writer.commit()
+        assert pool.execute(HOURS_QUERY)[1] == [(before + 5,)]
+
+        # A reader in the middle of a read transaction keeps its snapshot while the writer commits
+        with pool.connection() as conn:
+            conn.execute("BEGIN")
+            assert conn.execute(HOURS_QUERY).fetchone() == (before + 5,)
+            with writer:
+                writer.execute("UPDATE ticket_items SET actual_hours = ? WHERE id = 1", (before + 7,))
+            assert conn.execute(HOURS_QUERY).fetchone() == (before + 5,)
+        assert pool.execute(HOURS_QUERY)[1] == [(before + 7,)]
+
+        # Pooled and per-query connections format the same result
+        assert run_sql_query(HOURS_QUERY, db_path, pool) == run_sql_query(HOURS_QUERY, db_path)
+        assert run_sql_query(HOURS_QUERY, db_path, pool).startswith("Query Results:\nactual_hours\n")
+
+    writer.close()
+    assert checkpoint_wal(db_path, 'TRUNCATE')[0] == 0
+    assert disable_wal_mode(db_path) == 'delete'
+    print("✅ Pooled readers see committed writes and never wait for the writer")
+
+
+if __name__ == "__main__":
+    test_pooled_readers_are_query_only()
+    test_pooled_readers_see_committed_writes()
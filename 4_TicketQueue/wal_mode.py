@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+WAL Mode Utilities
+Opt-in write-ahead logging for the TicketQueue (and e-commerce) SQLite databases,
+so background writes no longer block the natural language readers.
+"""
+
+import argparse
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+# SQLite's own default; the WAL is folded back into the database every ~4MB
+DEFAULT_AUTOCHECKPOINT_PAGES = 1000
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+def configure_connection(conn, autocheckpoint=DEFAULT_AUTOCHECKPOINT_PAGES,
+                         busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+    """Apply the per-connection WAL settings (synchronous, checkpointing, busy timeout)."""
+    # journal_mode=WAL is stored in the database file, these are not
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA wal_autocheckpoint={int(autocheckpoint)}")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    return conn
+
+
+def get_journal_mode(db_path):
+    """Return the current journal mode of a database."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def enable_wal_mode(db_path, autocheckpoint=DEFAULT_AUTOCHECKPOINT_PAGES):
+    """Switch a database to WAL mode and return the resulting journal mode."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        configure_connection(conn, autocheckpoint=autocheckpoint)
+    finally:
+        conn.close()
+
+    if mode.lower() != 'wal':
+        raise sqlite3.OperationalError(f"Could not enable WAL mode on {db_path} (journal_mode={mode})")
+    return mode
+
+
+def disable_wal_mode(db_path):
+    """Checkpoint the WAL and switch the database back to rollback-journal mode."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def checkpoint_wal(db_path_or_conn, mode='PASSIVE'):
+    """Run a WAL checkpoint and return (busy, wal_frames, checkpointed_frames)."""
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode} (expected one of {', '.join(CHECKPOINT_MODES)})")
+
+    if isinstance(db_path_or_conn, sqlite3.Connection):
+        return db_path_or_conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+    conn = sqlite3.connect(db_path_or_conn)
+    try:
+        return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    finally:
+        conn.close()
+
+
+def connect_writer(db_path, autocheckpoint=DEFAULT_AUTOCHECKPOINT_PAGES):
+    """Open a connection for writes with the WAL settings applied."""
+    conn = sqlite3.connect(db_path, timeout=DEFAULT_BUSY_TIMEOUT_MS / 1000)
+    return configure_connection(conn, autocheckpoint=autocheckpoint)
+
+
+class ReaderPool:
+    """Fixed-size pool of read-only connections, sized to the CPU count by default."""
+
+    def __init__(self, db_path, size=None, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS, on_connect=None, on_borrow=None):
+        """Open `size` read-only connections to the database; on_connect(conn) runs on each one.
+
+        on_borrow(conn) runs every time a connection is lent out, for trusted setup that can
+        change while the pool is open (e.g. attaching a database that appeared later).
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database file not found: {db_path}")
+
+        self.db_path = db_path
+        self.size = size or os.cpu_count() or 1
+        self.busy_timeout_ms = busy_timeout_ms
+        self.on_connect = on_connect
+        self.on_borrow = on_borrow
+        self._connections = queue.LifoQueue()
+        self._all_connections = []
+
+        for _ in range(self.size):
+            conn = self._open_connection()
+            self._all_connections.append(conn)
+            self._connections.put(conn)
+
+    def _open_connection(self):
+        """Open one reader connection that is allowed to move between threads."""
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        # Trusted setup (functions, ATTACH, TEMP views) runs before the connection turns read-only
+        if self.on_connect:
+            self.on_connect(conn)
+        # Generated SQL is untrusted; readers must never take the write lock
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a reader connection, blocking until one is free."""
+        conn = self._connections.get()
+        try:
+            if self.on_borrow:
+                conn.execute("PRAGMA query_only=OFF")
+                try:
+                    self.on_borrow(conn)
+                finally:
+                    conn.execute("PRAGMA query_only=ON")
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._connections.put(conn)
+
+    def execute(self, sql_query, parameters=()):
+        """Run a query on a pooled connection and return (column_names, rows)."""
+        with self.connection() as conn:
+            cursor = conn.execute(sql_query, parameters)
+            rows = cursor.fetchall()
+            column_names = [description[0] for description in cursor.description] if cursor.description else []
+        return column_names, rows
+
+    def close(self):
+        """Close every connection in the pool."""
+        for conn in self._all_connections:
+            conn.close()
+        self._all_connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_sql_query(sql_query, db_path, reader_pool=None, on_connect=None):
+    """Execute SQL and return the results as a text table (nl_to_sql_main.execute_sql).
+
+    With a reader_pool the query runs on a pooled read-only connection; without one it opens
+    a connection to db_path for this query, after on_connect(conn).
+    """
+    try:
+        if reader_pool:
+            column_names, results = reader_pool.execute(sql_query)
+        else:
+            conn = sqlite3.connect(db_path)
+            try:
+                if on_connect:
+                    on_connect(conn)
+                cursor = conn.execute(sql_query)
+                results = cursor.fetchall()
+                column_names = [description[0] for description in cursor.description] if cursor.description else []
+            finally:
+                conn.close()
+
+        if not results:
+            return "Query executed successfully. No results returned."
+
+        output = "Query Results:\n"
+        output += " | ".join(column_names) + "\n"
+        output += "-" * (len(" | ".join(column_names)) + 10) + "\n"
+        for row in results:
+            output += " | ".join(str(cell) for cell in row) + "\n"
+        output += f"\nTotal rows returned: {len(results)}"
+        return output
+
+    except Exception as e:
+        return f"Error executing SQL: {str(e)}"
+
+
+def main():
+    """Command line entry point for switching journal modes and checkpointing."""
+    parser = argparse.ArgumentParser(description="Manage WAL mode for a SQLite database")
+    parser.add_argument('action', choices=['enable', 'disable', 'checkpoint', 'status'])
+    parser.add_argument('db_path', nargs='?', default='ticketqueue.db',
+                        help="Database file (default: ticketqueue.db)")
+    parser.add_argument('--mode', default='TRUNCATE', choices=CHECKPOINT_MODES,
+                        help="Checkpoint mode used by the 'checkpoint' action")
+    args = parser.parse_args()
+
+    try:
+        if args.action == 'enable':
+            enable_wal_mode(args.db_path)
+            print(f"✅ WAL mode enabled for {args.db_path} (synchronous=NORMAL)")
+        elif args.action == 'disable':
+            mode = disable_wal_mode(args.db_path)
+            print(f"✅ Journal mode for {args.db_path} is now {mode}")
+        elif args.action == 'checkpoint':
+            busy, wal_frames, checkpointed = checkpoint_wal(args.db_path, args.mode)
+            print(f"✅ Checkpoint ({args.mode}): {checkpointed}/{wal_frames} frames written back"
+                  f"{' (readers still busy)' if busy else ''}")
+        else:
+            print(f"Journal mode for {args.db_path}: {get_journal_mode(args.db_path)}")
+    except (sqlite3.Error, FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
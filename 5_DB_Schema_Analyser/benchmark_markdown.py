@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Markdown Writer Benchmark
+Builds a synthetic database with thousands of tables (foreign keys, sample rows with
+long TEXT values) and writes its schema markdown three ways, each in a fresh child
+process: the old string-concatenating generator, generate_markdown_schema() followed
+by one write, and the streaming save_markdown(). Reports time, peak traced allocations
+and peak RSS growth for each.
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from db_schema_analyzer import DatabaseSchemaAnalyzer
+
+MODES = ['concatenate', 'join', 'stream']
+
+
+def build_synthetic_database(db_path, tables, text_width):
+    """tables tables, each referencing a hub and the previous table, with three sample rows."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("BEGIN")
+    conn.execute("CREATE TABLE hub (hub_id INTEGER PRIMARY KEY, name TEXT)")
+    for number in range(tables):
+        parent = f"entity_{number - 1:05d}" if number else 'hub'
+        conn.execute(f"""CREATE TABLE entity_{number:05d} (
+            id INTEGER PRIMARY KEY,
+            hub_id INTEGER NOT NULL REFERENCES hub (hub_id),
+            parent_id INTEGER REFERENCES {parent},
+            name TEXT NOT NULL,
+            description TEXT,
+            amount REAL DEFAULT 0.0,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )""")
+        conn.executemany(f"INSERT INTO entity_{number:05d} (hub_id, parent_id, name, description) VALUES (1, ?, ?, ?)",
+                         [(row, f"name {row}", f"row {row} " + 'x' * text_width) for row in range(1, 4)])
+    conn.commit()
+    conn.close()
+
+
+def concatenated_markdown(analyzer):
+    """The generator as it was before streaming: one string grown with += and written at the end."""
+    markdown = next(analyzer.iter_markdown_schema())  # the document header
+    for table_name in analyzer.schema_info:
+        markdown += analyzer.render_table_section(table_name)
+    markdown += "## Relationships\n\n"
+    for table_name, rel_info in analyzer.relationships.items():
+        if rel_info['references'] or rel_info['referenced_by']:
+            markdown += f"### {table_name}\n"
+            if rel_info['references']:
+                markdown += f"- **References**: {', '.join(rel_info['references'])}\n"
+            if rel_info['referenced_by']:
+                markdown += f"- **Referenced by**: {', '.join(rel_info['referenced_by'])}\n"
+            markdown += "\n"
+    markdown += analyzer.render_cardinality_section()
+    if analyzer.hierarchical_relationships:
+        markdown += "## Hierarchical Relationships\n\n"
+        for rel in analyzer.hierarchical_relationships:
+            markdown += f"- **{rel['table']}**: Self-referencing (hierarchical structure)\n"
+        markdown += "\n"
+    if analyzer.many_to_many_relationships:
+        markdown += "## Many-to-Many Relationships\n\n"
+        for rel in analyzer.many_to_many_relationships:
+            markdown += f"- **{rel['relationship']}**\n"
+        markdown += "\n"
+    if analyzer.join_examples:
+        markdown += "## Join Examples\n\n"
+        for example in analyzer.join_examples:
+            markdown += f"### {example['type']}: {example['description']}\n"
+            markdown += f"```sql\n{example['sql_pattern']}\n```\n\n"
+    markdown += "## Complex Relationship Examples\n\n"
+    relationship_paths = []
+    for table_name, rel_info in analyzer.relationships.items():
+        for ref_table in rel_info['references']:
+            relationship_paths.append(f"- `{table_name}` → `{ref_table}`")
+    if relationship_paths:
+        markdown += "**Relationship Paths:**\n"
+        for path in relationship_paths:
+            markdown += f"{path}\n"
+        markdown += "\n"
+    markdown += "## Natural Language Query Examples\n\n"
+    markdown += "Based on the schema analysis, here are example queries you can try:\n\n"
+    for category, queries in analyzer.generate_example_queries().items():
+        markdown += f"### {category}\n"
+        for query in queries:
+            markdown += f"- \"{query}\"\n"
+        markdown += "\n"
+    return markdown
+
+
+def write_document(analyzer, mode, output_file):
+    """Write the markdown for analyzer in one of MODES."""
+    if mode == 'stream':
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.save_markdown(output_file)
+        return
+    markdown = concatenated_markdown(analyzer) if mode == 'concatenate' else analyzer.generate_markdown_schema()
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(markdown)
+
+
+def max_rss_mb():
+    """Peak resident set size of this process so far, in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def measure(task):
+    """Child process: analyze, then time one write and trace its allocations in a second write."""
+    db_path, mode, output_file = task
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = DatabaseSchemaAnalyzer(db_path)
+        analyzer.connect()
+        analyzer.analyze_database()
+        analyzer.disconnect()
+
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    write_document(analyzer, mode, output_file)
+    seconds = time.perf_counter() - start
+    rss_growth = max_rss_mb() - rss_before
+
+    tracemalloc.start()
+    write_document(analyzer, mode, output_file)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'mode': mode, 'seconds': seconds, 'traced_peak_mb': traced_peak / (1024 * 1024),
+            'rss_growth_mb': rss_growth, 'size_mb': os.path.getsize(output_file) / (1024 * 1024)}
+
+
+def main():
+    """Benchmark the markdown writers on a synthetic schema."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming vs concatenated schema markdown")
+    parser.add_argument('--tables', type=int, default=5000, help="Synthetic tables (default: 5000)")
+    parser.add_argument('--text-width', type=int, default=400, help="Characters in each sampled description")
+    args = parser.parse_args()
+
+    print("🚀 Markdown Writer Benchmark")
+    print("=" * 50)
+    workdir = tempfile.mkdtemp(prefix='markdown_bench_')
+    db_path = os.path.join(workdir, 'synthetic.db')
+    start = time.perf_counter()
+    build_synthetic_database(db_path, args.tables, args.text_width)
+    print(f"📦 {args.tables:,} tables built in {time.perf_counter() - start:.1f}s")
+
+    results = []
+    outputs = {}
+    for mode in MODES:
+        outputs[mode] = os.path.join(workdir, f"{mode}.md")
+        # A fresh process per mode, so peak RSS is not inherited from the previous one
+        with multiprocessing.Pool(1) as pool:
+            results.append(pool.apply(measure, ((db_path, mode, outputs[mode]),)))
+
+    print(f"\n{'mode':12} | {'seconds':>8} | {'traced peak MB':>14} | {'RSS growth MB':>13} | {'file MB':>8}")
+    print("-" * 67)
+    for r in results:
+        print(f"{r['mode']:12} | {r['seconds']:8.3f} | {r['traced_peak_mb']:14.1f} | "
+              f"{r['rss_growth_mb']:13.1f} | {r['size_mb']:8.1f}")
+
+    documents = set()
+    for path in outputs.values():
+        with open(path, encoding='utf-8') as f:
+            documents.add(''.join(line for line in f if not line.startswith('**Analysis Date**')))
+    shutil.rmtree(workdir, ignore_errors=True)
+    print("\n✅ All modes wrote the same document" if len(documents) == 1 else "\n❌ Documents differ")
+    return 0 if len(documents) == 1 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
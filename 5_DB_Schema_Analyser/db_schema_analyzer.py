@@ -7,20 +7,119 @@ for natural language to SQL conversion systems.
 
 import sqlite3
 import os
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import multiprocessing
+import re
+import time
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from collections.abc import MutableMapping
+from fk_graph import ForeignKeyGraph, primary_key_columns
+from join_planner import table_name_variants
+from schema_catalog import CatalogReader, EncodedValue, load_schema_info, write_catalog
+
+# Bump when the catalog layout changes; older catalogs are then ignored and everything is re-analyzed
+CATALOG_VERSION = 2
+# Rows sampled per table, for the markdown and for the fingerprint's data checksum
+SAMPLE_SIZE = 3
+
+# One finding of lint_performance(); fix is the SQL (or setting) that resolves it
+LintIssue = namedtuple('LintIssue', ['severity', 'check', 'table', 'column', 'rows', 'message', 'fix'])
+LINT_SEVERITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+# Columns that look like stored aggregates (total_spent, order_count, ...) and need something keeping them current
+DENORMALIZED_COLUMN = re.compile(r'^(total|num|sum|avg)_|_(count|total|sum)$', re.IGNORECASE)
+
+# Sampled TEXT values longer than this bloat every prompt the schema is pasted into
+WIDE_TEXT_LENGTH = 200
+
+# Joins that multiply rows by at least this much get an "aggregate in a subquery first" hint
+FAN_OUT_HINT_THRESHOLD = 3.0
+
+def fan_out_hint(table, ref_table, fan_out):
+    """Prompt hint for a join from ref_table to table that multiplies rows by fan_out."""
+    return (f"Joining `{ref_table}` to `{table}` multiplies rows by ~{fan_out:,.1f}: "
+            f"aggregate `{table}` in a subquery before joining it")
+
+def _encode_value(value):
+    """Make a sampled value JSON-safe (BLOBs become {'$bytes': hex})."""
+    if isinstance(value, bytes):
+        return {'$bytes': value.hex()}
+    return value
+
+def _decode_value(value):
+    """Inverse of _encode_value."""
+    if isinstance(value, dict) and '$bytes' in value:
+        return bytes.fromhex(value['$bytes'])
+    return value
+
+def _encode_sample(sample):
+    """A sample ({'columns', 'rows'}) as the catalog stores it."""
+    if not sample:
+        return sample
+    return {'columns': sample['columns'], 'rows': [[_encode_value(value) for value in row] for row in sample['rows']]}
+
+def _decode_sample(sample):
+    """Inverse of _encode_sample."""
+    if not sample:
+        return sample
+    return {'columns': sample['columns'], 'rows': [tuple(_decode_value(value) for value in row) for row in sample['rows']]}
+
+class SampleData(MutableMapping):
+    """Table → sample rows. Samples reused from the catalog stay encoded until something reads them."""
+    
+    def __init__(self):
+        self._samples = {}
+    
+    def __getitem__(self, table_name):
+        sample = self._samples[table_name]
+        if isinstance(sample, EncodedValue):
+            sample = self._samples[table_name] = _decode_sample(sample.decode())
+        return sample
+    
+    def __setitem__(self, table_name, sample):
+        self._samples[table_name] = sample
+    
+    def __delitem__(self, table_name):
+        del self._samples[table_name]
+    
+    def __iter__(self):
+        return iter(self._samples)
+    
+    def __len__(self):
+        return len(self._samples)
+    
+    def encoded(self, table_name):
+        """The sample as read from the catalog, or None once it has been decoded (or was never encoded)."""
+        sample = self._samples.get(table_name)
+        return sample if isinstance(sample, EncodedValue) else None
 
 class DatabaseSchemaAnalyzer:
     """Analyzes database schema and generates markdown documentation."""
     
-    def __init__(self, db_path):
-        """Initialize with database path."""
+    def __init__(self, db_path, catalog_path=None, sample_text_limit=None, run_analyze=False):
+        """Initialize with database path, an optional catalog file for incremental re-analysis,
+        an optional limit on the length of sampled TEXT values and whether to run ANALYZE first."""
         self.db_path = db_path
+        self.catalog_path = catalog_path
+        self.sample_text_limit = sample_text_limit
+        self.run_analyze = run_analyze
+        self.table_stats = {}
+        self.fan_outs = []
         self.conn = None
         self.cursor = None
         self.schema_info = {}
         self.relationships = {}
-        self.sample_data = {}
+        self.sample_data = SampleData()
+        self.fk_graph = None
+        self.fingerprints = {}
+        self.table_sections = {}
+        self.changed_tables = []
+        self.removed_tables = []
         
     def connect(self):
         """Connect to the database."""
@@ -42,6 +141,122 @@ class DatabaseSchemaAnalyzer:
         self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
         return [row[0] for row in self.cursor.fetchall()]
     
+    def get_table_fingerprints(self, tables):
+        """Fingerprint each table: a hash of its CREATE TABLE / CREATE INDEX SQL, a row-count estimate
+        and a checksum of the rows the sample is taken from."""
+        definitions = defaultdict(list)
+        self.cursor.execute("SELECT type, name, tbl_name, sql FROM sqlite_master WHERE type IN ('table', 'index')")
+        for object_type, name, table_name, sql in self.cursor.fetchall():
+            definitions[table_name].append(f"{object_type} {name} {sql}")
+        
+        fingerprints = {}
+        for table in tables:
+            definition = hashlib.sha256('\n'.join(sorted(definitions[table])).encode('utf-8')).hexdigest()
+            row_estimate, sample = self.data_fingerprint(table)
+            fingerprints[table] = {'definition': definition, 'row_estimate': row_estimate, 'sample': sample}
+        return fingerprints
+    
+    def data_fingerprint(self, table_name, sample_size=SAMPLE_SIZE):
+        """(estimate_row_count(), sample_checksum()) from one query: each sampled row carries MAX(rowid) along."""
+        try:
+            self.cursor.execute(f'SELECT (SELECT MAX(rowid) FROM "{table_name}"), * FROM "{table_name}" LIMIT {sample_size}')
+            rows = self.cursor.fetchall()
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID tables have no rowid to look at
+            return self.estimate_row_count(table_name), self.sample_checksum(table_name, sample_size)
+        checksum = hashlib.sha256(repr([row[1:] for row in rows]).encode('utf-8')).hexdigest()[:16]
+        return (rows[0][0] if rows else 0), checksum
+    
+    def sample_checksum(self, table_name, sample_size=SAMPLE_SIZE):
+        """Hash of the rows extract_sample_data() would read: an UPDATE, or a DELETE and re-INSERT
+        that keeps MAX(rowid), still changes the sample and so the fingerprint."""
+        try:
+            self.cursor.execute(f'SELECT * FROM "{table_name}" LIMIT {sample_size}')
+            return hashlib.sha256(repr(self.cursor.fetchall()).encode('utf-8')).hexdigest()[:16]
+        except sqlite3.Error:
+            return None
+    
+    def estimate_row_count(self, table_name):
+        """Cheap row-count estimate: MAX(rowid) reads the last b-tree page instead of scanning the table."""
+        try:
+            self.cursor.execute(f'SELECT MAX(rowid) FROM "{table_name}"')
+            return self.cursor.fetchone()[0] or 0
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID tables have no rowid to look at
+            self.cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+            return self.cursor.fetchone()[0]
+    
+    def load_catalog(self):
+        """Lazy reader over the persisted catalog, or None if there is no usable catalog."""
+        if not self.catalog_path or not os.path.exists(self.catalog_path):
+            return None
+        
+        try:
+            reader = CatalogReader(self.catalog_path)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"⚠️  Ignoring unreadable catalog {self.catalog_path}: {e}")
+            return None
+        
+        if reader.header.get('version') != CATALOG_VERSION:
+            reader.close()
+            return None
+        # Samples in the catalog were truncated (or not) with the limit it was written with
+        if reader.header.get('sample_text_limit') != self.sample_text_limit:
+            print(f"⚠️  Catalog samples were taken with sample_text_limit={reader.header.get('sample_text_limit')}; "
+                  f"re-analyzing every table")
+            reader.close()
+            return None
+        return reader
+    
+    def restore_table(self, table_name, catalog):
+        """Reuse the catalog entry of an unchanged table instead of re-introspecting it.
+        
+        Only the schema is decoded; the sample and the markdown section are kept as the catalog's
+        bytes, decoded when read and copied as they are into the next catalog.
+        """
+        schema = catalog.field(table_name, 'schema')
+        self.schema_info[table_name] = {key: [tuple(row) for row in rows] for key, rows in schema.items()}
+        sample = catalog.raw(table_name, 'sample')
+        self.sample_data[table_name] = sample if sample is not None else _decode_sample(catalog.field(table_name, 'sample'))
+        section = catalog.raw(table_name, 'markdown')
+        self.table_sections[table_name] = section if section is not None else catalog.field(table_name, 'markdown')
+    
+    def catalog_entry(self, table_name):
+        """Everything the catalog keeps about one table, JSON-ready; reused samples and sections stay encoded."""
+        sample = self.sample_data.encoded(table_name) or _encode_sample(self.sample_data.get(table_name))
+        section = self.table_sections.get(table_name)
+        return {
+            'fingerprint': self.fingerprints.get(table_name),
+            'stats': {
+                'rows': self.table_stats.get(table_name, {}).get('rows'),
+                'fan_out': [{key: fan[key] for key in ('ref_table', 'columns', 'fan_out', 'source')}
+                            for fan in self.table_stats.get(table_name, {}).get('fan_out', [])]
+            },
+            'schema': {key: [list(row) for row in rows] for key, rows in self.schema_info[table_name].items()},
+            'sample': sample,
+            'markdown': section if isinstance(section, EncodedValue) else self.render_table_section(table_name)
+        }
+    
+    def save_catalog(self, catalog_path=None):
+        """Persist the catalog (JSON, or MessagePack for a .msgpack path) with its per-table offset index.
+        
+        The next analyze_database() only re-analyzes tables that changed.
+        """
+        catalog_path = catalog_path or self.catalog_path
+        header = {
+            'version': CATALOG_VERSION,
+            'database': os.path.basename(self.db_path),
+            'sample_text_limit': self.sample_text_limit,
+            'analyzed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        # Entries are encoded one table at a time, so the whole catalog is never built in memory
+        write_catalog(catalog_path, header,
+                      ((table_name, self.catalog_entry(table_name)) for table_name in self.schema_info),
+                      len(self.schema_info))
+        
+        print(f"✅ Catalog saved to: {catalog_path}")
+        return catalog_path
+    
     def analyze_table_schema(self, table_name):
         """Analyze schema for a specific table."""
         # Get column information
@@ -62,11 +277,15 @@ class DatabaseSchemaAnalyzer:
             'indexes': indexes
         }
     
-    def extract_sample_data(self, table_name, sample_size=3):
+    def extract_sample_data(self, table_name, sample_size=SAMPLE_SIZE):
         """Extract sample data from a table."""
         try:
             self.cursor.execute(f"SELECT * FROM {table_name} LIMIT {sample_size}")
             rows = self.cursor.fetchall()
+            if self.sample_text_limit:
+                limit = self.sample_text_limit
+                rows = [tuple(value[:limit] + '…' if isinstance(value, str) and len(value) > limit else value
+                              for value in row) for row in rows]
             
             # Get column names
             self.cursor.execute(f"PRAGMA table_info({table_name})")
@@ -81,29 +300,14 @@ class DatabaseSchemaAnalyzer:
             return None
     
     def map_relationships(self):
-        """Map all relationships between tables."""
+        """Map all relationships between tables from the foreign key graph."""
         relationships = {}
         
-        for table_name, info in self.schema_info.items():
+        for table_name in self.schema_info:
             relationships[table_name] = {
-                'references': [],  # Tables this table references
-                'referenced_by': []  # Tables that reference this table
+                'references': self.fk_graph.references(table_name),  # Tables this table references
+                'referenced_by': self.fk_graph.referenced_by(table_name)  # Tables that reference this table
             }
-            
-            # Find outgoing relationships (foreign keys)
-            for fk in info['foreign_keys']:
-                if len(fk) >= 3:
-                    foreign_table = fk[2]  # Referenced table
-                    relationships[table_name]['references'].append(foreign_table)
-            
-            # Find incoming relationships
-            for other_table, other_info in self.schema_info.items():
-                if other_table != table_name:
-                    for fk in other_info['foreign_keys']:
-                        if len(fk) >= 3:
-                            foreign_table = fk[2]  # Referenced table
-                            if foreign_table == table_name:
-                                relationships[table_name]['referenced_by'].append(other_table)
         
         return relationships
     
@@ -111,15 +315,11 @@ class DatabaseSchemaAnalyzer:
         """Detect self-referencing (hierarchical) relationships."""
         hierarchical_tables = []
         
-        for table_name, info in self.schema_info.items():
-            for fk in info['foreign_keys']:
-                if len(fk) >= 3:
-                    foreign_table = fk[2]  # Referenced table
-                    if foreign_table == table_name:
-                        hierarchical_tables.append({
-                            'table': table_name,
-                            'self_reference': fk
-                        })
+        for edge in self.fk_graph.self_references():
+            hierarchical_tables.append({
+                'table': edge.table,
+                'self_reference': edge
+            })
         
         return hierarchical_tables
     
@@ -127,21 +327,13 @@ class DatabaseSchemaAnalyzer:
         """Detect many-to-many relationships through junction tables."""
         many_to_many = []
         
-        for table_name, info in self.schema_info.items():
-            # Check if table has exactly 2 foreign keys (likely a junction table)
-            if len(info['foreign_keys']) == 2:
-                fk1, fk2 = info['foreign_keys']
-                
-                if len(fk1) >= 3 and len(fk2) >= 3:
-                    table1 = fk1[2]  # First referenced table
-                    table2 = fk2[2]  # Second referenced table
-                    
-                    many_to_many.append({
-                        'junction_table': table_name,
-                        'table1': table1,
-                        'table2': table2,
-                        'relationship': f"{table1} ↔ {table2} (via {table_name})"
-                    })
+        for table_name, (edge1, edge2) in self.fk_graph.junction_tables.items():
+            many_to_many.append({
+                'junction_table': table_name,
+                'table1': edge1.ref_table,
+                'table2': edge2.ref_table,
+                'relationship': f"{edge1.ref_table} ↔ {edge2.ref_table} (via {table_name})"
+            })
         
         return many_to_many
     
@@ -150,24 +342,24 @@ class DatabaseSchemaAnalyzer:
         examples = []
         
         # Find tables with multiple relationships
-        for table_name, rel_info in self.relationships.items():
-            if len(rel_info['references']) > 1 or len(rel_info['referenced_by']) > 1:
-                # Generate join examples
-                if rel_info['references']:
-                    for ref_table in rel_info['references']:
-                        examples.append({
-                            'type': 'INNER JOIN',
-                            'description': f"{table_name} → {ref_table}",
-                            'sql_pattern': f"SELECT * FROM {table_name} INNER JOIN {ref_table} ON {table_name}.id = {ref_table}.{table_name}_id"
-                        })
+        for table_name in self.schema_info:
+            outgoing = self.fk_graph.outgoing[table_name]
+            incoming = [edge for edge in self.fk_graph.incoming[table_name] if not edge.is_self_reference]
+            if len(outgoing) > 1 or len(incoming) > 1:
+                # Generate join examples with the real foreign key columns
+                for edge in outgoing:
+                    examples.append({
+                        'type': 'INNER JOIN',
+                        'description': f"{table_name} → {edge.ref_table}",
+                        'sql_pattern': f"SELECT * FROM {table_name} INNER JOIN {edge.ref_table} ON {edge.join_condition()}"
+                    })
                 
-                if rel_info['referenced_by']:
-                    for ref_table in rel_info['referenced_by']:
-                        examples.append({
-                            'type': 'LEFT JOIN',
-                            'description': f"{ref_table} → {table_name}",
-                            'sql_pattern': f"SELECT * FROM {ref_table} LEFT JOIN {table_name} ON {ref_table}.{table_name}_id = {table_name}.id"
-                        })
+                for edge in incoming:
+                    examples.append({
+                        'type': 'LEFT JOIN',
+                        'description': f"{edge.table} → {table_name}",
+                        'sql_pattern': f"SELECT * FROM {edge.table} LEFT JOIN {table_name} ON {edge.join_condition()}"
+                    })
         
         return examples
     
@@ -175,18 +367,43 @@ class DatabaseSchemaAnalyzer:
         """Perform complete database analysis."""
         print("🔍 Analyzing database schema...")
         
+        if self.run_analyze:
+            # Writes sqlite_stat1, which the planner and the cardinality annotations read
+            print("📈 Running ANALYZE...")
+            self.conn.execute("ANALYZE")
+            self.conn.commit()
+        
         # Get all tables
         tables = self.get_table_names()
         print(f"📋 Found {len(tables)} tables: {', '.join(tables)}")
         
-        # Analyze each table
+        # Analyze only the tables whose definition, row-count estimate or sampled rows changed since the catalog was saved
+        previous = self.load_catalog()
+        self.fingerprints = self.get_table_fingerprints(tables)
+        self.schema_info = {}
+        self.sample_data = SampleData()
+        self.table_sections = {}
+        self.changed_tables = []
         for table in tables:
+            # Fingerprints come from the catalog's index; reused entries only have their schema decoded
+            if previous and table in previous and previous.fingerprint(table) == self.fingerprints[table]:
+                self.restore_table(table, previous)
+                continue
+            
             print(f"  📊 Analyzing table: {table}")
             self.schema_info[table] = self.analyze_table_schema(table)
             self.sample_data[table] = self.extract_sample_data(table)
+            self.changed_tables.append(table)
+        
+        self.removed_tables = sorted(set(previous.tables) - set(tables)) if previous else []
+        if previous:
+            previous.close()
+            print(f"♻️  Reused {len(tables) - len(self.changed_tables)} unchanged tables from the catalog, "
+                  f"re-analyzed {len(self.changed_tables)}, dropped {len(self.removed_tables)}")
         
-        # Map relationships
+        # Map relationships: one pass over all foreign keys builds the graph every later step reads
         print("🔗 Mapping relationships...")
+        self.fk_graph = ForeignKeyGraph(self.schema_info)
         self.relationships = self.map_relationships()
         
         # Detect complex relationships
@@ -194,12 +411,15 @@ class DatabaseSchemaAnalyzer:
         self.many_to_many_relationships = self.detect_many_to_many_relationships()
         self.join_examples = self.generate_join_examples()
         
+        # Row counts and join fan-out are re-read every run: ANALYZE does not change table fingerprints
+        self.collect_statistics()
+        
         print("✅ Database analysis complete!")
     
-    def generate_markdown_schema(self):
-        """Generate comprehensive markdown schema documentation."""
+    def iter_markdown_schema(self):
+        """Yield the markdown schema documentation section by section, in document order."""
         
-        markdown = f"""# Database Schema Analysis
+        yield f"""# Database Schema Analysis
 
 **Database**: `{os.path.basename(self.db_path)}`  
 **Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
@@ -213,97 +433,113 @@ This database contains {len(self.schema_info)} tables with complex relationships
 
 """
         
-        # Generate table schemas
-        for table_name, info in self.schema_info.items():
-            markdown += f"### {table_name}\n\n"
-            markdown += "**Columns:**\n"
-            
-            for column in info['columns']:
-                col_id, col_name, col_type, not_null, default_val, pk = column
-                pk_indicator = " 🔑" if pk else ""
-                not_null_indicator = " NOT NULL" if not_null else ""
-                default_indicator = f" DEFAULT {default_val}" if default_val else ""
-                
-                markdown += f"- `{col_name}` ({col_type}){pk_indicator}{not_null_indicator}{default_indicator}\n"
-            
-            # Add foreign key information
-            if info['foreign_keys']:
-                markdown += "\n**Foreign Keys:**\n"
-                for fk in info['foreign_keys']:
-                    id, seq, table, from_col, to_col, on_update, on_delete, match = fk
-                    markdown += f"- `{from_col}` → `{table}.{to_col}`\n"
-            
-            # Add sample data
-            if self.sample_data[table_name]:
-                markdown += "\n**Sample Data:**\n"
-                markdown += "```\n"
-                for row in self.sample_data[table_name]['rows']:
-                    markdown += f"{row}\n"
-                markdown += "```\n"
-            
-            markdown += "\n"
+        # Generate table schemas (unchanged tables reuse their section from the catalog)
+        for table_name in self.schema_info:
+            yield self.render_table_section(table_name)
         
         # Add relationships section
-        markdown += "## Relationships\n\n"
+        yield "## Relationships\n\n"
         
         for table_name, rel_info in self.relationships.items():
             if rel_info['references'] or rel_info['referenced_by']:
-                markdown += f"### {table_name}\n"
+                section = f"### {table_name}\n"
                 if rel_info['references']:
-                    markdown += f"- **References**: {', '.join(rel_info['references'])}\n"
+                    section += f"- **References**: {', '.join(rel_info['references'])}\n"
                 if rel_info['referenced_by']:
-                    markdown += f"- **Referenced by**: {', '.join(rel_info['referenced_by'])}\n"
-                markdown += "\n"
+                    section += f"- **Referenced by**: {', '.join(rel_info['referenced_by'])}\n"
+                yield section + "\n"
+        
+        # Row counts and fan-out, so the model knows which joins explode
+        yield self.render_cardinality_section()
         
         # Add complex relationships
         if self.hierarchical_relationships:
-            markdown += "## Hierarchical Relationships\n\n"
+            yield "## Hierarchical Relationships\n\n"
             for rel in self.hierarchical_relationships:
-                markdown += f"- **{rel['table']}**: Self-referencing (hierarchical structure)\n"
-            markdown += "\n"
+                yield f"- **{rel['table']}**: Self-referencing (hierarchical structure)\n"
+            yield "\n"
         
         if self.many_to_many_relationships:
-            markdown += "## Many-to-Many Relationships\n\n"
+            yield "## Many-to-Many Relationships\n\n"
             for rel in self.many_to_many_relationships:
-                markdown += f"- **{rel['relationship']}**\n"
-            markdown += "\n"
+                yield f"- **{rel['relationship']}**\n"
+            yield "\n"
         
         # Add join examples
         if self.join_examples:
-            markdown += "## Join Examples\n\n"
+            yield "## Join Examples\n\n"
             for example in self.join_examples:
-                markdown += f"### {example['type']}: {example['description']}\n"
-                markdown += f"```sql\n{example['sql_pattern']}\n```\n\n"
+                yield f"### {example['type']}: {example['description']}\n```sql\n{example['sql_pattern']}\n```\n\n"
         
         # Add complex relationship examples
-        markdown += "## Complex Relationship Examples\n\n"
+        yield "## Complex Relationship Examples\n\n"
         
         # Generate relationship paths
-        relationship_paths = []
-        for table_name, rel_info in self.relationships.items():
-            if rel_info['references']:
+        if any(rel_info['references'] for rel_info in self.relationships.values()):
+            yield "**Relationship Paths:**\n"
+            for table_name, rel_info in self.relationships.items():
                 for ref_table in rel_info['references']:
-                    relationship_paths.append(f"- `{table_name}` → `{ref_table}`")
-        
-        if relationship_paths:
-            markdown += "**Relationship Paths:**\n"
-            for path in relationship_paths:
-                markdown += f"{path}\n"
-            markdown += "\n"
+                    yield f"- `{table_name}` → `{ref_table}`\n"
+            yield "\n"
         
         # Add natural language query examples
-        markdown += "## Natural Language Query Examples\n\n"
-        markdown += "Based on the schema analysis, here are example queries you can try:\n\n"
+        yield "## Natural Language Query Examples\n\n"
+        yield "Based on the schema analysis, here are example queries you can try:\n\n"
         
         # Generate example queries based on table names and relationships
         example_queries = self.generate_example_queries()
         for category, queries in example_queries.items():
-            markdown += f"### {category}\n"
-            for query in queries:
-                markdown += f"- \"{query}\"\n"
-            markdown += "\n"
+            yield f"### {category}\n" + ''.join(f"- \"{query}\"\n" for query in queries) + "\n"
+    
+    def write_markdown(self, sink):
+        """Stream the markdown schema into sink (anything with a write(str) method)."""
+        for section in self.iter_markdown_schema():
+            sink.write(section)
+    
+    def generate_markdown_schema(self):
+        """Generate comprehensive markdown schema documentation."""
+        return ''.join(self.iter_markdown_schema())
+    
+    def render_table_section(self, table_name):
+        """Markdown section for one table; unchanged tables reuse the section stored in the catalog.
+        
+        New sections are not kept, so streaming the document never holds all of it in memory.
+        """
+        section = self.table_sections.get(table_name)
+        if isinstance(section, EncodedValue):
+            return section.decode()
+        if section is not None:
+            return section
         
-        return markdown
+        info = self.schema_info[table_name]
+        section = f"### {table_name}\n\n"
+        section += "**Columns:**\n"
+        
+        for column in info['columns']:
+            col_id, col_name, col_type, not_null, default_val, pk = column
+            pk_indicator = " 🔑" if pk else ""
+            not_null_indicator = " NOT NULL" if not_null else ""
+            default_indicator = f" DEFAULT {default_val}" if default_val else ""
+            
+            section += f"- `{col_name}` ({col_type}){pk_indicator}{not_null_indicator}{default_indicator}\n"
+        
+        # Add foreign key information
+        if info['foreign_keys']:
+            section += "\n**Foreign Keys:**\n"
+            for fk in info['foreign_keys']:
+                id, seq, table, from_col, to_col, on_update, on_delete, match = fk
+                section += f"- `{from_col}` → `{table}.{to_col}`\n"
+        
+        # Add sample data
+        if self.sample_data[table_name]:
+            section += "\n**Sample Data:**\n"
+            section += "```\n"
+            for row in self.sample_data[table_name]['rows']:
+                section += f"{row}\n"
+            section += "```\n"
+        
+        section += "\n"
+        return section
     
     def generate_example_queries(self):
         """Generate example natural language queries based on schema."""
@@ -340,54 +576,536 @@ This database contains {len(self.schema_info)} tables with complex relationships
         
         return examples
     
-    def save_markdown(self, output_file):
-        """Save the markdown schema to a file."""
-        markdown_content = self.generate_markdown_schema()
+    def get_named_index_columns(self, table_name):
+        """{index name: column list} for the table's full (non-partial) indexes."""
+        indexes = {}
+        for index in self.schema_info[table_name]['indexes']:
+            seq, index_name, unique, origin, partial = index
+            if partial:
+                continue
+            self.cursor.execute(f'PRAGMA index_info("{index_name}")')
+            indexes[index_name] = [row[2] for row in self.cursor.fetchall()]
+        return indexes
+    
+    def get_index_columns(self, table_name):
+        """Column lists of the table's full (non-partial) indexes, plus an INTEGER PRIMARY KEY rowid alias."""
+        info = self.schema_info[table_name]
+        indexed = []
+        primary_key = primary_key_columns(info)
+        if len(primary_key) == 1 and any(column[1] == primary_key[0] and (column[2] or '').upper() == 'INTEGER'
+                                         for column in info['columns']):
+            indexed.append(primary_key)
+        indexed.extend(self.get_named_index_columns(table_name).values())
+        return indexed
+    
+    def read_stat1(self):
+        """{table: {index name or None: [rows, avg rows per key prefix, ...]}} from sqlite_stat1, or {}."""
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        if not self.cursor.fetchone():
+            return {}
+        stats = defaultdict(dict)
+        self.cursor.execute("SELECT tbl, idx, stat FROM sqlite_stat1")
+        for table_name, index_name, stat in self.cursor.fetchall():
+            numbers = []
+            for token in (stat or '').split():
+                if not token.isdigit():
+                    break  # trailing flags such as "unordered" or "sz=..."
+                numbers.append(int(token))
+            if numbers:
+                stats[table_name][index_name] = numbers
+        return stats
+    
+    def collect_statistics(self):
+        """Row count per table and average fan-out per foreign key, from sqlite_stat1 when ANALYZE has run.
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        A foreign key's fan-out is how many child rows one parent row joins: the stat1 average
+        rows per key of an index led by the foreign key columns, else rows(child) / rows(parent).
+        """
+        stat1 = self.read_stat1()
+        self.table_stats = {}
+        for table_name in self.schema_info:
+            table_stat = stat1.get(table_name)
+            if table_stat:
+                self.table_stats[table_name] = {'rows': next(iter(table_stat.values()))[0], 'source': 'sqlite_stat1'}
+            else:
+                self.table_stats[table_name] = {'rows': self.table_rows(table_name), 'source': 'estimate'}
+            self.table_stats[table_name]['fan_out'] = []
         
-        print(f"✅ Markdown schema saved to: {output_file}")
-        return output_file
-
-def main():
-    """Main function to analyze the e-commerce database."""
+        self.fan_outs = []
+        index_columns = {}
+        for edge in self.fk_graph.edges:
+            if edge.is_self_reference or edge.ref_table not in self.table_stats:
+                continue
+            if edge.table not in index_columns:
+                index_columns[edge.table] = self.get_named_index_columns(edge.table)
+            fan_out, source = None, 'row ratio'
+            width = len(edge.from_columns)
+            for index_name, columns in index_columns[edge.table].items():
+                numbers = stat1.get(edge.table, {}).get(index_name, [])
+                if set(columns[:width]) == set(edge.from_columns) and len(numbers) > width:
+                    fan_out, source = float(numbers[width]), 'sqlite_stat1'
+                    break
+            if fan_out is None:
+                fan_out = self.table_stats[edge.table]['rows'] / max(self.table_stats[edge.ref_table]['rows'], 1)
+            fan = {'table': edge.table, 'ref_table': edge.ref_table, 'columns': list(edge.from_columns),
+                   'fan_out': fan_out, 'source': source}
+            self.fan_outs.append(fan)
+            self.table_stats[edge.table]['fan_out'].append(fan)
+        return self.table_stats, self.fan_outs
     
-    # Database path
-    db_path = "/Users/anidhula/learn/DB_SQL_Natural_Language/3_Complex_ecommerce_database/mydb.sqlite"
+    def cardinality_hints(self, tables=None, threshold=FAN_OUT_HINT_THRESHOLD):
+        """Hints for the joins (between tables, if given) that multiply rows by at least threshold; largest first."""
+        wanted = set(tables) if tables is not None else None
+        fan_outs = [fan for fan in self.fan_outs if fan['fan_out'] >= threshold
+                    and (wanted is None or (fan['table'] in wanted and fan['ref_table'] in wanted))]
+        hints = {}
+        for fan in sorted(fan_outs, key=lambda fan: -fan['fan_out']):
+            # Two foreign keys between the same tables (created_by, assigned_to) need one hint
+            hints.setdefault((fan['table'], fan['ref_table']), fan_out_hint(fan['table'], fan['ref_table'], fan['fan_out']))
+        return list(hints.values())
     
-    # Output file
-    output_file = "ecommerce_database_schema.md"
+    def render_cardinality_section(self):
+        """Markdown with row counts, foreign key fan-out and the resulting query hints."""
+        if not self.table_stats:
+            return ""
+        analyzed = any(stat['source'] == 'sqlite_stat1' for stat in self.table_stats.values())
+        section = "## Cardinality\n\n"
+        section += ("Row counts and join fan-out from `sqlite_stat1`.\n\n" if analyzed else
+                    "Row counts and join fan-out estimated from rowids (run ANALYZE for exact statistics).\n\n")
+        section += "**Rows:**\n"
+        for table_name, stat in self.table_stats.items():
+            section += f"- `{table_name}`: ~{stat['rows']:,}\n"
+        if self.fan_outs:
+            section += "\n**Join fan-out** (rows of the referencing table per referenced row):\n"
+            for fan in self.fan_outs:
+                section += (f"- `{fan['ref_table']}` → `{fan['table']}` ({', '.join(fan['columns'])}): "
+                            f"~{fan['fan_out']:,.1f}\n")
+        hints = self.cardinality_hints()
+        if hints:
+            section += "\n**Query hints:**\n"
+            for hint in hints:
+                section += f"- {hint}\n"
+        return section + "\n"
     
-    print("🚀 Database Schema Analyzer")
-    print("=" * 50)
+    def lint_unindexed_foreign_keys(self):
+        """Foreign keys whose columns are not the leading columns of any index: every join or
+        ON DELETE check through them scans the child table."""
+        issues = []
+        for edge in self.fk_graph.edges:
+            width = len(edge.from_columns)
+            if any(set(columns[:width]) == set(edge.from_columns) for columns in self.get_index_columns(edge.table)):
+                continue
+            columns = ', '.join(edge.from_columns)
+            issues.append(LintIssue(
+                'high', 'unindexed foreign key', edge.table, columns, self.table_rows(edge.table),
+                f"`{edge.table}.{columns}` → `{edge.ref_table}` has no index; joins from `{edge.ref_table}` "
+                f"scan all of `{edge.table}`",
+                f"CREATE INDEX idx_{edge.table}_{'_'.join(edge.from_columns)} ON {edge.table} ({columns});"
+            ))
+        return issues
     
-    try:
-        # Initialize analyzer
-        analyzer = DatabaseSchemaAnalyzer(db_path)
+    def lint_missing_statistics(self):
+        """Tables without sqlite_stat1 rows: the query planner guesses their size and selectivity."""
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        analyzed = set()
+        if self.cursor.fetchone():
+            self.cursor.execute("SELECT DISTINCT tbl FROM sqlite_stat1")
+            analyzed = {row[0] for row in self.cursor.fetchall()}
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'")
+        virtual = {row[0] for row in self.cursor.fetchall()}
         
-        # Connect to database
-        analyzer.connect()
+        issues = []
+        for table_name in self.schema_info:
+            # Virtual tables and their shadow tables (products_fts_data, ...) are managed by their module;
+            # ANALYZE writes no rows for empty tables
+            if (table_name in analyzed or table_name.startswith('sqlite_') or not self.table_rows(table_name)
+                    or any(table_name == name or table_name.startswith(f"{name}_") for name in virtual)):
+                continue
+            issues.append(LintIssue(
+                'medium', 'missing statistics', table_name, None, self.table_rows(table_name),
+                f"`{table_name}` has no sqlite_stat1 rows, so the planner cannot tell selective indexes apart",
+                f"ANALYZE {table_name};"
+            ))
+        return issues
+    
+    def lint_unmaintained_aggregates(self):
+        """Denormalized aggregate columns (total_*, *_count, ...) that no trigger keeps up to date."""
+        self.cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'")
+        trigger_sql = [row[0] or '' for row in self.cursor.fetchall()]
         
-        # Analyze database
-        analyzer.analyze_database()
+        issues = []
+        for table_name, info in self.schema_info.items():
+            updates = [sql for sql in trigger_sql if re.search(rf'\bUPDATE\s+"?{re.escape(table_name)}"?\s', sql, re.IGNORECASE)]
+            for column in info['columns']:
+                column_name = column[1]
+                if not DENORMALIZED_COLUMN.search(column_name) or column[5]:
+                    continue
+                if any(re.search(rf'\b{re.escape(column_name)}\b', sql) for sql in updates):
+                    continue
+                issues.append(LintIssue(
+                    'medium', 'unmaintained aggregate', table_name, column_name, self.table_rows(table_name),
+                    f"`{table_name}.{column_name}` looks like a stored aggregate but no trigger updates it; "
+                    f"it drifts unless application code recomputes it",
+                    self.aggregate_trigger_skeleton(table_name, column_name)
+                ))
+        return issues
+    
+    def aggregate_trigger_skeleton(self, table_name, column_name):
+        """Insert/delete triggers recomputing table_name.column_name from a table referencing it,
+        preferably the one the column is named after (review_count → reviews)."""
+        incoming = [edge for edge in self.fk_graph.incoming.get(table_name, []) if not edge.is_self_reference]
+        if not incoming:
+            return f"-- No table references {table_name}: recompute {column_name} where its inputs are written"
         
-        # Generate and save markdown
-        analyzer.save_markdown(output_file)
+        named = [edge for edge in incoming
+                 if any(variant.replace(' ', '_') in column_name.lower() for variant in table_name_variants(edge.table))]
+        edge = (named or incoming)[0]
+        aggregate = 'COUNT(*)' if re.search(r'count$|^num_', column_name, re.IGNORECASE) else f"SUM({edge.table}.<value column>)"
+        statements = [f"-- Adjust the aggregate to what {column_name} means; add an UPDATE trigger if rows move"]
+        for event, row in (('insert', 'NEW'), ('delete', 'OLD')):
+            match_child = ' AND '.join(f"{edge.table}.{from_column} = {row}.{from_column}" for from_column in edge.from_columns)
+            match_parent = ' AND '.join(f"{to_column} = {row}.{from_column}"
+                                        for from_column, to_column in zip(edge.from_columns, edge.to_columns))
+            statements.append(
+                f"CREATE TRIGGER trg_{edge.table}_{table_name}_{column_name}_{event} AFTER {event.upper()} ON {edge.table}\n"
+                f"BEGIN\n"
+                f"    UPDATE {table_name} SET {column_name} = (SELECT {aggregate} FROM {edge.table} WHERE {match_child})\n"
+                f"    WHERE {match_parent};\n"
+                f"END;"
+            )
+        return '\n'.join(statements)
+    
+    def lint_wide_sampled_text(self):
+        """TEXT values in the sample rows long enough to bloat every prompt the schema goes into."""
+        issues = []
+        for table_name, sample in self.sample_data.items():
+            if not sample:
+                continue
+            for position, column_name in enumerate(sample['columns']):
+                widest = max((len(row[position]) for row in sample['rows'] if isinstance(row[position], str)), default=0)
+                if widest > WIDE_TEXT_LENGTH:
+                    issues.append(LintIssue(
+                        'low', 'wide sampled text', table_name, column_name, self.table_rows(table_name),
+                        f"Sampled `{table_name}.{column_name}` values reach {widest:,} characters in the prompt",
+                        f"-- Truncate sampled text: DatabaseSchemaAnalyzer(db_path, sample_text_limit=80)"
+                    ))
+        return issues
+    
+    def table_rows(self, table_name):
+        """Row-count estimate from the table's fingerprint."""
+        return (self.fingerprints.get(table_name) or {}).get('row_estimate', 0)
+    
+    def lint_performance(self):
+        """Cross-check the collected schema for performance problems; most severe and largest tables first."""
+        issues = (self.lint_unindexed_foreign_keys() + self.lint_missing_statistics()
+                  + self.lint_unmaintained_aggregates() + self.lint_wide_sampled_text())
+        return sorted(issues, key=lambda issue: (LINT_SEVERITY_RANK[issue.severity], -issue.rows,
+                                                 issue.table, issue.column or ''))
+    
+    def save_lint_report(self, output_file, issues=None):
+        """Save the ranked lint issues with the SQL fixing each one as markdown."""
+        issues = self.lint_performance() if issues is None else issues
+        counts = {severity: sum(issue.severity == severity for issue in issues) for severity in LINT_SEVERITY_RANK}
+        lines = [
+            "# Performance Lint Report",
+            "",
+            f"**Database**: `{os.path.basename(self.db_path)}`  ",
+            f"**Issues**: {len(issues)} ({counts['high']} high, {counts['medium']} medium, {counts['low']} low)",
+            "",
+            "| # | Severity | Check | Table | Column | Rows |",
+            "|---|---|---|---|---|---|"
+        ]
+        lines += [f"| {number} | {issue.severity} | {issue.check} | `{issue.table}` | {issue.column or ''} | {issue.rows:,} |"
+                  for number, issue in enumerate(issues, 1)]
+        lines += ["", "## Fixes", ""]
+        for number, issue in enumerate(issues, 1):
+            lines += [f"### {number}. {issue.check}: {issue.table}{'.' + issue.column if issue.column else ''}",
+                      "", issue.message, "", "```sql", issue.fix, "```", ""]
         
-        # Disconnect
-        analyzer.disconnect()
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"✅ Performance lint report saved to: {output_file}")
+        return output_file
+    
+    def save_markdown(self, output_file):
+        """Save the markdown schema to a file, writing it section by section."""
+        with open(output_file, 'w', encoding='utf-8') as f:
+            self.write_markdown(f)
         
-        print("\n🎉 Analysis complete!")
-        print(f"📄 Schema documentation: {output_file}")
-        print(f"📊 Tables analyzed: {len(analyzer.schema_info)}")
-        print(f"🔗 Relationships found: {sum(len(rel['references']) + len(rel['referenced_by']) for rel in analyzer.relationships.values())}")
+        print(f"✅ Markdown schema saved to: {output_file}")
+        return output_file
+
+# The e-commerce example database this project ships with
+DEFAULT_DB_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                               '..', '3_Complex_ecommerce_database', 'mydb.sqlite'))
+DEFAULT_OUTPUT_STEM = "ecommerce_database"
+DATABASE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3', '.db3')
+CATALOG_EXTENSIONS = {'json': '.catalog.json', 'msgpack': '.catalog.msgpack'}
+
+def find_databases(patterns):
+    """Expand database files, directories (searched recursively) and glob patterns into sorted paths."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files if name.lower().endswith(DATABASE_EXTENSIONS))
+        elif glob.has_magic(pattern):
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+def output_stems(db_paths):
+    """Unique output file stem per database.
+    
+    The file name, or for names that collide the path below their common directory
+    (t/a/data/app.db → a_data_app), plus the extension if that still collides
+    (foo.db → foo_db); anything left over gets a numeric suffix.
+    """
+    names = defaultdict(list)
+    for path in db_paths:
+        names[os.path.splitext(os.path.basename(path))[0]].append(path)
+    stems = {}
+    for name, paths in names.items():
+        if len(paths) == 1:
+            stems[paths[0]] = name
+            continue
+        absolute = [os.path.abspath(path) for path in paths]
+        root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+        relative = [os.path.splitext(os.path.relpath(path, root)) for path in absolute]
+        with_extension = len({stem for stem, _ in relative}) < len(relative)
+        for path, (stem, extension) in zip(paths, relative):
+            stem = stem.replace(os.sep, '_')
+            stems[path] = f"{stem}_{extension.lstrip('.')}" if with_extension and extension else stem
+    
+    # Flattened paths can still meet (a_b/x.db and a/b_x.db); output files must never be shared
+    taken = set()
+    for path in db_paths:
+        stem = candidate = stems[path]
+        number = 2
+        while candidate in taken:
+            candidate = f"{stem}_{number}"
+            number += 1
+        taken.add(candidate)
+        stems[path] = candidate
+    return stems
+
+def table_shape(info):
+    """Short hash of a table's columns (name, type, NOT NULL, primary key) and foreign keys."""
+    columns = [(column[1], (column[2] or '').upper(), column[3], column[5]) for column in info['columns']]
+    foreign_keys = sorted((fk[2], fk[3], fk[4]) for fk in info['foreign_keys'])
+    return hashlib.sha256(repr((columns, foreign_keys)).encode('utf-8')).hexdigest()[:12]
+
+def analyze_one(task):
+    """Analyze one database into output_dir; returns a result dict with per-phase timings.
+    
+    Runs in a worker process; the analyzer's own progress output is captured instead of interleaved.
+    """
+    db_path, stem, output_dir, catalog_format, lint, run_analyze = task
+    markdown_file = os.path.join(output_dir, f"{stem}_schema.md")
+    catalog_file = os.path.join(output_dir, f"{stem}_schema{CATALOG_EXTENSIONS[catalog_format]}")
+    result = {'db_path': db_path, 'markdown': markdown_file, 'catalog': catalog_file, 'timings': {}, 'error': None}
+    timings = result['timings']
+    log = io.StringIO()
+    
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        with contextlib.redirect_stdout(log):
+            analyzer = DatabaseSchemaAnalyzer(db_path, catalog_file, run_analyze=run_analyze)
+            phase_start = time.perf_counter()
+            analyzer.connect()
+            timings['connect'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
+            analyzer.analyze_database()
+            timings['analyze'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
+            analyzer.save_markdown(markdown_file)
+            timings['markdown'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
+            analyzer.save_catalog()
+            timings['catalog'] = time.perf_counter() - phase_start
+            
+            if lint:
+                phase_start = time.perf_counter()
+                issues = analyzer.lint_performance()
+                result['lint_report'] = analyzer.save_lint_report(
+                    os.path.join(output_dir, f"{stem}_performance_lint.md"), issues)
+                result['lint_issues'] = len(issues)
+                timings['lint'] = time.perf_counter() - phase_start
+            analyzer.disconnect()
         
+        result['shapes'] = {table_name: table_shape(info) for table_name, info in analyzer.schema_info.items()}
+        result['changed_tables'] = len(analyzer.changed_tables)
+        result['relationships'] = sum(len(rel['references']) + len(rel['referenced_by'])
+                                      for rel in analyzer.relationships.values())
     except Exception as e:
-        print(f"❌ Error: {e}")
+        result['error'] = str(e)
+    result['log'] = log.getvalue()
+    return result
+
+def analyze_databases(db_paths, output_dir=".", jobs=None, catalog_format='json', stems=None, progress=None,
+                      lint=False, run_analyze=False):
+    """Analyze many databases across a process pool; returns one result dict per database, in input order.
+    
+    progress(done, total, result) is called as each database finishes. With lint, each database
+    also gets a <stem>_performance_lint.md report; with run_analyze, ANALYZE runs on each first.
+    """
+    stems = stems or output_stems(db_paths)
+    tasks = [(path, stems[path], output_dir, catalog_format, lint, run_analyze) for path in db_paths]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    
+    results = {}
+    if jobs == 1:
+        finished = map(analyze_one, tasks)
+    else:
+        pool = multiprocessing.Pool(jobs)
+        finished = pool.imap_unordered(analyze_one, tasks)
+    try:
+        for result in finished:
+            results[result['db_path']] = result
+            if progress:
+                progress(len(results), len(tasks), result)
+    finally:
+        if jobs > 1:
+            pool.close()
+            pool.join()
+    return [results[path] for path in db_paths]
+
+def summarize_databases(results):
+    """Cross-database summary: how many databases have each table, and tables whose shape drifts between them."""
+    analyzed = [result for result in results if not result['error']]
+    shapes = defaultdict(lambda: defaultdict(list))
+    for result in analyzed:
+        for table_name, shape in result['shapes'].items():
+            shapes[table_name][shape].append(result['db_path'])
+    
+    tables = {}
+    for table_name, variants in sorted(shapes.items()):
+        # The most common shape is the reference; databases with another shape have drifted
+        ordered = sorted(variants.items(), key=lambda item: (-len(item[1]), item[0]))
+        tables[table_name] = {
+            'databases': sum(len(paths) for _, paths in ordered),
+            'shape': ordered[0][0],
+            'drifted': sorted(path for _, paths in ordered[1:] for path in paths)
+        }
+    return {
+        'databases': len(results),
+        'failed': [(result['db_path'], result['error']) for result in results if result['error']],
+        'tables': tables,
+        'shared_tables': [name for name, table in tables.items() if table['databases'] == len(analyzed) and not table['drifted']],
+        'drifted_tables': [name for name, table in tables.items() if table['drifted']],
+        'partial_tables': [name for name, table in tables.items() if table['databases'] < len(analyzed)]
+    }
+
+def write_summary_markdown(summary, results, output_file):
+    """Save the cross-database summary and per-database timings as markdown."""
+    lines = [
+        "# Multi-Database Schema Summary",
+        "",
+        f"**Databases**: {summary['databases']} ({len(summary['failed'])} failed)  ",
+        f"**Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "## Shared Tables",
+        "",
+        "Same shape (columns, types, keys) in every database:",
+        ""
+    ]
+    lines += [f"- `{name}`" for name in summary['shared_tables']] or ["- (none)"]
+    lines += ["", "## Schema Drift", ""]
+    for name in summary['drifted_tables']:
+        table = summary['tables'][name]
+        lines.append(f"### {name}")
+        lines.append(f"- {table['databases'] - len(table['drifted'])} of {table['databases']} databases share the common shape `{table['shape']}`")
+        lines += [f"- Differs in `{path}`" for path in table['drifted']]
+        lines.append("")
+    if not summary['drifted_tables']:
+        lines += ["No table differs between databases.", ""]
+    if summary['partial_tables']:
+        lines += ["## Tables Missing From Some Databases", ""]
+        lines += [f"- `{name}`: in {summary['tables'][name]['databases']} of {summary['databases'] - len(summary['failed'])}"
+                  for name in summary['partial_tables']]
+        lines.append("")
+    if summary['failed']:
+        lines += ["## Failed", ""]
+        lines += [f"- `{path}`: {error}" for path, error in summary['failed']]
+        lines.append("")
+    lines += ["## Timings (ms)", "", "| Database | Connect | Analyze | Markdown | Catalog |", "|---|---|---|---|---|"]
+    for result in results:
+        timings = result['timings']
+        lines.append(f"| `{result['db_path']}` | " + " | ".join(
+            f"{timings[phase] * 1000:.1f}" if phase in timings else "-" for phase in ('connect', 'analyze', 'markdown', 'catalog')) + " |")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return output_file
+
+def print_progress(done, total, result):
+    """One line per finished database: tables, per-phase timings or the error."""
+    name = os.path.basename(result['db_path'])
+    if result['error']:
+        print(f"[{done}/{total}] ❌ {name}: {result['error']}")
+        return
+    timings = ' '.join(f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in result['timings'].items())
+    print(f"[{done}/{total}] ✅ {name}: {len(result['shapes'])} tables "
+          f"({result['changed_tables']} re-analyzed) | {timings}")
+
+def main():
+    """Analyze one or many SQLite databases into markdown and catalogs."""
+    parser = argparse.ArgumentParser(description="Analyze SQLite databases for NL-to-SQL schema documentation")
+    parser.add_argument('databases', nargs='*',
+                        help="Database files, directories or glob patterns (default: the e-commerce example database)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for several databases (default: CPU count)")
+    parser.add_argument('--output-dir', default=".", help="Where the markdown and catalog files go (default: .)")
+    parser.add_argument('--format', choices=sorted(CATALOG_EXTENSIONS), default='json',
+                        help="Catalog format (default: json; msgpack needs pip install msgpack)")
+    parser.add_argument('--lint', action='store_true',
+                        help="Also write a ranked performance lint report with fixes per database")
+    parser.add_argument('--analyze', action='store_true',
+                        help="Run ANALYZE first so row counts and join fan-out come from sqlite_stat1 (writes to the database)")
+    args = parser.parse_args()
+    
+    print("🚀 Database Schema Analyzer")
+    print("=" * 50)
+    
+    db_paths = find_databases(args.databases) if args.databases else [DEFAULT_DB_PATH]
+    if not db_paths:
+        print(f"❌ Error: no databases match {' '.join(args.databases)}")
         return 1
+    stems = {DEFAULT_DB_PATH: DEFAULT_OUTPUT_STEM} if not args.databases else None
+    
+    if len(db_paths) == 1:
+        # A single database keeps the analyzer's own progress output
+        result = analyze_one((db_paths[0], (stems or output_stems(db_paths))[db_paths[0]], args.output_dir,
+                              args.format, args.lint, args.analyze))
+        print(result['log'], end='')
+        if result['error']:
+            print(f"❌ Error: {result['error']}")
+            return 1
+        
+        print("\n🎉 Analysis complete!")
+        print(f"📄 Schema documentation: {result['markdown']}")
+        print(f"📊 Tables analyzed: {len(result['shapes'])}")
+        print(f"🔗 Relationships found: {result['relationships']}")
+        if args.lint:
+            print(f"🩺 Performance issues: {result['lint_issues']} ({result['lint_report']})")
+        return 0
+    
+    print(f"📚 Analyzing {len(db_paths)} databases with {min(args.jobs, len(db_paths))} jobs")
+    start = time.perf_counter()
+    results = analyze_databases(db_paths, args.output_dir, args.jobs, args.format, progress=print_progress,
+                                lint=args.lint, run_analyze=args.analyze)
+    summary = summarize_databases(results)
+    summary_file = write_summary_markdown(summary, results, os.path.join(args.output_dir, "schema_summary.md"))
     
-    return 0
+    print(f"\n🎉 Analyzed {len(db_paths)} databases in {time.perf_counter() - start:.2f}s")
+    print(f"🤝 Shared tables: {len(summary['shared_tables'])}, drifted: {len(summary['drifted_tables'])}, "
+          f"missing from some databases: {len(summary['partial_tables'])}")
+    print(f"📄 Summary: {summary_file}")
+    return 1 if summary['failed'] else 0
 
 if __name__ == "__main__":
     exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Fixtures for the Schema Analyzer
+Shared by the test scripts: a temporary working directory that is removed with
+everything in it (databases, catalogs, markdown) when the test is done, a database
+built from a schema script inside it, and a quiet analyzer run.
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+
+from db_schema_analyzer import DatabaseSchemaAnalyzer
+
+
+@contextlib.contextmanager
+def temp_workdir():
+    """A temporary directory for one test; removed with its contents when the block ends."""
+    with tempfile.TemporaryDirectory(prefix='schema_analyzer_test_') as workdir:
+        yield workdir
+
+
+def create_database(workdir, schema, name='shop.db', journal_mode=None):
+    """Create workdir/name from a schema script (optionally in journal_mode); returns its path."""
+    db_path = os.path.join(workdir, name)
+    conn = sqlite3.connect(db_path)
+    if journal_mode:
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.executescript(schema)
+    conn.close()
+    return db_path
+
+
+def run_analyzer(db_path, catalog_path=None, markdown_path=None, disconnect=True, **options):
+    """Analyze db_path with the progress output suppressed; returns the analyzer.
+
+    Saves the markdown and the catalog when their paths are given. With disconnect=False
+    the analyzer stays connected, for tests that go on to query or lint through it.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = DatabaseSchemaAnalyzer(db_path, catalog_path, **options)
+        analyzer.connect()
+        analyzer.analyze_database()
+        if markdown_path:
+            analyzer.save_markdown(markdown_path)
+        if catalog_path:
+            analyzer.save_catalog()
+        if disconnect:
+            analyzer.disconnect()
+    return analyzer
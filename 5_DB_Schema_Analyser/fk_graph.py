@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Foreign Key Graph
+One adjacency-list graph of every foreign key in a schema, built in a single pass over
+the PRAGMA foreign_key_list rows. Edges are typed: they carry the real column pairs,
+whether they are self-references, and which tables are junction tables. Relationship
+mapping, hierarchy and many-to-many detection and the join examples all read from it,
+so they scale linearly with the number of foreign keys.
+"""
+
+from collections import namedtuple
+
+
+class ForeignKeyEdge(namedtuple('ForeignKeyEdge', ['table', 'ref_table', 'from_columns', 'to_columns', 'fk_id'])):
+    """One foreign key: table.from_columns → ref_table.to_columns (several columns for composite keys)."""
+    __slots__ = ()
+
+    @property
+    def is_self_reference(self):
+        """True for hierarchies such as categories.parent_category_id → categories.category_id."""
+        return self.table == self.ref_table
+
+    def join_condition(self, alias=None, ref_alias=None):
+        """ON condition for this edge, e.g. 'orders.customer_id = customers.customer_id'."""
+        alias = alias or self.table
+        ref_alias = ref_alias or self.ref_table
+        return ' AND '.join(f"{alias}.{from_column} = {ref_alias}.{to_column}"
+                            for from_column, to_column in zip(self.from_columns, self.to_columns))
+
+
+class ForeignKeyGraph:
+    """Outgoing and incoming foreign key edges per table."""
+
+    def __init__(self, schema_info):
+        """Build from {table: {'columns': ..., 'foreign_keys': ...}} as collected by the analyzer."""
+        self.tables = list(schema_info)
+        self.edges = []
+        self.outgoing = {table: [] for table in self.tables}
+        self.incoming = {table: [] for table in self.tables}
+
+        for table, info in schema_info.items():
+            # PRAGMA foreign_key_list gives one row per column; rows of a composite key share an id
+            rows_by_id = {}
+            for fk in info['foreign_keys']:
+                rows_by_id.setdefault(fk[0], []).append(fk)
+            for fk_id, rows in rows_by_id.items():
+                rows.sort(key=lambda row: row[1])
+                ref_table = rows[0][2]
+                to_columns = [row[4] for row in rows]
+                if None in to_columns:
+                    # "REFERENCES parent" without columns points at the parent's primary key
+                    to_columns = primary_key_columns(schema_info.get(ref_table)) or to_columns
+                edge = ForeignKeyEdge(table, ref_table, tuple(row[3] for row in rows), tuple(to_columns), fk_id)
+                self.edges.append(edge)
+                self.outgoing[table].append(edge)
+                self.incoming.setdefault(ref_table, []).append(edge)
+
+        # A table whose only foreign keys are exactly two edges links the two tables many-to-many
+        self.junction_tables = {table: edges for table, edges in self.outgoing.items() if len(edges) == 2}
+
+    def references(self, table):
+        """Tables that table points at, one entry per foreign key, in declaration order."""
+        return [edge.ref_table for edge in self.outgoing.get(table, [])]
+
+    def referenced_by(self, table):
+        """Other tables that point at table, one entry per foreign key."""
+        return [edge.table for edge in self.incoming.get(table, []) if not edge.is_self_reference]
+
+    def self_references(self):
+        """Edges from a table to itself."""
+        return [edge for edge in self.edges if edge.is_self_reference]
+
+    def neighbours(self, table):
+        """(edge, other table) for every edge touching table, in either direction, excluding self-references."""
+        pairs = [(edge, edge.ref_table) for edge in self.outgoing.get(table, []) if not edge.is_self_reference]
+        pairs.extend((edge, edge.table) for edge in self.incoming.get(table, []) if not edge.is_self_reference)
+        return pairs
+
+
+def primary_key_columns(info):
+    """Primary key columns of a table in key order, from its PRAGMA table_info rows."""
+    if not info:
+        return []
+    return [column[1] for column in sorted((column for column in info['columns'] if column[5]),
+                                           key=lambda column: column[5])]
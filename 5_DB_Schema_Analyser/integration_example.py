@@ -5,44 +5,227 @@ This shows how to use the generated markdown schema in your NL-to-SQL applicatio
 """
 
 import os
+import threading
+from collections import Counter, namedtuple
+from contextlib import contextmanager
 from openai import OpenAI
 from dotenv import load_dotenv
+from db_schema_analyzer import FAN_OUT_HINT_THRESHOLD, DatabaseSchemaAnalyzer, fan_out_hint
+from fk_graph import ForeignKeyGraph
+from schema_catalog import CatalogReader
+from join_planner import JoinPlanner, match_tables
+from schema_retrieval import DEFAULT_MAX_SCHEMA_CHARS, SchemaIndex
+from schema_watcher import DEFAULT_POLL_INTERVAL, SchemaWatcher, print_rebuild
 
 # Load environment variables
 load_dotenv()
 
+# Everything a prompt is built from, swapped as one object when the schema changes
+SchemaArtifacts = namedtuple('SchemaArtifacts', ['schema_index', 'catalog', 'join_planner'])
+
+def close_artifacts(artifacts):
+    """Release the memory-mapped catalog of a SchemaArtifacts (None is ignored)."""
+    if artifacts and artifacts.catalog:
+        artifacts.catalog.close()
+
 class NLToSQLWithSchema:
     """Natural Language to SQL converter using generated schema."""
     
-    def __init__(self, schema_file_path):
-        """Initialize with path to generated schema markdown file."""
+    def __init__(self, schema_file_path, catalog_path=None, max_schema_chars=DEFAULT_MAX_SCHEMA_CHARS,
+                 db_path=None, watch_interval=DEFAULT_POLL_INTERVAL):
+        """Initialize with path to generated schema markdown file (and the analyzer's catalog next to it).
+        
+        With db_path, the schema files are regenerated from that database and a SchemaWatcher
+        rebuilds them in the background whenever its schema changes.
+        """
         self.schema_file_path = schema_file_path
+        self.catalog_path = catalog_path or f"{os.path.splitext(schema_file_path)[0]}.catalog.json"
+        self.max_schema_chars = max_schema_chars
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.schema_content = self.load_schema()
+        # Artifacts swapped out by a rebuild are closed once no request holds them any more
+        self._holds_lock = threading.RLock()
+        self._holds = Counter()
+        self._retired = {}
+        self._live = None
+        if db_path:
+            self.watcher = SchemaWatcher(db_path, self.build_artifacts, watch_interval,
+                                         on_rebuild=self._swapped_in).start()
+            self._artifacts = None
+        else:
+            self.watcher = None
+            self._artifacts = self.load_artifacts()
+    
+    @property
+    def artifacts(self):
+        """Current SchemaArtifacts; take it once per question so every part of the prompt agrees."""
+        return self.watcher.snapshot.value if self.watcher else self._artifacts
+    
+    @contextmanager
+    def hold_artifacts(self):
+        """Current SchemaArtifacts, kept open until the block ends even if a rebuild swaps them out."""
+        with self._holds_lock:
+            artifacts = self.artifacts
+            self._holds[id(artifacts)] += 1
+        try:
+            yield artifacts
+        finally:
+            with self._holds_lock:
+                self._holds[id(artifacts)] -= 1
+                if not self._holds[id(artifacts)]:
+                    del self._holds[id(artifacts)]
+                    if self._retired.pop(id(artifacts), None) is not None:
+                        close_artifacts(artifacts)
+    
+    def _swapped_in(self, seconds, snapshot):
+        """Watcher callback after a rebuild: retire the previous artifacts, closing them unless a request holds them."""
+        print_rebuild(seconds, snapshot)
+        with self._holds_lock:
+            previous, self._live = self._live, snapshot.value
+            if previous is None:
+                return
+            if self._holds[id(previous)]:
+                self._retired[id(previous)] = previous
+            else:
+                close_artifacts(previous)
+    
+    def close(self):
+        """Stop the watcher and close the current artifacts."""
+        if self.watcher:
+            self.watcher.stop()
+        with self._holds_lock:
+            close_artifacts(self._live or self._artifacts)
+            self._live = self._artifacts = None
+    
+    @property
+    def schema_index(self):
+        """Section index of the current artifacts."""
+        return self.artifacts.schema_index
+    
+    @property
+    def catalog(self):
+        """Catalog reader of the current artifacts, or None."""
+        return self.artifacts.catalog
+    
+    @property
+    def join_planner(self):
+        """Join planner of the current artifacts, or None."""
+        return self.artifacts.join_planner
+    
+    def build_artifacts(self, db_path):
+        """Re-analyze db_path (incrementally, through the catalog), rewrite the schema files and load them."""
+        analyzer = DatabaseSchemaAnalyzer(db_path, self.catalog_path)
+        analyzer.connect()
+        try:
+            analyzer.analyze_database()
+            analyzer.save_markdown(self.schema_file_path)
+            analyzer.save_catalog()
+        finally:
+            analyzer.disconnect()
+        return self.load_artifacts()
+    
+    def load_artifacts(self):
+        """Load the schema index, the catalog and the join planner from the schema files."""
+        catalog = self.load_catalog()
+        return SchemaArtifacts(self.load_schema(), catalog, self.load_join_planner(catalog))
     
     def load_schema(self):
-        """Load the generated schema markdown file."""
+        """Split the generated schema markdown file into per-table sections and index them."""
         try:
-            with open(self.schema_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            print(f"✅ Loaded schema from: {self.schema_file_path}")
-            return content
+            index = SchemaIndex.from_file(self.schema_file_path)
+            print(f"✅ Loaded schema from: {self.schema_file_path} ({len(index.tables)} table sections)")
+            return index
         except FileNotFoundError:
             print(f"❌ Schema file not found: {self.schema_file_path}")
             return None
     
-    def generate_sql(self, natural_language_query):
-        """Generate SQL from natural language using the schema."""
+    def load_catalog(self):
+        """Memory-mapped reader over the analyzer's catalog; table entries are decoded on demand."""
+        if not os.path.exists(self.catalog_path):
+            print(f"⚠️  Catalog not found: {self.catalog_path} (no join planner; schema sections picked by the index alone)")
+            return None
+        return CatalogReader(self.catalog_path)
+    
+    def load_join_planner(self, catalog):
+        """Join planner over the catalog's foreign keys, with all shortest paths precomputed."""
+        if not catalog:
+            return None
         
-        if not self.schema_content:
-            return "Error: Schema not loaded"
+        planner = JoinPlanner(ForeignKeyGraph(catalog.schema_info()))
+        planner.precompute()
+        return planner
+    
+    def join_skeleton(self, natural_language_query, artifacts=None):
+        """Exact FROM/JOIN clause connecting the tables the question mentions, or None."""
+        join_planner = (artifacts or self.artifacts).join_planner
+        if not join_planner:
+            return None
+        
+        tables = match_tables(natural_language_query, join_planner.graph.tables)
+        if len(tables) < 2:
+            return None
+        return join_planner.join_skeleton(tables)
+    
+    def question_tables(self, natural_language_query, artifacts=None):
+        """Tables on the join tree of the tables the question names, or [] without a catalog or a match."""
+        join_planner = (artifacts or self.artifacts).join_planner
+        if not join_planner:
+            return []
+        
+        tables = match_tables(natural_language_query, join_planner.graph.tables)
+        if not tables:
+            return []
+        
+        plan = join_planner.join_tree(tables)
+        return [plan.root] + [step.table for step in plan.steps] + plan.unreachable if plan.root else plan.unreachable
+    
+    def schema_for_question(self, natural_language_query, artifacts=None):
+        """Schema text for the prompt, at most max_schema_chars of table sections.
+        
+        The tables on the question's join tree come first, then the best matches from the
+        section index, then their foreign key neighbours without sample data.
+        """
+        artifacts = artifacts or self.artifacts
+        return artifacts.schema_index.schema_text(natural_language_query,
+                                                  required=self.question_tables(natural_language_query, artifacts),
+                                                  max_chars=self.max_schema_chars)
+    
+    def cardinality_hints(self, natural_language_query, artifacts=None):
+        """Hints for the question's joins that multiply rows, from the fan-out stored in the catalog."""
+        artifacts = artifacts or self.artifacts
+        needed = set(self.question_tables(natural_language_query, artifacts))
+        fan_outs = []
+        for table in needed:
+            stats = artifacts.catalog.table(table).get('stats') or {}
+            fan_outs.extend((fan['fan_out'], table, fan['ref_table']) for fan in stats.get('fan_out', [])
+                            if fan['ref_table'] in needed and fan['fan_out'] >= FAN_OUT_HINT_THRESHOLD)
+        hints = {}
+        for fan_out, table, ref_table in sorted(fan_outs, reverse=True):
+            hints.setdefault((table, ref_table), fan_out_hint(table, ref_table, fan_out))
+        return list(hints.values())
+    
+    def build_prompt(self, natural_language_query, artifacts):
+        """The SQL generation prompt for a question from one set of artifacts, or None without a schema."""
+        if not artifacts.schema_index:
+            return None
+        
+        # The planner's join tree uses the real foreign key columns, so the model does not have to guess them
+        skeleton = self.join_skeleton(natural_language_query, artifacts)
+        join_section = f"""
+JOIN SKELETON (tables this question needs, joined on their real foreign keys):
+{skeleton}
+""" if skeleton else ""
+        
+        # Fan-out from ANALYZE statistics: which of these joins multiply rows
+        hints = self.cardinality_hints(natural_language_query, artifacts)
+        if hints:
+            join_section += "\nJOIN CARDINALITY HINTS:\n" + ''.join(f"- {hint}\n" for hint in hints)
         
         prompt = f"""
 You are a SQL expert. Convert the following natural language query to SQL.
 
 Database Schema:
-{self.schema_content}
-
+{self.schema_for_question(natural_language_query, artifacts)}
+{join_section}
 Natural Language Query: {natural_language_query}
 
 CRITICAL RULES:
@@ -56,11 +239,23 @@ CRITICAL RULES:
 8. Use GROUP BY and HAVING for grouped aggregations
 9. Use ORDER BY and LIMIT for sorting and limiting results
 10. Use meaningful table aliases for readability
-11. Return ONLY the SQL query, no explanations
+11. When a JOIN SKELETON is given, build the query on it and keep its join conditions
+12. Follow the JOIN CARDINALITY HINTS: aggregate a one-to-many table in a subquery before joining it, instead of aggregating over the multiplied rows
+13. Return ONLY the SQL query, no explanations
 
 SQL Query:
 """
-
+        return prompt
+    
+    def generate_sql(self, natural_language_query):
+        """Generate SQL from natural language using the schema."""
+        
+        # One snapshot for the whole prompt, even if the watcher swaps in a new one meanwhile
+        with self.hold_artifacts() as artifacts:
+            prompt = self.build_prompt(natural_language_query, artifacts)
+        if prompt is None:
+            return "Error: Schema not loaded"
+        
         try:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
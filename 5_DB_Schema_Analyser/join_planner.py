@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Join Path Planner
+Plans joins over the foreign key graph with the real column pairs. Shortest join paths
+come from a breadth-first search per table; they are cached and can be precomputed for
+all pairs. For the set of tables a question touches, join_tree() returns a small join
+tree connecting them (shortest-path Steiner tree approximation), memoized per table
+set. join_skeleton() renders that tree as the exact FROM/JOIN clause for the prompt.
+"""
+
+import re
+from collections import deque, namedtuple
+
+# table joins the tree through edge, whose other end is already in the tree
+JoinStep = namedtuple('JoinStep', ['table', 'edge'])
+JoinPlan = namedtuple('JoinPlan', ['root', 'steps', 'unreachable'])
+
+
+class JoinPlanner:
+    """Shortest join paths and minimal join trees over a ForeignKeyGraph."""
+
+    def __init__(self, graph):
+        """Plan over graph; paths are computed on first use unless precompute() is called."""
+        self.graph = graph
+        self._parents = {}
+        self._plans = {}
+
+    def parents_from(self, source):
+        """BFS tree from source: {table: (previous table, edge)}, source maps to (None, None)."""
+        parents = self._parents.get(source)
+        if parents is None:
+            parents = {source: (None, None)}
+            queue = deque([source])
+            while queue:
+                table = queue.popleft()
+                for edge, other in self.graph.neighbours(table):
+                    if other not in parents:
+                        parents[other] = (table, edge)
+                        queue.append(other)
+            self._parents[source] = parents
+        return parents
+
+    def precompute(self):
+        """Shortest paths between all pairs of tables; returns the number of connected pairs."""
+        return sum(len(self.parents_from(table)) - 1 for table in self.graph.tables)
+
+    def distance(self, source, target):
+        """Number of joins on the shortest path, or None if the tables are not connected."""
+        path = self.path(source, target)
+        return None if path is None else len(path)
+
+    def path(self, source, target):
+        """[JoinStep] leading from source to target, or None if they are not connected."""
+        parents = self.parents_from(source)
+        if target not in parents:
+            return None
+        steps = []
+        table = target
+        while table != source:
+            previous, edge = parents[table]
+            steps.append(JoinStep(table, edge))
+            table = previous
+        return steps[::-1]
+
+    def join_tree(self, tables):
+        """JoinPlan connecting tables with few joins; memoized per set of tables.
+
+        Starts from the table closest to all the others and repeatedly attaches the
+        nearest remaining table by its shortest path to any table already in the tree.
+        """
+        key = frozenset(tables)
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        terminals = sorted(table for table in key if table in self.graph.outgoing)
+        unreachable = sorted(key - set(terminals))
+        if not terminals:
+            plan = JoinPlan(None, [], unreachable)
+            self._plans[key] = plan
+            return plan
+
+        def total_distance(candidate):
+            parents = self.parents_from(candidate)
+            reachable = [other for other in terminals if other in parents]
+            return (len(terminals) - len(reachable),
+                    sum(len(self.path(candidate, other)) for other in reachable), candidate)
+
+        root = min(terminals, key=total_distance)
+        in_tree = {root}
+        steps = []
+        remaining = [table for table in terminals if table != root]
+        while remaining:
+            best = None
+            for target in remaining:
+                for source in sorted(in_tree):
+                    path = self.path(source, target)
+                    if path is not None and (best is None or len(path) < len(best[1])):
+                        best = (target, path)
+            if best is None:
+                unreachable.extend(remaining)
+                break
+            target, path = best
+            for step in path:
+                if step.table not in in_tree:
+                    in_tree.add(step.table)
+                    steps.append(step)
+            remaining = [table for table in remaining if table not in in_tree]
+
+        plan = JoinPlan(root, steps, sorted(unreachable))
+        self._plans[key] = plan
+        return plan
+
+    def join_skeleton(self, tables):
+        """FROM ... JOIN ... ON ... text joining tables with their real foreign key columns, or None."""
+        plan = self.join_tree(tables)
+        if plan.root is None or not plan.steps:
+            return None
+        lines = [f"FROM {plan.root}"]
+        for step in plan.steps:
+            lines.append(f"JOIN {step.table} ON {step.edge.join_condition()}")
+        return '\n'.join(lines)
+
+
+def table_name_variants(table):
+    """Phrases that refer to a table in a question: 'order_items' → 'order items', 'order item', ..."""
+    phrase = table.lower().replace('_', ' ')
+    variants = {phrase}
+    if phrase.endswith('ies'):
+        variants.add(phrase[:-3] + 'y')
+    elif phrase.endswith('ses') or phrase.endswith('xes'):
+        variants.add(phrase[:-2])
+    elif phrase.endswith('s'):
+        variants.add(phrase[:-1])
+    return variants
+
+
+def match_tables(question, tables):
+    """Tables whose name (singular or plural, underscores as spaces) appears in the question.
+
+    A match inside a longer one does not count: "order items" names order_items, not orders.
+    """
+    text = ' ' + ' '.join(re.findall(r'[a-z0-9]+', question.lower())) + ' '
+    spans = {}
+    for table in tables:
+        for variant in table_name_variants(table):
+            for match in re.finditer(rf"(?= ({re.escape(variant)}(?:s|es)?) )", text):
+                spans.setdefault(table, set()).add(match.span(1))
+    covered = {(start, end) for table_spans in spans.values() for start, end in table_spans}
+    return [table for table, table_spans in spans.items()
+            if any(not any(start <= inner_start and inner_end <= end and (start, end) != (inner_start, inner_end)
+                           for start, end in covered)
+                   for inner_start, inner_end in table_spans)]
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Structured Schema Catalog
+Writes the analyzer's catalog (tables, columns, foreign keys, indexes, row estimates,
+samples and rendered markdown) as JSON or MessagePack, plus a small offset index next
+to it. The catalog stays one ordinary JSON / MessagePack document; the index records
+where each table's entry, and each field of it, starts and ends, so CatalogReader can
+memory-map the file and decode single tables or fields on demand instead of parsing the
+whole document, and a rewrite can copy unchanged fields without decoding them.
+"""
+
+import json
+import mmap
+import os
+from collections import namedtuple
+
+try:
+    import msgpack
+except ImportError:  # MessagePack catalogs are optional
+    msgpack = None
+
+# File extension → catalog format; anything else is written as JSON
+FORMAT_EXTENSIONS = {
+    '.json': 'json',
+    '.msgpack': 'msgpack',
+    '.mpk': 'msgpack',
+}
+
+
+def catalog_format(catalog_path):
+    """'json' or 'msgpack', from the catalog file's extension."""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(catalog_path)[1].lower(), 'json')
+
+
+def index_path(catalog_path):
+    """Path of the offset index kept next to a catalog."""
+    return f"{catalog_path}.index.json"
+
+
+class EncodedValue(namedtuple('EncodedValue', ['format', 'data'])):
+    """A value as it is stored in a catalog file; writers of the same format copy the bytes as they are."""
+
+    def decode(self):
+        """The value itself."""
+        return _decode(self.format, self.data)
+
+
+def _require_msgpack():
+    """Raise a helpful error when a MessagePack catalog is used without msgpack."""
+    if msgpack is None:
+        raise ImportError("MessagePack catalogs require msgpack: pip install msgpack")
+
+
+def _encode_json(value):
+    """JSON bytes of value; an EncodedValue read from a JSON catalog is copied as it is."""
+    if isinstance(value, EncodedValue):
+        if value.format == 'json':
+            return bytes(value.data)
+        value = value.decode()
+    return json.dumps(value).encode('utf-8')
+
+
+def _encode_msgpack(packer, value):
+    """MessagePack bytes of value; an EncodedValue read from a MessagePack catalog is copied as it is."""
+    if isinstance(value, EncodedValue):
+        if value.format == 'msgpack':
+            return bytes(value.data)
+        value = value.decode()
+    return packer.pack(value)
+
+
+def _write_json(f, header, tables, table_count):
+    """Write {**header, 'tables': {...}} and return {table: (offset, length, {field: (offset, length)})}.
+
+    Each entry is encoded and written as tables yields it, field by field, in the bytes
+    json.dumps(entry) would produce; table_count is only needed by MessagePack.
+    """
+    offsets = {}
+    f.write(b'{')
+    for key, value in header.items():
+        f.write(f"{json.dumps(key)}: {json.dumps(value)}, ".encode('utf-8'))
+    f.write(b'"tables": {')
+    for number, (table_name, entry) in enumerate(tables):
+        if number:
+            f.write(b', ')
+        f.write(f"{json.dumps(table_name)}: ".encode('utf-8'))
+        start = f.tell()
+        parts = [b'{']
+        position = start + 1
+        fields = {}
+        for number_in_entry, (key, value) in enumerate(entry.items()):
+            prefix = f"{', ' if number_in_entry else ''}{json.dumps(key)}: ".encode('utf-8')
+            data = _encode_json(value)
+            fields[key] = (position + len(prefix), len(data))
+            parts += (prefix, data)
+            position += len(prefix) + len(data)
+        parts.append(b'}')
+        f.write(b''.join(parts))
+        offsets[table_name] = (start, position + 1 - start, fields)
+    f.write(b'}}')
+    return offsets
+
+
+def _write_msgpack(f, header, tables, table_count):
+    """Same document as _write_json, as one MessagePack map.
+
+    The tables map header carries its length up front, so the count is passed in and the
+    entries are still encoded one at a time; a count that does not match raises ValueError.
+    """
+    _require_msgpack()
+    packer = msgpack.Packer()
+    offsets = {}
+    f.write(packer.pack_map_header(len(header) + 1))
+    for key, value in header.items():
+        f.write(packer.pack(key))
+        f.write(packer.pack(value))
+    f.write(packer.pack('tables'))
+    f.write(packer.pack_map_header(table_count))
+    for table_name, entry in tables:
+        f.write(packer.pack(table_name))
+        start = f.tell()
+        parts = [packer.pack_map_header(len(entry))]
+        position = start + len(parts[0])
+        fields = {}
+        for key, value in entry.items():
+            prefix = packer.pack(key)
+            data = _encode_msgpack(packer, value)
+            fields[key] = (position + len(prefix), len(data))
+            parts += (prefix, data)
+            position += len(prefix) + len(data)
+        f.write(b''.join(parts))
+        offsets[table_name] = (start, position - start, fields)
+    if len(offsets) != table_count:
+        raise ValueError(f"MessagePack catalog announced {table_count} tables but got {len(offsets)}")
+    return offsets
+
+
+def _decode(catalog_format, data):
+    """Decode one JSON or MessagePack value."""
+    if catalog_format == 'msgpack':
+        _require_msgpack()
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+def write_catalog(catalog_path, header, tables, table_count):
+    """Write the catalog and its offset index; tables yields table_count (table name, JSON-ready entry) pairs.
+
+    Entry fields other than the fingerprint may be EncodedValues from an earlier catalog (CatalogReader.raw());
+    in the same format their bytes are copied without being decoded.
+
+    Both files are written under temporary names and renamed into place. A reader that
+    sees the new catalog with the old index notices the size/mtime mismatch and parses
+    the whole file instead.
+    """
+    file_format = catalog_format(catalog_path)
+    writer = _write_msgpack if file_format == 'msgpack' else _write_json
+    temp_file = f"{catalog_path}.tmp"
+    entries = []
+
+    def remember_fingerprints():
+        for table_name, entry in tables:
+            entries.append((table_name, entry.get('fingerprint')))
+            yield table_name, entry
+
+    try:
+        with open(temp_file, 'wb') as f:
+            offsets = writer(f, header, remember_fingerprints(), table_count)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    os.replace(temp_file, catalog_path)
+
+    stat = os.stat(catalog_path)
+    index = {
+        'format': file_format,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'header': header,
+        'tables': {table_name: {'offset': offsets[table_name][0], 'length': offsets[table_name][1],
+                                'fields': offsets[table_name][2], 'fingerprint': fingerprint}
+                   for table_name, fingerprint in entries}
+    }
+    with open(f"{index_path(catalog_path)}.tmp", 'w', encoding='utf-8') as f:
+        # json.dumps runs the C encoder; json.dump(…, f) would encode the index in pure Python
+        f.write(json.dumps(index))
+    os.replace(f"{index_path(catalog_path)}.tmp", index_path(catalog_path))
+    return catalog_path
+
+
+def read_index(catalog_path):
+    """The catalog's offset index, or None if it is missing or was written for another version of the file."""
+    try:
+        with open(index_path(catalog_path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = os.stat(catalog_path)
+    except (OSError, ValueError):
+        return None
+    if index.get('size') != stat.st_size or index.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return index
+
+
+class CatalogReader:
+    """Lazy, read-only view of a catalog: the header and table list come from the index,
+    each table's entry is decoded from the memory-mapped file the first time it is asked for."""
+
+    def __init__(self, catalog_path):
+        """Open catalog_path; without a usable index the whole document is parsed once."""
+        self.catalog_path = catalog_path
+        self.format = catalog_format(catalog_path)
+        self.index = read_index(catalog_path)
+        self._entries = {}
+        self._file = open(catalog_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._map = None
+
+        if self.index is None:
+            document = _decode(self.format, self._map[:] if self._map else b'')
+            self._entries = document.pop('tables')
+            self.header = document
+            self._fingerprints = {table_name: entry.get('fingerprint') for table_name, entry in self._entries.items()}
+            self.tables = list(self._entries)
+        else:
+            self.header = self.index['header']
+            self._fingerprints = {table_name: info['fingerprint'] for table_name, info in self.index['tables'].items()}
+            self.tables = list(self.index['tables'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, table_name):
+        return table_name in self._fingerprints
+
+    def close(self):
+        """Release the memory map and the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def fingerprint(self, table_name):
+        """Fingerprint stored for table_name, without decoding its entry."""
+        return self._fingerprints.get(table_name)
+
+    def raw(self, table_name, field):
+        """One field of a table's entry as an EncodedValue, without decoding it; None without a usable index."""
+        info = self.index['tables'][table_name] if self.index else None
+        if info is None or field not in info.get('fields', {}):
+            return None
+        offset, length = info['fields'][field]
+        return EncodedValue(self.format, self._map[offset:offset + length])
+
+    def field(self, table_name, field):
+        """One field of a table's entry, decoded on its own when the index records where it is."""
+        if table_name not in self._entries:
+            value = self.raw(table_name, field)
+            if value is not None:
+                return value.decode()
+        return self.table(table_name)[field]
+
+    def table(self, table_name):
+        """Catalog entry of one table ({'fingerprint', 'schema', 'sample', 'markdown'}), decoded on first use."""
+        entry = self._entries.get(table_name)
+        if entry is None:
+            info = self.index['tables'][table_name]
+            entry = _decode(self.format, self._map[info['offset']:info['offset'] + info['length']])
+            self._entries[table_name] = entry
+        return entry
+
+    def schema_info(self, tables=None):
+        """{table: {'columns', 'foreign_keys', 'indexes'}} as PRAGMA-style tuples, for all or some tables."""
+        return {table_name: {key: [tuple(row) for row in rows] for key, rows in self.field(table_name, 'schema').items()}
+                for table_name in (self.tables if tables is None else tables)}
+
+
+def load_schema_info(catalog_path):
+    """{table: {'columns', 'foreign_keys', 'indexes'}} from a saved catalog, without opening the database."""
+    with CatalogReader(catalog_path) as reader:
+        return reader.schema_info()
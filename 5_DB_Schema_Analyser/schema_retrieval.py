@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Schema Section Retrieval
+Splits the analyzer's markdown into one chunk per table (read line by line, so a
+multi-megabyte document is never held whole) and keeps only those chunks and the
+database overview; relationship, join and example sections are dropped. A local token
+index over table names, column names and sample values ranks the chunks for a question.
+schema_text() returns the tables a question needs, their foreign key neighbours without
+sample data, and the names of the rest, within a fixed character budget.
+"""
+
+import math
+import re
+from collections import Counter
+
+DEFAULT_MAX_SCHEMA_CHARS = 12000
+DEFAULT_MAX_TABLES = 6
+# Ranked tables scoring below this fraction of the best score are left out
+MIN_RELATIVE_SCORE = 0.3
+
+# Token weights by where the token occurs in a table's section
+NAME_WEIGHT = 4
+COLUMN_WEIGHT = 2
+SAMPLE_WEIGHT = 1
+
+STOPWORDS = {
+    'a', 'all', 'an', 'and', 'any', 'are', 'as', 'at', 'by', 'each', 'find', 'for', 'from', 'get', 'give',
+    'has', 'have', 'how', 'in', 'is', 'it', 'list', 'many', 'me', 'most', 'much', 'of', 'on', 'or', 'per',
+    'show', 'that', 'the', 'their', 'them', 'there', 'to', 'was', 'were', 'what', 'which', 'who', 'with',
+}
+
+FOREIGN_KEY_LINE = re.compile(r"^- `[^`]+` → `([^`]+)\.[^`]*`$")
+COLUMN_LINE = re.compile(r"^- `([^`]+)` \(")
+
+
+def tokenize(text):
+    """Lowercase word tokens, identifiers split at underscores, plurals reduced; stopwords dropped."""
+    tokens = []
+    for token in re.findall(r'[a-z0-9]+', text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith('ies'):
+            token = token[:-3] + 'y'
+        elif len(token) > 4 and (token.endswith('sses') or token.endswith('xes')):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def compact_section(section):
+    """A table section without its sample data: columns and foreign keys only."""
+    cut = section.find("\n**Sample Data:**")
+    return section if cut < 0 else section[:cut] + "\n\n"
+
+
+def split_schema_markdown(lines):
+    """(overview, {table: section}) from the analyzer's markdown lines; other sections and sqlite_ tables are skipped."""
+    overview = []
+    sections = {}
+    heading = None
+    table = None
+    in_fence = False
+    for line in lines:
+        if not in_fence and line.startswith('## '):
+            heading = line.strip()
+            table = None
+            continue
+        if line.startswith('```'):
+            in_fence = not in_fence
+        if heading == '## Database Overview':
+            overview.append(line)
+        elif heading == '## Table Schemas':
+            if not in_fence and line.startswith('### '):
+                table = line[4:].strip()
+                sections[table] = [line]
+            elif table is not None:
+                sections[table].append(line)
+    for table in [table for table in sections if table.startswith('sqlite_')]:
+        del sections[table]
+    overview_text = ''.join(overview).strip()
+    return (f"## Database Overview\n{overview_text}\n\n" if overview_text else "",
+            {table: ''.join(section) for table, section in sections.items()})
+
+
+class SchemaIndex:
+    """Per-table schema sections with a token index, to build a bounded schema for each question."""
+
+    def __init__(self, sections, overview=""):
+        """Index sections ({table: markdown section}); overview is prepended to every schema text."""
+        self.sections = sections
+        self.overview = overview
+        self.neighbours = {table: set() for table in sections}
+        self.postings = {}
+        for table, section in sections.items():
+            for ref_table in self.section_references(section):
+                if ref_table in self.neighbours and ref_table != table:
+                    self.neighbours[table].add(ref_table)
+                    self.neighbours[ref_table].add(table)
+            for token, weight in self.section_terms(table, section).items():
+                self.postings.setdefault(token, {})[table] = weight
+
+    @classmethod
+    def from_markdown(cls, markdown):
+        """Index a markdown document held in a string."""
+        overview, sections = split_schema_markdown(markdown.splitlines(keepends=True))
+        return cls(sections, overview)
+
+    @classmethod
+    def from_file(cls, path):
+        """Index the markdown file at path, reading it line by line."""
+        with open(path, 'r', encoding='utf-8') as f:
+            overview, sections = split_schema_markdown(f)
+        return cls(sections, overview)
+
+    @staticmethod
+    def section_references(section):
+        """Tables the section's foreign keys point at."""
+        references = []
+        in_foreign_keys = False
+        for line in compact_section(section).splitlines():
+            if line.startswith('**'):
+                in_foreign_keys = line == '**Foreign Keys:**'
+            elif in_foreign_keys:
+                match = FOREIGN_KEY_LINE.match(line)
+                if match:
+                    references.append(match.group(1))
+        return references
+
+    @staticmethod
+    def section_terms(table, section):
+        """{token: weight} for a table: its name, then its column names, then the rest of the section."""
+        terms = Counter()
+        for token in tokenize(table):
+            terms[token] += NAME_WEIGHT
+        head = compact_section(section)
+        for line in head.splitlines():
+            match = COLUMN_LINE.match(line)
+            if match:
+                for token in tokenize(match.group(1)):
+                    terms[token] += COLUMN_WEIGHT
+        for token in set(tokenize(section[len(head):])):
+            terms[token] += SAMPLE_WEIGHT
+        return terms
+
+    @property
+    def tables(self):
+        """Indexed table names."""
+        return list(self.sections)
+
+    def rank(self, question):
+        """[(table, score)] for the tables sharing tokens with question, best first."""
+        scores = Counter()
+        table_count = len(self.sections)
+        for token in set(tokenize(question)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + table_count / len(postings))
+            for table, weight in postings.items():
+                scores[table] += idf * weight
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def select(self, question, required=(), max_tables=DEFAULT_MAX_TABLES, max_chars=DEFAULT_MAX_SCHEMA_CHARS):
+        """[(table, section)] for question within max_chars of sections.
+
+        required tables come first, then the best ranked (within MIN_RELATIVE_SCORE of the top
+        score) up to max_tables, in full while they fit and without sample data once they do
+        not; then their foreign key neighbours without sample data while those fit.
+        """
+        wanted = [table for table in required if table in self.sections]
+        ranked = self.rank(question)
+        for table, score in ranked:
+            if len(wanted) >= max(max_tables, len(required)) or score < ranked[0][1] * MIN_RELATIVE_SCORE:
+                break
+            if table not in wanted:
+                wanted.append(table)
+
+        chosen = {}
+        used = 0
+        for table in wanted:
+            for section in (self.sections[table], compact_section(self.sections[table])):
+                if used + len(section) <= max_chars:
+                    chosen[table] = section
+                    used += len(section)
+                    break
+        for table in list(chosen):
+            for neighbour in sorted(self.neighbours[table] - set(chosen)):
+                section = compact_section(self.sections[neighbour])
+                if used + len(section) <= max_chars:
+                    chosen[neighbour] = section
+                    used += len(section)
+        return list(chosen.items())
+
+    def schema_text(self, question, required=(), max_tables=DEFAULT_MAX_TABLES, max_chars=DEFAULT_MAX_SCHEMA_CHARS):
+        """Bounded schema for the prompt: overview, selected sections, then the other table names."""
+        selected = self.select(question, required, max_tables, max_chars)
+        text = self.overview + "## Table Schemas\n\n" + ''.join(section for _, section in selected)
+
+        shown = {table for table, _ in selected}
+        others = []
+        budget = max_chars - sum(len(section) for _, section in selected)
+        for table in self.sections:
+            if table not in shown:
+                budget -= len(table) + 2
+                if budget < 0:
+                    others.append('…')
+                    break
+                others.append(table)
+        if others:
+            text += f"**Other tables:** {', '.join(others)}\n"
+        return text
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for cardinality annotations
+Builds a shop where every customer has many orders and a few addresses, and checks the
+row counts and foreign key fan-out with and without ANALYZE, the resulting "aggregate in a
+subquery" hints in the markdown and the catalog, and why they matter: aggregating over
+two one-to-many joins at once inflates the counts.
+"""
+
+import json
+import os
+import sqlite3
+
+from fixtures import create_database, run_analyzer, temp_workdir
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE orders (
+    order_id INTEGER PRIMARY KEY,
+    customer_id INTEGER REFERENCES customers (customer_id),
+    created_by INTEGER REFERENCES customers (customer_id)
+);
+CREATE TABLE addresses (address_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+CREATE INDEX idx_orders_customer_id ON orders (customer_id);
+"""
+
+
+def shop_database(workdir):
+    """10 customers with 20 orders and 2 addresses each in workdir; returns the database path."""
+    db_path = create_database(workdir, SHOP_SCHEMA)
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(number, f"customer {number}") for number in range(1, 11)])
+    conn.executemany("INSERT INTO orders (customer_id, created_by) VALUES (?, ?)",
+                     [(customer, customer) for customer in range(1, 11) for _ in range(20)])
+    conn.executemany("INSERT INTO addresses (customer_id) VALUES (?)",
+                     [(customer,) for customer in range(1, 11) for _ in range(2)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def fan_out(analyzer, table, columns):
+    """The fan-out record of the foreign key table(columns)."""
+    return next(fan for fan in analyzer.fan_outs if fan['table'] == table and fan['columns'] == columns)
+
+
+def test_fan_out_with_and_without_analyze():
+    """Row ratios without statistics, stat1 averages after ANALYZE, one hint per table pair."""
+    with temp_workdir() as workdir:
+        db_path = shop_database(workdir)
+
+        print("🧪 Testing cardinality annotations")
+        print("=" * 50)
+
+        estimated = run_analyzer(db_path, disconnect=False)
+        assert estimated.table_stats['orders']['source'] == 'estimate'
+        assert fan_out(estimated, 'orders', ['customer_id']) == {
+            'table': 'orders', 'ref_table': 'customers', 'columns': ['customer_id'], 'fan_out': 20.0, 'source': 'row ratio'}
+        estimated.disconnect()
+
+        analyzed = run_analyzer(db_path, disconnect=False, run_analyze=True)
+        assert analyzed.table_stats['orders']['rows'] == 200 and analyzed.table_stats['orders']['source'] == 'sqlite_stat1'
+        assert fan_out(analyzed, 'orders', ['customer_id'])['source'] == 'sqlite_stat1'
+        assert fan_out(analyzed, 'orders', ['created_by'])['source'] == 'row ratio'
+        assert fan_out(analyzed, 'addresses', ['customer_id'])['fan_out'] == 2.0
+
+        hints = analyzed.cardinality_hints()
+        for hint in hints:
+            print(f"  {hint}")
+        assert len(hints) == 1 and '`orders`' in hints[0] and '~20.0' in hints[0]
+        assert analyzed.cardinality_hints(['customers', 'addresses']) == []
+
+        markdown = analyzed.generate_markdown_schema()
+        assert "## Cardinality" in markdown and "- `customers` → `orders` (customer_id): ~20.0" in markdown
+        assert markdown.index("## Cardinality") < markdown.index("## Natural Language Query Examples")
+        analyzed.disconnect()
+        print("✅ Row counts and fan-out from sqlite_stat1, with one hint for the exploding join")
+
+
+def test_catalog_keeps_stats_and_hints_matter():
+    """The catalog stores fan-out per table; joining both child tables inflates the counts 2x and 20x."""
+    with temp_workdir() as workdir:
+        db_path = shop_database(workdir)
+        catalog_path = os.path.join(workdir, 'shop.catalog.json')
+        run_analyzer(db_path, catalog_path, run_analyze=True)
+
+        with open(catalog_path, encoding='utf-8') as f:
+            orders = json.load(f)['tables']['orders']['stats']
+        assert orders['rows'] == 200 and {fan['ref_table'] for fan in orders['fan_out']} == {'customers'}
+
+        conn = sqlite3.connect(db_path)
+        exploded = conn.execute("""
+            SELECT COUNT(o.order_id), COUNT(a.address_id) FROM customers c
+            JOIN orders o ON o.customer_id = c.customer_id JOIN addresses a ON a.customer_id = c.customer_id
+            WHERE c.customer_id = 1""").fetchone()
+        aggregated = conn.execute("""
+            SELECT o.order_count, a.address_count FROM customers c
+            JOIN (SELECT customer_id, COUNT(*) AS order_count FROM orders GROUP BY customer_id) o ON o.customer_id = c.customer_id
+            JOIN (SELECT customer_id, COUNT(*) AS address_count FROM addresses GROUP BY customer_id) a ON a.customer_id = c.customer_id
+            WHERE c.customer_id = 1""").fetchone()
+        conn.close()
+        print(f"Exploded join counts {exploded}, aggregated first {aggregated}")
+        assert exploded == (40, 40) and aggregated == (20, 2)
+        print("✅ Catalog keeps per-table fan-out; subquery aggregation gives the right counts")
+
+
+if __name__ == "__main__":
+    test_fan_out_with_and_without_analyze()
+    test_catalog_keeps_stats_and_hints_matter()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the foreign key graph
+Checks typed edges (composite keys, implicit primary key targets, self-references,
+junction tables) and that the graph gives the same relationship map as the old
+table-by-table scan, in linear time on a schema with thousands of tables.
+"""
+
+import sqlite3
+import time
+
+from fk_graph import ForeignKeyGraph
+
+SCHEMA = """
+CREATE TABLE categories (category_id INTEGER PRIMARY KEY, parent_category_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE products (product_id INTEGER PRIMARY KEY, category_id INTEGER REFERENCES categories);
+CREATE TABLE tags (tag_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE product_tags (
+    product_id INTEGER REFERENCES products (product_id),
+    tag_id INTEGER REFERENCES tags (tag_id),
+    PRIMARY KEY (product_id, tag_id)
+);
+CREATE TABLE shipments (
+    shipment_id INTEGER PRIMARY KEY,
+    product_id INTEGER,
+    tag_id INTEGER,
+    FOREIGN KEY (product_id, tag_id) REFERENCES product_tags (product_id, tag_id)
+);
+"""
+
+
+def schema_info_of(conn):
+    """{table: {'columns', 'foreign_keys'}} the way the analyzer collects it."""
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+    return {table: {'columns': conn.execute(f"PRAGMA table_info({table})").fetchall(),
+                    'foreign_keys': conn.execute(f"PRAGMA foreign_key_list({table})").fetchall()}
+            for table in tables}
+
+
+def quadratic_relationships(schema_info):
+    """The relationship map as the analyzer used to build it, scanning every table for every table."""
+    relationships = {}
+    for table_name, info in schema_info.items():
+        relationships[table_name] = {'references': [fk[2] for fk in info['foreign_keys']], 'referenced_by': []}
+        for other_table, other_info in schema_info.items():
+            if other_table != table_name:
+                relationships[table_name]['referenced_by'].extend(
+                    other_table for fk in other_info['foreign_keys'] if fk[2] == table_name)
+    return relationships
+
+
+def test_graph_edges_are_typed():
+    """Composite keys are one edge; implicit targets resolve to the primary key; junctions are found."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    graph = ForeignKeyGraph(schema_info_of(conn))
+
+    print("🧪 Testing the foreign key graph")
+    print("=" * 50)
+
+    shipment_edge, = graph.outgoing['shipments']
+    assert shipment_edge.from_columns == ('product_id', 'tag_id') and shipment_edge.to_columns == ('product_id', 'tag_id')
+    assert shipment_edge.join_condition('s', 'pt') == "s.product_id = pt.product_id AND s.tag_id = pt.tag_id"
+
+    product_edge, = graph.outgoing['products']
+    assert product_edge.to_columns == ('category_id',)
+
+    assert [edge.table for edge in graph.self_references()] == ['categories']
+    assert graph.referenced_by('categories') == ['products']
+    assert list(graph.junction_tables) == ['product_tags']
+    assert sorted(other for _, other in graph.neighbours('product_tags')) == ['products', 'shipments', 'tags']
+    print("✅ Edges carry real column pairs; hierarchy and junction detected")
+
+
+def test_graph_matches_old_scan_and_scales_linearly():
+    """Same references / referenced_by as the quadratic scan; 5,000 tables map in well under a second."""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE hub (hub_id INTEGER PRIMARY KEY)")
+    for number in range(5000):
+        parent = f"t{number - 1:04d}" if number else 'hub'
+        conn.execute(f"CREATE TABLE t{number:04d} (id INTEGER PRIMARY KEY, hub_id INTEGER REFERENCES hub (hub_id), "
+                     f"parent_id INTEGER REFERENCES {parent})")
+    schema_info = schema_info_of(conn)
+
+    start = time.perf_counter()
+    graph = ForeignKeyGraph(schema_info)
+    mapped = {table: {'references': graph.references(table), 'referenced_by': graph.referenced_by(table)}
+              for table in schema_info}
+    graph_seconds = time.perf_counter() - start
+
+    small = dict(list(schema_info.items())[:300])
+    small_graph = ForeignKeyGraph(small)
+    assert quadratic_relationships(small) == {
+        table: {'references': small_graph.references(table), 'referenced_by': small_graph.referenced_by(table)}
+        for table in small
+    }
+    print(f"\n5,001 tables, {len(graph.edges):,} foreign keys mapped in {graph_seconds * 1000:.0f} ms")
+    assert len(mapped['hub']['referenced_by']) == 5001 and graph_seconds < 1.0
+    print("✅ Graph matches the old scan and scales linearly")
+
+
+if __name__ == "__main__":
+    test_graph_edges_are_typed()
+    test_graph_matches_old_scan_and_scales_linearly()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental re-analysis
+Analyzes a small shop database with a persisted catalog, changes one table at a time
+and checks that only that table is re-analyzed and that the markdown stays identical
+to a full analysis. Then times a re-analysis of a 2,000-table database after one ALTER against a bound.
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+import time
+
+from db_schema_analyzer import DatabaseSchemaAnalyzer
+from fixtures import create_database, run_analyzer, temp_workdir
+from schema_catalog import CatalogReader, EncodedValue
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT NOT NULL, total_spent REAL DEFAULT 0.0);
+CREATE TABLE orders (
+    order_id INTEGER PRIMARY KEY,
+    customer_id INTEGER NOT NULL REFERENCES customers (customer_id),
+    total_amount REAL
+);
+CREATE TABLE attachments (attachment_id INTEGER PRIMARY KEY, order_id INTEGER REFERENCES orders (order_id),
+                          content BLOB);
+CREATE INDEX idx_orders_customer_id ON orders (customer_id);
+INSERT INTO customers VALUES (1, 'Ann', 10.0), (2, 'Bob', 0.0);
+INSERT INTO orders VALUES (1, 1, 10.0);
+INSERT INTO attachments VALUES (1, 1, X'00FF10');
+"""
+
+
+def analyze(db_path, catalog_path, sample_text_limit=None):
+    """Run the analyzer quietly; returns (analyzer, markdown without the timestamp line)."""
+    analyzer = run_analyzer(db_path, catalog_path, disconnect=False, sample_text_limit=sample_text_limit)
+    with contextlib.redirect_stdout(io.StringIO()):
+        markdown = analyzer.generate_markdown_schema()
+        analyzer.disconnect()
+    return analyzer, '\n'.join(line for line in markdown.splitlines() if not line.startswith('**Analysis Date**'))
+
+
+def test_only_changed_tables_are_reanalyzed():
+    """Unchanged tables come from the catalog; ALTER, INSERT, UPDATE, re-INSERT and DROP are picked up."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        catalog_path = os.path.join(workdir, 'shop.catalog.json')
+        conn = sqlite3.connect(db_path)
+
+        print("🧪 Testing incremental re-analysis")
+        print("=" * 50)
+
+        first, _ = analyze(db_path, catalog_path)
+        assert first.changed_tables == ['attachments', 'customers', 'orders']
+
+        second, markdown = analyze(db_path, catalog_path)
+        assert second.changed_tables == [] and second.removed_tables == []
+        assert markdown == analyze(db_path, None)[1]
+        assert second.sample_data['attachments']['rows'][0][2] == b'\x00\xff\x10'
+        print("Unchanged database: nothing re-analyzed, same markdown as a full run")
+
+        conn.execute("ALTER TABLE customers ADD COLUMN email TEXT")
+        conn.commit()
+        third, markdown = analyze(db_path, catalog_path)
+        assert third.changed_tables == ['customers']
+        assert '`email` (TEXT)' in markdown and markdown == analyze(db_path, None)[1]
+
+        conn.execute("INSERT INTO orders VALUES (2, 2, 5.0)")
+        conn.commit()
+        assert analyze(db_path, catalog_path)[0].changed_tables == ['orders']
+
+        # Same row count and MAX(rowid), different sampled rows
+        conn.execute("UPDATE customers SET name = 'Anna' WHERE customer_id = 1")
+        conn.commit()
+        updated, markdown = analyze(db_path, catalog_path)
+        assert updated.changed_tables == ['customers'] and "(1, 'Anna'" in markdown
+        conn.execute("DELETE FROM orders WHERE order_id = 1")
+        conn.execute("INSERT INTO orders VALUES (1, 2, 99.0)")
+        conn.commit()
+        reinserted, markdown = analyze(db_path, catalog_path)
+        assert reinserted.changed_tables == ['orders'] and '(1, 2, 99.0)' in markdown
+        assert markdown == analyze(db_path, None)[1]
+
+        conn.execute("DROP TABLE attachments")
+        conn.commit()
+        fifth, markdown = analyze(db_path, catalog_path)
+        assert fifth.changed_tables == [] and fifth.removed_tables == ['attachments']
+        assert '### attachments' not in markdown
+        conn.close()
+        print("✅ ALTER, INSERT, UPDATE, re-INSERT and DROP each re-analyze only the affected table")
+
+
+def test_changed_sample_text_limit_reanalyzes():
+    """Samples reused from the catalog always match the current sample_text_limit."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, "CREATE TABLE notes (note_id INTEGER PRIMARY KEY, body TEXT);"
+                                           "INSERT INTO notes (body) VALUES ('" + 'x' * 200 + "');", 'notes.db')
+        catalog_path = os.path.join(workdir, 'notes.catalog.json')
+
+        full, _ = analyze(db_path, catalog_path)
+        assert full.sample_data['notes']['rows'][0][1] == 'x' * 200
+
+        truncated, _ = analyze(db_path, catalog_path, sample_text_limit=20)
+        assert truncated.changed_tables == ['notes']
+        assert truncated.sample_data['notes']['rows'][0][1] == 'x' * 20 + '…'
+        assert analyze(db_path, catalog_path, sample_text_limit=20)[0].changed_tables == []
+
+        untruncated, _ = analyze(db_path, catalog_path)
+        assert untruncated.changed_tables == ['notes']
+        assert untruncated.sample_data['notes']['rows'][0][1] == 'x' * 200
+        print("✅ Changing sample_text_limit re-analyzes instead of reusing differently truncated samples")
+
+
+def timed_analysis(db_path, catalog_path):
+    """Time analyze_database() alone, then save the catalog; returns (analyzer, seconds, SQL statements run)."""
+    statements = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = DatabaseSchemaAnalyzer(db_path, catalog_path)
+        analyzer.connect()
+        analyzer.conn.set_trace_callback(statements.append)
+        start = time.perf_counter()
+        analyzer.analyze_database()
+        seconds = time.perf_counter() - start
+        analyzer.conn.set_trace_callback(None)
+        analyzer.save_catalog()
+        analyzer.disconnect()
+    return analyzer, seconds, len(statements)
+
+
+def test_reanalysis_of_a_large_schema_after_one_alter():
+    """2,000 tables: after one ALTER only one table is introspected again, well within the time bound."""
+    with temp_workdir() as workdir:
+        db_path = os.path.join(workdir, 'warehouse.db')
+        catalog_path = os.path.join(workdir, 'warehouse.catalog.json')
+        conn = sqlite3.connect(db_path)
+        conn.execute("BEGIN")
+        for number in range(2000):
+            conn.execute(f"CREATE TABLE fact_{number:04d} (id INTEGER PRIMARY KEY, dim_id INTEGER, amount REAL, note TEXT)")
+            conn.execute(f"INSERT INTO fact_{number:04d} (dim_id, amount, note) VALUES (1, 2.5, 'row')")
+        conn.commit()
+
+        _, full_seconds, _ = timed_analysis(db_path, catalog_path)
+
+        conn.execute("ALTER TABLE fact_1234 ADD COLUMN region TEXT")
+        conn.commit()
+        conn.close()
+
+        analyzer, incremental_seconds, statements = timed_analysis(db_path, catalog_path)
+        print(f"\nFull analysis: {full_seconds * 1000:.0f} ms, after one ALTER: {incremental_seconds * 1000:.0f} ms "
+              f"({statements} statements)")
+        assert analyzer.changed_tables == ['fact_1234']
+        # One fingerprint query per table, plus the altered table's introspection and a few catalog-wide reads
+        assert statements < 2000 + 20, statements
+        # Reused tables keep their sample and markdown section as the catalog's bytes
+        assert analyzer.sample_data.encoded('fact_0000') is not None and analyzer.sample_data.encoded('fact_1234') is None
+        assert isinstance(analyzer.table_sections['fact_0000'], EncodedValue)
+        assert incremental_seconds < min(full_seconds, 0.5), (full_seconds, incremental_seconds)
+
+        with CatalogReader(catalog_path) as reader:
+            assert reader.field('fact_0000', 'sample')['rows'] == [[1, 1, 2.5, 'row']]
+            assert reader.field('fact_1234', 'schema')['columns'][-1][1] == 'region'
+        print("✅ Only the altered table was re-analyzed; reused entries were copied without being decoded")
+
+if __name__ == "__main__":
+    test_only_changed_tables_are_reanalyzed()
+    test_changed_sample_text_limit_reanalyzes()
+    test_reanalysis_of_a_large_schema_after_one_alter()
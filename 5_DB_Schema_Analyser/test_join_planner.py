@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the join path planner
+Checks that join paths and join trees use the real foreign key columns, that plans are
+memoized, that unconnected tables are reported, that question words map to tables,
+and that the planner can be built from a saved catalog without the database.
+"""
+
+import os
+
+from db_schema_analyzer import load_schema_info
+from fixtures import create_database, run_analyzer, temp_workdir
+from fk_graph import ForeignKeyGraph
+from join_planner import JoinPlanner, match_tables
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE categories (category_id INTEGER PRIMARY KEY, parent_category_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE products (product_id INTEGER PRIMARY KEY, category_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE orders (order_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+CREATE TABLE order_items (
+    order_item_id INTEGER PRIMARY KEY,
+    order_id INTEGER REFERENCES orders (order_id),
+    product_id INTEGER REFERENCES products (product_id)
+);
+CREATE TABLE reviews (
+    review_id INTEGER PRIMARY KEY,
+    product_id INTEGER REFERENCES products (product_id),
+    customer_id INTEGER REFERENCES customers (customer_id)
+);
+CREATE TABLE audit_log (entry_id INTEGER PRIMARY KEY, message TEXT);
+"""
+
+
+def shop_schema_info(workdir):
+    """Analyze the shop schema, saving its catalog in workdir; returns its schema_info."""
+    db_path = create_database(workdir, SHOP_SCHEMA)
+    return run_analyzer(db_path, os.path.join(workdir, 'shop.catalog.json')).schema_info
+
+
+def test_paths_use_real_join_columns():
+    """customers → categories goes through reviews and products on their key columns."""
+    with temp_workdir() as workdir:
+        schema_info = shop_schema_info(workdir)
+        planner = JoinPlanner(ForeignKeyGraph(schema_info))
+
+        print("🧪 Testing the join path planner")
+        print("=" * 50)
+
+        assert planner.distance('customers', 'categories') == 3
+        assert planner.distance('customers', 'audit_log') is None
+        skeleton = planner.join_skeleton(['customers', 'categories'])
+        print(skeleton)
+        # reviews links customers to products in two joins, shorter than going through orders
+        assert skeleton == ("FROM categories\n"
+                            "JOIN products ON products.category_id = categories.category_id\n"
+                            "JOIN reviews ON reviews.product_id = products.product_id\n"
+                            "JOIN customers ON reviews.customer_id = customers.customer_id")
+        print("✅ Shortest path joins on the real foreign key columns")
+
+
+def test_join_trees_are_memoized_and_report_unreachable_tables():
+    """One tree connects several tables; the same table set returns the cached plan."""
+    with temp_workdir() as workdir:
+        schema_info = shop_schema_info(workdir)
+        planner = JoinPlanner(ForeignKeyGraph(schema_info))
+        assert planner.precompute() == 6 * 5
+
+        plan = planner.join_tree(['orders', 'categories', 'customers', 'audit_log'])
+        assert plan is planner.join_tree(['customers', 'audit_log', 'categories', 'orders'])
+        assert plan.unreachable == ['audit_log']
+        joined = [plan.root] + [step.table for step in plan.steps]
+        # optimal is four joins (two extra tables), through reviews or through order_items
+        assert len(joined) == 5 and {'categories', 'customers', 'orders', 'products'} <= set(joined)
+        # every step joins a table to one that is already in the tree
+        for position, step in enumerate(plan.steps):
+            other = step.edge.ref_table if step.edge.table == step.table else step.edge.table
+            assert other in joined[:position + 1]
+        assert planner.join_skeleton(['audit_log']) is None
+        print("✅ Join tree connects three tables with two extra ones, memoized per table set")
+
+
+def test_question_words_match_tables_and_catalog_reload():
+    """'category' and 'order items' name tables; the planner can be rebuilt from the catalog alone."""
+    with temp_workdir() as workdir:
+        schema_info = shop_schema_info(workdir)
+        question = "Total order items per category for each customer"
+        tables = match_tables(question, list(schema_info))
+        assert sorted(tables) == ['categories', 'customers', 'order_items'], tables
+
+        reloaded = load_schema_info(os.path.join(workdir, 'shop.catalog.json'))
+        assert reloaded == schema_info
+        planner = JoinPlanner(ForeignKeyGraph(reloaded))
+        assert planner.join_skeleton(tables).startswith("FROM ")
+        print("✅ Question words map to tables; planner rebuilt from the saved catalog")
+
+
+if __name__ == "__main__":
+    test_paths_use_real_join_columns()
+    test_join_trees_are_memoized_and_report_unreachable_tables()
+    test_question_words_match_tables_and_catalog_reload()
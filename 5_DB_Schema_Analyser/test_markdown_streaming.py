@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming markdown writer
+Analyzes a small database with a self-reference, a junction table and long sample text,
+then checks that write_markdown() into a StringIO, save_markdown() and
+generate_markdown_schema() produce the same document, with the sections in their
+original order.
+"""
+
+import contextlib
+import io
+import os
+
+from fixtures import create_database, run_analyzer, temp_workdir
+
+SHOP_SCHEMA = """
+CREATE TABLE categories (category_id INTEGER PRIMARY KEY, name TEXT, parent_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE products (product_id INTEGER PRIMARY KEY, name TEXT, description TEXT,
+                       category_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE tags (tag_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE product_tags (product_id INTEGER REFERENCES products (product_id), tag_id INTEGER REFERENCES tags (tag_id),
+                           PRIMARY KEY (product_id, tag_id));
+INSERT INTO categories VALUES (1, 'Electronics', NULL), (2, 'Laptops', 1);
+INSERT INTO products VALUES (1, 'Notebook', '""" + 'long description ' * 40 + """', 2);
+INSERT INTO tags VALUES (1, 'sale');
+INSERT INTO product_tags VALUES (1, 1);
+"""
+
+# Top-level sections in the order the document has always had them
+SECTION_ORDER = [
+    '## Database Overview',
+    '## Table Schemas',
+    '## Relationships',
+    '## Cardinality',
+    '## Hierarchical Relationships',
+    '## Many-to-Many Relationships',
+    '## Join Examples',
+    '## Complex Relationship Examples',
+    '## Natural Language Query Examples',
+]
+
+
+def without_date(markdown):
+    """The markdown without its analysis timestamp, which changes between renders."""
+    return '\n'.join(line for line in markdown.splitlines() if not line.startswith('**Analysis Date**'))
+
+
+def section_headings(markdown):
+    """Top-level '## ' headings outside code fences, in document order."""
+    headings = []
+    in_fence = False
+    for line in markdown.splitlines():
+        if line.startswith('```'):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith('## '):
+            headings.append(line.strip())
+    return headings
+
+
+def test_streamed_markdown_matches_generated():
+    """write_markdown(StringIO) and save_markdown() equal generate_markdown_schema(), section for section."""
+    print("🧪 Testing the streaming markdown writer")
+    print("=" * 50)
+
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        markdown_path = os.path.join(workdir, 'shop_schema.md')
+        analyzer = run_analyzer(db_path, markdown_path=markdown_path, disconnect=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generated = analyzer.generate_markdown_schema()
+            sink = io.StringIO()
+            analyzer.write_markdown(sink)
+            analyzer.disconnect()
+        with open(markdown_path, encoding='utf-8') as f:
+            saved = f.read()
+
+    assert without_date(sink.getvalue()) == without_date(generated)
+    assert without_date(saved) == without_date(generated)
+
+    headings = section_headings(generated)
+    print(f"Sections: {', '.join(heading[3:] for heading in headings)}")
+    assert headings == SECTION_ORDER
+    print("✅ Streamed, saved and generated markdown are identical, sections in their original order")
+
+
+if __name__ == "__main__":
+    test_streamed_markdown_matches_generated()
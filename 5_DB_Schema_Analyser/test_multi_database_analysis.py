@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-database analysis
+Builds a directory of tenant databases, one with a drifted table, one missing a table
+and one that is not a database. Analyzes them through the process pool and through the
+command line, and checks the per-database outputs, the drift summary and the timings.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+from db_schema_analyzer import analyze_databases, find_databases, output_stems, summarize_databases
+from fixtures import create_database, temp_workdir
+
+TENANT_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE orders (order_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+CREATE TABLE notes (note_id INTEGER PRIMARY KEY, body TEXT);
+INSERT INTO customers VALUES (1, 'Ann');
+"""
+
+
+def tenant_directory(workdir):
+    """workdir/tenants/ with six healthy databases (one drifted, one without notes) and one corrupt file."""
+    tenants = os.path.join(workdir, 'tenants')
+    os.makedirs(os.path.join(tenants, 'eu'))
+    for number in range(5):
+        create_database(tenants, TENANT_SCHEMA, f"tenant_{number}.db")
+    create_database(os.path.join(tenants, 'eu'), TENANT_SCHEMA, 'tenant_0.db')
+
+    conn = sqlite3.connect(os.path.join(tenants, 'tenant_3.db'))
+    conn.execute("ALTER TABLE customers ADD COLUMN tier TEXT")
+    conn.close()
+    conn = sqlite3.connect(os.path.join(tenants, 'tenant_4.db'))
+    conn.execute("DROP TABLE notes")
+    conn.close()
+    with open(os.path.join(tenants, 'corrupt.db'), 'w') as f:
+        f.write("not a database")
+    return tenants
+
+
+def test_pool_analysis_and_drift_summary():
+    """Every database gets its own outputs; drift, missing tables and failures are reported."""
+    with temp_workdir() as workdir:
+        tenants = tenant_directory(workdir)
+        output_dir = os.path.join(workdir, 'out')
+
+        print("🧪 Testing multi-database analysis")
+        print("=" * 50)
+
+        db_paths = find_databases([tenants])
+        assert len(db_paths) == 7
+        stems = output_stems(db_paths)
+        assert stems[os.path.join(tenants, 'eu', 'tenant_0.db')] == 'eu_tenant_0'
+        assert stems[os.path.join(tenants, 'tenant_1.db')] == 'tenant_1'
+
+        finished = []
+        results = analyze_databases(db_paths, output_dir, jobs=2,
+                                    progress=lambda done, total, result: finished.append(done))
+        assert finished == list(range(1, 8))
+        assert [result['db_path'] for result in results] == db_paths
+
+        failed = [result for result in results if result['error']]
+        assert [os.path.basename(result['db_path']) for result in failed] == ['corrupt.db']
+        for result in results:
+            if not result['error']:
+                assert os.path.exists(result['markdown']) and os.path.exists(result['catalog'])
+                assert set(result['timings']) == {'connect', 'analyze', 'markdown', 'catalog'}
+
+        summary = summarize_databases(results)
+        print(f"Shared: {summary['shared_tables']}, drifted: {summary['drifted_tables']}, "
+              f"partial: {summary['partial_tables']}")
+        assert summary['shared_tables'] == ['orders']
+        assert summary['drifted_tables'] == ['customers']
+        assert summary['tables']['customers']['drifted'] == [os.path.join(tenants, 'tenant_3.db')]
+        assert summary['partial_tables'] == ['notes'] and summary['tables']['notes']['databases'] == 5
+
+        rerun = analyze_databases(db_paths, output_dir, jobs=2)
+        assert all(result['changed_tables'] == 0 for result in rerun if not result['error'])
+        print("✅ Per-database catalogs reused on the second run; drift and failures reported")
+
+
+def test_colliding_names_get_distinct_outputs():
+    """Same file name deeper down or with another extension: every database still gets its own files."""
+    with temp_workdir() as workdir:
+        db_paths = [os.path.join(workdir, 't', 'a', 'data', 'app.db'), os.path.join(workdir, 't', 'b', 'data', 'app.db'),
+                    os.path.join(workdir, 'x', 'foo.db'), os.path.join(workdir, 'x', 'foo.sqlite'),
+                    os.path.join(workdir, 'y', 'foo_db.db')]
+        for number, path in enumerate(db_paths):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path)
+            conn.execute(f"CREATE TABLE tenant_{number} (id INTEGER PRIMARY KEY)")
+            conn.close()
+
+        stems = output_stems(db_paths)
+        print(f"Stems: {sorted(stems.values())}")
+        assert [stems[path] for path in db_paths] == ['a_data_app', 'b_data_app', 'foo_db', 'foo_sqlite', 'foo_db_2']
+
+        output_dir = os.path.join(workdir, 'out')
+        results = analyze_databases(db_paths, output_dir, jobs=2)
+        assert len({result['markdown'] for result in results}) == len(db_paths)
+        for number, result in enumerate(results):
+            with open(result['markdown'], encoding='utf-8') as f:
+                assert f"### tenant_{number}" in f.read()
+        print("✅ Colliding file names resolved to distinct output files")
+
+
+def test_command_line_glob():
+    """The CLI takes a glob, writes the summary and exits non-zero because one file failed."""
+    with temp_workdir() as workdir:
+        tenants = tenant_directory(workdir)
+        output_dir = os.path.join(workdir, 'out')
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db_schema_analyzer.py')
+
+        completed = subprocess.run([sys.executable, script, os.path.join(tenants, '**', '*.db'),
+                                    '--jobs', '2', '--output-dir', output_dir],
+                                   capture_output=True, text=True)
+        print(completed.stdout.strip().splitlines()[-3])
+        assert completed.returncode == 1
+        assert '[7/7]' in completed.stdout and '❌ corrupt.db' in completed.stdout
+        with open(os.path.join(output_dir, 'schema_summary.md'), encoding='utf-8') as f:
+            summary = f.read()
+        assert '### customers' in summary and '| Database | Connect | Analyze | Markdown | Catalog |' in summary
+        assert len([name for name in os.listdir(output_dir) if name.endswith('_schema.md')]) == 6
+        print("✅ Command line analyzed the glob and wrote schema_summary.md")
+
+
+if __name__ == "__main__":
+    test_pool_analysis_and_drift_summary()
+    test_colliding_names_get_distinct_outputs()
+    test_command_line_glob()
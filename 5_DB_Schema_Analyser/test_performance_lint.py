@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the performance lint pass
+Builds a shop database with an unindexed foreign key, no ANALYZE statistics, an
+aggregate column nobody maintains and long sampled text, checks that each is reported
+in severity order, and that running the suggested fixes clears the report.
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+
+from fixtures import create_database, run_analyzer, temp_workdir
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT, order_count INTEGER DEFAULT 0);
+CREATE TABLE products (product_id INTEGER PRIMARY KEY, name TEXT, description TEXT, review_count INTEGER DEFAULT 0);
+CREATE TABLE orders (order_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+CREATE TABLE order_items (
+    order_id INTEGER REFERENCES orders (order_id),
+    product_id INTEGER REFERENCES products (product_id),
+    quantity INTEGER,
+    PRIMARY KEY (order_id, product_id)
+);
+CREATE TABLE reviews (review_id INTEGER PRIMARY KEY, product_id INTEGER REFERENCES products (product_id), rating INTEGER);
+CREATE INDEX idx_orders_customer_id ON orders (customer_id);
+CREATE INDEX idx_reviews_product_id ON reviews (product_id);
+CREATE VIRTUAL TABLE products_fts USING fts5(name);
+CREATE TRIGGER trg_orders_order_count AFTER INSERT ON orders
+BEGIN
+    UPDATE customers SET order_count = order_count + 1 WHERE customer_id = NEW.customer_id;
+END;
+INSERT INTO customers (customer_id, name) VALUES (1, 'Ann');
+INSERT INTO products (product_id, name, description) VALUES (1, 'Lamp', 'A lamp. ' || printf('%.500c', 'x'));
+INSERT INTO orders VALUES (1, 1);
+INSERT INTO order_items VALUES (1, 1, 2);
+"""
+
+
+def lint(db_path, **options):
+    """Analyze quietly and return (connected analyzer, ranked issues)."""
+    analyzer = run_analyzer(db_path, disconnect=False, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        issues = analyzer.lint_performance()
+    return analyzer, issues
+
+
+def test_each_check_reports_in_rank_order():
+    """Unindexed FK first, then statistics and the unmaintained aggregate, then wide text."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        analyzer, issues = lint(db_path)
+
+        print("🧪 Testing the performance lint pass")
+        print("=" * 50)
+        for issue in issues:
+            print(f"  {issue.severity:6} {issue.check:24} {issue.table}.{issue.column or ''}")
+
+        found = {(issue.check, issue.table, issue.column) for issue in issues}
+        # order_items.order_id leads the primary key index and orders.customer_id has its own index
+        assert ('unindexed foreign key', 'order_items', 'product_id') in found
+        assert not {('unindexed foreign key', 'order_items', 'order_id'), ('unindexed foreign key', 'orders', 'customer_id'),
+                    ('unindexed foreign key', 'reviews', 'product_id')} & found
+        assert ('missing statistics', 'orders', None) in found
+        assert not any(issue.table.startswith('products_fts') for issue in issues)
+        # customers.order_count has a trigger, products.review_count does not
+        assert ('unmaintained aggregate', 'products', 'review_count') in found
+        assert ('unmaintained aggregate', 'customers', 'order_count') not in found
+        assert ('wide sampled text', 'products', 'description') in found
+        assert [issue.severity for issue in issues] == sorted((issue.severity for issue in issues),
+                                                              key=['high', 'medium', 'low'].index)
+
+        report_path = analyzer.save_lint_report(os.path.join(workdir, 'lint.md'), issues)
+        with open(report_path, encoding='utf-8') as f:
+            report = f.read()
+        assert "CREATE INDEX idx_order_items_product_id ON order_items (product_id);" in report
+        analyzer.disconnect()
+        print("✅ Every check reported, most severe first, with its fix in the report")
+
+
+def test_fixes_clear_the_report():
+    """Running each suggested fix (and truncating samples) leaves nothing to report."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        _, issues = lint(db_path)
+
+        conn = sqlite3.connect(db_path)
+        for issue in issues:
+            if issue.check in ('unindexed foreign key', 'unmaintained aggregate'):
+                conn.executescript(issue.fix)
+        conn.execute("INSERT INTO reviews (product_id, rating) VALUES (1, 5)")
+        conn.commit()
+        assert conn.execute("SELECT review_count FROM products WHERE product_id = 1").fetchone()[0] == 1
+        # Statistics last, so they describe the final rows; reviews was empty (and not reported) when linted
+        conn.executescript(''.join(issue.fix for issue in issues if issue.check == 'missing statistics'))
+        conn.execute("ANALYZE reviews")
+        conn.commit()
+        conn.close()
+
+        analyzer, issues = lint(db_path, sample_text_limit=80)
+        assert [issue.check for issue in issues] == [], issues
+        description = analyzer.sample_data['products']['rows'][0][2]
+        assert len(description) == 81 and description.endswith('…')
+        analyzer.disconnect()
+        print("✅ Index, ANALYZE and trigger fixes applied; report is empty")
+
+
+if __name__ == "__main__":
+    test_each_check_reports_in_rank_order()
+    test_fixes_clear_the_report()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured schema catalog
+Checks that the catalog is one valid JSON (or MessagePack) document, that the offset
+index points at each table's entry so single tables decode on demand, that a stale
+index falls back to parsing the whole file, and that incremental re-analysis reads
+fingerprints from the index. Both writers must encode each entry as it is produced.
+"""
+
+import contextlib
+import io
+import json
+import os
+
+from fixtures import create_database, run_analyzer, temp_workdir
+from schema_catalog import CatalogReader, _write_json, _write_msgpack, index_path, msgpack
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE orders (order_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+CREATE TABLE attachments (attachment_id INTEGER PRIMARY KEY, order_id INTEGER REFERENCES orders (order_id), content BLOB);
+INSERT INTO customers VALUES (1, 'Ann "the first"'), (2, 'Bjørn');
+INSERT INTO orders VALUES (1, 1);
+INSERT INTO attachments VALUES (1, 1, X'00FF');
+"""
+
+
+def test_json_catalog_loads_single_tables():
+    """The catalog is plain JSON; the reader decodes only the tables asked for."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        catalog_path = os.path.join(workdir, 'shop.catalog.json')
+        analyzer = run_analyzer(db_path, catalog_path)
+
+        print("🧪 Testing the structured schema catalog")
+        print("=" * 50)
+
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        assert list(document['tables']) == ['attachments', 'customers', 'orders']
+
+        with CatalogReader(catalog_path) as reader:
+            assert reader.index is not None and reader.tables == ['attachments', 'customers', 'orders']
+            assert reader.header['database'] == 'shop.db'
+            assert reader.fingerprint('orders') == analyzer.fingerprints['orders']
+            assert reader._entries == {}
+            assert reader.table('customers') == document['tables']['customers']
+            assert list(reader._entries) == ['customers']
+            assert reader.schema_info(['orders'])['orders'] == analyzer.schema_info['orders']
+            assert reader.field('orders', 'markdown') == document['tables']['orders']['markdown']
+            assert list(reader._entries) == ['customers']
+
+        # A re-run copies the unchanged entries' fields as they are: the same document comes back
+        assert run_analyzer(db_path, catalog_path).changed_tables == []
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['tables'] == document['tables']
+        print("✅ Valid JSON document; single tables and fields decoded through the offset index")
+
+
+def test_stale_index_falls_back_to_full_parse():
+    """A catalog rewritten behind the index's back is still read correctly."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        catalog_path = os.path.join(workdir, 'shop.catalog.json')
+        run_analyzer(db_path, catalog_path)
+
+        with open(catalog_path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        with CatalogReader(catalog_path) as reader:
+            assert reader.index is None
+            assert reader.table('attachments')['sample']['rows'] == [[1, 1, {'$bytes': '00ff'}]]
+
+        os.remove(index_path(catalog_path))
+        second = run_analyzer(db_path, catalog_path)
+        assert second.changed_tables == [] and os.path.exists(index_path(catalog_path))
+        assert second.sample_data['customers']['rows'][1] == (2, 'Bjørn')
+        print("✅ Stale or missing index: whole file parsed, catalog still reused")
+
+
+def test_writers_stream_entries():
+    """Each entry is written before the next one is asked for; MessagePack checks the announced count."""
+    writers = [('JSON', _write_json)] + ([('MessagePack', _write_msgpack)] if msgpack is not None else [])
+    for name, writer in writers:
+        sink = io.BytesIO()
+        written = []
+
+        def entries():
+            for number in range(5):
+                written.append(len(sink.getvalue()))
+                yield f"table_{number}", {'fingerprint': str(number), 'markdown': 'x' * 100}
+
+        offsets = writer(sink, {'version': 2}, entries(), 5)
+        assert len(offsets) == 5
+        # Nothing is buffered: the file grew between every two entries
+        assert all(later > earlier for earlier, later in zip(written, written[1:])), (name, written)
+        print(f"✅ {name} catalog entries encoded one at a time")
+
+    if msgpack is None:
+        print("⏭️  MessagePack count check skipped (pip install msgpack)")
+        return
+    try:
+        _write_msgpack(io.BytesIO(), {'version': 2}, iter([('orders', {})]), 2)
+        raise AssertionError("a table count that does not match was accepted")
+    except ValueError as e:
+        assert 'announced 2 tables but got 1' in str(e)
+
+
+def test_msgpack_catalog():
+    """A .msgpack catalog holds the same entries and supports incremental re-analysis."""
+    if msgpack is None:
+        print("⏭️  MessagePack catalog skipped (pip install msgpack)")
+        return
+
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        json_path = os.path.join(workdir, 'shop.catalog.json')
+        msgpack_path = os.path.join(workdir, 'shop.catalog.msgpack')
+        run_analyzer(db_path, json_path)
+        run_analyzer(db_path, msgpack_path)
+
+        with open(msgpack_path, 'rb') as f:
+            document = msgpack.unpackb(f.read(), raw=False)
+        with CatalogReader(json_path) as json_reader, CatalogReader(msgpack_path) as msgpack_reader:
+            assert msgpack_reader.format == 'msgpack' and msgpack_reader.index is not None
+            for table_name in json_reader.tables:
+                assert msgpack_reader.table(table_name) == json_reader.table(table_name) == document['tables'][table_name]
+        assert run_analyzer(db_path, msgpack_path).changed_tables == []
+        with open(msgpack_path, 'rb') as f:
+            assert msgpack.unpackb(f.read(), raw=False)['tables'] == document['tables']
+
+        # Entries reused from the JSON catalog are re-encoded when saved as MessagePack
+        converted_path = os.path.join(workdir, 'converted.catalog.msgpack')
+        reused = run_analyzer(db_path, json_path)
+        assert reused.changed_tables == []
+        with contextlib.redirect_stdout(io.StringIO()):
+            reused.save_catalog(converted_path)
+        with open(converted_path, 'rb') as f:
+            assert msgpack.unpackb(f.read(), raw=False)['tables'] == document['tables']
+        print(f"✅ MessagePack catalog: {os.path.getsize(msgpack_path)} bytes vs {os.path.getsize(json_path)} as JSON")
+
+
+if __name__ == "__main__":
+    test_json_catalog_loads_single_tables()
+    test_stale_index_falls_back_to_full_parse()
+    test_writers_stream_entries()
+    test_msgpack_catalog()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for per-question schema retrieval
+Analyzes a shop database padded with hundreds of unrelated tables until its markdown is
+over a megabyte, then checks that the section index keeps only per-table sections, finds
+the tables a question is about, adds their foreign key neighbours and keeps the prompt
+schema within its budget.
+"""
+
+import os
+import sqlite3
+
+from fixtures import create_database, run_analyzer, temp_workdir
+from schema_retrieval import SchemaIndex, compact_section
+
+SHOP_SCHEMA = """
+CREATE TABLE categories (category_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE products (product_id INTEGER PRIMARY KEY, name TEXT, category_id INTEGER REFERENCES categories (category_id));
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT, email TEXT);
+CREATE TABLE reviews (
+    review_id INTEGER PRIMARY KEY,
+    product_id INTEGER REFERENCES products (product_id),
+    customer_id INTEGER REFERENCES customers (customer_id),
+    rating INTEGER
+);
+INSERT INTO categories VALUES (1, 'Electronics'), (2, 'Garden');
+INSERT INTO products VALUES (1, 'Lamp', 1), (2, 'Hose', 2);
+INSERT INTO customers VALUES (1, 'Ann', 'ann@example.com');
+INSERT INTO reviews VALUES (1, 1, 1, 5), (2, 2, 1, 3);
+"""
+
+PADDING_TABLES = 600
+
+
+def padded_shop_markdown(workdir):
+    """Analyze the shop plus PADDING_TABLES telemetry tables with long sample text; returns the markdown path."""
+    db_path = create_database(workdir, SHOP_SCHEMA)
+    conn = sqlite3.connect(db_path)
+    for number in range(PADDING_TABLES):
+        conn.execute(f"CREATE TABLE telemetry_{number:04d} (sample_id INTEGER PRIMARY KEY, payload TEXT)")
+        conn.executemany(f"INSERT INTO telemetry_{number:04d} (payload) VALUES (?)",
+                         [(f"sensor reading {row} " + 'z' * 500,) for row in range(3)])
+    conn.commit()
+    conn.close()
+
+    markdown_path = os.path.join(workdir, 'shop_schema.md')
+    run_analyzer(db_path, markdown_path=markdown_path)
+    return markdown_path
+
+
+def test_sections_and_selection():
+    """Only table sections are indexed; a question gets its tables, their neighbours and nothing else."""
+    with temp_workdir() as workdir:
+        markdown_path = padded_shop_markdown(workdir)
+        size = os.path.getsize(markdown_path)
+
+        print("🧪 Testing per-question schema retrieval")
+        print("=" * 50)
+
+        index = SchemaIndex.from_file(markdown_path)
+        assert len(index.tables) == 4 + PADDING_TABLES
+        assert not any('Natural Language Query Examples' in section or '\n## ' in section
+                       for section in index.sections.values())
+        assert index.neighbours['reviews'] == {'products', 'customers'}
+        assert index.overview.startswith("## Database Overview")
+
+        question = "Average rating of products in each category"
+        ranked = [table for table, _ in index.rank(question)]
+        assert set(ranked[:3]) == {'reviews', 'products', 'categories'}, ranked
+
+        selected = dict(index.select(question))
+        assert set(selected) == {'reviews', 'products', 'categories', 'customers'}
+        assert selected['customers'] == compact_section(index.sections['customers'])
+        assert "**Sample Data:**" in selected['reviews']
+
+        text = index.schema_text(question)
+        print(f"Markdown {size / (1024 * 1024):.1f} MB, prompt schema {len(text):,} characters")
+        assert size > 1024 * 1024 and len(text) < 12000 + len(index.overview) + 100
+        assert "**Other tables:** telemetry_0000" in text and "telemetry_0599" in text
+        # A tighter budget cuts the list of other tables short
+        assert index.schema_text(question, max_chars=5000).rstrip().endswith('…')
+        print("✅ Question tables and neighbours selected from a megabyte-sized schema")
+
+
+def test_required_tables_and_budget():
+    """Join tree tables come first; sections shrink to their columns, then drop out, as the budget tightens."""
+    with temp_workdir() as workdir:
+        markdown_path = padded_shop_markdown(workdir)
+        index = SchemaIndex.from_file(markdown_path)
+
+        selected = index.select("sensor payloads", required=['customers'], max_tables=2)
+        assert [table for table, _ in selected][0] == 'customers'
+        assert len(selected) <= 3
+
+        full = len(index.sections['reviews'])
+        compact = len(compact_section(index.sections['reviews']))
+        assert index.select("ratings in reviews", max_chars=full) == [('reviews', index.sections['reviews'])]
+        assert index.select("ratings in reviews", max_chars=compact) == [('reviews', compact_section(index.sections['reviews']))]
+        assert index.select("ratings in reviews", max_chars=compact - 1) == []
+        for budget in (500, 2000, 8000):
+            sections = sum(len(section) for _, section in index.select("average rating by category", max_chars=budget))
+            assert sections <= budget
+        print("✅ Required tables first; sections shrink and drop to stay within the budget")
+
+
+if __name__ == "__main__":
+    test_sections_and_selection()
+    test_required_tables_and_budget()
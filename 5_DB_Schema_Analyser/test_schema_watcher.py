@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the schema watcher
+Runs a watcher that rebuilds the analyzer's markdown and section index, then changes the
+database underneath it: data-only writes must not rebuild, schema changes (also ones
+still in the WAL) must appear without a restart, requests must keep reading the old
+snapshot while a slow rebuild runs, a failed rebuild must keep the old snapshot and
+be retried, and request threads racing for the first snapshot must build it only once.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from fixtures import create_database, run_analyzer, temp_workdir
+from schema_retrieval import SchemaIndex
+from schema_watcher import SchemaWatcher
+
+SHOP_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE orders (order_id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (customer_id));
+INSERT INTO customers VALUES (1, 'Ann');
+"""
+
+POLL_INTERVAL = 0.05
+
+
+def build_index(db_path):
+    """What NLToSQLWithSchema.build_artifacts does, without the OpenAI client: analyze, write, index."""
+    markdown_path = f"{os.path.splitext(db_path)[0]}_schema.md"
+    run_analyzer(db_path, f"{os.path.splitext(db_path)[0]}.catalog.json", markdown_path)
+    return SchemaIndex.from_file(markdown_path)
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll condition until it is true or timeout seconds pass; returns its last value."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL / 2)
+    return condition()
+
+
+def test_schema_changes_swap_in():
+    """Writes leave the snapshot alone; a new table appears in a new snapshot with its rebuild time."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        durations = []
+
+        print("🧪 Testing the schema watcher")
+        print("=" * 50)
+
+        with SchemaWatcher(db_path, build_index, POLL_INTERVAL, on_rebuild=lambda seconds, _: durations.append(seconds)) as watcher:
+            first = watcher.snapshot
+            assert first.value.tables == ['customers', 'orders'] and watcher.rebuilds == 1
+
+            conn = sqlite3.connect(db_path)
+            conn.executemany("INSERT INTO orders (customer_id) VALUES (?)", [(1,)] * 50)
+            conn.commit()
+            time.sleep(POLL_INTERVAL * 6)
+            assert watcher.snapshot is first
+
+            conn.execute("CREATE TABLE refunds (refund_id INTEGER PRIMARY KEY, order_id INTEGER REFERENCES orders (order_id))")
+            conn.commit()
+            conn.close()
+            assert wait_for(lambda: 'refunds' in watcher.snapshot.value.tables)
+
+        second = watcher.snapshot
+        assert second.schema_version > first.schema_version and watcher.rebuilds == 2
+        assert first.value.tables == ['customers', 'orders']
+        assert second.value.neighbours['refunds'] == {'orders'}
+        assert len(durations) == 2 and durations[-1] == second.build_seconds
+        print(f"✅ Data writes ignored; new table picked up, rebuilt in {second.build_seconds * 1000:.1f} ms")
+
+
+def test_wal_schema_change_is_seen():
+    """A schema change still in the -wal file (not checkpointed) is detected."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA, journal_mode='wal')
+        writer = sqlite3.connect(db_path)
+        writer.execute("PRAGMA wal_autocheckpoint = 0")
+
+        with SchemaWatcher(db_path, build_index, POLL_INTERVAL, on_rebuild=None) as watcher:
+            writer.execute("CREATE INDEX idx_orders_customer_id ON orders (customer_id)")
+            writer.execute("CREATE TABLE notes (note_id INTEGER PRIMARY KEY, body TEXT)")
+            writer.commit()
+            assert wait_for(lambda: 'notes' in watcher.snapshot.value.tables)
+        writer.close()
+        print("✅ Schema change in the WAL picked up before any checkpoint")
+
+
+def test_requests_never_wait_and_failures_keep_the_snapshot():
+    """Reads during a slow rebuild return the old snapshot at once; a failing build is retried."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        release = threading.Event()
+        failures = []
+        calls = []
+
+        def build(path):
+            calls.append(path)
+            if len(calls) == 2:
+                release.wait(5)
+            if len(calls) == 3:
+                raise sqlite3.OperationalError("database is locked")
+            return build_index(path)
+
+        with SchemaWatcher(db_path, build, POLL_INTERVAL, on_rebuild=None, on_error=failures.append) as watcher:
+            first = watcher.snapshot
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE refunds (refund_id INTEGER PRIMARY KEY)")
+            conn.commit()
+            assert wait_for(lambda: len(calls) == 2)
+
+            start = time.perf_counter()
+            for _ in range(1000):
+                assert watcher.snapshot is first
+            read_seconds = time.perf_counter() - start
+            release.set()
+            assert wait_for(lambda: 'refunds' in watcher.snapshot.value.tables)
+
+            conn.execute("CREATE TABLE returns (return_id INTEGER PRIMARY KEY)")
+            conn.commit()
+            conn.close()
+            assert wait_for(lambda: 'returns' in watcher.snapshot.value.tables)
+
+        assert [str(e) for e in failures] == ["database is locked"] and len(calls) == 4
+        print(f"Snapshot reads during a rebuild: {read_seconds / 1000 * 1e6:.2f} µs each")
+        print("✅ Requests kept the old snapshot during the rebuild; the failed rebuild was retried")
+
+
+def test_first_snapshot_is_built_once():
+    """Threads reading the snapshot of an unstarted watcher at once share one build; start() reuses it."""
+    with temp_workdir() as workdir:
+        db_path = create_database(workdir, SHOP_SCHEMA)
+        calls = []
+        snapshots = []
+
+        def build(path):
+            calls.append(path)
+            time.sleep(POLL_INTERVAL)
+            return build_index(path)
+
+        watcher = SchemaWatcher(db_path, build, POLL_INTERVAL, on_rebuild=None)
+        readers = [threading.Thread(target=lambda: snapshots.append(watcher.snapshot)) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+
+        assert len(calls) == 1 and watcher.rebuilds == 1
+        assert len(snapshots) == 8 and all(snapshot is snapshots[0] for snapshot in snapshots)
+        with watcher:
+            time.sleep(POLL_INTERVAL * 3)
+            assert watcher.snapshot is snapshots[0] and len(calls) == 1
+        print("✅ Concurrent first reads built the snapshot once")
+
+
+if __name__ == "__main__":
+    test_schema_changes_swap_in()
+    test_wal_schema_change_is_seen()
+    test_requests_never_wait_and_failures_keep_the_snapshot()
+    test_first_snapshot_is_built_once()